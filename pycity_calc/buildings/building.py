@@ -140,6 +140,10 @@ class BuildingExtended(build.Building):
         self.window_layout = window_layout
         self.retrofit_state = retrofit_state
 
+        #  ProfileStore with cached, resampled profiles (e.g. occupancy).
+        #  Generated on demand (see toolbox.profile_store.get_profile_store)
+        self.profile_store = None
+
     def get_annual_space_heat_demand(self):
         """
         Returns annual space heating demand in kWh/a
@@ -10,6 +10,8 @@ except:  # pragma: no cover
     ImportError('Package pycity_base is not found. Please install pycity first.' +
                 'https://github.com/RWTH-EBC/pyCity')
 
+import networkx as nx
+
 import pycity_base.classes.CityDistrict as citydist
 
 
@@ -38,8 +40,22 @@ class City(citydist.CityDistrict):
         >>> prices = price.Prices()
         >>> environment = env.Environment(timer, weather, prices)
         >>> city = City(environment)
+
+        Annotations
+        -----------
+        City holds an index of edges per network_type (e.g. 'heating',
+        'electricity', 'heating_and_deg', 'street'), which is updated by
+        add_edge(s_from), remove_edge(s_from), remove_node(s_from) and
+        clear. If network_type attributes are changed directly via
+        city.edges[u, v]['network_type'] = ..., call rebuild_edge_index.
         """
 
+        #  Index of edges per network_type
+        #  {network_type: {frozenset((u, v)): (u, v)}}
+        self._edge_index = {}
+        #  network_type per edge {frozenset((u, v)): network_type}
+        self._edge_net_type = {}
+
         # Initialize City with inheritance from pycity citydistrict object
         super(City, self).__init__(environment)
 
@@ -218,3 +234,141 @@ class City(citydist.CityDistrict):
                           + self.get_annual_dhw_demand(nodelist=nodelist)
 
         return total_th_demand
+
+    def _has_valid_edge_index(self):
+        """
+        Returns True, if edge index is available (False for graph views and
+        city objects, which have been pickled without edge index)
+        """
+        return (getattr(self, '_edge_index', None) is not None and
+                not nx.is_frozen(self))
+
+    def _index_edge(self, u, v):
+        """
+        Add (or update) edge (u, v) within edge index
+        """
+        if not self._has_valid_edge_index():
+            return
+        key = frozenset((u, v))
+        net_type = self._adj[u][v].get('network_type', None)
+        if key in self._edge_net_type:
+            old_type = self._edge_net_type[key]
+            if old_type == net_type:
+                return
+            del self._edge_index[old_type][key]
+        self._edge_net_type[key] = net_type
+        self._edge_index.setdefault(net_type, {})[key] = (u, v)
+
+    def _unindex_edge(self, u, v):
+        """
+        Remove edge (u, v) from edge index
+        """
+        if not self._has_valid_edge_index():
+            return
+        key = frozenset((u, v))
+        if key in self._edge_net_type:
+            del self._edge_index[self._edge_net_type.pop(key)][key]
+
+    def rebuild_edge_index(self):
+        """
+        Rebuild index of edges per network_type out of all city edges
+        """
+        self._edge_index = {}
+        self._edge_net_type = {}
+        for u, v in self.edges():
+            self._index_edge(u, v)
+
+    def add_edge(self, u_of_edge, v_of_edge, **attr):
+        super(City, self).add_edge(u_of_edge, v_of_edge, **attr)
+        self._index_edge(u_of_edge, v_of_edge)
+
+    def add_edges_from(self, ebunch_to_add, **attr):
+        ebunch_to_add = list(ebunch_to_add)
+        super(City, self).add_edges_from(ebunch_to_add, **attr)
+        for e in ebunch_to_add:
+            self._index_edge(e[0], e[1])
+
+    def remove_edge(self, u, v):
+        super(City, self).remove_edge(u, v)
+        self._unindex_edge(u, v)
+
+    def remove_edges_from(self, ebunch):
+        ebunch = list(ebunch)
+        super(City, self).remove_edges_from(ebunch)
+        for e in ebunch:
+            self._unindex_edge(e[0], e[1])
+
+    def remove_node(self, n):
+        list_nb = list(self._adj[n]) if n in self._adj else []
+        super(City, self).remove_node(n)
+        for nb in list_nb:
+            self._unindex_edge(n, nb)
+
+    def remove_nodes_from(self, nodes):
+        nodes = list(nodes)
+        list_edges = [(n, nb) for n in nodes if n in self._adj
+                      for nb in self._adj[n]]
+        super(City, self).remove_nodes_from(nodes)
+        for (n, nb) in list_edges:
+            self._unindex_edge(n, nb)
+
+    def clear(self):
+        super(City, self).clear()
+        self._edge_index = {}
+        self._edge_net_type = {}
+
+    def get_edges_of_network_type(self, network_type):
+        """
+        Returns list of edges of specific network_type(s)
+
+        Parameters
+        ----------
+        network_type : str or list (of str)
+            Network type(s), e.g. 'heating' or ['heating', 'heating_and_deg']
+
+        Returns
+        -------
+        list_edges : list (of tuples)
+            List of edge tuples (u, v)
+        """
+
+        if isinstance(network_type, str):
+            network_type = [network_type]
+
+        if not self._has_valid_edge_index():
+            if nx.is_frozen(self):
+                #  Graph view: Search edges
+                return [(u, v) for u, v, t in
+                        self.edges(data='network_type')
+                        if t in network_type]
+            #  E.g. unpickled city object without edge index
+            self.rebuild_edge_index()
+
+        list_edges = []
+        for net_type in network_type:
+            list_edges.extend(self._edge_index.get(net_type, {}).values())
+
+        return list_edges
+
+    def get_nodes_of_network_type(self, network_type):
+        """
+        Returns set of node ids, which are connected to edges of specific
+        network_type(s)
+
+        Parameters
+        ----------
+        network_type : str or list (of str)
+            Network type(s), e.g. 'heating' or ['heating', 'heating_and_deg']
+
+        Returns
+        -------
+        set_nodes : set
+            Set of node ids
+        """
+
+        set_nodes = set()
+        for u, v in self.get_edges_of_network_type(network_type):
+            set_nodes.add(u)
+            set_nodes.add(v)
+
+        return set_nodes
@@ -29,19 +29,8 @@ import pycity_calc.visualization.city_visual as citvis
 import pycity_calc.toolbox.modifiers.slp_th_manipulator as slpman
 import pycity_calc.toolbox.teaser_usage.teaser_use as tusage
 import pycity_calc.toolbox.mc_helpers.user.user_unc_sampling as usunc
-
-try:
-    import teaser.logic.simulation.VDI_6007.weather as vdiweather
-except:  # pragma: no cover
-    msg = 'Could not import teaser.logic.simulation.VDI_6007.weather. ' \
-          'If you need to use it, install ' \
-          'it via pip "pip install TEASER". Alternatively, you might have ' \
-          'run into trouble with XML bindings in TEASER. This can happen ' \
-          'if you try to re-import TEASER within an active Python console.' \
-          'Please close the active Python console and open another one. Then' \
-          ' try again. You might also be on the wrong TEASER branch ' \
-          '(without VDI 6007 core).'
-    warnings.warn(msg)
+import pycity_calc.toolbox.mc_helpers.sampling_engine as sampeng
+import pycity_calc.toolbox.user.user_profile_batch as upbatch
 
 
 def load_data_file_with_spec_demand_data(filename):
@@ -844,7 +833,8 @@ def generate_res_building_multi_zone(environment,
                                      slp_manipulate=True,
                                      curr_central_ahu=False,
                                      dhw_random=False, prev_heat_dev=True,
-                                     season_mod=None):
+                                     season_mod=None, batch_profiles=False,
+                                     rng=None):
     """
     Function generates and returns extended residential building object
     with multiple apartments. Occupants are randomly distributed over
@@ -965,6 +955,15 @@ def generate_res_building_multi_zone(environment,
         with cosine wave to increase winter usage and decrease summer usage.
         Reference is maximum lighting power (default: None). If set to None,
         do NOT perform rescaling with cosine wave
+    batch_profiles : bool, optional
+        Defines, if occupancy and stochastic el. and dhw profiles of all
+        apartments should be generated at once with user_profile_batch
+        (default: False). Profiles are statistically equivalent to the
+        profiles of the single apartment models, but generation is much
+        faster for buildings with many apartments.
+    rng : np.random.Generator, optional
+        Random Generator for batch profile generation (default: None).
+        Only relevant, if batch_profiles is True.
 
     Returns
     -------
@@ -1046,6 +1045,25 @@ def generate_res_building_multi_zone(environment,
     else:
         annual_el_demand_ap = None
 
+    if season_mod is not None:
+        season_light_mod = True
+    else:
+        season_light_mod = False
+
+    #  Generate occupancy profiles of all apartments at once. Stochastic
+    #  el. and dhw profiles are generated after apartment loop.
+    use_batch = (batch_profiles and total_number_occupants is not None and
+                 (el_gen_method == 2 or (dhw_method == 2 and use_dhw)))
+
+    if use_batch:
+        rng = sampeng.get_rng(rng=rng)
+        array_occ_profiles = \
+            upbatch.gen_occ_profiles(array_nb_occ=occupancy_list, rng=rng)
+        array_el_dem_ap = np.zeros(int(nb_of_apartments))
+        array_dhw_vol_ap = np.zeros(int(nb_of_apartments))
+        list_el_curves = []
+        list_dhw_curves = []
+
     # Loop over apartments
     #  #---------------------------------------------------------------------
     for i in range(int(nb_of_apartments)):
@@ -1060,7 +1078,14 @@ def generate_res_building_multi_zone(environment,
             curr_number_occupants = occupancy_list[i]
 
             #  Generate occupancy profiles for stochastic el. and/or dhw
-            if el_gen_method == 2 or (dhw_method == 2 and use_dhw):
+            if use_batch:
+                occupancy_object = occup.Occupancy(environment,
+                                                   number_occupants=
+                                                   curr_number_occupants,
+                                                   do_profile=False)
+                occupancy_object.occupancy = array_occ_profiles[i]
+
+            elif el_gen_method == 2 or (dhw_method == 2 and use_dhw):
 
                 #  Generate occupancy profile (necessary for stochastic, el. or
                 #  dhw profile)
@@ -1144,12 +1169,15 @@ def generate_res_building_multi_zone(environment,
         print()
 
         # Create electrical power curve
-        if el_gen_method == 2:
+        if el_gen_method == 2 and use_batch:
+            #  Load curve is generated after apartment loop
+            el_power_curve = ElectricalDemand.ElectricalDemand(environment,
+                                                               method=0,
+                                                               loadcurve=np.zeros(environment.timer.timestepsTotal))
+            array_el_dem_ap[i] = annual_el_demand_ap
+            list_el_curves.append(el_power_curve)
 
-            if season_mod is not None:
-                season_light_mod = True
-            else:
-                season_light_mod = False
+        elif el_gen_method == 2:
 
             el_power_curve = ElectricalDemand.ElectricalDemand(environment,
                                                                method=2,
@@ -1194,6 +1222,19 @@ def generate_res_building_multi_zone(environment,
                     dailyConsumption=dhw_volumen * curr_number_occupants,
                     supplyTemperature=25)
 
+            elif use_batch:  # Stochastic profile (after apartment loop)
+                dhw_power_curve = DomesticHotWater.DomesticHotWater(
+                    environment,
+                    tFlow=60,
+                    thermal=True,
+                    method=0,
+                    loadcurve=np.zeros(environment.timer.timestepsTotal),
+                    supplyTemperature=25)
+                dhw_power_curve.water = \
+                    np.zeros(environment.timer.timestepsTotal)
+                array_dhw_vol_ap[i] = dhw_volumen * curr_number_occupants
+                list_dhw_curves.append(dhw_power_curve)
+
             else:  # Stochastic profile
                 dhw_power_curve = DomesticHotWater.DomesticHotWater(
                     environment,
@@ -1251,6 +1292,32 @@ def generate_res_building_multi_zone(environment,
         # Add apartment to extended building
         extended_building.addEntity(entity=apartment)
 
+    if use_batch:
+        #  Generate stochastic el. and dhw profiles of all apartments
+        #  (rescaled to annual el. demands and dhw volumes of apartments)
+        dict_profiles = \
+            upbatch.gen_apartment_profiles(environment=environment,
+                                           array_nb_occ=occupancy_list,
+                                           occ_profiles=array_occ_profiles,
+                                           el_profiles=len(list_el_curves) > 0,
+                                           dhw_profiles=
+                                           len(list_dhw_curves) > 0,
+                                           annual_el_demands=array_el_dem_ap,
+                                           prev_heat_dev=prev_heat_dev,
+                                           season_light_mod=season_light_mod,
+                                           light_mod_fac=season_mod,
+                                           do_normalization=do_normalization,
+                                           t_flow=60, t_supply=25,
+                                           dhw_volumes=array_dhw_vol_ap,
+                                           rng=rng)
+
+        for (i, el_power_curve) in enumerate(list_el_curves):
+            el_power_curve.loadcurve = dict_profiles['el'][i]
+
+        for (i, dhw_power_curve) in enumerate(list_dhw_curves):
+            dhw_power_curve.water = dict_profiles['dhw_water'][i]
+            dhw_power_curve.loadcurve = dict_profiles['dhw_heat'][i]
+
     return extended_building
 
 
@@ -1616,7 +1683,8 @@ def run_city_generator(generation_mode, timestep,
                        t_night=16,
                        vdi_sh_manipulate=False, city_osm=None,
                        el_random=False, dhw_random=False, prev_heat_dev=True,
-                       season_mod=None, merge_windows=False, new_try=False):
+                       season_mod=None, merge_windows=False, new_try=False,
+                       batch_profiles=False, seed=None):
     """
     Function generates city district for user defined input. Generated
     buildings consist of only one single zone!
@@ -1769,6 +1837,14 @@ def run_city_generator(generation_mode, timestep,
         If True, assumes that TRY dataset has been generated after 2017 and
         belongs to the new TRY classes. This is important for extracting
         the correct values from the TRY dataset!
+    batch_profiles : bool, optional
+        Defines, if occupancy and stochastic el. and dhw profiles of all
+        apartments of multi-family houses should be generated at once with
+        user_profile_batch (default: False). Much faster for buildings with
+        many apartments.
+    seed : int, optional
+        Seed for batch profile generation (default: None). Only relevant,
+        if batch_profiles is True.
 
     Returns
     -------
@@ -1837,6 +1913,11 @@ def run_city_generator(generation_mode, timestep,
     if generation_mode == 1: # pragma: no cover
         assert city_osm is not None, 'Generation mode 1 requires city object!'
 
+    if batch_profiles:
+        rng = sampeng.get_rng(seed=seed)
+    else:
+        rng = None
+
     if vdi_sh_manipulate is True and th_gen_method == 3: # pragma: no cover
         msg = 'Simulated profiles of VDI 6007 call (TEASER --> ' \
               'space heating) is going to be normalized with annual thermal' \
@@ -2424,7 +2505,9 @@ def run_city_generator(generation_mode, timestep,
                                                                 curr_central_ahu=curr_central_ahu,
                                                                 dhw_random=dhw_random,
                                                                 prev_heat_dev=prev_heat_dev,
-                                                                season_mod=season_mod)
+                                                                season_mod=season_mod,
+                                                                batch_profiles=batch_profiles,
+                                                                rng=rng)
 
                 elif curr_nb_of_apartments == 1:  # Single-family house
                     building = generate_res_building_single_zone(environment,
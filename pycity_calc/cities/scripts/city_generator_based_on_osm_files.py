@@ -60,16 +60,15 @@ import sys
 
 import os.path
 import numpy
-import utm
 
 import pycity_base.classes.demand.Apartment as Apartment
-import pycity_calc.cities.scripts.city_generator.city_generator as citgen
 import pycity_base.classes.demand.Occupancy as occup
 import pycity_calc.buildings.building as build_ex
 import uesgraphs.uesgraph as ues
 
 import pycity_calc.cities.scripts.osm_call as osm
 
+
 def main():  # pragma: no cover
 
     """
@@ -249,24 +248,14 @@ def main():  # pragma: no cover
     conv_utm = False
     zone_number = 32
 
+    #  Folder for cached results of the generator stages (topology, utm,
+    #  geometry, enrichment). Stages are reused, if osm file and stage
+    #  parameters are unchanged (e.g. for a changed min_house_area, only the
+    #  data enrichment is repeated). Set to None to disable file caching.
     this_path = os.path.dirname(os.path.abspath(__file__))
-    osm_path = os.path.join(this_path, 'input_osm', filename)
+    path_cache = os.path.join(this_path, 'output_osm', 'cache')
 
-    # Generate environment
-    environment = citgen.generate_environment(timestep=timestep,
-                                              year_timer=year,
-                                              try_path=try_path,
-                                              location=location,
-                                              altitude=altitude,
-                                              new_try=new_try)
-
-    #  Generate city topology based on osm data
-    min_area = 0  # --> Do NOT change! Needed to get all buildings at first and to delete the small buildings later on.  The small buildings are needed for identification of the building types!
-    city = osm.gen_osm_city_topology(osm_path=osm_path,
-                                     environment=environment,
-                                     name=None,
-                                     check_boundary=False,
-                                     min_area=min_area)
+    osm_path = os.path.join(this_path, 'input_osm', filename)
 
     if user_defined_building_distribution == True:
         print("User-defined city distrubution with", percentage_sfh, " % SFH, ", percentage_mfh, "% MFH and ",
@@ -277,48 +266,41 @@ def main():  # pragma: no cover
         assert (user_defined_building_distribution == True and (
         percentage_sfh + percentage_mfh + percentage_non_res) != 100), "Sum of percentages is unequal 100.  Try again..."
 
-    deleted_buildings, nodelist_buildings = delete_not_relevant_buildings(city=city, min_house_area=min_house_area, generate_nodelist_from_function_of_citydistrict=generate_nodelist_from_function_of_citydistrict)
-
-    if conv_utm:
-        # Convert latitude, longitude to utm
-        city = osm.conv_city_long_lat_to_utm(city, zone_number=zone_number)
-        conv_outlines_of_buildings_long_lat_to_utm(city=city, zone_number=zone_number, min_house_area=min_house_area, nodelist_buildings=nodelist_buildings, generate_nodelist_from_function_of_citydistrict=generate_nodelist_from_function_of_citydistrict)
-
-    if save_city_CSV == False:
-        # DEF data_enrichment
-        data_enrichment(city=city, osm_path=osm_path, zone_number=zone_number, min_house_area=min_house_area,
-                                          considered_area_around_a_building=considered_area_around_building, \
-                        user_defined_building_distribution= user_defined_building_distribution, \
-                        percentage_sfh=percentage_sfh, percentage_mfh=percentage_mfh, percentage_non_res=percentage_non_res, \
-                        specific_buildings=specific_buildings, \
-                        user_defined_build_year=user_defined_build_year,
-                        specified_build_year_beginning=specified_build_year_beginning, \
-                        specified_build_year_end=specified_build_year_end, user_defined_mod_year=user_defined_mod_year,
-                        mod_year_method = mod_year_method, range_of_mod_years= range_of_mod_years, specified_range_mod_year_beginning=specified_range_mod_year_beginning, \
-                        specified_range_mod_year_end=specified_range_mod_year_end,
-                        user_defined_number_of_occupants=user_defined_number_of_occupants, \
-                        specified_number_occupants=specified_number_occupants,
-                        user_defined_number_of_apartments=user_defined_number_of_apartments, \
-                        specified_number_apartments=specified_number_apartments, forced_modification = forced_modification, forced_modification_after=forced_modification_after, timestep=timestep, year=year, try_path=try_path, location=location, altitude=altitude, generate_nodelist_from_function_of_citydistrict=generate_nodelist_from_function_of_citydistrict, save_city_CSV=save_city_CSV, user_defined_el_demand=user_defined_el_demand, user_defined_therm_demand=user_defined_therm_demand, user_defined_dhw=user_defined_dhw)
-
-    # DEF put_building_data_into_csv()
+    import pycity_calc.cities.scripts.osm_pipeline as osmpipe
+
+    pipeline = osmpipe.OSMCityPipeline(osm_path=osm_path, path_cache=path_cache, timestep=timestep, year=year,
+                                       try_path=try_path, location=location, altitude=altitude, new_try=new_try)
+
+    #  City topology with all buildings (before deletion of not relevant buildings)
+    (key_utm, city_utm) = pipeline.get_utm_stage(conv_utm=conv_utm, zone_number=zone_number)
+
+    #  Copy for print statements (deletion would modify cached stage result)
+    deleted_buildings, nodelist_buildings = delete_not_relevant_buildings(city=copy.deepcopy(city_utm), min_house_area=min_house_area, generate_nodelist_from_function_of_citydistrict=generate_nodelist_from_function_of_citydistrict)
+
+    # DEF data_enrichment (with cached topology, utm and geometry stages)
+    city, res_enrich = pipeline.gen_city(min_house_area=min_house_area, considered_area_around_a_building=considered_area_around_building,
+                                         conv_utm=conv_utm, zone_number=zone_number,
+                                         generate_nodelist_from_function_of_citydistrict=generate_nodelist_from_function_of_citydistrict,
+                                         user_defined_building_distribution=user_defined_building_distribution,
+                                         percentage_sfh=percentage_sfh, percentage_mfh=percentage_mfh, percentage_non_res=percentage_non_res,
+                                         specific_buildings=specific_buildings,
+                                         user_defined_build_year=user_defined_build_year,
+                                         specified_build_year_beginning=specified_build_year_beginning,
+                                         specified_build_year_end=specified_build_year_end, user_defined_mod_year=user_defined_mod_year,
+                                         mod_year_method=mod_year_method, range_of_mod_years=range_of_mod_years,
+                                         specified_range_mod_year_beginning=specified_range_mod_year_beginning,
+                                         specified_range_mod_year_end=specified_range_mod_year_end,
+                                         forced_modification=forced_modification, forced_modification_after=forced_modification_after,
+                                         user_defined_number_of_occupants=user_defined_number_of_occupants,
+                                         specified_number_occupants=specified_number_occupants,
+                                         user_defined_number_of_apartments=user_defined_number_of_apartments,
+                                         specified_number_apartments=specified_number_apartments,
+                                         user_defined_el_demand=user_defined_el_demand, user_defined_therm_demand=user_defined_therm_demand,
+                                         user_defined_dhw=user_defined_dhw, save_city_CSV=save_city_CSV)
+
+    # DEF write_building_data_csv()
     if save_city_CSV == True:
-        put_building_data_into_csv(city=city, csv_filename = csv_filename, osm_path=osm_path, zone_number=zone_number, min_house_area=min_house_area,
-                                   considered_area_around_a_building=considered_area_around_building, \
-                        user_defined_building_distribution= user_defined_building_distribution, \
-                        percentage_sfh=percentage_sfh, percentage_mfh=percentage_mfh, percentage_non_res=percentage_non_res, \
-                        specific_buildings=specific_buildings, \
-                        user_defined_build_year=user_defined_build_year,
-                        specified_build_year_beginning=specified_build_year_beginning, \
-                        specified_build_year_end=specified_build_year_end, user_defined_mod_year=user_defined_mod_year,
-                        specified_range_mod_year_beginning=specified_range_mod_year_beginning, \
-                        specified_range_mod_year_end=specified_range_mod_year_end,
-                        forced_modification=forced_modification,
-                        forced_modification_after=forced_modification_after,
-                        user_defined_number_of_occupants=user_defined_number_of_occupants, \
-                        specified_number_occupants=specified_number_occupants,
-                        user_defined_number_of_apartments=user_defined_number_of_apartments, \
-                        specified_number_apartments=specified_number_apartments, mod_year_method = mod_year_method, range_of_mod_years = range_of_mod_years,  nodelist_buildings=nodelist_buildings, deleted_buildings=deleted_buildings, timestep=timestep, year=year, try_path=try_path, location=location, altitude=altitude, generate_nodelist_from_function_of_citydistrict=generate_nodelist_from_function_of_citydistrict, save_city_CSV=save_city_CSV, user_defined_el_demand=user_defined_el_demand,user_defined_therm_demand=user_defined_therm_demand, user_defined_dhw=user_defined_dhw)
+        write_building_data_csv(building_parameters_for_analysis=res_enrich[0], csv_filename=csv_filename)
         print("Saved city object as CSV to ", csv_filename)
 
     osm_out_path = os.path.join(this_path, 'output_osm', city_filename)
@@ -705,32 +687,17 @@ def conv_outlines_of_buildings_long_lat_to_utm(city, min_house_area, nodelist_bu
     else:
         nodelist_buildings_from_osm = nodelist_buildings
 
-    #  Loop over every node in city
-    for n in nodelist_buildings_from_osm:
-        #  Current node
-        cur_pos = city.nodes[n]['outlines']
-
-
-        # for i in range(1, (len(city.nodes[n]['outlines'].keys())+1)):
-        for i in range(len(city.nodes[n]['outlines'])):
-        #  Current x/y coordinates
-            x_cor = city.nodes[n]['outlines'][i][1]  # Longitude
-            y_cor= city.nodes[n]['outlines'][i][0]  # Latitude
+    #  Outline points are (latitude, longitude) tuples. All points are converted with one array call per utm zone
+    packed_outlines = osm.PackedOutlines.from_city(city=city, nodelist=nodelist_buildings_from_osm)
+    packed_outlines = packed_outlines.conv_lat_long_to_utm(zone_number=zone_number)
 
-        #  Convert lat, long to utm
-            (x_new, y_new, zone_nb, zone_str) = utm.from_latlon(y_cor, x_cor,
-                                                            zone_number)
-
-        #  New shapely point
-            cur_point = ((x_new, y_new))
-
-        #  Overwrite positional attributes
-            city.nodes[n]['outlines'][i] = cur_point
+    #  Overwrite outlines with (x, y) utm coordinates
+    packed_outlines.write_to_city(city=city)
 
     return city
 
 
-def get_buildings_within_spezified_square(city, zone_number, considered_area, min_house_area, nodelist_buildings):
+def get_buildings_within_spezified_square(city, zone_number, considered_area, min_house_area, nodelist_buildings, dict_geometry=None):
     """
     returns the buildings, which are within a square of 100 m * 100 m in default.
     The coordinates of the "start_building" are the center of the square.
@@ -738,11 +705,26 @@ def get_buildings_within_spezified_square(city, zone_number, considered_area, mi
     :param city: str, city-object
     :param considered_area:         int, default = 10000    -  Area in m^2 around a building, which includes other buildings.
     :param min_house_area:          int, default = 35       - minimal area of a considered building
+    :param dict_geometry:           dict, default = None    - precomputed geometry of get_building_geometry (for a superset of nodelist_buildings)
 
     :return: building_list_within_spezified_square         - return of list with all the buildings within spezified square  -> a
     :return: number_of_buildings_within_spezified_square   - list with the number of buildings within spezified square      -> b
     """
 
+    if dict_geometry is not None:
+        building_list_within_spezified_square = restrict_building_geometry(dict_geometry=dict_geometry, key='building_list_within_spezified_square',
+                                                                           considered_area=considered_area, nodelist_buildings=nodelist_buildings)
+        number_of_buildings_within_spezified_square = {key: len(building_list_within_spezified_square[key]) + 1 for key in nodelist_buildings}
+        return building_list_within_spezified_square, number_of_buildings_within_spezified_square
+
+    # Outline points of all buildings in one array
+    packed_outlines = osm.PackedOutlines.from_city(city=city, nodelist=nodelist_buildings)
+    # First point is not considered --> it is fine, because the last edge is just the same as the first one
+    mask_points = numpy.ones(len(packed_outlines.coords), dtype=bool)
+    mask_points[packed_outlines.offsets[:-1]] = False
+    coords = packed_outlines.coords[mask_points]
+    owners = packed_outlines.get_owners()[mask_points]
+
     building_list_within_spezified_square = {key: [] for key in nodelist_buildings}
     for building_a in nodelist_buildings:
         #create area
@@ -752,16 +734,17 @@ def get_buildings_within_spezified_square(city, zone_number, considered_area, mi
         possible_x_low = city.nodes[building_a]["position"].x  - displacement_of_corrdinates
         possible_y_high = city.nodes[building_a]["position"].y + displacement_of_corrdinates
         possible_y_low = city.nodes[building_a]["position"].y - displacement_of_corrdinates
-        for building_b in nodelist_buildings:
-            if building_a != building_b:
-                for edge in range(1, len(city.nodes[building_b]["outlines"])): #--> it is fine, because the last edge is just the same as the first one
 
-                    if possible_x_low < city.nodes[building_b]["outlines"][edge][0] < possible_x_high:
-                        if possible_y_low < city.nodes[building_b]["outlines"][edge][1] < possible_y_high:
-                            if building_b not in building_list_within_spezified_square[building_a]:
-                                building_list_within_spezified_square[building_a].append(building_b)
+        mask_square = (possible_x_low < coords[:, 0]) & (coords[:, 0] < possible_x_high) & \
+                      (possible_y_low < coords[:, 1]) & (coords[:, 1] < possible_y_high)
+
+        # numpy.unique is sorted --> buildings keep order of nodelist_buildings
+        for index in numpy.unique(owners[mask_square]):
+            building_b = packed_outlines.list_ids[index]
+            if building_a != building_b:
+                building_list_within_spezified_square[building_a].append(building_b)
 
-        number_of_buildings_within_spezified_square = {key: 0 for key in nodelist_buildings}
+    number_of_buildings_within_spezified_square = {key: 0 for key in nodelist_buildings}
     for i in building_list_within_spezified_square:
         number_of_buildings_within_spezified_square[i] = len(building_list_within_spezified_square[i]) + 1 # --> + 1 so the house itself is considered, and in percentage of shop it is never divided with zero.
 
@@ -783,7 +766,72 @@ def get_distance_between_2_buildings(city, start_building, end_building):
     return dist
 
 
-def get_distances(city, zone_number, considered_area_around_buildings, min_house_area, nodelist_buildings, ):
+def get_building_geometry(city, considered_area, nodelist_buildings):
+    """
+    Calculates the geometric relations between the buildings, which do not depend on the minimal house area:
+    buildings within the squared area around every building, the neighbour buildings and the coordinates of their
+    shared walls.
+
+    If the geometry is calculated for all buildings of the OSM file, it can be reused for every subset of
+    buildings (e.g. after the deletion of buildings with a different min_house_area), as both relations are
+    checked pairwise.
+
+    :param city:                    str, city-object
+    :param considered_area:         int, default = 10000    -  Area in m^2 around a building, which includes other buildings.
+    :param nodelist_buildings:      list                    -  list of building nodes (e.g. all buildings of the OSM file)
+
+    :return: dict_geometry          dict                    -  dict with keys 'considered_area', 'building_list_within_spezified_square',
+                                                               'buildings_neighbours' and 'coordinates_of_shared_walls'
+    """
+
+    dict_geometry = {'considered_area': considered_area}
+
+    building_list_within_spezified_square, number_of_buildings_within_spezified_square = \
+        get_buildings_within_spezified_square(city=city, zone_number=None, considered_area=considered_area, min_house_area=None,
+                                              nodelist_buildings=nodelist_buildings)
+    dict_geometry['building_list_within_spezified_square'] = building_list_within_spezified_square
+
+    res_neighbours = get_neighbour_building(city=city, zone_number=None, considered_area_around_buildings=considered_area,
+                                            min_house_area=None, nodelist_buildings=nodelist_buildings, dict_geometry=dict_geometry)
+    dict_geometry['buildings_neighbours'] = res_neighbours[0]
+    dict_geometry['coordinates_of_shared_walls'] = res_neighbours[-1]
+
+    return dict_geometry
+
+
+def restrict_building_geometry(dict_geometry, key, considered_area, nodelist_buildings):
+    """
+    Restricts the building lists (or dicts with building keys) of the precomputed geometry to the buildings of nodelist_buildings.
+
+    :param dict_geometry:           dict                    -  geometry of get_building_geometry
+    :param key:                     str                     -  'building_list_within_spezified_square', 'buildings_neighbours' or
+                                                               'coordinates_of_shared_walls'
+    :param considered_area:         int, default = 10000    -  Area in m^2 around a building, which has to match the geometry
+    :param nodelist_buildings:      list                    -  list of considered building nodes
+
+    :return: dict_restricted        dict                    -  dict with building ids of nodelist_buildings and their restricted building list
+                                                               (or dict)
+    """
+
+    if dict_geometry['considered_area'] != considered_area:
+        msg = 'Geometry has been calculated for a considered area of ' + \
+              str(dict_geometry['considered_area']) + ' m^2, not ' + str(considered_area) + ' m^2.'
+        raise AssertionError(msg)
+
+    set_nodes = set(nodelist_buildings)
+
+    dict_restricted = {}
+    for building_a in nodelist_buildings:
+        if isinstance(dict_geometry[key][building_a], dict):
+            dict_restricted[building_a] = {building_b: value for (building_b, value) in dict_geometry[key][building_a].items()
+                                           if building_b in set_nodes}
+        else:
+            dict_restricted[building_a] = [building_b for building_b in dict_geometry[key][building_a] if building_b in set_nodes]
+
+    return dict_restricted
+
+
+def get_distances(city, zone_number, considered_area_around_buildings, min_house_area, nodelist_buildings, dict_geometry=None):
     """
     This function creates a dictionary with all the distances between a building to every other building within the square from their centres.
 
@@ -798,6 +846,7 @@ def get_distances(city, zone_number, considered_area_around_buildings, min_house
     :param zone_number:                         int, default: 32            zone number is needed
     :param considered_area_around_buildings:    int, default: 10000 m^2     squared area around a building
     :param min_house_area                       int, default: 35            minimal area for a considered building
+    :param dict_geometry:                       dict, default: None         precomputed geometry of get_building_geometry
 
 
     :return: min_distance_within_square           - dict with just the nearest building
@@ -805,7 +854,7 @@ def get_distances(city, zone_number, considered_area_around_buildings, min_house
 
     """
 
-    building_list_within_spezified_square, number_of_buildings_within_spezified_square = get_buildings_within_spezified_square(city=city,min_house_area=min_house_area, zone_number=zone_number, considered_area= considered_area_around_buildings, nodelist_buildings=nodelist_buildings)
+    building_list_within_spezified_square, number_of_buildings_within_spezified_square = get_buildings_within_spezified_square(city=city,min_house_area=min_house_area, zone_number=zone_number, considered_area= considered_area_around_buildings, nodelist_buildings=nodelist_buildings, dict_geometry=dict_geometry)
 
     distance_buildings_within_square = {}
     for building_a in nodelist_buildings:
@@ -1020,7 +1069,7 @@ def get_buildings_parameters(city, min_house_area, nodelist_buildings, generate_
            buildings_with_roof_shape, buildings_buildyear, buildings_condition, buildings_height, buildings_without_parameters, buildings_with_leisure
 
 
-def get_shops_within_spezified_square(city, zone_number,considered_area, min_house_area, nodelist_buildings, generate_nodelist_from_function_of_citydistrict):
+def get_shops_within_spezified_square(city, zone_number,considered_area, min_house_area, nodelist_buildings, generate_nodelist_from_function_of_citydistrict, dict_geometry=None):
     '''
     Function to check if shops are within the squared defined area.
     Aim to get the percentage of the shops within the area to identify the city district.
@@ -1029,6 +1078,7 @@ def get_shops_within_spezified_square(city, zone_number,considered_area, min_hou
     :param zone_number:                         int, default: 32            zone number is needed
     :param considered_area_around_buildings:    int, default: 10000 m^2     squared area around a building
     :param min_house_area                       int, default: 35            minimal area for a considered building
+    :param dict_geometry:                       dict, default: None         precomputed geometry of get_building_geometry
 
     :return: shops_in_spezified_square          dict, str,                  list of certain shops within the area of every building
     :return: percentage_of_shops_to_houses      dict, int                   percentage of shops for the area around every buildings
@@ -1036,7 +1086,7 @@ def get_shops_within_spezified_square(city, zone_number,considered_area, min_hou
     '''
 
     building_list_within_spezified_square, number_of_buildings_within_spezified_square \
-        = get_buildings_within_spezified_square(city=city, min_house_area=min_house_area, zone_number= zone_number, considered_area = considered_area, nodelist_buildings=nodelist_buildings)
+        = get_buildings_within_spezified_square(city=city, min_house_area=min_house_area, zone_number= zone_number, considered_area = considered_area, nodelist_buildings=nodelist_buildings, dict_geometry=dict_geometry)
 
     buildings_with_comment, comments, apartment_buildings, house_buildings, residential_buildings, terrace_buildings, \
     detached_buildings, bungalow_buildings, dormitory_buildings, garages_and_roofs, \
@@ -1184,22 +1234,26 @@ def is_ground_area_almost_the_same(city, min_house_area, nodelist_buildings, var
 
     """
 
-    area = []
-    for i in nodelist_buildings:
-        x = round(city.nodes[i]["area"], 0)
-        if i not in area:
-            area.append(x)
+    list_areas = [city.nodes[i]["area"] for i in nodelist_buildings]
+    area = [round(x, 0) for x in list_areas]
     same_ground_areas = {key: [] for key in area}
-    for i in nodelist_buildings:
-        for areas in area:
-            if (areas - variance ) < city.nodes[i]["area"] < (areas+variance):
-                if i not in same_ground_areas[areas]:
-                    same_ground_areas[areas].append(i)
+
+    # Sorted ground areas --> buildings within (areas - variance, areas + variance) by binary search
+    array_areas = numpy.array(list_areas, dtype=float)
+    array_order = numpy.argsort(array_areas, kind='stable')
+    array_sorted = array_areas[array_order]
+
+    for areas in same_ground_areas:
+        index_low = numpy.searchsorted(array_sorted, areas - variance, side='right')
+        index_high = numpy.searchsorted(array_sorted, areas + variance, side='left')
+        # Buildings keep order of nodelist_buildings
+        for index in numpy.sort(array_order[index_low:index_high]):
+            same_ground_areas[areas].append(nodelist_buildings[index])
 
     return same_ground_areas
 
 
-def get_neighbour_building(city, zone_number, considered_area_around_buildings, min_house_area, nodelist_buildings):
+def get_neighbour_building(city, zone_number, considered_area_around_buildings, min_house_area, nodelist_buildings, dict_geometry=None):
     """
      Checks, if the coordinates of the outlines of the buildings within the squared defined area are the same as from another building --> buildings attached to each other.
      If yes, addition to dict "building_neigbours" with the neighbour building/s
@@ -1209,20 +1263,33 @@ def get_neighbour_building(city, zone_number, considered_area_around_buildings,
     :param variance_overlap:                    int, default = 1                -  variance of how much the coordinates of the buildings are allowed to overlap due to a certain uncertainty. --> NO NEED ANYMORE; because the coordinates are exactly the same to the neigbour building !
     :param zone_number:                         int, default = zone_number      -  UTM zone number. Needed for the convertion to utm.
     :param considered_area_around_buildings:    int, default: 10000 m^2         - squared area around a building
+    :param dict_geometry:                       dict, default: None             - precomputed geometry of get_building_geometry
 
 
     :return: buildings_neigbours            - dict with a key-building and their neighbour buildings.
     :return: number_neighbour_buildings     - dict with just the number of neighbour buildings for the key-building.
 
     :return: List for a specific number of neighbour buildings, seen below.
+    :return: coordinates_of_shared_walls    - dict with a key-building and the coordinates of its shared walls.
     """
 
     building_list_within_spezified_square, number_of_buildings_within_spezified_square \
-        = get_buildings_within_spezified_square(city=city, min_house_area=min_house_area, zone_number=zone_number, considered_area=considered_area_around_buildings, nodelist_buildings=nodelist_buildings)
+        = get_buildings_within_spezified_square(city=city, min_house_area=min_house_area, zone_number=zone_number, considered_area=considered_area_around_buildings, nodelist_buildings=nodelist_buildings, dict_geometry=dict_geometry)
+
+    if dict_geometry is not None and 'buildings_neighbours' in dict_geometry and 'coordinates_of_shared_walls' in dict_geometry:
+        # Shared walls are checked pairwise --> neighbours and shared walls of the precomputed geometry can be reused
+        buildings_neighbours = restrict_building_geometry(dict_geometry=dict_geometry, key='buildings_neighbours',
+                                                          considered_area=considered_area_around_buildings, nodelist_buildings=nodelist_buildings)
+        coordinates_of_shared_walls = restrict_building_geometry(dict_geometry=dict_geometry, key='coordinates_of_shared_walls',
+                                                                 considered_area=considered_area_around_buildings,
+                                                                 nodelist_buildings=nodelist_buildings)
+        nodelist_to_check = []
+    else:
+        buildings_neighbours = {key: [] for key in nodelist_buildings}
+        coordinates_of_shared_walls = {key: [] for key in nodelist_buildings}
+        nodelist_to_check = nodelist_buildings
 
-    buildings_neighbours = {key: [] for key in nodelist_buildings}
-    coordinates_of_shared_walls = {key: [] for key in nodelist_buildings}
-    for building_a in nodelist_buildings:
+    for building_a in nodelist_to_check:
         shared_wall = {}
 
         building_counter = 0
@@ -1438,7 +1505,7 @@ def get_street_information(osm_path):
     return streets_parameters, street_parameters_ordered_by_street_name
 
 
-def check_correlation_between_buildings(city, zone_number, considered_area_around_buildings, min_house_area, nodelist_buildings, variance_for_same_ground_area = 2):
+def check_correlation_between_buildings(city, zone_number, considered_area_around_buildings, min_house_area, nodelist_buildings, variance_for_same_ground_area = 2, dict_geometry=None):
     """
     Function to get to know, if there is a correlation between the same ground area within a considered area around a building.
     Aim is to figure out, if building of the same type are built.
@@ -1448,6 +1515,7 @@ def check_correlation_between_buildings(city, zone_number, considered_area_aroun
     :param variance_for_same_ground_area:       int, default = 2                -  variance for the ground area of different buildings in m^2
     :param considered_area_around_buildings:    int, default = 10000            -  building within this area area considered in m^2
     :param min_house_area                       int, default: 35                -  minimal area for a considered building
+    :param dict_geometry:                       dict, default: None             -  precomputed geometry of get_building_geometry
 
 
     :return: near_by_buildings_with_same_area  -  dict with the building id and a attached list of the building within
@@ -1456,7 +1524,7 @@ def check_correlation_between_buildings(city, zone_number, considered_area_aroun
     """
 
     same_area = is_ground_area_almost_the_same(city= city, min_house_area=min_house_area, variance=variance_for_same_ground_area, nodelist_buildings=nodelist_buildings)
-    building_list_within_spezified_square, number_of_buildings_within_spezified_square = get_buildings_within_spezified_square(city = city, min_house_area=min_house_area, zone_number=zone_number, considered_area= considered_area_around_buildings,nodelist_buildings=nodelist_buildings)
+    building_list_within_spezified_square, number_of_buildings_within_spezified_square = get_buildings_within_spezified_square(city = city, min_house_area=min_house_area, zone_number=zone_number, considered_area= considered_area_around_buildings,nodelist_buildings=nodelist_buildings, dict_geometry=dict_geometry)
     near_by_buildings_with_same_area = {key: [] for key in nodelist_buildings}
     for i in same_area.keys():
         if len(same_area.get(i)) > 1:
@@ -1608,7 +1676,7 @@ def get_residential_layout(city, zone_number, min_house_area, nodelist_buildings
 #-----------------------------------------------------------------------------------------
 # Functions for data enrichment
 
-def get_district_type(city, zone_number, considered_area_around_building, min_house_area, nodelist_buildings):
+def get_district_type(city, zone_number, considered_area_around_building, min_house_area, nodelist_buildings, dict_geometry=None):
     '''
     Needed for city district.
     Function gives information about the cropped area with buildings and the average neighbour building within the squared defined area.
@@ -1618,6 +1686,7 @@ def get_district_type(city, zone_number, considered_area_around_building, min_ho
     :param zone_number:                         int, default = zone_number      -  UTM zone number. Needed for the convertion to utm.
     :param considered_area_around_buildings:    int, default = 10000            -  building within this area area considered in m^2
     :param min_house_area                       int, default: 35                -  minimal area for a considered building
+    :param dict_geometry:                       dict, default: None             -  precomputed geometry of get_building_geometry
 
     :return: cropped_area_within_square
     :return: percentage_cropped_area_within_square
@@ -1625,11 +1694,11 @@ def get_district_type(city, zone_number, considered_area_around_building, min_ho
     '''
 
     building_list_within_spezified_square, number_of_buildings_within_spezified_square = \
-        get_buildings_within_spezified_square(city = city, min_house_area=min_house_area, zone_number=zone_number, considered_area= considered_area_around_building, nodelist_buildings=nodelist_buildings)
+        get_buildings_within_spezified_square(city = city, min_house_area=min_house_area, zone_number=zone_number, considered_area= considered_area_around_building, nodelist_buildings=nodelist_buildings, dict_geometry=dict_geometry)
     buildings_neighbours, number_neighbour_buildings, no_neigbours, one_neigbour, two_neigbours, more_than_two_neighbours, three_neigbours, \
     four_neigbours, five_neigbours, six_neigbours, more_than_six_neigbours, coordinates_of_shared_walls \
         = get_neighbour_building(city=city, min_house_area=min_house_area, zone_number=zone_number,
-                                 considered_area_around_buildings=considered_area_around_building, nodelist_buildings=nodelist_buildings)
+                                 considered_area_around_buildings=considered_area_around_building, nodelist_buildings=nodelist_buildings, dict_geometry=dict_geometry)
 
     cropped_area_within_square = {key: [] for key in nodelist_buildings}
     percentage_cropped_area_within_square = {key: [] for key in nodelist_buildings}
@@ -3262,7 +3331,7 @@ def data_enrichment(city, osm_path, zone_number, min_house_area,  considered_are
                     percentage_sfh, percentage_mfh, percentage_non_res, specific_buildings, user_defined_build_year,\
                     specified_build_year_beginning, specified_build_year_end, user_defined_mod_year, specified_range_mod_year_beginning,\
                     specified_range_mod_year_end, mod_year_method, range_of_mod_years, forced_modification, forced_modification_after,
-                    user_defined_number_of_occupants ,specified_number_occupants, user_defined_number_of_apartments , specified_number_apartments, timestep, year, try_path, location, altitude, generate_nodelist_from_function_of_citydistrict, save_city_CSV, user_defined_el_demand, user_defined_therm_demand, user_defined_dhw):
+                    user_defined_number_of_occupants ,specified_number_occupants, user_defined_number_of_apartments , specified_number_apartments, timestep, year, try_path, location, altitude, generate_nodelist_from_function_of_citydistrict, save_city_CSV, user_defined_el_demand, user_defined_therm_demand, user_defined_dhw, dict_geometry=None):
     '''
     Main function for identification  the building type and to do the data enrichment.
 
@@ -3302,6 +3371,8 @@ def data_enrichment(city, osm_path, zone_number, min_house_area,  considered_are
     :param specified_number_occupants:          int                         number of occupants, if user_defined_number_of_occupants == True
     :param user_defined_number_of_apartments:   boolean                     True: number of apartments are given by the user; False: automatic determination
     :param specified_number_apartments:         int                         number of apartments, if user_defined_number_of_apartments == True
+    :param dict_geometry:                       dict, default: None         precomputed geometry of get_building_geometry (e.g. for all buildings of the OSM file).
+                                                                            If None, geometry is calculated for the relevant buildings.
 
     :return: enriched city object
     '''
@@ -3323,28 +3394,32 @@ def data_enrichment(city, osm_path, zone_number, min_house_area,  considered_are
     buildings_with_roof_shape, buildings_buildyear, buildings_condition, buildings_height, buildings_without_parameters, buildings_with_leisure \
         = get_buildings_parameters(city=city, min_house_area=min_house_area, nodelist_buildings=nodelist_buildings, generate_nodelist_from_function_of_citydistrict=generate_nodelist_from_function_of_citydistrict)
 
+    # Geometric relations between the buildings are calculated once and reused by all following functions
+    if dict_geometry is None:
+        dict_geometry = get_building_geometry(city=city, considered_area=considered_area_around_a_building, nodelist_buildings=nodelist_buildings)
+
      # get_buildings_within_spezified_square; useful for the comparision of the buildings within a square
     building_list_within_spezified_square, number_of_buildings_within_spezified_square = \
-        get_buildings_within_spezified_square(city=city,zone_number=zone_number, considered_area=considered_area_around_a_building, min_house_area=min_house_area, nodelist_buildings=nodelist_buildings )
+        get_buildings_within_spezified_square(city=city,zone_number=zone_number, considered_area=considered_area_around_a_building, min_house_area=min_house_area, nodelist_buildings=nodelist_buildings, dict_geometry=dict_geometry)
 
     # Neighbour buildings
     buildings_neighbours, number_neighbour_buildings, no_neigbours, one_neigbour, two_neigbours, more_than_two_neighbours, three_neigbours, \
     four_neigbours, five_neigbours, six_neigbours, more_than_six_neigbours, coordinates_of_shared_walls \
         = get_neighbour_building(city=city, min_house_area=min_house_area, zone_number=zone_number,
-                                 considered_area_around_buildings=considered_area_around_a_building, nodelist_buildings=nodelist_buildings)
+                                 considered_area_around_buildings=considered_area_around_a_building, nodelist_buildings=nodelist_buildings, dict_geometry=dict_geometry)
 
     # Correlation between buildings regarding area within a certain distance
     near_by_buildings_with_same_area = check_correlation_between_buildings(city=city, min_house_area=min_house_area, zone_number=zone_number,
-                                                                           considered_area_around_buildings=considered_area_around_a_building, nodelist_buildings=nodelist_buildings)
+                                                                           considered_area_around_buildings=considered_area_around_a_building, nodelist_buildings=nodelist_buildings, dict_geometry=dict_geometry)
 
     # get_shops_within_spezified_square
     shops_in_spezified_square, percentage_of_shops_to_houses = get_shops_within_spezified_square(
-        city=city, min_house_area=min_house_area,  zone_number=zone_number, considered_area=considered_area_around_a_building, nodelist_buildings=nodelist_buildings, generate_nodelist_from_function_of_citydistrict=generate_nodelist_from_function_of_citydistrict)
+        city=city, min_house_area=min_house_area,  zone_number=zone_number, considered_area=considered_area_around_a_building, nodelist_buildings=nodelist_buildings, generate_nodelist_from_function_of_citydistrict=generate_nodelist_from_function_of_citydistrict, dict_geometry=dict_geometry)
 
     # get_district_type needed to identify the usage of the city district (residentail, city or non residential area)
     cropped_area_within_square, percentage_cropped_area_within_square, average_buildings_neighbours = \
         get_district_type(city=city, zone_number=zone_number, considered_area_around_building=considered_area_around_a_building, \
-                          min_house_area= min_house_area, nodelist_buildings=nodelist_buildings)
+                          min_house_area= min_house_area, nodelist_buildings=nodelist_buildings, dict_geometry=dict_geometry)
 
     # Set building_parameters for CSV file
 
@@ -3414,7 +3489,8 @@ def data_enrichment(city, osm_path, zone_number, min_house_area,  considered_are
                                                                                  min_house_area=min_house_area,
                                                                                  zone_number=zone_number,
                                                                                  considered_area_around_buildings=considered_area_around_a_building,
-                                                                                 nodelist_buildings=nodelist_buildings)
+                                                                                 nodelist_buildings=nodelist_buildings,
+                                                                                 dict_geometry=dict_geometry)
 
     for building_id in nodelist_buildings:
 
@@ -5360,7 +5436,7 @@ def put_building_data_into_csv(city, csv_filename, osm_path, zone_number, min_ho
                     percentage_sfh, percentage_mfh, percentage_non_res, specific_buildings, user_defined_build_year,\
                     specified_build_year_beginning, specified_build_year_end, user_defined_mod_year, specified_range_mod_year_beginning,\
                     specified_range_mod_year_end, mod_year_method, range_of_mod_years, forced_modification, forced_modification_after,
-                    user_defined_number_of_occupants ,specified_number_occupants, user_defined_number_of_apartments , specified_number_apartments, nodelist_buildings, deleted_buildings, timestep, year, try_path, location, altitude, generate_nodelist_from_function_of_citydistrict, save_city_CSV, user_defined_el_demand, user_defined_therm_demand, user_defined_dhw):
+                    user_defined_number_of_occupants ,specified_number_occupants, user_defined_number_of_apartments , specified_number_apartments, nodelist_buildings, deleted_buildings, timestep, year, try_path, location, altitude, generate_nodelist_from_function_of_citydistrict, save_city_CSV, user_defined_el_demand, user_defined_therm_demand, user_defined_dhw, dict_geometry=None):
     building_parameters_for_analysis, individual_buildings, single_family_house, detached_single_family_houses, terraced_houses, double_houses,multi_family_houses,  high_rise_houses,  commercial, city_district \
         = data_enrichment(city=city, osm_path=osm_path, zone_number=zone_number, min_house_area=min_house_area, considered_area_around_a_building=considered_area_around_a_building, \
                           user_defined_building_distribution=user_defined_building_distribution,
@@ -5377,7 +5453,18 @@ def put_building_data_into_csv(city, csv_filename, osm_path, zone_number, min_ho
                           user_defined_number_of_occupants=user_defined_number_of_occupants, \
                           specified_number_occupants=specified_number_occupants,
                           user_defined_number_of_apartments=user_defined_number_of_apartments, \
-                          specified_number_apartments=specified_number_apartments,  timestep=timestep, year=year, try_path=try_path, location=location, altitude=altitude, generate_nodelist_from_function_of_citydistrict=generate_nodelist_from_function_of_citydistrict, save_city_CSV=save_city_CSV, user_defined_el_demand=user_defined_el_demand, user_defined_therm_demand=user_defined_therm_demand, user_defined_dhw=user_defined_dhw)
+                          specified_number_apartments=specified_number_apartments,  timestep=timestep, year=year, try_path=try_path, location=location, altitude=altitude, generate_nodelist_from_function_of_citydistrict=generate_nodelist_from_function_of_citydistrict, save_city_CSV=save_city_CSV, user_defined_el_demand=user_defined_el_demand, user_defined_therm_demand=user_defined_therm_demand, user_defined_dhw=user_defined_dhw, dict_geometry=dict_geometry)
+
+    write_building_data_csv(building_parameters_for_analysis=building_parameters_for_analysis, csv_filename=csv_filename)
+
+
+def write_building_data_csv(building_parameters_for_analysis, csv_filename):
+    """
+    Writes building parameters of data enrichment into CSV file
+
+    :param building_parameters_for_analysis:    dict                        building parameters returned by data_enrichment
+    :param csv_filename:                        str                         path of CSV file
+    """
 
     my_dict = building_parameters_for_analysis
 
@@ -15,6 +15,7 @@ mercator coordinates in m
 import os
 import pickle
 import utm
+import numpy as np
 import shapely.geometry.point as point
 
 import pycity_base.classes.demand.Apartment as apart
@@ -214,6 +215,98 @@ def gen_osm_city_topology(osm_path, environment,
     return city
 
 
+def get_utm_zone_numbers(array_lat, array_long):
+    """
+    Returns utm zone numbers of latitude, longitude arrays (vectorized
+    version of utm.latlon_to_zone_number, including exceptions for Norway
+    and Svalbard)
+
+    Parameters
+    ----------
+    array_lat : array-like
+        Latitudes in degree
+    array_long : array-like
+        Longitudes in degree
+
+    Returns
+    -------
+    array_zones : np.array (of ints)
+        Utm zone number per point
+    """
+
+    array_lat = np.asarray(array_lat, dtype=float)
+    array_long = np.asarray(array_long, dtype=float)
+
+    array_zones = ((array_long + 180) / 6).astype(int) + 1
+
+    #  Norway
+    array_zones[(array_lat >= 56) & (array_lat < 64) &
+                (array_long >= 3) & (array_long < 12)] = 32
+
+    #  Svalbard
+    mask_sval = (array_lat >= 72) & (array_lat <= 84) & (array_long >= 0)
+    for (long_max, zone) in [(9, 31), (21, 33), (33, 35), (42, 37)]:
+        mask_zone = mask_sval & (array_long < long_max)
+        array_zones[mask_zone] = zone
+        mask_sval &= ~mask_zone
+
+    return array_zones
+
+
+def conv_long_lat_arrays_to_utm(array_lat, array_long, zone_number=None):
+    """
+    Converts latitude, longitude arrays to utm coordinates in meters with
+    one utm call per utm zone (instead of one call per point)
+
+    Parameters
+    ----------
+    array_lat : array-like
+        Latitudes in degree
+    array_long : array-like
+        Longitudes in degree
+    zone_number : int, optional
+        Zone number of utm as integer (default: None)
+        If set to none, zone is chosen automatically for every point.
+
+    Returns
+    -------
+    tup_res : tuple
+        (array_x, array_y, zone_nb, zone_str) with utm x and y coordinates
+        in meters and utm zone number and letter of last point
+    """
+
+    array_lat = np.asarray(array_lat, dtype=float)
+    array_long = np.asarray(array_long, dtype=float)
+
+    array_x = np.zeros(len(array_lat))
+    array_y = np.zeros(len(array_lat))
+
+    if len(array_lat) == 0:
+        return (array_x, array_y, zone_number, None)
+
+    if zone_number is None:
+        array_zones = get_utm_zone_numbers(array_lat, array_long)
+    else:
+        array_zones = np.full(len(array_lat), zone_number, dtype=int)
+
+    #  utm requires points of one zone and hemisphere per call
+    array_south = array_lat < 0
+    for zone in np.unique(array_zones):
+        for south in [False, True]:
+            mask = (array_zones == zone) & (array_south == south)
+            if np.any(mask):
+                (x_new, y_new, zone_nb, zone_str) = \
+                    utm.from_latlon(array_lat[mask], array_long[mask],
+                                    int(zone))
+                array_x[mask] = x_new
+                array_y[mask] = y_new
+
+    zone_nb = int(array_zones[-1])
+    zone_str = utm.latitude_to_zone_letter(array_lat[-1])
+
+    return (array_x, array_y, zone_nb, zone_str)
+
+
 def conv_city_long_lat_to_utm(city, zone_number=None):
     """
     Converts all point object coordinates within city from latitude,
@@ -233,24 +326,22 @@ def conv_city_long_lat_to_utm(city, zone_number=None):
         City object in UTM
     """
 
-    #  Loop over every node in city
-    for n in city.nodes():
-        #  Current node
-        cur_pos = city.nodes[n]['position']
-
-        #  Current x/y coordinates
-        x_cor = cur_pos.x  # Longitude
-        y_cor = cur_pos.y  # Latitude
+    list_nodes = list(city.nodes())
 
-        #  Convert lat, long to utm
-        (x_new, y_new, zone_nb, zone_str) = utm.from_latlon(y_cor, x_cor,
-                                                            zone_number)
+    #  x/y coordinates are longitude/latitude
+    array_long = np.array([city.nodes[n]['position'].x for n in list_nodes])
+    array_lat = np.array([city.nodes[n]['position'].y for n in list_nodes])
 
-        #  New shapely point
-        cur_point = point.Point((x_new, y_new))
+    #  Convert lat, long of all nodes to utm
+    (array_x, array_y, zone_nb, zone_str) = \
+        conv_long_lat_arrays_to_utm(array_lat=array_lat,
+                                    array_long=array_long,
+                                    zone_number=zone_number)
 
-        #  Overwrite positional attributes
-        city.nodes[n]['position'] = cur_point
+    #  Overwrite positional attributes with new shapely points
+    for i in range(len(list_nodes)):
+        city.nodes[list_nodes[i]]['position'] = \
+            point.Point((array_x[i], array_y[i]))
 
     city.graph['zone_nb'] = zone_nb
     city.graph['zone_str'] = zone_str
@@ -258,6 +349,240 @@ def conv_city_long_lat_to_utm(city, zone_number=None):
     return city
 
 
+class PackedOutlines(object):
+    """
+    Building outlines of city packed into a single coordinate array plus
+    offsets (ragged array). Outline of building list_ids[i] is given by
+    coords[offsets[i]:offsets[i + 1]]. Enables vectorized area, centroid
+    and bounding box calculation.
+    """
+
+    def __init__(self, list_ids, coords, offsets):
+        """
+        Constructor of PackedOutlines
+
+        Parameters
+        ----------
+        list_ids : list
+            List of building node ids
+        coords : np.array
+            2d array (nb_points x 2) holding coordinates of all outlines
+        offsets : np.array
+            Array (len(list_ids) + 1) with start index of outline per
+            building in coords (and total number of points as last entry)
+        """
+
+        self.list_ids = list(list_ids)
+        self.coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+        self.offsets = np.asarray(offsets, dtype=int)
+
+        if len(self.offsets) != len(self.list_ids) + 1:
+            msg = 'offsets requires len(list_ids) + 1 entries.'
+            raise AssertionError(msg)
+        if np.any(np.diff(self.offsets) <= 0):
+            msg = 'Every building requires at least one outline point.'
+            raise AssertionError(msg)
+
+    @classmethod
+    def from_city(cls, city, nodelist=None):
+        """
+        Generates PackedOutlines from outlines of city building nodes.
+        Nodes without outlines are skipped.
+
+        Parameters
+        ----------
+        city : object
+            City object with 'outlines' attribute on building nodes
+        nodelist : list, optional
+            List of node ids (default: None). If None, uses all building
+            nodes of city.
+
+        Returns
+        -------
+        packed_outlines : object
+            PackedOutlines instance
+        """
+
+        if nodelist is None:
+            nodelist = city.get_list_id_of_spec_node_type()
+
+        list_ids = []
+        list_lengths = [0]
+        list_coords = []
+
+        for n in nodelist:
+            outlines = city.nodes[n].get('outlines')
+            if outlines is not None and len(outlines) > 0:
+                list_ids.append(n)
+                list_lengths.append(len(outlines))
+                list_coords.extend(outlines)
+
+        return cls(list_ids=list_ids, coords=list_coords,
+                   offsets=np.cumsum(list_lengths))
+
+    def __len__(self):
+        return len(self.list_ids)
+
+    def get_outline(self, index):
+        """
+        Returns outline of building with list index index
+
+        Parameters
+        ----------
+        index : int
+            Index of building in list_ids
+
+        Returns
+        -------
+        outline : np.array
+            2d array with outline coordinates
+        """
+
+        return self.coords[self.offsets[index]:self.offsets[index + 1]]
+
+    def get_owners(self):
+        """
+        Returns list index of owning building per point
+
+        Returns
+        -------
+        array_owners : np.array (of ints)
+            Index of building in list_ids per row of coords
+        """
+
+        return np.repeat(np.arange(len(self.list_ids)),
+                         np.diff(self.offsets))
+
+    def _get_next_idx(self):
+        """
+        Returns index of next point of (closed) outline per point
+        """
+
+        array_next = np.arange(1, len(self.coords) + 1)
+        array_next[self.offsets[1:] - 1] = self.offsets[:-1]
+
+        return array_next
+
+    def _calc_cross_sums(self):
+        """
+        Returns shoelace cross products per point and sums per building
+        """
+
+        array_next = self._get_next_idx()
+        x = self.coords[:, 0]
+        y = self.coords[:, 1]
+
+        array_cross = x * y[array_next] - x[array_next] * y
+
+        return (array_next,
+                array_cross,
+                np.add.reduceat(array_cross, self.offsets[:-1]))
+
+    def calc_areas(self):
+        """
+        Calculates polygon area of every outline (shoelace formula).
+        Outlines are closed automatically.
+
+        Returns
+        -------
+        array_areas : np.array
+            Area per building (unit of coordinates squared)
+        """
+
+        return np.abs(self._calc_cross_sums()[2]) / 2
+
+    def calc_centroids(self):
+        """
+        Calculates polygon centroid of every outline. For outlines without
+        area, the mean of the outline points is used.
+
+        Returns
+        -------
+        array_centroids : np.array
+            2d array (nb_buildings x 2) with centroid coordinates
+        """
+
+        (array_next, array_cross, array_sums) = self._calc_cross_sums()
+
+        x = self.coords[:, 0]
+        y = self.coords[:, 1]
+
+        array_cx = np.add.reduceat((x + x[array_next]) * array_cross,
+                                   self.offsets[:-1])
+        array_cy = np.add.reduceat((y + y[array_next]) * array_cross,
+                                   self.offsets[:-1])
+
+        array_len = np.diff(self.offsets)
+        array_centroids = np.column_stack(
+            (np.add.reduceat(x, self.offsets[:-1]) / array_len,
+             np.add.reduceat(y, self.offsets[:-1]) / array_len))
+
+        mask = array_sums != 0
+        array_centroids[mask, 0] = array_cx[mask] / (3 * array_sums[mask])
+        array_centroids[mask, 1] = array_cy[mask] / (3 * array_sums[mask])
+
+        return array_centroids
+
+    def calc_bounding_boxes(self):
+        """
+        Calculates bounding box of every outline
+
+        Returns
+        -------
+        array_bbox : np.array
+            2d array (nb_buildings x 4) with x_min, y_min, x_max, y_max
+        """
+
+        array_start = self.offsets[:-1]
+
+        return np.column_stack(
+            (np.minimum.reduceat(self.coords[:, 0], array_start),
+             np.minimum.reduceat(self.coords[:, 1], array_start),
+             np.maximum.reduceat(self.coords[:, 0], array_start),
+             np.maximum.reduceat(self.coords[:, 1], array_start)))
+
+    def conv_lat_long_to_utm(self, zone_number=None):
+        """
+        Converts all outline points from (latitude, longitude) to utm
+        (x, y) coordinates in meters with a single array call per utm zone
+
+        Parameters
+        ----------
+        zone_number : int, optional
+            Zone number of utm as integer (default: None)
+            If set to none, zone is chosen automatically for every point.
+
+        Returns
+        -------
+        packed_outlines : object
+            New PackedOutlines instance with utm coordinates
+        """
+
+        (array_x, array_y, zone_nb, zone_str) = \
+            conv_long_lat_arrays_to_utm(array_lat=self.coords[:, 0],
+                                        array_long=self.coords[:, 1],
+                                        zone_number=zone_number)
+
+        return PackedOutlines(list_ids=self.list_ids,
+                              coords=np.column_stack((array_x, array_y)),
+                              offsets=self.offsets)
+
+    def write_to_city(self, city):
+        """
+        Overwrites outlines of city building nodes with (list of tuples)
+        outlines of PackedOutlines
+
+        Parameters
+        ----------
+        city : object
+            City object
+        """
+
+        for i in range(len(self.list_ids)):
+            city.nodes[self.list_ids[i]]['outlines'] = \
+                [tuple(coord) for coord in self.get_outline(i).tolist()]
+
+
 def get_list_b_nodes_without_area(city):
     """
     Returns list of building node ids without area parameter.
@@ -0,0 +1,474 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Staged generation of city objects based on osm files.
+
+The osm city generator (city_generator_based_on_osm_files.py) is split into
+explicit stages. The output of every stage is cached (in memory and
+optionally as pickle file within a cache folder). Every stage is identified
+by a key, which depends on the hash of the osm input file, the parameters of
+the stage and the key of the previous stage. Thus, re-running the generator
+with changed enrichment parameters (e.g. min_house_area or build year method)
+reuses the expensive stages (osm parsing, utm conversion and geometric
+relations between the buildings).
+
+Stages:
+
+1. topology     Environment and city topology (all buildings, min_area=0)
+                --> osm file hash, environment parameters
+2. utm          Conversion of positions and outlines to utm (optional)
+                --> zone_number
+3. geometry     Buildings within squared area and neighbour buildings of
+                all buildings of the osm file
+                --> considered area, nodelist generation
+4. enrichment   Data enrichment of relevant buildings
+                --> min_house_area and all enrichment parameters
+"""
+from __future__ import division
+
+import os
+import copy
+import json
+import random
+import hashlib
+import numpy as np
+
+import pycity_calc.cities.scripts.city_generator.city_generator as citgen
+import pycity_calc.cities.scripts.osm_call as osm
+import pycity_calc.cities.scripts.city_generator_based_on_osm_files as osmgen
+
+
+def get_default_enrich_par():
+    """
+    Returns dict with default data enrichment parameters (input parameters
+    of osmgen.data_enrichment, which are not set by pipeline itself)
+
+    Returns
+    -------
+    dict_enrich_par : dict
+        Dictionary with enrichment parameter names as keys and default values
+    """
+
+    dict_enrich_par = {'user_defined_building_distribution': False,
+                       'percentage_sfh': 0,
+                       'percentage_mfh': 0,
+                       'percentage_non_res': 100,
+                       'specific_buildings': False,
+                       'user_defined_build_year': True,
+                       'specified_build_year_beginning': 1970,
+                       'specified_build_year_end': 1985,
+                       'user_defined_mod_year': False,
+                       'mod_year_method': 1,
+                       'range_of_mod_years': [30, 36, 50, 60, 72, 90, 100,
+                                              108, 120, 144, 150],
+                       'specified_range_mod_year_beginning': 30,
+                       'specified_range_mod_year_end': 36,
+                       'forced_modification': True,
+                       'forced_modification_after': 40,
+                       'user_defined_number_of_occupants': False,
+                       'specified_number_occupants': 36,
+                       'user_defined_number_of_apartments': False,
+                       'specified_number_apartments': 12,
+                       'user_defined_el_demand': True,
+                       'user_defined_therm_demand': True,
+                       'user_defined_dhw': True,
+                       'save_city_CSV': True}
+
+    return dict_enrich_par
+
+
+def get_file_hash(path, block_size=2 ** 20):
+    """
+    Returns sha1 hash of file content
+
+    Parameters
+    ----------
+    path : str
+        Path to file
+    block_size : int, optional
+        Size of read blocks in bytes (default: 2 ** 20)
+
+    Returns
+    -------
+    file_hash : str
+        Hex digest of sha1 hash of file content
+    """
+
+    sha = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            sha.update(block)
+
+    return sha.hexdigest()
+
+
+def gen_stage_key(stage, dict_par, parent_key):
+    """
+    Generates key of pipeline stage based on stage name, stage parameters and
+    key of previous stage
+
+    Parameters
+    ----------
+    stage : str
+        Name of stage
+    dict_par : dict
+        Dictionary with parameters of stage (json serializable)
+    parent_key : str
+        Key of previous stage (or hash of input file for first stage)
+
+    Returns
+    -------
+    key : str
+        Hex digest of sha1 hash
+    """
+
+    str_par = json.dumps(dict_par, sort_keys=True)
+
+    sha = hashlib.sha1()
+    for string in [stage, str_par, parent_key]:
+        sha.update(string.encode('utf-8'))
+
+    return sha.hexdigest()
+
+
+class OSMCityPipeline(object):
+    """
+    Staged osm city generator with cached stage results
+    """
+
+    def __init__(self, osm_path, path_cache=None, timestep=3600, year=2017,
+                 try_path=None, location=(50.775346, 6.083887), altitude=55,
+                 new_try=False):
+        """
+        Constructor of OSMCityPipeline
+
+        Parameters
+        ----------
+        osm_path : str
+            Path to osm file
+        path_cache : str, optional
+            Path to folder, where stage results are saved as pickle files
+            (default: None). If None, stage results are only cached in
+            memory.
+        timestep : int, optional
+            Timestep in seconds (default: 3600)
+        year : int, optional
+            Year of environment (timer and co2 emission factors)
+            (default: 2017)
+        try_path : str, optional
+            Path to TRY weather file (default: None). If None, uses default
+            TRY file.
+        location : tuple, optional
+            (latitude, longitude) of city district
+            (default: (50.775346, 6.083887))
+        altitude : float, optional
+            Altitude of location in m (default: 55)
+        new_try : bool, optional
+            Defines, if TRY dataset of 2017 or newer is used (default: False)
+        """
+
+        self.osm_path = osm_path
+        self.osm_hash = get_file_hash(osm_path)
+        self.path_cache = path_cache
+
+        self.dict_env_par = {'timestep': timestep, 'year': year,
+                             'try_path': try_path,
+                             'location': list(location),
+                             'altitude': altitude, 'new_try': new_try}
+        if try_path is not None:
+            self.dict_env_par['try_hash'] = get_file_hash(try_path)
+
+        #  Stage results in memory
+        self.dict_cache = {}
+
+        #  Number of calculations (not loaded from cache) per stage
+        self.dict_nb_calc = {'topology': 0, 'utm': 0, 'geometry': 0,
+                             'enrichment': 0}
+
+        if path_cache is not None and not os.path.exists(path_cache):
+            os.makedirs(path_cache)
+
+    def _get_stage(self, stage, dict_par, parent_key, func, use_cache=True):
+        """
+        Returns key and result of stage. Result is loaded from cache, if
+        available, else func is called and result is cached.
+
+        Parameters
+        ----------
+        stage : str
+            Name of stage
+        dict_par : dict
+            Dictionary with parameters of stage
+        parent_key : str
+            Key of previous stage
+        func : callable
+            Function without arguments, which calculates stage result
+        use_cache : bool, optional
+            Defines, if stage result should be loaded from / saved to cache
+            (default: True). Should be False for non-reproducible stages
+            (e.g. random sampling without seed).
+
+        Returns
+        -------
+        tup_res : tuple
+            (key, result)
+        """
+
+        key = gen_stage_key(stage=stage, dict_par=dict_par,
+                            parent_key=parent_key)
+
+        if not use_cache:
+            self.dict_nb_calc[stage] += 1
+            return (key, func())
+
+        if key in self.dict_cache:
+            return (key, self.dict_cache[key])
+
+        if self.path_cache is not None:
+            path_file = os.path.join(self.path_cache,
+                                     stage + '_' + key + '.p')
+
+            if os.path.isfile(path_file):
+                result = osmgen.pickle_load(path_file)
+                if result is not None:
+                    self.dict_cache[key] = result
+                    return (key, result)
+
+        result = func()
+        self.dict_nb_calc[stage] += 1
+        self.dict_cache[key] = result
+
+        if self.path_cache is not None:
+            #  Write to temporary file first to prevent corrupted cache files
+            path_tmp = path_file + '.tmp'
+            osmgen.pickle_dumper(result, path_tmp)
+            if hasattr(os, 'replace'):
+                os.replace(path_tmp, path_file)
+            else:
+                #  Python 2.7: No os.replace (rename to existing file fails
+                #  on Windows)
+                if os.path.isfile(path_file):
+                    os.remove(path_file)
+                os.rename(path_tmp, path_file)
+
+        return (key, result)
+
+    def _calc_topology(self):
+        """
+        Generates environment and city topology with all buildings of osm
+        file (min_area=0). Small buildings are needed for identification of
+        building types and are deleted within data enrichment.
+
+        Returns
+        -------
+        city : object
+            City object of pycity_calc
+        """
+
+        environment = citgen.generate_environment(
+            timestep=self.dict_env_par['timestep'],
+            year_timer=self.dict_env_par['year'],
+            year_co2=self.dict_env_par['year'],
+            try_path=self.dict_env_par['try_path'],
+            location=tuple(self.dict_env_par['location']),
+            altitude=self.dict_env_par['altitude'],
+            new_try=self.dict_env_par['new_try'])
+
+        city = osm.gen_osm_city_topology(osm_path=self.osm_path,
+                                         environment=environment,
+                                         name=None,
+                                         check_boundary=False,
+                                         min_area=0)
+
+        return city
+
+    def get_topology_stage(self):
+        """
+        Returns key and (cached) city topology of osm file.
+        Cached city object should not be modified!
+
+        Returns
+        -------
+        tup_res : tuple
+            (key, city)
+        """
+
+        return self._get_stage(stage='topology', dict_par=self.dict_env_par,
+                               parent_key=self.osm_hash,
+                               func=self._calc_topology)
+
+    def get_utm_stage(self, conv_utm=False, zone_number=32):
+        """
+        Returns key and (cached) city topology with positions and building
+        outlines converted to utm. If conv_utm is False, topology stage is
+        returned. Cached city object should not be modified!
+
+        Parameters
+        ----------
+        conv_utm : bool, optional
+            Convert latitude, longitude to utm (default: False)
+        zone_number : int, optional
+            Zone number of utm (default: 32)
+
+        Returns
+        -------
+        tup_res : tuple
+            (key, city)
+        """
+
+        (key_topo, city_topo) = self.get_topology_stage()
+
+        if not conv_utm:
+            return (key_topo, city_topo)
+
+        def calc_utm():
+            city = copy.deepcopy(city_topo)
+            city = osm.conv_city_long_lat_to_utm(city, zone_number=zone_number)
+            #  Convert outlines of all buildings (independent of deletion)
+            osmgen.conv_outlines_of_buildings_long_lat_to_utm(
+                city=city, min_house_area=0, nodelist_buildings=None,
+                generate_nodelist_from_function_of_citydistrict=True,
+                zone_number=zone_number)
+            return city
+
+        return self._get_stage(stage='utm',
+                               dict_par={'zone_number': zone_number},
+                               parent_key=key_topo, func=calc_utm)
+
+    def get_geometry_stage(self, considered_area_around_a_building=10000,
+                           conv_utm=False, zone_number=32,
+                           generate_nodelist_from_function_of_citydistrict=True):
+        """
+        Returns key and (cached) geometric relations of all buildings of osm
+        file (see osmgen.get_building_geometry)
+
+        Parameters
+        ----------
+        considered_area_around_a_building : int, optional
+            Squared area around a building in m^2 (default: 10000)
+        conv_utm : bool, optional
+            Convert latitude, longitude to utm (default: False)
+        zone_number : int, optional
+            Zone number of utm (default: 32)
+        generate_nodelist_from_function_of_citydistrict : bool, optional
+            If True, uses city.get_list_id_of_spec_node_type() as node list,
+            else city.nodelist_building (default: True)
+
+        Returns
+        -------
+        tup_res : tuple
+            (key, dict_geometry)
+        """
+
+        (key_utm, city) = self.get_utm_stage(conv_utm=conv_utm,
+                                             zone_number=zone_number)
+
+        def calc_geometry():
+            if generate_nodelist_from_function_of_citydistrict:
+                nodelist_buildings = city.get_list_id_of_spec_node_type()
+            else:
+                nodelist_buildings = city.nodelist_building
+
+            return osmgen.get_building_geometry(
+                city=city, considered_area=considered_area_around_a_building,
+                nodelist_buildings=nodelist_buildings)
+
+        dict_par = {'considered_area': considered_area_around_a_building,
+                    'nodelist_from_citydistrict':
+                        generate_nodelist_from_function_of_citydistrict}
+
+        return self._get_stage(stage='geometry', dict_par=dict_par,
+                               parent_key=key_utm, func=calc_geometry)
+
+    def gen_city(self, min_house_area=50,
+                 considered_area_around_a_building=10000, conv_utm=False,
+                 zone_number=32,
+                 generate_nodelist_from_function_of_citydistrict=True,
+                 seed=None, **kwargs):
+        """
+        Returns enriched city object. Previous stages are reused, if they
+        have already been calculated for the same osm file and parameters.
+
+        Parameters
+        ----------
+        min_house_area : float, optional
+            Minimal ground area of considered buildings in m^2 (default: 50)
+        considered_area_around_a_building : int, optional
+            Squared area around a building in m^2 (default: 10000)
+        conv_utm : bool, optional
+            Convert latitude, longitude to utm (default: False)
+        zone_number : int, optional
+            Zone number of utm (default: 32)
+        generate_nodelist_from_function_of_citydistrict : bool, optional
+            If True, uses city.get_list_id_of_spec_node_type() as node list,
+            else city.nodelist_building (default: True)
+        seed : int, optional
+            Seed of random number generators of data enrichment
+            (default: None). If None, no seed is set and the enrichment
+            stage is re-calculated on every call (not cached).
+        kwargs : dict
+            Data enrichment parameters of osmgen.data_enrichment, which
+            overwrite the defaults of get_default_enrich_par()
+
+        Returns
+        -------
+        tup_res : tuple
+            (city, res_enrich) with enriched city object (copy) and tuple
+            returned by osmgen.data_enrichment
+            (building_parameters_for_analysis, individual_buildings, ...)
+        """
+
+        dict_enrich_par = get_default_enrich_par()
+        for key in kwargs:
+            if key not in dict_enrich_par:
+                msg = 'Unknown data enrichment parameter ' + str(key)
+                raise ValueError(msg)
+            dict_enrich_par[key] = kwargs[key]
+
+        (key_utm, city_utm) = self.get_utm_stage(conv_utm=conv_utm,
+                                                 zone_number=zone_number)
+
+        (key_geo, dict_geometry) = self.get_geometry_stage(
+            considered_area_around_a_building=considered_area_around_a_building,
+            conv_utm=conv_utm, zone_number=zone_number,
+            generate_nodelist_from_function_of_citydistrict=
+            generate_nodelist_from_function_of_citydistrict)
+
+        def calc_enrichment():
+            #  Data enrichment deletes not relevant buildings
+            city = copy.deepcopy(city_utm)
+
+            if seed is not None:
+                random.seed(seed)
+                np.random.seed(seed)
+
+            res_enrich = osmgen.data_enrichment(
+                city=city, osm_path=self.osm_path, zone_number=zone_number,
+                min_house_area=min_house_area,
+                considered_area_around_a_building=
+                considered_area_around_a_building,
+                timestep=self.dict_env_par['timestep'],
+                year=self.dict_env_par['year'],
+                try_path=self.dict_env_par['try_path'],
+                location=tuple(self.dict_env_par['location']),
+                altitude=self.dict_env_par['altitude'],
+                generate_nodelist_from_function_of_citydistrict=
+                generate_nodelist_from_function_of_citydistrict,
+                dict_geometry=dict_geometry,
+                **dict_enrich_par)
+
+            return {'city': city, 'res_enrich': res_enrich}
+
+        dict_par = copy.deepcopy(dict_enrich_par)
+        dict_par['min_house_area'] = min_house_area
+        dict_par['seed'] = seed
+
+        #  Without seed, enrichment results are random and are not cached
+        (key_enrich, dict_res) = self._get_stage(stage='enrichment',
+                                                 dict_par=dict_par,
+                                                 parent_key=key_geo,
+                                                 func=calc_enrichment,
+                                                 use_cache=seed is not None)
+
+        return (copy.deepcopy(dict_res['city']),
+                copy.deepcopy(dict_res['res_enrich']))
@@ -1328,6 +1328,70 @@ class CityAnnuityCalc(object):
         #  Perform final energy anaylsis
         self.energy_balance.calc_final_energy_balance_city()
 
+        return self.perform_economic_calc(
+            run_mc=run_mc, dict_samples_const=dict_samples_const,
+            dict_samples_esys=dict_samples_esys, run_idx=run_idx,
+            sampling_method=sampling_method,
+            dict_city_sample_lhc=dict_city_sample_lhc,
+            dict_build_samples_lhc=dict_build_samples_lhc,
+            use_kwkg_lhn_sub=use_kwkg_lhn_sub, el_mix_for_chp=el_mix_for_chp,
+            el_mix_for_pv=el_mix_for_pv, plot_res=plot_res)
+
+    def perform_economic_calc(self, run_mc=False, dict_samples_const=None,
+                              dict_samples_esys=None, run_idx=None,
+                              sampling_method=None,
+                              dict_city_sample_lhc=None,
+                              dict_build_samples_lhc=None,
+                              use_kwkg_lhn_sub=False, el_mix_for_chp=True,
+                              el_mix_for_pv=True, plot_res=False):
+        """
+        Perform emissions and annuity calculation with existing energy
+        balance results (e.g. to re-evaluate changed economic parameters
+        without re-running the energy balance). Requires, that energy balance
+        and final energy balance of city have been calculated.
+
+        Parameters
+        ----------
+        run_mc : bool, optional
+            Defines, if Monte-Carlo analysis should be run (default: False).
+        dict_samples_const : dict (of dicts)
+            Dictionary holding dictionaries with constant
+            sample data for MC run (default: None)
+        dict_samples_esys : dict (of dicts)
+            Dictionary holding dictionaries with energy system sampling
+            data for MC run (default: None)
+        run_idx : int, optional
+            Index / number of run for Monte-Carlo analysis (default: None)
+        sampling_method : str, optional
+            Defines method used for sampling (default: None).
+            Options: 'lhc', 'random'
+        dict_city_sample_lhc : dict, optional
+            Dict holding city parameter names as keys and numpy arrays with
+            samples as dict values (default: None)
+        dict_build_samples_lhc : dict, optional
+            Dict. holding building ids as keys and dict of samples as
+            values (default: None)
+        use_kwkg_lhn_sub : bool, optional
+            Defines, if KWKG LHN subsidies are used (default: False).
+        el_mix_for_chp : bool, optional
+            Defines, if el. mix should be used for CHP fed-in electricity
+            (default: True)
+        el_mix_for_pv : bool, optional
+            Defines, if el. mix should be used for PV fed-in electricity
+            (default: True)
+        plot_res : bool, optional
+            Defines if annuity results should be printed (default: False)
+
+        Returns
+        -------
+        res_tuple : tuple (of floats)
+            Results tuple (annuity, co2) with
+            annuity : float
+                Annuity in Euro/a
+            co2 : float
+                Emissions in kg/a
+        """
+
         #  Perform emissions calculation
         co2 = self.energy_balance.calc_co2_emissions(
             el_mix_for_chp=el_mix_for_chp,
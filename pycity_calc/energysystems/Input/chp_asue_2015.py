@@ -7,6 +7,8 @@ Energieverbrauch e.V., BHKW-Kenndaten 2014/15, Essen, 2015.
 (following functions  are only valid for gas-CHP systems!)
 """
 from __future__ import division
+
+import numpy as np
 #  #------------------------------------------------------------------------------------------------------------------
 #  From th. power --> el. efficiency th. efficiency --> --> el. power
 
@@ -223,3 +225,71 @@ def calc_asue_el_th_ratio(th_power):
     el_th_ratio = 0.0799 * th_power ** 0.1783
 
     return el_th_ratio
+
+
+def calc_el_eff_with_th_power_array(th_power):
+    """
+    Returns electrical efficiencies of CHP for array of thermal powers in W
+    (vectorized version of calc_el_eff_with_th_power)
+
+    Parameters
+    ----------
+    th_power : array (of floats)
+        Thermal output powers in W
+
+    Returns
+    ------
+    el_eff : array (of floats)
+        Electrical efficiencies (without unit)
+    """
+
+    th_power = np.asarray(th_power, dtype=float)
+
+    if np.any(th_power < 0):
+        raise AssertionError('Thermal power cannot be below zero.')
+
+    el_eff = np.select([th_power <= 21130, th_power <= 139762,
+                        th_power <= 1064487],
+                       [0.0787 * th_power ** 0.1273,
+                        0.0847 * th_power ** 0.1227,
+                        0.1304 * th_power ** 0.0845],
+                       0.1926 * th_power ** 0.0557)
+
+    if np.any(el_eff > 1):
+        raise AssertionError('Electrical efficiency cannot be above one.')
+
+    return el_eff
+
+
+def calc_el_eff_with_p_el_array(el_power):
+    """
+    Returns electrical efficiencies of CHP for array of electrical powers in
+    W (vectorized version of calc_el_eff_with_p_el)
+
+    Parameters
+    ----------
+    el_power : array (of floats)
+        Electric output powers in W
+
+    Returns
+    ------
+    el_eff : array (of floats)
+        Electrical efficiencies (without unit)
+    """
+
+    el_power = np.asarray(el_power, dtype=float)
+
+    if np.any(el_power < 0):
+        raise AssertionError('Electrical power cannot be below zero.')
+
+    el_eff = np.select([el_power <= 10 * 1000, el_power <= 100 * 1000,
+                        el_power <= 1000 * 1000],
+                       [0.21794 * (el_power / 1000) ** 0.108,
+                        0.2256 * (el_power / 1000) ** 0.1032,
+                        0.25416 * (el_power / 1000) ** 0.0732],
+                       0.29627 * (el_power / 1000) ** 0.0498)
+
+    if np.any(el_eff > 1):
+        raise AssertionError('Electrical efficiency cannot be above one.')
+
+    return el_eff
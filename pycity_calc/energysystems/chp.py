@@ -565,12 +565,22 @@ class ChpExtended(chp.CHP):
         #  Calculate thermal power output of chp in W
         th_power = self.thOperation_calc_chp_th_power_output(control_signal)
 
-        #  Calculate el. power output of chp in W
-        el_power = self.thOperation_calc_chp_el_power_output_w_th(th_power)
+        if self.chp_type == 'ASUE_2015' and th_power > 0:
+            #  Evaluate efficiency fit once for el. power and fuel power
+            el_eff = asue.calc_el_eff_with_th_power(th_power)
+            th_eff = asue.calc_th_eff_with_el_eff(el_eff, self.omega)
+
+            #  El. power output and fuel power input of chp in W
+            el_power = th_power * el_eff / th_eff
+            fuel_power_in = th_power / th_eff
+        else:
+            #  Calculate el. power output of chp in W
+            el_power = self.thOperation_calc_chp_el_power_output_w_th(
+                th_power)
 
-        #  Calculate fuel power input of chp in W
-        fuel_power_in = \
-            self.thOperation_calc_chp_fuel_power_input_w_th(th_power)
+            #  Calculate fuel power input of chp in W
+            fuel_power_in = \
+                self.thOperation_calc_chp_fuel_power_input_w_th(th_power)
 
         if save_res:
             #  Save results
@@ -914,6 +924,172 @@ class ChpExtended(chp.CHP):
 
         return (th_power, el_power, fuel_power_in)
 
+    def _limit_control_signals(self, control_signals, nominal_power,
+                               mode_name):
+        """
+        Returns array of power outputs for array of control signals (negative
+        control signals and control signals below part load limit are set to
+        zero, power is limited to nominal power). Warnings are raised once
+        per call.
+
+        Parameters
+        ----------
+        control_signals : array (of floats)
+            Desired power outputs in W
+        nominal_power : float
+            Nominal power in W (qNominal or pNominal)
+        mode_name : str
+            Name of control signal for warning messages ('Thermal' or
+            'Electrical')
+
+        Returns
+        -------
+        power : array (of floats)
+            Power outputs in W
+        """
+
+        power = np.array(control_signals, dtype=float)
+
+        is_neg = power < 0
+        if np.any(is_neg):
+            warnings.warn(mode_name + ' control signal for CHP' + str(self) +
+                          'is negative for ' + str(np.count_nonzero(is_neg)) +
+                          ' timesteps. Therefore, output is defined as zero.')
+            power[is_neg] = 0
+
+        is_below = (power < self.lowerActivationLimit * nominal_power) & \
+                   (power != 0)
+        if np.any(is_below):
+            warnings.warn(mode_name + ' control signal for CHP' + str(self) +
+                          'is below minimum part load performance for ' +
+                          str(np.count_nonzero(is_below)) + ' timesteps. '
+                          'Therefore, output is defined as zero.')
+            power[is_below] = 0
+
+        return np.minimum(power, nominal_power)
+
+    def _save_results_array(self, th_power, el_power, fuel_power_in,
+                            time_index):
+        """
+        Save result arrays to timesteps time_index to
+        time_index + len(th_power) - 1
+        """
+
+        time_slice = slice(time_index, time_index + len(th_power))
+
+        self.totalQOutput[time_slice] = th_power
+        self.totalPOutput[time_slice] = el_power
+        self.array_fuel_power[time_slice] = fuel_power_in
+
+    def th_op_calc_all_results_array(self, control_signals, time_index=0,
+                                     save_res=True):
+        """
+        Calculate and save results (thermal and el. output, fuel input)
+        for thermal operation mode and array of control signals (vectorized
+        version of th_op_calc_all_results, e.g. for whole year).
+
+        Parameters
+        ----------
+        control_signals : array (of floats)
+            Control signals for desired thermal power in W
+        time_index : int, optional
+            Number of first timestep (default: 0). Results are saved to
+            timesteps time_index to time_index + len(control_signals) - 1.
+        save_res : bool, optional
+            Defines, if results should be saved on CHP object instance
+            (default: True)
+
+        Returns
+        -------
+        results_tuple : tuple (of arrays)
+            Tuple with result arrays (thermal power, el. power, fuel power)
+        """
+
+        if self.chp_type != 'ASUE_2015':
+            raise AssertionError('Unknown chp_type. Check input.')
+
+        #  Thermal power output of chp in W
+        th_power = self._limit_control_signals(
+            control_signals=control_signals, nominal_power=self.qNominal,
+            mode_name='Thermal')
+
+        el_power = np.zeros(len(th_power))
+        fuel_power_in = np.zeros(len(th_power))
+
+        is_on = th_power > 0
+
+        el_eff = asue.calc_el_eff_with_th_power_array(th_power[is_on])
+        th_eff = self.omega - el_eff
+
+        if np.any(th_eff < 0) or np.any(th_eff > 1):
+            raise AssertionError('Thermal efficiency has to be between zero '
+                                 'and one.')
+
+        #  El. power output and fuel power input of chp in W
+        el_power[is_on] = th_power[is_on] * el_eff / th_eff
+        fuel_power_in[is_on] = th_power[is_on] / th_eff
+
+        if save_res:
+            self._save_results_array(th_power=th_power, el_power=el_power,
+                                     fuel_power_in=fuel_power_in,
+                                     time_index=time_index)
+
+        return (th_power, el_power, fuel_power_in)
+
+    def el_op_calc_all_results_array(self, control_signals, time_index=0,
+                                     save_res=True):
+        """
+        Calculate and save results (thermal and el. output, fuel input)
+        for electrical operation mode and array of control signals
+        (vectorized version of el_op_calc_all_results, e.g. for whole year).
+
+        Parameters
+        ----------
+        control_signals : array (of floats)
+            Control signals for desired electrical power in W
+        time_index : int, optional
+            Number of first timestep (default: 0). Results are saved to
+            timesteps time_index to time_index + len(control_signals) - 1.
+        save_res : bool, optional
+            Defines, if results should be saved on CHP object instance
+            (default: True)
+
+        Returns
+        -------
+        results_tuple : tuple (of arrays)
+            Tuple with result arrays (thermal power, el. power, fuel power)
+        """
+
+        if self.chp_type != 'ASUE_2015':
+            raise AssertionError('Unknown chp_type. Check inputs.')
+
+        #  El. power output of chp in W
+        el_power = self._limit_control_signals(
+            control_signals=control_signals, nominal_power=self.pNominal,
+            mode_name='Electrical')
+
+        th_power = np.zeros(len(el_power))
+        fuel_power_in = np.zeros(len(el_power))
+
+        is_on = el_power > 0
+
+        el_eff = asue.calc_el_eff_with_p_el_array(el_power[is_on])
+        th_eff = self.omega - el_eff
+
+        if np.any(th_eff <= 0):
+            raise AssertionError('Thermal efficiency has to be above zero.')
+
+        #  Thermal power output and fuel power input of chp in W
+        th_power[is_on] = el_power[is_on] * th_eff / el_eff
+        fuel_power_in[is_on] = el_power[is_on] / el_eff
+
+        if save_res:
+            self._save_results_array(th_power=th_power, el_power=el_power,
+                                     fuel_power_in=fuel_power_in,
+                                     time_index=time_index)
+
+        return (th_power, el_power, fuel_power_in)
+
     def calc_nb_on_off_switching(self):
         """
         Calculates number of on/off-switching events during one year.
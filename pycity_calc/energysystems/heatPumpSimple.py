@@ -127,6 +127,9 @@ class heatPumpSimple(heat.HeatingDevice):
         timesteps_total = environment.timer.timestepsTotal
         self.array_el_power_in = np.zeros(timesteps_total)
 
+        #  Cached COP profile (see get_cop_array)
+        self._cop_cache = None
+
         #  Calculate quality grade
         self._recalc_quality_grade()
 
@@ -225,6 +228,78 @@ class heatPumpSimple(heat.HeatingDevice):
 
         return cop
 
+    def calc_hp_cop_array(self, temp_source):
+        """
+        Returns array of COP estimations for array of source temperatures
+        (vectorized version of calc_hp_cop_with_quality_grade).
+        Maximal allowed COP values is 5.
+
+        Parameters
+        ----------
+        temp_source : array (of floats)
+            Temperatures of heatsource in °C
+
+        Returns
+        ------
+        cop : array (of floats)
+            Heatpump coefficients of performance (no unit)
+            max 5
+        """
+
+        temp_source = np.asarray(temp_source, dtype=float)
+
+        if np.any(unitcon.con_celsius_to_kelvin(temp_source) <= 0):
+            msg = 'Source temperature cannot be below 0 Kelvin.'
+            raise AssertionError(msg)
+
+        cop = np.zeros(temp_source.shape) + 5
+
+        #  COP of 5 for source temperatures equal or above sink temperature
+        is_below = temp_source < self.t_sink
+
+        # Get maximal possible COP
+        cop_max = unitcon.con_celsius_to_kelvin(self.t_sink) / (
+            self.t_sink - temp_source[is_below])
+
+        #  Estimate COP with quality grade (Guetegrad), limited to 5
+        cop[is_below] = np.minimum(self.quality_grade * cop_max, 5)
+
+        return cop
+
+    def get_cop_array(self):
+        """
+        Returns COP profile of heat pump for source temperature of
+        environment (weather.tAmbient for air/water, temp_ground for
+        water/water heat pump). COP profile is cached and only
+        recalculated, if hp_type, quality_grade, t_sink or source
+        temperatures have been changed.
+
+        Returns
+        ------
+        cop : array (of floats)
+            COP profile (read-only) with one value per timestep
+        """
+
+        if self.hp_type == 'aw':
+            temp_source = self.environment.weather.tAmbient
+        elif self.hp_type == 'ww':
+            temp_source = np.zeros(self.environment.timer.timestepsTotal) \
+                          + self.environment.temp_ground
+
+        key = (self.hp_type, self.quality_grade, self.t_sink)
+
+        #  getattr, as older pickled hp objects do not hold _cop_cache
+        cop_cache = getattr(self, '_cop_cache', None)
+
+        if (cop_cache is None or cop_cache[0] != key
+                or not np.array_equal(cop_cache[1], temp_source)):
+            cop = self.calc_hp_cop_array(temp_source=temp_source)
+            cop.flags.writeable = False
+
+            self._cop_cache = (key, np.array(temp_source), cop)
+
+        return self._cop_cache[2]
+
     def calc_hp_th_power_output(self, control_signal):
         """
         Returns heatpump thermal power output in Watt
@@ -260,7 +335,7 @@ class heatPumpSimple(heat.HeatingDevice):
 
         return q_power_output
 
-    def calc_hp_el_power_input(self, control_signal, t_source):
+    def calc_hp_el_power_input(self, control_signal, t_source, cop=None):
         """
         Returns electric power input of heat pump, depending on the required
         thermal output and given temperature. If Heat Pump type is air-water
@@ -275,6 +350,10 @@ class heatPumpSimple(heat.HeatingDevice):
             Temperature of heatsource in °C
             t_source is used for the calculation of the air-water hp,
             for water-water hp environment.temp_ground is used
+        cop : float, optional
+            COP of heat pump (default: None), e.g. out of get_cop_array.
+            If None, COP is calculated with t_source.
+
         Returns
         ------
         p_el_in : float
@@ -285,8 +364,9 @@ class heatPumpSimple(heat.HeatingDevice):
 
         if q_power_output > 0:
 
-            #  Estimate COP with quality grade
-            cop = self.calc_hp_cop_with_quality_grade(t_source)
+            if cop is None:
+                #  Estimate COP with quality grade
+                cop = self.calc_hp_cop_with_quality_grade(t_source)
 
             # Calculate electrical power
             p_el_in = q_power_output / cop
@@ -297,7 +377,7 @@ class heatPumpSimple(heat.HeatingDevice):
         return p_el_in
 
     def calc_hp_all_results(self, control_signal, t_source, time_index,
-                            save_res=True):
+                            save_res=True, cop=None):
         """
         Calculate and save all results of heat pump
         (thermal power output, electrical power input)
@@ -313,6 +393,9 @@ class heatPumpSimple(heat.HeatingDevice):
         save_res : bool, optional
             Defines, if results should be saved on hp object instance
             (default: True)
+        cop : float, optional
+            COP of heat pump (default: None), e.g. get_cop_array()[time_index]
+            If None, COP is calculated with t_source.
 
         Returns
         -------
@@ -324,7 +407,8 @@ class heatPumpSimple(heat.HeatingDevice):
         th_power_out = self.calc_hp_th_power_output(control_signal)
 
         #  Calculate electrical power input
-        el_power_in = self.calc_hp_el_power_input(th_power_out, t_source)
+        el_power_in = self.calc_hp_el_power_input(th_power_out, t_source,
+                                                  cop=cop)
 
         if save_res:
             #  Save results
@@ -332,3 +416,73 @@ class heatPumpSimple(heat.HeatingDevice):
             self.array_el_power_in[time_index] = el_power_in
 
         return (th_power_out, el_power_in)
+
+    def calc_hp_all_results_array(self, control_signals, t_source=None,
+                                  time_index=0, save_res=True):
+        """
+        Calculate and save all results of heat pump (thermal power output,
+        electrical power input) for array of control signals (vectorized
+        version of calc_hp_all_results, e.g. for whole year)
+
+        Parameters
+        ----------
+        control_signals : array (of floats)
+            Desired thermal power outputs in W
+        t_source : array (of floats), optional
+            Source temperatures in °C (default: None). If None, uses cached
+            COP profile of environment source temperatures (see
+            get_cop_array).
+        time_index : int, optional
+            Number of first timestep (default: 0). Results are saved to
+            timesteps time_index to time_index + len(control_signals) - 1.
+        save_res : bool, optional
+            Defines, if results should be saved on hp object instance
+            (default: True)
+
+        Returns
+        -------
+        results_tuple : tuple (of arrays)
+            Tuple with result arrays (thermal power output, electrical power
+            input)
+        """
+
+        th_power_out = np.array(control_signals, dtype=float)
+
+        is_neg = th_power_out < 0
+        if np.any(is_neg):
+            warnings.warn('Control signal for heatpump' + str(self) +
+                          'is negative for ' + str(np.count_nonzero(is_neg)) +
+                          ' timesteps. Therefore, output is defined as zero.')
+            th_power_out[is_neg] = 0
+
+        is_below = (th_power_out < self.lowerActivationLimit * self.qNominal) \
+                   & (th_power_out != 0)
+        if np.any(is_below):
+            warnings.warn('Control signal for heatpump' + str(self) +
+                          'is below minimum part load performance for ' +
+                          str(np.count_nonzero(is_below)) + ' timesteps. '
+                          'Therefore, output is defined as zero.')
+            th_power_out[is_below] = 0
+
+        #  Output is limited to nominal thermal power
+        th_power_out = np.minimum(th_power_out, self.qNominal)
+
+        if t_source is None:
+            cop = self.get_cop_array()[time_index:
+                                       time_index + len(th_power_out)]
+        else:
+            cop = self.calc_hp_cop_array(
+                temp_source=np.broadcast_to(t_source, th_power_out.shape))
+
+        el_power_in = np.zeros(len(th_power_out))
+
+        is_on = th_power_out > 0
+        el_power_in[is_on] = th_power_out[is_on] / cop[is_on]
+
+        if save_res:
+            time_slice = slice(time_index, time_index + len(th_power_out))
+
+            self.totalQOutput[time_slice] = th_power_out
+            self.array_el_power_in[time_slice] = el_power_in
+
+        return (th_power_out, el_power_in)
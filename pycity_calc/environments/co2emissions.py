@@ -4,9 +4,10 @@ Script with emission class holding CO2 and primary energy (PE) factors
 """
 from __future__ import division
 import os
-import numpy as np
 import warnings
 
+import pycity_calc.environments.data_cache as dcache
+
 
 class Emissions(object):
     """
@@ -174,8 +175,9 @@ class Emissions(object):
             try:
                 input_data_path = os.path.join(src_path, 'data', 'BaseData',
                                                'CO2', 'co2_gemis_factors.txt')
-                co2_dataset = np.genfromtxt(input_data_path, delimiter='\t',
-                                            skip_header=1)
+                co2_dataset = dcache.load_data_file(input_data_path,
+                                                    delimiter='\t',
+                                                    skip_header=1)
                 if year in gemis_year_list:
                     if year == 2014:
                         use_column = 2
@@ -253,7 +255,7 @@ class Emissions(object):
     def load_dyn_co2_signals(self, path_mix=None, path_sup=None):
         """
         Load dynamic co2 signals from given pathes. If path is None, uses
-        default path.
+        default path. Files are parsed once per process (see data_cache).
 
         Parameters
         ----------
@@ -279,8 +281,10 @@ class Emissions(object):
             name_sup = 'CO2factors_supp.txt'
             path_sup = os.path.join(path_data_folder, name_sup)
 
-        matrix_co2_mix = np.loadtxt(path_mix, usecols=(0, 1, 2))
-        matrix_co2_sup = np.loadtxt(path_sup, usecols=(0, 1, 2))
+        matrix_co2_mix = dcache.load_data_file(path_mix, loader='loadtxt',
+                                               usecols=(0, 1, 2))
+        matrix_co2_sup = dcache.load_data_file(path_sup, loader='loadtxt',
+                                               usecols=(0, 1, 2))
 
         #  Arrays with dynamic CO2 signals for electricity mix in Germany
         #  for different shares of renewables (60%, 80%, 100%)
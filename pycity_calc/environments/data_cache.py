@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Process-wide cache for numeric data files of environment objects (e.g.
+price tables of Market and CO2 factors of Emissions).
+
+Each data file is parsed once per process. Optionally, parsed data is
+stored as binary .npy sidecar file in a user cache directory
+(<filename>.<key>.cache.npy), which is loaded by following processes
+instead of parsing the text file again. Sidecar files are only used, if
+a cache directory is set (path_cache argument or path_cache_default) and
+if they are newer than the data file. If sidecar files cannot be written,
+only the process-wide cache is used.
+"""
+from __future__ import division
+
+import os
+import hashlib
+import tempfile
+import numpy as np
+
+#  Default directory of .npy sidecar files (None: no sidecar files),
+#  e.g. os.path.join(os.path.expanduser('~'), '.cache', 'pycity_calc')
+path_cache_default = None
+
+#  Holding tuples (path, loader, options) as keys and parsed arrays as values
+_dict_data = {}
+
+
+def _get_sidecar_path(path_cache, key):
+    """
+    Returns path of .npy sidecar file of data file within cache directory
+    """
+
+    digest = hashlib.md5(repr(key).encode('utf-8')).hexdigest()[:8]
+
+    return os.path.join(path_cache,
+                        os.path.basename(key[0]) + '.' + digest + '.cache.npy')
+
+
+def _replace_file(path_src, path_dst):
+    """
+    Rename file path_src to path_dst (replaces existing file path_dst)
+    """
+
+    if hasattr(os, 'replace'):
+        os.replace(path_src, path_dst)
+    else:
+        #  Python 2.7: os.rename does not replace existing files on Windows
+        if os.path.isfile(path_dst):
+            os.remove(path_dst)
+        os.rename(path_src, path_dst)
+
+
+def _save_sidecar(path_sidecar, array):
+    """
+    Save array as sidecar file (atomic replace, fails silently)
+    """
+
+    path_tmp = None
+
+    try:
+        path_cache = os.path.dirname(path_sidecar)
+        if not os.path.isdir(path_cache):
+            os.makedirs(path_cache)
+        (fd, path_tmp) = tempfile.mkstemp(dir=path_cache, suffix='.npy')
+        with os.fdopen(fd, 'wb') as file:
+            np.save(file, array)
+        _replace_file(path_tmp, path_sidecar)
+    except (OSError, IOError):
+        if path_tmp is not None and os.path.isfile(path_tmp):
+            try:
+                os.remove(path_tmp)
+            except (OSError, IOError):
+                pass
+
+
+def load_data_file(path, loader='genfromtxt', path_cache=None, **kwargs):
+    """
+    Returns data of numeric text file as array. Data is parsed once per
+    process (and once per file change, if sidecar files are used).
+
+    Parameters
+    ----------
+    path : str
+        Path to data file
+    loader : str, optional
+        Numpy loader function (default: 'genfromtxt').
+        Options: 'genfromtxt', 'loadtxt'
+    path_cache : str, optional
+        Path to directory of binary .npy sidecar files, which store parsed
+        data for following processes (default: None). If None, uses
+        path_cache_default. If both are None, no sidecar files are used.
+    kwargs
+        Keyword arguments of loader function (e.g. delimiter=',')
+
+    Returns
+    -------
+    array : np.array
+        Data array (copy of cached array)
+    """
+
+    if loader == 'genfromtxt':
+        load_func = np.genfromtxt
+    elif loader == 'loadtxt':
+        load_func = np.loadtxt
+    else:
+        msg = 'Unknown loader ' + str(loader) + '. Use genfromtxt or loadtxt.'
+        raise ValueError(msg)
+
+    if path_cache is None:
+        path_cache = path_cache_default
+
+    path = os.path.abspath(path)
+    key = (path, loader, tuple(sorted(kwargs.items())))
+
+    if key not in _dict_data:
+
+        mtime = os.path.getmtime(path)  # Raises OSError for missing file
+        array = None
+
+        if path_cache is not None:
+            path_sidecar = _get_sidecar_path(path_cache, key)
+            if os.path.isfile(path_sidecar) and \
+                    os.path.getmtime(path_sidecar) >= mtime:
+                try:
+                    array = np.load(path_sidecar)
+                except (OSError, IOError, ValueError):
+                    array = None
+
+        if array is None:
+            array = load_func(path, **kwargs)
+            if path_cache is not None:
+                _save_sidecar(path_sidecar, array)
+
+        _dict_data[key] = array
+
+    return np.array(_dict_data[key])
+
+
+def clear_cache(path_cache=None):
+    """
+    Clear process-wide data cache
+
+    Parameters
+    ----------
+    path_cache : str, optional
+        Path to directory of .npy sidecar files (default: None). If set,
+        sidecar files of cached data files are removed, too.
+    """
+
+    if path_cache is not None:
+        for key in _dict_data.keys():
+            path_sidecar = _get_sidecar_path(path_cache, key)
+            if os.path.isfile(path_sidecar):
+                os.remove(path_sidecar)
+
+    _dict_data.clear()
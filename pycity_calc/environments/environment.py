@@ -44,3 +44,7 @@ class EnvironmentExtended(Env.Environment):
 
         #  Further attributes
         self.temp_ground = temp_ground
+
+        #  ProfileStore with cached, resampled profiles (e.g. weather data).
+        #  Generated on demand (see toolbox.profile_store.get_profile_store)
+        self.profile_store = None
@@ -5,6 +5,7 @@ Script to extend pycity market object
 """
 from __future__ import division
 import warnings
+import numpy as np
 
 import pycity_calc.environments.market as market
 
@@ -18,6 +19,14 @@ class GermanMarket(market.Market):
     grid avoidance fee.
     """
 
+    #  Upper bounds of nominal el. CHP power tiers in W
+    #  (for _sub_chp and _sub_chp_self)
+    _bounds_chp = [50000, 100000, 250000, 2000000]
+    _bounds_chp_self = [50000, 100000]
+
+    #  Upper bounds of PV peak load tiers in W (residential, for _sub_pv)
+    _bounds_pv = [10000, 40000, 100000]
+
     def __init__(self, reset_pycity_default_values=True,
                  chp_tax_return=0.0055, eeg_pay=0.0688,
                  eex_baseload=[0.03309, 0.03309, 0.03309, 0.03309],
@@ -61,6 +70,7 @@ class GermanMarket(market.Market):
 
         #  List of PV subsidies (<= 10 kW, <= 40 kW, <= 100 kW, commercial
         self._sub_pv = [0.1183, 0.115, 0.1028, 0.0818] # Since 01.10.2018
+
         #  E.g. https://www.photovoltaik4all.de/aktuelle-eeg-verguetungssaetze-fuer-photovoltaikanlagen-2017
 
         #  CHP tax return on gas
@@ -82,6 +92,21 @@ class GermanMarket(market.Market):
         #  Dict with EEG payment on self consumed energy (status quo: 2017)
         self._dict_eeg_self = {'pv': 0.4 * eeg_pay, 'chp': 0.4 * eeg_pay}
 
+    @staticmethod
+    def _get_tier_value(values, bounds, x):
+        """
+        Returns value of tier (binary search on upper bounds, including
+        bound) for float or array x. values holds one more entry than
+        bounds (values for x larger than last bound).
+        """
+
+        idx = np.searchsorted(bounds, x, side='left')
+        res = np.asarray(values)[idx]
+
+        if np.ndim(res) == 0:
+            return float(res)
+        return res
+
     def get_sub_chp(self, p_nom):
         """
         Returns CHP subsidy payment per kWh feed in el. energy, depending
@@ -89,35 +114,24 @@ class GermanMarket(market.Market):
 
         Parameters
         ----------
-        p_nom : float
+        p_nom : float or array-like
             Nominal electrical CHP power in W
 
         Returns
         -------
-        sub_chp : float
+        sub_chp : float or np.array
             CHP subsidies payment in Euro/kWh for fed-in electric energy
         """
 
-        for i in range(len(self._sub_chp) - 1):
-            if self._sub_chp[i + 1] > self._sub_chp[i]:
-                msg = 'self._sub_chp list seems to hold higher subsidies for' \
-                      'larger CHP units. Check if this has been done ' \
-                      'intentionally. According to German CHP law, subsidies' \
-                      ' are higher for smaller CHP sizes.'
-                warnings.warn(msg)
-
-        if p_nom <= 50000:
-            sub_chp = self._sub_chp[0]
-        elif p_nom <= 100000:
-            sub_chp = self._sub_chp[1]
-        elif p_nom <= 250000:
-            sub_chp = self._sub_chp[2]
-        elif p_nom <= 2000000:
-            sub_chp = self._sub_chp[3]
-        else:
-            sub_chp = self._sub_chp[4]
+        if np.any(np.diff(self._sub_chp) > 0):
+            msg = 'self._sub_chp list seems to hold higher subsidies for' \
+                  'larger CHP units. Check if this has been done ' \
+                  'intentionally. According to German CHP law, subsidies' \
+                  ' are higher for smaller CHP sizes.'
+            warnings.warn(msg)
 
-        return sub_chp
+        return self._get_tier_value(values=self._sub_chp,
+                                    bounds=self._bounds_chp, x=p_nom)
 
     def get_sub_chp_self(self, p_nom):
         """
@@ -126,30 +140,24 @@ class GermanMarket(market.Market):
 
         Parameters
         ----------
-        p_nom : float
+        p_nom : float or array-like
             Nominal electrical CHP power in W
 
         Returns
         -------
-        sub_chp : float
+        sub_chp : float or np.array
             CHP subsidies payment in Euro/kWh for self-consumed electric energy
         """
-        for i in range(len(self._sub_chp_self) - 1):
-            if self._sub_chp_self[i + 1] > self._sub_chp_self[i]:
-                msg = 'self._sub_chp_self list seems to hold higher subsidies ' \
-                      'for larger CHP units. Check if this has been done ' \
-                      'intentionally. According to German CHP law, subsidies' \
-                      ' are higher for smaller CHP sizes.'
-                warnings.warn(msg)
-
-        if p_nom <= 50000:
-            sub_chp = self._sub_chp_self[0]
-        elif p_nom <= 100000:
-            sub_chp = self._sub_chp_self[1]
-        else:
-            sub_chp = self._sub_chp_self[2]
 
-        return sub_chp
+        if np.any(np.diff(self._sub_chp_self) > 0):
+            msg = 'self._sub_chp_self list seems to hold higher subsidies ' \
+                  'for larger CHP units. Check if this has been done ' \
+                  'intentionally. According to German CHP law, subsidies' \
+                  ' are higher for smaller CHP sizes.'
+            warnings.warn(msg)
+
+        return self._get_tier_value(values=self._sub_chp_self,
+                                    bounds=self._bounds_chp_self, x=p_nom)
 
     def get_max_total_runtime_chp_sub(self, p_el_nom):
         """
@@ -158,12 +166,12 @@ class GermanMarket(market.Market):
 
         Parameters
         ----------
-        p_el_nom : float
+        p_el_nom : float or array-like
             Nominal electric power of CHP in Watt
 
         Returns
         -------
-        sub_chp_runtime : int
+        sub_chp_runtime : int or np.array
             Maximum CHP runtime, which is used to get subsidy payments, in
             hours
 
@@ -172,12 +180,14 @@ class GermanMarket(market.Market):
         http://www.bhkw-jetzt.de/foerderung/nach-kwk-g/
         """
 
-        assert p_el_nom >= 0
+        assert np.all(np.asarray(p_el_nom) >= 0)
 
-        if p_el_nom <= 50 * 1000:
-            return 60000
-        else:  # Larger than 50 kW el.
-            return 30000
+        #  60000 hours up to 50 kW el., 30000 hours for larger units
+        runtime = np.where(np.asarray(p_el_nom) <= 50 * 1000, 60000, 30000)
+
+        if np.ndim(runtime) == 0:
+            return int(runtime)
+        return runtime
 
 
     def get_sub_pv(self, pv_peak_load, is_res=True):
@@ -186,7 +196,7 @@ class GermanMarket(market.Market):
 
         Parameters
         ----------
-        pv_peak_load : float
+        pv_peak_load : float or array-like
             PV peak load in Watt
         is_res : bool, optional
             Defines, if PV is installed on residential building (default: True)
@@ -196,41 +206,30 @@ class GermanMarket(market.Market):
 
         Returns
         -------
-        sub_pv : float
+        sub_pv : float or np.array
             Subsidy payment for sold PV el. energy in Euro/kWh
         """
 
         if is_res:
-
-            if pv_peak_load <= 10000:
-                # max 10kWp
-                sub_pv = self._sub_pv[0]
-            elif pv_peak_load <= 40000:
-                # from 10 to 40kWp
-                sub_pv = self._sub_pv[1]
-            elif pv_peak_load <= 100000:
-                # maximum 100kWp
-                sub_pv = self._sub_pv[2]
-            else:
-                msg = 'PV System hast more than 100kWp.\nThe implemented EEG' \
-                      ' subsidy payments method is not valid for this case.\n' \
-                      ' sub_pv set to ' + str(self._sub_pv[3] * 0.7) + '.\n ' \
-                      'Consider adding own PV subsidy value!'
-                warnings.warn(msg)
-                sub_pv = self._sub_pv[2] * 0.7
-
+            #  max 10kWp, from 10 to 40kWp, maximum 100kWp, larger
+            values = [self._sub_pv[0], self._sub_pv[1], self._sub_pv[2],
+                      self._sub_pv[2] * 0.7]
+            bounds = self._bounds_pv
+            sub_large = self._sub_pv[2] * 0.7
         else:
-            if pv_peak_load <= 100000:
-                sub_pv = self._sub_pv[3]
-            else:
-                msg = 'PV System hast more than 100kWp.\nThe implemented EEG' \
-                      ' subsidy payments method is not valid for this case.\n' \
-                      ' sub_pv set to ' + str(self._sub_pv[3] * 0.7) + '.\n ' \
-                      'Consider adding own PV subsidy value!'
-                warnings.warn(msg)
-                sub_pv = self._sub_pv[3] * 0.7
-
-        return sub_pv
+            values = [self._sub_pv[3], self._sub_pv[3] * 0.7]
+            bounds = self._bounds_pv[-1:]
+            sub_large = self._sub_pv[3] * 0.7
+
+        if np.any(np.asarray(pv_peak_load) > self._bounds_pv[-1]):
+            msg = 'PV System hast more than 100kWp.\nThe implemented EEG' \
+                  ' subsidy payments method is not valid for this case.\n' \
+                  ' sub_pv set to ' + str(sub_large) + '.\n ' \
+                  'Consider adding own PV subsidy value!'
+            warnings.warn(msg)
+
+        return self._get_tier_value(values=values, bounds=bounds,
+                                    x=pv_peak_load)
 
     def get_eeg_payment(self, type):
         """
@@ -9,6 +9,8 @@ import warnings
 
 import pycity_base.classes.Prices as Price
 
+import pycity_calc.environments.data_cache as dcache
+
 
 class Market(Price.Prices):
     """
@@ -68,6 +70,7 @@ class Market(Price.Prices):
         Method returns np.arrays with pricing data for gas and electricity
         for residential and non-residential buildings in Germany.
         Prices are related to annual demand and reference year.
+        Price files are parsed once per process (see data_cache).
 
         The output format is:
         1. column: Demand in kWh from
@@ -109,8 +112,9 @@ class Market(Price.Prices):
         el_res_filepath = os.path.join(data_path, 'Electricity', 'Private',
                                        el_res_filename)
         try:
-            el_price_data_res = np.genfromtxt(el_res_filepath, delimiter='\t',
-                                              skip_header=2)
+            el_price_data_res = dcache.load_data_file(el_res_filepath,
+                                                      delimiter='\t',
+                                                      skip_header=2)
         except:
             warnings.warn('Could not load res. el. price data. ' +
                           'Going to return None.')
@@ -121,8 +125,9 @@ class Market(Price.Prices):
         el_ind_filepath = os.path.join(data_path, 'Electricity', 'Industry',
                                        el_ind_filename)
         try:
-            el_price_data_ind = np.genfromtxt(el_ind_filepath, delimiter='\t',
-                                              skip_header=2)
+            el_price_data_ind = dcache.load_data_file(el_ind_filepath,
+                                                      delimiter='\t',
+                                                      skip_header=2)
         except:
             warnings.warn('Could not load res. el. price data. ' +
                           'Going to return None.')
@@ -133,8 +138,9 @@ class Market(Price.Prices):
         gas_res_filepath = os.path.join(data_path, 'Gas', 'Private',
                                         gas_res_filename)
         try:
-            gas_price_data_res = np.genfromtxt(gas_res_filepath,
-                                               delimiter='\t', skip_header=2)
+            gas_price_data_res = dcache.load_data_file(gas_res_filepath,
+                                                       delimiter='\t',
+                                                       skip_header=2)
         except:
             warnings.warn('Could not load res. el. price data. ' +
                           'Going to return None.')
@@ -145,8 +151,9 @@ class Market(Price.Prices):
         gas_ind_filepath = os.path.join(data_path, 'Gas', 'Industry',
                                         gas_ind_filename)
         try:
-            gas_price_data_ind = np.genfromtxt(gas_ind_filepath,
-                                               delimiter='\t', skip_header=2)
+            gas_price_data_ind = dcache.load_data_file(gas_ind_filepath,
+                                                       delimiter='\t',
+                                                       skip_header=2)
         except:
             warnings.warn('Could not load res. el. price data. ' +
                           'Going to return None.')
@@ -154,6 +161,40 @@ class Market(Price.Prices):
         return el_price_data_res, el_price_data_ind, gas_price_data_res, \
                gas_price_data_ind
 
+    def _get_spec_cost(self, price_data, year, annual_demand):
+        """
+        Returns specific cost of price data table in Euro/kWh, depending on
+        reference year and annual demand in kWh (float or array).
+        Demand levels are found with binary search.
+        """
+
+        list_of_years = [2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018]
+
+        array_year = np.asarray(year)
+        assert np.all(np.isin(array_year, list_of_years)), \
+            'Year must be in list_of_years!'
+
+        if np.any(array_year >= 2017):
+            msg = 'Year 2017 is chosen. However, prices are only available' \
+                  ' for 2016!'
+            warnings.warn(msg)
+            array_year = np.minimum(array_year, 2016)
+
+        #  Find column index according to year (skip two columns with
+        #  demand data)
+        column = array_year - 2010 + 2
+
+        #  Find row index according to demand (first row with annual demand
+        #  smaller than max. demand value in data, else last row)
+        row = np.searchsorted(price_data[:, 1], annual_demand, side='right')
+        row = np.minimum(row, len(price_data) - 1)
+
+        spec_cost = price_data[row, column]
+
+        if np.ndim(spec_cost) == 0:
+            return float(spec_cost)
+        return spec_cost
+
     def get_spec_gas_cost(self, type, year, annual_demand):
         """
         Returns specific gas cost in Euro/kWh, depending on building type,
@@ -165,51 +206,29 @@ class Market(Price.Prices):
             Building type. Options:
             - 'res' - Residential
             - 'ind' - Industrial / Non-residential
-        year : int
+        year : int or array-like
             Reference year. Options:
             (2010, 2011, 2012, 2013, 2014, 2015, 2016)
-        annual_demand : float
+        annual_demand : float or array-like
             Annual gas energy demand in kWh/a
 
         Returns
         -------
-        spec_cost_gas : float
-            Specific cost of gas in Euro/kWh
+        spec_cost_gas : float or np.array
+            Specific cost of gas in Euro/kWh (array, if year or
+            annual_demand is array)
         """
-        list_of_years = [2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018]
-        assert year in list_of_years, 'Year must be in list_of_years!'
 
-        if year == 2017 or year == 2018:
-            msg = 'Year 2017 is chosen. However, prices are only available' \
-                  ' for 2016!'
-            warnings.warn(msg)
-            year = 2016
-
-        #  Find column index according to year
-        year_index = list_of_years.index(year)  # Find year index in list
-        column = year_index + 2  # Skip two columns with demand data
-
-        if type == 'res' or type == 'ind':
-            if type == 'res':  # Residential
-                gas_price_data = self.gas_price_data_res
-            elif type == 'ind':  # Industrial
-                gas_price_data = self.gas_price_data_ind
-            # Find row index according to demand
-            max_demand_column = gas_price_data[:, [1]]
-            for i in range(len(max_demand_column)):
-                #  If annual_demand is smaller than max demand value in data
-                if annual_demand < max_demand_column[i]:
-                    row = i  # Return row index
-                    break
-                else:  # index of last row
-                    row = len(max_demand_column) - 1
-
-            spec_cost_gas = gas_price_data[row][column]
+        if type == 'res':  # Residential
+            gas_price_data = self.gas_price_data_res
+        elif type == 'ind':  # Industrial
+            gas_price_data = self.gas_price_data_ind
         else:
             raise ValueError('Chosen type for method get_spec_gas_cost is ' +
                              'unknown. Select "res" or "ind".')
 
-        return spec_cost_gas
+        return self._get_spec_cost(price_data=gas_price_data, year=year,
+                                   annual_demand=annual_demand)
 
     def get_spec_el_cost(self, type, year, annual_demand):
         """
@@ -222,51 +241,29 @@ class Market(Price.Prices):
             Building type. Options:
             - 'res' - Residential
             - 'ind' - Industrial / Non-residential
-        year : int
+        year : int or array-like
             Reference year. Options:
             (2010, 2011, 2012, 2013, 2014, 2015, 2016)
-        annual_demand : float
+        annual_demand : float or array-like
             Annual electricity energy demand in kWh/a
 
         Returns
         -------
-        spec_cost_el : float
-            Specific cost of gas in Euro/kWh
+        spec_cost_el : float or np.array
+            Specific cost of electricity in Euro/kWh (array, if year or
+            annual_demand is array)
         """
-        list_of_years = [2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018]
-        assert year in list_of_years, 'Year must be in list_of_years!'
 
-        if year == 2017 or year == 2018:
-            msg = 'Year 2017 is chosen. However, prices are only available' \
-                  ' for 2016!'
-            warnings.warn(msg)
-            year = 2016
-
-        #  Find column index according to year
-        year_index = list_of_years.index(year)  # Find year index in list
-        column = year_index + 2  # Skip two columns with demand data
-
-        if type == 'res' or type == 'ind':
-            if type == 'res':  # Residential
-                el_price_data = self.el_price_data_res
-            elif type == 'ind':  # Industrial
-                el_price_data = self.el_price_data_ind
-            # Find row index according to demand
-            max_demand_column = el_price_data[:, [1]]
-            for i in range(len(max_demand_column)):
-                #  If annual_demand is smaller than max demand value in data
-                if annual_demand < max_demand_column[i]:
-                    row = i  # Return row index
-                    break
-                else:  # index of last row
-                    row = len(max_demand_column) - 1
-
-            spec_cost_gas = el_price_data[row][column]
+        if type == 'res':  # Residential
+            el_price_data = self.el_price_data_res
+        elif type == 'ind':  # Industrial
+            el_price_data = self.el_price_data_ind
         else:
             raise ValueError('Chosen type for method get_spec_el_cost is ' +
                              'unknown. Select "res" or "ind".')
 
-        return spec_cost_gas
+        return self._get_spec_cost(price_data=el_price_data, year=year,
+                                   annual_demand=annual_demand)
 
 
 if __name__ == '__main__':
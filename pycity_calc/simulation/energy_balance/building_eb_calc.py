@@ -1135,6 +1135,9 @@ def calc_build_therm_eb(build, soc_init=0.8, boiler_full_pl=True,
     elif has_tes and has_hp:
         #  Use heat pump with thermal storage to cover space heating demand
 
+        #  Cached COP profile of heat pump (one value per timestep)
+        array_cop = build.bes.heatpump.get_cop_array()
+
         #  Loop over power values
         for i in range(len(sh_p_array)):
 
@@ -1194,6 +1197,7 @@ def calc_build_therm_eb(build, soc_init=0.8, boiler_full_pl=True,
                     hp.calc_hp_all_results(
                         control_signal=q_nom_hp,
                         t_source=temp_source,
+                        cop=array_cop[i],
                         time_index=i)
 
                     sh_pow_remain -= q_nom_hp
@@ -1210,12 +1214,14 @@ def calc_build_therm_eb(build, soc_init=0.8, boiler_full_pl=True,
                         hp.calc_hp_all_results(
                             control_signal=0,
                             t_source=temp_source,
+                            cop=array_cop[i],
                             time_index=i)
                     else:
                         #  HP can operate in part load
                         hp.calc_hp_all_results(
                             control_signal=sh_pow_remain,
                             t_source=temp_source,
+                            cop=array_cop[i],
                             time_index=i)
 
                         sh_pow_remain = 0
@@ -1367,6 +1373,7 @@ def calc_build_therm_eb(build, soc_init=0.8, boiler_full_pl=True,
                     hp.calc_hp_all_results(
                         control_signal=q_nom_hp,
                         t_source=temp_source,
+                        cop=array_cop[i],
                         time_index=i)
 
                     if sh_pow_remain > q_nom_hp:
@@ -1392,12 +1399,14 @@ def calc_build_therm_eb(build, soc_init=0.8, boiler_full_pl=True,
                         hp.calc_hp_all_results(
                             control_signal=0,
                             t_source=temp_source,
+                            cop=array_cop[i],
                             time_index=i)
                     else:
                         #  HP can operate in part load
                         hp.calc_hp_all_results(
                             control_signal=sh_pow_remain + q_tes_in_remain,
                             t_source=temp_source,
+                            cop=array_cop[i],
                             time_index=i)
 
                         sh_pow_remain = 0
@@ -1535,6 +1544,7 @@ def calc_build_therm_eb(build, soc_init=0.8, boiler_full_pl=True,
                     hp.calc_hp_all_results(
                         control_signal=q_nom_hp,
                         t_source=temp_source,
+                        cop=array_cop[i],
                         time_index=i)
 
                     if sh_pow_remain > q_nom_hp:
@@ -1558,12 +1568,14 @@ def calc_build_therm_eb(build, soc_init=0.8, boiler_full_pl=True,
                         hp.calc_hp_all_results(
                             control_signal=0,
                             t_source=temp_source,
+                            cop=array_cop[i],
                             time_index=i)
                     else:
                         #  HP can operate in part load
                         hp.calc_hp_all_results(
                             control_signal=sh_pow_remain + q_tes_in_max,
                             t_source=temp_source,
+                            cop=array_cop[i],
                             time_index=i)
 
                         sh_pow_remain = 0
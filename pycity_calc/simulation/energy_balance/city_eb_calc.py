@@ -11,16 +11,6 @@ import pickle
 import warnings
 import numpy as np
 import networkx as nx
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.patches import Patch
-from matplotlib.lines import Line2D
-
-try:
-    from matplotlib2tikz import save as tikz_save
-except:
-    msg = 'Could not import matplotlib2tikz'
-    warnings.warn(msg)
 
 import pycity_calc.simulation.energy_balance.check_eb_requ as check_eb
 import pycity_calc.toolbox.networks.network_ops as netop
@@ -84,6 +74,507 @@ def get_list_lhn_build_without_th_esys(city, list_buildings=None):
     return list_no_th_esys
 
 
+def get_build_eb_results(build):
+    """
+    Returns energy balance results of building, e.g. to return results of
+    worker processes without building and environment objects.
+
+    Parameters
+    ----------
+    build : object
+        Building object of pyCity_calc holding energy balance results
+
+    Returns
+    -------
+    dict_res : dict
+        Dict with keys 'bes' and 'dict_el_eb_res'. dict_res['bes'] holds
+        energy system attribute names of bes as keys and dicts with all
+        attributes of energy system objects (except environment) as values.
+        dict_res['dict_el_eb_res'] holds dict_el_eb_res of building (or None)
+    """
+
+    dict_res = {'bes': {},
+                'dict_el_eb_res': getattr(build, 'dict_el_eb_res', None)}
+
+    if build.hasBes:
+        for (key, device) in build.bes.__dict__.items():
+            if key == 'environment' or not hasattr(device, '__dict__'):
+                continue
+            dict_res['bes'][key] = {}
+            for (attr, val) in device.__dict__.items():
+                if attr != 'environment':
+                    dict_res['bes'][key][attr] = val
+
+    return dict_res
+
+
+def get_build_eb_input(build):
+    """
+    Returns input data of energy balance of building (load curves and
+    energy system parameters), e.g. to submit jobs to worker processes
+    without building and environment objects.
+
+    Parameters
+    ----------
+    build : object
+        Building object of pyCity_calc
+
+    Returns
+    -------
+    dict_input : dict
+        Dict with keys 'sh', 'dhw', 'el' (space heating, hot water and
+        electric power curves in W), 'dhw_dem' (annual hot water demand in
+        kWh) and 'bes'. dict_input['bes'] is None for buildings without bes.
+        Else, it holds tuple (bes class, dict with attributes of bes), where
+        energy system objects are replaced by tuples (class, dict with all
+        attributes except environment).
+    """
+
+    dict_input = {'sh': build.get_space_heating_power_curve(),
+                  'dhw': build.get_dhw_power_curve(),
+                  'el': build.get_electric_power_curve(),
+                  'dhw_dem': build.get_annual_dhw_demand(),
+                  'bes': None}
+
+    if build.hasBes:
+        dict_bes = {}
+        for (key, val) in build.bes.__dict__.items():
+            if key == 'environment':
+                continue
+            if hasattr(val, '__dict__'):
+                dict_attr = {}
+                for (attr, attr_val) in val.__dict__.items():
+                    if attr != 'environment':
+                        dict_attr[attr] = attr_val
+                val = (val.__class__, dict_attr)
+            dict_bes[key] = val
+        dict_input['bes'] = (build.bes.__class__, dict_bes)
+
+    return dict_input
+
+
+def _get_eb_environment(environment):
+    """
+    Returns copy of environment, which only holds attributes used by energy
+    balance of buildings (timer, weather and ground temperature)
+    """
+
+    env = environment.__class__.__new__(environment.__class__)
+
+    for attr in ['_kind', 'timer', 'weather', 'location', 'temp_ground']:
+        if hasattr(environment, attr):
+            setattr(env, attr, getattr(environment, attr))
+
+    return env
+
+
+def _new_with_attr(cls, dict_attr, environment):
+    """
+    Returns new object of class cls with attributes of dict_attr and
+    environment
+    """
+
+    obj = cls.__new__(cls)
+    obj.__dict__.update(dict_attr)
+    obj.environment = environment
+
+    return obj
+
+
+class EbBuilding(object):
+    """
+    Building stand-in for energy balance calculation in worker processes.
+    Holds load curves and energy systems of building (see
+    get_build_eb_input).
+    """
+
+    def __init__(self, dict_input, environment):
+        """
+        Constructor of EbBuilding
+
+        Parameters
+        ----------
+        dict_input : dict
+            Input data of energy balance of building (see get_build_eb_input)
+        environment : object
+            Environment object (see _get_eb_environment)
+        """
+
+        self.environment = environment
+
+        self._sh_power = dict_input['sh']
+        self._dhw_power = dict_input['dhw']
+        self._el_power = dict_input['el']
+        self._dhw_dem = dict_input['dhw_dem']
+
+        self.hasBes = dict_input['bes'] is not None
+
+        if self.hasBes:
+            (bes_class, dict_bes) = dict_input['bes']
+            dict_attr = {}
+            for (key, val) in dict_bes.items():
+                if isinstance(val, tuple):
+                    val = _new_with_attr(cls=val[0], dict_attr=val[1],
+                                         environment=environment)
+                dict_attr[key] = val
+            self.bes = _new_with_attr(cls=bes_class, dict_attr=dict_attr,
+                                      environment=environment)
+
+    def get_space_heating_power_curve(self):
+        return self._sh_power
+
+    def get_dhw_power_curve(self):
+        return self._dhw_power
+
+    def get_electric_power_curve(self):
+        return self._el_power
+
+    def get_annual_dhw_demand(self):
+        return self._dhw_dem
+
+
+def merge_build_eb_results(build, build_res):
+    """
+    Merge energy balance results of building copy (e.g. returned by worker
+    process) into original building object. Copies all attributes of
+    energy system objects (except environment) and dict_el_eb_res.
+
+    Parameters
+    ----------
+    build : object
+        Building object of pyCity_calc (within city)
+    build_res : object or dict
+        Building object of pyCity_calc holding energy balance results or
+        results dict of building (see get_build_eb_results)
+    """
+
+    if build_res is build:
+        return
+
+    if not isinstance(build_res, dict):
+        build_res = get_build_eb_results(build_res)
+
+    if build.hasBes:
+        for (key, dict_attr) in build_res['bes'].items():
+            device = getattr(build.bes, key)
+            for (attr, val) in dict_attr.items():
+                setattr(device, attr, val)
+
+    if build_res['dict_el_eb_res'] is not None:
+        build.dict_el_eb_res = build_res['dict_el_eb_res']
+
+
+def calc_single_build_eb(build, id, eeg_pv_limit=False):
+    """
+    Calculate thermal and electric energy balance of stand-alone building
+    (not connected to energy networks).
+
+    Parameters
+    ----------
+    build : object
+        Building object of pyCity_calc
+    id : int
+        Building node id
+    eeg_pv_limit : bool, optional
+        Defines, if EEG PV feed-in limitation of 70 % of peak load is
+        active (default: False)
+
+    Returns
+    -------
+    build : object
+        Building object holding energy balance results
+    """
+
+    print()
+    print('########################################################')
+    print('Process stand-alone building with id: ', id)
+
+    #  Calculate single building thermal energy balance
+    beb.calc_build_therm_eb(build=build, id=id)
+
+    #  Calculate single building electrical energy balance
+    beb.calc_build_el_eb(build=build, eeg_pv_limit=eeg_pv_limit)
+
+    return build
+
+
+def calc_multi_build_eb(list_ids, list_build, eeg_pv_limit=False,
+                        th_eb=True, environment=None):
+    """
+    Calculate energy balances of multiple, independent buildings (e.g. as
+    job of worker process). Only results are returned (without building and
+    environment objects).
+
+    Parameters
+    ----------
+    list_ids : list (of ints)
+        List of building node ids
+    list_build : list (of objects or dicts)
+        List of building objects of pyCity_calc or input dicts of buildings
+        (see get_build_eb_input)
+    eeg_pv_limit : bool, optional
+        Defines, if EEG PV feed-in limitation of 70 % of peak load is
+        active (default: False)
+    th_eb : bool, optional
+        Defines, if thermal energy balance should be calculated before
+        electric energy balance (default: True). If False, only electric
+        energy balance is calculated (e.g. for LHN connected buildings,
+        which have already been processed with LHN energy balance)
+    environment : object, optional
+        Environment object of buildings (default: None). Required, if
+        list_build holds input dicts.
+
+    Returns
+    -------
+    list_res : list (of dicts)
+        List of results dicts of buildings (see get_build_eb_results)
+    """
+
+    list_res = []
+
+    for (n, build) in zip(list_ids, list_build):
+        if isinstance(build, dict):
+            build = EbBuilding(dict_input=build, environment=environment)
+
+        if th_eb:
+            calc_single_build_eb(build=build, id=n,
+                                 eeg_pv_limit=eeg_pv_limit)
+        else:
+            beb.calc_build_el_eb(build=build, eeg_pv_limit=eeg_pv_limit)
+
+        list_res.append(get_build_eb_results(build))
+
+    return list_res
+
+
+def calc_multi_build_eb_parallel(list_ids, list_build, executor,
+                                 eeg_pv_limit=False, th_eb=True,
+                                 nb_build_per_job=None):
+    """
+    Calculate energy balances of independent buildings in worker processes
+    and merge results into building objects
+
+    Parameters
+    ----------
+    list_ids : list (of ints)
+        List of building node ids
+    list_build : list (of objects)
+        List of building objects of pyCity_calc
+    executor : object
+        concurrent.futures executor (e.g. ProcessPoolExecutor)
+    eeg_pv_limit : bool, optional
+        Defines, if EEG PV feed-in limitation of 70 % of peak load is
+        active (default: False)
+    th_eb : bool, optional
+        Defines, if thermal energy balance should be calculated before
+        electric energy balance (default: True)
+    nb_build_per_job : int, optional
+        Number of buildings per worker job (default: None). If None,
+        buildings are split into about four jobs per CPU.
+
+    Notes
+    -----
+    Jobs only hold load curves and energy system parameters of buildings
+    (see get_build_eb_input) and one copy of timer and weather data per job.
+    """
+
+    if len(list_ids) == 0:
+        return
+
+    if nb_build_per_job is None:
+        nb_cpu = os.cpu_count() or 1
+        nb_build_per_job = int(np.ceil(len(list_ids) / (4 * nb_cpu)))
+
+    environment = _get_eb_environment(list_build[0].environment)
+
+    list_futures = []
+    for i in range(0, len(list_ids), nb_build_per_job):
+        list_input = [get_build_eb_input(build)
+                      for build in list_build[i:i + nb_build_per_job]]
+        list_futures.append(executor.submit(
+            calc_multi_build_eb, list_ids[i:i + nb_build_per_job],
+            list_input, eeg_pv_limit, th_eb, environment))
+
+    list_res = []
+    for future in list_futures:
+        list_res.extend(future.result())
+
+    for (build, build_res) in zip(list_build, list_res):
+        merge_build_eb_results(build=build, build_res=build_res)
+
+
+def _calc_lhn_subcity_th_eb_worker(dict_input, list_no_th_esys, list_th_esys,
+                                   dict_lhn_data, timestep, environment):
+    """
+    Worker function of calc_lhn_subcity_th_eb, which takes input dicts of
+    buildings (see get_build_eb_input) and returns results dicts of
+    buildings (see get_build_eb_results) instead of building objects
+    """
+
+    dict_build = {}
+    for n in dict_input:
+        dict_build[n] = EbBuilding(dict_input=dict_input[n],
+                                   environment=environment)
+
+    (pump_energy, list_th_esys, dict_build) = \
+        calc_lhn_subcity_th_eb(dict_build=dict_build,
+                               list_no_th_esys=list_no_th_esys,
+                               list_th_esys=list_th_esys,
+                               dict_lhn_data=dict_lhn_data,
+                               timestep=timestep)
+
+    dict_res = {}
+    for n in dict_build:
+        dict_res[n] = get_build_eb_results(dict_build[n])
+
+    return (pump_energy, list_th_esys, dict_res)
+
+
+def calc_lhn_subcity_th_eb(dict_build, list_no_th_esys, list_th_esys,
+                           dict_lhn_data, timestep):
+    """
+    Calculate thermal energy balance of single LHN subcity. Thermal power of
+    buildings without own thermal energy supply plus network losses are
+    covered by feeder buildings (buildings with CHP first).
+
+    Parameters
+    ----------
+    dict_build : dict
+        Dict holding building node ids as keys and building objects as values
+    list_no_th_esys : list (of ints)
+        List of building ids without own thermal energy supply
+    list_th_esys : list (of ints)
+        List of building ids with own thermal energy supply (feeders)
+    dict_lhn_data : dict
+        Dict holding LHN parameters with keys 'temp_vl', 'temp_rl', 'c_p',
+        'rho', 'u_value', 'lhn_len', 'temp_env', 'u_val_unc', 'loss_buff',
+        'press_loss' and 'eta_pump'
+    timestep : int
+        Timestep in seconds
+
+    Returns
+    -------
+    res_tuple : tuple
+        Results tuple (pump_energy, list_th_esys, dict_build)
+        pump_energy : float
+            Pump energy of LHN in kWh/a
+        list_th_esys : list (of ints)
+            List of feeder building ids in processing order
+        dict_build : dict
+            Dict holding building node ids as keys and building objects
+            (with energy balance results) as values
+    """
+
+    print()
+    print('########################################################')
+    print('Process LHN network with buildings: ')
+    print(list_no_th_esys + list_th_esys)
+    print()
+
+    print('Buildings within LHN network without thermal energy '
+          'supply:')
+    print(list_no_th_esys)
+
+    print('Buildings within LHN network with feeder supply:')
+    print(list_th_esys)
+    print()
+
+    #  Sum up thermal energy demand of all buildings without own th.
+    #  supply system
+    th_lhn_power = np.zeros(int(365 * 24 * 3600 / timestep))
+
+    for n in list_no_th_esys:
+        build = dict_build[n]
+
+        th_lhn_power += build.get_space_heating_power_curve()
+        th_lhn_power += build.get_dhw_power_curve()
+
+    # Get maximum thermal power of buildings (without esys
+    q_dot_max_buildings = max(th_lhn_power)
+
+    temp_vl = dict_lhn_data['temp_vl']
+    temp_rl = dict_lhn_data['temp_rl']
+    temp_env = dict_lhn_data['temp_env']
+    lhn_len = dict_lhn_data['lhn_len']
+
+    print('Total LHN network length in m: ')
+    print(round(lhn_len, 0))
+    print()
+
+    #  Estimate heat pipe losses per timestep, where LHN is used
+    #  ###########################################################
+    q_lhn_loss_if = dict_lhn_data['u_val_unc'] * dict_lhn_data['u_value'] \
+                    * lhn_len * (temp_vl - temp_env)
+    q_lhn_loss_rf = dict_lhn_data['u_val_unc'] * dict_lhn_data['u_value'] \
+                    * lhn_len * (temp_rl - temp_env)
+
+    #  Sum up loss powers and use rescaling factor
+    q_lhn_loss = dict_lhn_data['loss_buff'] * (q_lhn_loss_if + q_lhn_loss_rf)
+
+    q_dot_max = q_dot_max_buildings + q_lhn_loss
+
+    print('Total heating power loss of LHN in kW:')
+    print(round(q_lhn_loss / 1000, 2))
+    print()
+
+    #  Add LHN losses to total thermal power demand
+    #  (when LHN is active)
+    lhn_active = th_lhn_power > 0
+    th_lhn_power[lhn_active] += q_lhn_loss
+
+    # Add LHN electric power demand for pumps
+    #  ##########################################################
+    #  Estimate total pressure loss
+    delta_p_total = dict_lhn_data['press_loss'] * lhn_len  # in Pa
+
+    #  Estimate mass flow rate in kg/s
+    m_dot = q_dot_max / (dict_lhn_data['c_p'] * (temp_vl - temp_rl))
+
+    #  Estimate pump power
+    p_pump = delta_p_total * m_dot / (dict_lhn_data['rho']
+                                      * dict_lhn_data['eta_pump'])
+
+    #  Estimate pump energy (convert from Joule to kWh)
+    pump_energy = p_pump * timestep * np.count_nonzero(lhn_active) \
+                  / (1000 * 3600)
+
+    print('Estimated pump energy in kWh/a:')
+    print(round(pump_energy, ndigits=2))
+
+    #  Hand over network energy demand to feeder node buildings
+    #  and solve thermal energy balance
+    #  ##########################################################
+
+    th_lhn_power_remain = th_lhn_power.copy()
+
+    #  Sort list_th_esys (CHP systems first)
+    list_th_esys_copy = []
+    for n in list_th_esys:
+        if dict_build[n].bes.hasChp:
+            list_th_esys_copy.insert(0, n)
+        else:
+            list_th_esys_copy.append(n)
+
+    list_th_esys = list_th_esys_copy
+
+    for n in list_th_esys:
+        #  Solve thermal energy balance for single building with
+        #  remaining LHN power demand
+        beb.calc_build_therm_eb(build=dict_build[n],
+                                id=n,
+                                th_lhn_pow_rem=th_lhn_power_remain)
+
+    array_uncovered = np.where(np.abs(th_lhn_power_remain) > 0.001)[0]
+    if len(array_uncovered) > 0:
+        i = array_uncovered[0]
+        msg = 'Could not cover LHN thermal energy demand of' \
+              ' ' + str(int(th_lhn_power_remain[i])) + ' Watt' \
+              ' for timestep ' + str(i) + '.'
+        raise beb.EnergyBalanceException(msg)
+
+    return (pump_energy, list_th_esys, dict_build)
+
+
 class CityEBCalculator(object):
     """
     City Energy Balance Calculator class. Used to perform energy balance
@@ -236,9 +727,66 @@ class CityEBCalculator(object):
         self._list_no_th_esys = \
             get_list_lhn_build_without_th_esys(city=self.city)
 
+    def _get_lhn_data(self, ref_id, list_lhn_build_ids):
+        """
+        Extract LHN pipe data and network length of LHN subcity
+
+        Parameters
+        ----------
+        ref_id : int
+            Id of building node, which is used to extract pipe data
+        list_lhn_build_ids : list (of ints)
+            List of building ids within LHN subcity
+
+        Returns
+        -------
+        dict_lhn_data : dict
+            Dict holding LHN parameters (temp_vl, temp_rl, c_p, rho,
+            u_value, lhn_len, temp_env, loss_buff, press_loss, eta_pump)
+        """
+
+        dict_lhn_data = None
+
+        # Identify neighbors of first building
+        for n in nx.neighbors(G=self.city, n=ref_id):
+
+            edge = self.city.edges[ref_id, n]
+
+            if (edge.get('network_type') in ['heating', 'heating_and_deg']
+                    and 'temp_vl' in edge):
+                #  Extract lhn data
+                dict_lhn_data = {'temp_vl': edge['temp_vl'],
+                                 'temp_rl': edge['temp_rl'],
+                                 'c_p': edge['c_p'],
+                                 'rho': edge['rho'],
+                                 #  Estimate u-value of pipe in W/mK
+                                 'u_value': dimnet.estimate_u_value(
+                                     edge['d_i'])}
+                break
+
+        if dict_lhn_data is None:
+            msg = 'Could not find network of type heating or network' \
+                  ' does not have temp_vl as attribute!'
+            raise AssertionError(msg)
+
+        # Get LHN network length (sum up weights)
+        lhn_len = 0
+        for tup_lhn in self.city.edges(nbunch=list_lhn_build_ids,
+                                       data='weight'):
+            lhn_len += tup_lhn[2]
+
+        dict_lhn_data['lhn_len'] = lhn_len
+        #  Get ground temperature as LHN losses reference temperature
+        dict_lhn_data['temp_env'] = self.city.environment.temp_ground
+        dict_lhn_data['loss_buff'] = self.loss_buff
+        dict_lhn_data['press_loss'] = self.press_loss
+        dict_lhn_data['eta_pump'] = self.eta_pump
+
+        return dict_lhn_data
+
     def calc_lhn_energy_balance(self, run_mc=False, dict_samples_const=None,
                                 run_idx=None, sampling_method=None,
-                                dict_city_sample_lhc=None):
+                                dict_city_sample_lhc=None, executor=None):
         """
         Calculate thermal energy balance for LHN connected buildings
 
@@ -267,6 +815,10 @@ class CityEBCalculator(object):
             Dict holding city parameter names as keys and numpy arrays with
             samples as dict values (default: None). Only
             relevant if mc_run is True and sampling_method == 'lhc'
+        executor : object, optional
+            concurrent.futures executor (e.g. ProcessPoolExecutor) to solve
+            independent LHN subcities in parallel (default: None). If None,
+            LHN subcities are processed sequentially.
 
         Returns
         -------
@@ -320,57 +872,26 @@ class CityEBCalculator(object):
         # Add weights to edges
         netop.add_weights_to_edges(graph=self.city)
 
-        list_pump_energy = []
+        timestep = self.city.environment.timer.timeDiscretization
+
+        set_no_th_esys = set(self._list_no_th_esys)
+
+        list_jobs = []
 
         #  Loop over subcities
         for list_lhn_build_ids in self._list_lists_lhn_ids_build:
 
-            print()
-            print('########################################################')
-            print('Process LHN network with buildings: ')
-            print(list_lhn_build_ids)
-            print()
-
             #  Start with buildings without own thermal energy supply units
             #  Identify all buildings in list_lhn_build_ids, which do
             #  not have own thermal energy supply
             list_no_th_esys = []
             list_th_esys = []
             for n in list_lhn_build_ids:
-                if n in self._list_no_th_esys:
+                if n in set_no_th_esys:
                     list_no_th_esys.append(n)
                 else:
                     list_th_esys.append(n)
 
-            print('Buildings within LHN network without thermal energy '
-                  'supply:')
-            print(list_no_th_esys)
-
-            print('Buildings within LHN network with feeder supply:')
-            print(list_th_esys)
-            print()
-
-            timestep = self.city.environment.timer.timeDiscretization
-
-            #  Sum up thermal energy demand of all buildings without own th.
-            #  supply system
-            th_lhn_power = np.zeros(int(365 * 24 * 3600 / timestep))
-
-            for n in list_no_th_esys:
-                build = self.city.nodes[n]['entity']
-
-                th_lhn_power += build.get_space_heating_power_curve()
-                th_lhn_power += build.get_dhw_power_curve()
-
-                self.list_th_done.append(n)
-
-            # Get maximum thermal power of buildings (without esys
-            q_dot_max_buildings = max(th_lhn_power)
-
-            # Estimate energy network losses
-            #  ###########################################################
-            #  Get lhn network temperatures, env. temperature and diameter
-
             #  TODO: Implement better way to extract LHN pipe data instead of
             #  TODO: Choosing from first node
 
@@ -380,137 +901,48 @@ class CityEBCalculator(object):
             else:
                 ref_id = list_th_esys[0]
 
-            # Identify neighbors of first building
-            list_neighb = nx.neighbors(G=self.city, n=ref_id)
-
-            temp_vl = None
-
-            #  Extract data
-            for n in list_neighb:
-
-                if 'network_type' in self.city.edges[ref_id, n]:
-
-                    if (self.city.edges[ref_id, n]['network_type'] == 'heating'
-                            or self.city.edges[ref_id, n][
-                                'network_type'] == 'heating_and_deg'):
-                        #  Extract lhn data
-                        temp_vl = self.city.edges[ref_id, n]['temp_vl']
-                        temp_rl = self.city.edges[ref_id, n]['temp_rl']
-                        d_i = self.city.edges[ref_id, n]['d_i']
-                        rho = self.city.edges[ref_id, n]['rho']
-                        c_p = self.city.edges[ref_id, n]['c_p']
-
-                        #  Estimate u-value of pipe in W/mK
-                        u_value = dimnet.estimate_u_value(d_i)
-                        break
-
-            if temp_vl is None:
-                msg = 'Could not find network of type heating or network' \
-                      ' does not have temp_vl as attribute!'
-                raise AssertionError(msg)
-
-            # Get LHN network length
-            list_lhn_weights = \
-                list(self.city.edges(nbunch=list_lhn_build_ids, data='weight'))
-
-            #  Sum up weights to get total network lenght
-            lhn_len = 0
-            for tup_lhn in list_lhn_weights:
-                lhn_len += tup_lhn[2]
-
-            print('Total LHN network length in m: ')
-            print(round(lhn_len, 0))
-            print()
-
-            #  Estimate heat pipe losses per timestep, where LHN is used
-            #  ###########################################################
-
-            #  Get ground temperature as LHN losses reference temperature
-            temp_env = self.city.environment.temp_ground
+            dict_lhn_data = self._get_lhn_data(
+                ref_id=ref_id, list_lhn_build_ids=list_lhn_build_ids)
+            dict_lhn_data['u_val_unc'] = u_val_unc
 
-            q_lhn_loss_if = u_val_unc * u_value * lhn_len * \
-                            (temp_vl - temp_env)
-            q_lhn_loss_rf = u_val_unc * u_value * lhn_len * \
-                            (temp_rl - temp_env)
-
-            #  Sum up loss powers and use rescaling factor
-            q_lhn_loss = self.loss_buff * (q_lhn_loss_if + q_lhn_loss_rf)
-
-            q_dot_max = q_dot_max_buildings + q_lhn_loss
-
-            print('Total heating power loss of LHN in kW:')
-            print(round(q_lhn_loss / 1000, 2))
-            print()
-
-            #  Add LHN losses to total thermal power demand
-            #  (when LHN is active)
-            for i in range(len(th_lhn_power)):
-                if th_lhn_power[i] > 0:
-                    th_lhn_power[i] += q_lhn_loss
+            dict_build = {}
+            for n in list_lhn_build_ids:
+                dict_build[n] = self.city.nodes[n]['entity']
 
-            # Add LHN electric power demand for pumps
-            #  ##########################################################
-            #  Estimate total pressure loss
-            delta_p_total = self.press_loss * lhn_len  # in Pa
+            list_jobs.append((dict_build, list_no_th_esys, list_th_esys,
+                              dict_lhn_data, timestep))
 
-            #  Estimate mass flow rate in kg/s
-            m_dot = q_dot_max / (c_p * (temp_vl - temp_rl))
+        if executor is None:
+            list_res = [calc_lhn_subcity_th_eb(*job) for job in list_jobs]
+        else:
+            #  LHN subcities are independent of each other
+            environment = _get_eb_environment(self.city.environment)
+            list_futures = []
+            for job in list_jobs:
+                dict_input = {}
+                for n in job[0]:
+                    dict_input[n] = get_build_eb_input(job[0][n])
+                list_futures.append(executor.submit(
+                    _calc_lhn_subcity_th_eb_worker, dict_input, job[1],
+                    job[2], job[3], job[4], environment))
+            list_res = [future.result() for future in list_futures]
 
-            #  Estimate pump power
-            p_pump = delta_p_total * m_dot / (rho * self.eta_pump)
+        list_pump_energy = []
 
-            pump_energy = 0
-            #  Estimate pump energy
-            for i in range(len(th_lhn_power)):
-                if th_lhn_power[i] > 0:
-                    pump_energy += p_pump * timestep
+        for (job, res) in zip(list_jobs, list_res):
+            (pump_energy, list_th_esys, dict_build_res) = res
 
-            # Convert pump energy from Joule to kWh
-            pump_energy /= (1000 * 3600)
+            #  Merge results (if processed in separate process)
+            for n in dict_build_res:
+                merge_build_eb_results(build=job[0][n],
+                                       build_res=dict_build_res[n])
 
-            print('Estimated pump energy in kWh/a:')
-            print(round(pump_energy, ndigits=2))
+            self.list_th_done.extend(job[1])
+            self.list_th_done.extend(list_th_esys)
 
             #  Append pump energy list
             list_pump_energy.append(pump_energy)
 
-            #  Hand over network energy demand to feeder node buildings
-            #  and solve thermal energy balance
-            #  ##########################################################
-
-            th_lhn_power_remain = copy.deepcopy(th_lhn_power)
-
-            #  Sort list_th_esys (CHP systems first)
-            list_th_esys_copy = []
-            for n in list_th_esys:
-                build = self.city.nodes[n]['entity']
-
-                if build.bes.hasChp:
-                    list_th_esys_copy.insert(0, n)
-                else:
-                    list_th_esys_copy.append(n)
-
-            list_th_esys = list_th_esys_copy
-
-            for n in list_th_esys:
-                build = self.city.nodes[n]['entity']
-
-                #  Solve thermal energy balance for single building with
-                #  remaining LHN power demand
-                beb.calc_build_therm_eb(build=build,
-                                        id=n,
-                                        th_lhn_pow_rem=th_lhn_power_remain)
-
-                self.list_th_done.append(n)
-
-            for i in range(len(th_lhn_power_remain)):
-                if abs(th_lhn_power_remain[i]) > 0.001:
-                    msg = 'Could not cover LHN thermal energy demand of' \
-                          ' ' + str(int(th_lhn_power_remain[i])) + ' Watt' \
-                                                                   ' for timestep ' + str(
-                        i) + '.'
-                    raise beb.EnergyBalanceException(msg)
-
         # Save list pump energy on energy balance object
         self.list_pump_energy = list_pump_energy
 
@@ -520,8 +952,8 @@ class CityEBCalculator(object):
                                  dict_samples_const=None,
                                  run_idx=None, eeg_pv_limit=False,
                                  sampling_method=None,
-                                 dict_city_sample_lhc=None
-                                 ):
+                                 dict_city_sample_lhc=None,
+                                 executor=None, nb_build_per_job=None):
         """
         Calculate energy balance of whole city. Save results on city object
 
@@ -555,6 +987,17 @@ class CityEBCalculator(object):
             Dict holding city parameter names as keys and numpy arrays with
             samples as dict values (default: None). Only
             relevant if mc_run is True and sampling_method == 'lhc'
+        executor : object, optional
+            concurrent.futures executor (e.g. ProcessPoolExecutor) to solve
+            stand-alone buildings, independent LHN subcities and electric
+            energy balances of LHN connected buildings in parallel
+            (default: None). If None, buildings and subcities are processed
+            sequentially. Worker processes only return energy balance
+            results, which are merged into the city.
+        nb_build_per_job : int, optional
+            Number of buildings per worker job (default: None), see
+            calc_multi_build_eb_parallel. Only relevant, if executor is
+            not None.
         """
 
         if run_mc and sampling_method is 'random':
@@ -586,22 +1029,25 @@ class CityEBCalculator(object):
         self.list_el_done = []
 
         #  Loop over buildings, which are not connected to energy networks
+        list_single_build = []
         for n in self._list_single_build:
-            print()
-            print('########################################################')
-            print('Process stand-alone building with id: ', n)
+            list_single_build.append(self.city.nodes[n]['entity'])
 
-            building = self.city.nodes[n]['entity']
-
-            #  Calculate single building thermal energy balance
-            beb.calc_build_therm_eb(build=building, id=n)
-
-            self.list_th_done.append(n)
-
-            #  Calculate single building electrical energy balance
-            beb.calc_build_el_eb(build=building, eeg_pv_limit=eeg_pv_limit)
+        if executor is None:
+            for (n, building) in zip(self._list_single_build,
+                                     list_single_build):
+                calc_single_build_eb(build=building, id=n,
+                                     eeg_pv_limit=eeg_pv_limit)
+        else:
+            #  Stand-alone buildings are independent of each other
+            calc_multi_build_eb_parallel(list_ids=self._list_single_build,
+                                         list_build=list_single_build,
+                                         executor=executor,
+                                         eeg_pv_limit=eeg_pv_limit,
+                                         nb_build_per_job=nb_build_per_job)
 
-            self.list_el_done.append(n)
+        self.list_th_done.extend(self._list_single_build)
+        self.list_el_done.extend(self._list_single_build)
 
         # LHN energy balance
         #  ################################################################
@@ -610,7 +1056,8 @@ class CityEBCalculator(object):
                                      dict_samples_const=dict_samples_const,
                                      run_idx=run_idx,
                                      sampling_method=sampling_method,
-                                     dict_city_sample_lhc=dict_city_sample_lhc)
+                                     dict_city_sample_lhc=dict_city_sample_lhc,
+                                     executor=executor)
 
         #  Make flat lists with all buildings in LHN and DEG networks
         list_lhn_all_b = []
@@ -626,18 +1073,26 @@ class CityEBCalculator(object):
 
         # Solve electric energy balance for buildings with LHN connection
         #  which are not connected to DEG
-        for n in list_lhn_all_b:
-            if n not in list_deg_all_b:
+        set_deg_all_b = set(list_deg_all_b)
+        list_lhn_el = [n for n in list_lhn_all_b if n not in set_deg_all_b]
+
+        if executor is None:
+            for n in list_lhn_el:
                 build = self.city.nodes[n]['entity']
 
                 beb.calc_build_el_eb(build=build, eeg_pv_limit=eeg_pv_limit)
 
-                self.list_el_done.append(n)
+        else:
+            calc_multi_build_eb_parallel(
+                list_ids=list_lhn_el,
+                list_build=[self.city.nodes[n]['entity'] for n in list_lhn_el],
+                executor=executor, eeg_pv_limit=eeg_pv_limit, th_eb=False,
+                nb_build_per_job=nb_build_per_job)
 
-                #  Electrical energy balance of subcity (deg subcities)
-                #  TODO: Implement DEG energy balance
+        self.list_el_done.extend(list_lhn_el)
 
-                #  Share with deg
+        #  Electrical energy balance of subcity (deg subcities)
+        #  TODO: Implement DEG energy balance
 
         # Control check, if all buildings have been processed
         list_buildings = copy.deepcopy(
@@ -1189,6 +1644,11 @@ class CityEBCalculator(object):
             Defines, if coverage factors should be printed (default: True)
         """
 
+        import matplotlib.pyplot as plt
+        import matplotlib.patches as mpatches
+        from matplotlib.patches import Patch
+        from matplotlib.lines import Line2D
+
         #  Extract data for stacked bar no. 1
         list_th_energy = []
 
@@ -1535,8 +1995,14 @@ class CityEBCalculator(object):
             plt.savefig(path_svg, format='svg', dpi=dpi)
 
             if save_tikz:
-                tikz_save(path_tikz, figureheight='\\figureheight',
-                          figurewidth='\\figurewidth')
+                try:
+                    from matplotlib2tikz import save as tikz_save
+
+                    tikz_save(path_tikz, figureheight='\\figureheight',
+                              figurewidth='\\figurewidth')
+                except ImportError:
+                    msg = 'Could not import matplotlib2tikz'
+                    warnings.warn(msg)
 
         plt.close()
 
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Pytest script for ba_clustering
+"""
+from __future__ import division
+
+import networkx as nx
+import shapely.geometry.point as point
+
+import pycity_calc.toolbox.clustering.ba_clustering as bacl
+
+
+class TestBaClustering(object):
+
+    def gen_graph_and_building_list(self, list_b_pos, list_str_pos):
+
+        graph = nx.Graph()
+        building_list = []
+
+        for i in range(len(list_b_pos)):
+            graph.add_node(i, position=point.Point(list_b_pos[i]))
+            graph.add_node(100 + i, position=point.Point(list_str_pos[i]))
+            building_list.append([i, 0, 0, 0, graph.nodes[i]['position'],
+                                  100 + i])
+
+        return graph, building_list
+
+    def test_disjoint_set(self):
+
+        dis_set = bacl.DisjointSet(5)
+        dis_set.union(0, 1)
+        dis_set.union(3, 4)
+        dis_set.union(1, 4)
+
+        assert dis_set.find(0) == dis_set.find(3)
+        assert dis_set.find(2) == 2
+        assert dis_set.find(2) != dis_set.find(0)
+
+    def test_grouping_street(self):
+
+        list_b_pos = [(0, 10), (5, 10), (50, 10), (8, -10), (100, 10)]
+        list_str_pos = [(0, 0), (5, 0), (50, 0), (12, 0), (100, 0)]
+
+        graph, building_list = \
+            self.gen_graph_and_building_list(list_b_pos, list_str_pos)
+
+        groups = bacl.grouping(graph, building_list, d_neighbor=10,
+                               mode='street')
+
+        assert [[b[0] for b in g] for g in groups] == [[0, 1, 3], [2], [4]]
+
+    def test_grouping_building(self):
+
+        list_b_pos = [(0, 10), (5, 10), (50, 10), (8, -10), (100, 10)]
+        list_str_pos = [(0, 0), (5, 0), (50, 0), (12, 0), (100, 0)]
+
+        graph, building_list = \
+            self.gen_graph_and_building_list(list_b_pos, list_str_pos)
+
+        groups = bacl.grouping(graph, building_list, d_neighbor=10,
+                               mode='building')
+
+        assert [[b[0] for b in g] for g in groups] == [[0, 1], [2], [3], [4]]
+
+    def test_find_closest_streets(self):
+
+        graph = nx.Graph()
+        graph.add_node(0, position=point.Point(0, 0))
+        graph.add_node(1, position=point.Point(100, 0))
+        graph.add_node(2, position=point.Point(100, 100))
+        streetedges = [(0, 1), (1, 2)]
+
+        building_list = [[10, 0, 0, 0, point.Point(20, 5)],
+                         [11, 0, 0, 0, point.Point(90, 60)],
+                         [12, 0, 0, 0, point.Point(-10, -10)]]
+
+        list_idx, x_min, y_min = \
+            bacl.find_closest_streets(building_list, graph, streetedges)
+
+        assert list(list_idx) == [0, 1, 0]
+        assert list(x_min) == [20, 100, 0]
+        assert list(y_min) == [0, 60, 0]
@@ -6,6 +6,8 @@ Test script for BatteryExtended class
 from __future__ import division
 from decimal import *
 
+import numpy as np
+
 import pycity_calc.energysystems.chp as Chp
 import pycity_calc.economic.energy_sys_cost.chp_cost as chp_cost
 
@@ -291,3 +293,37 @@ class Test_Chp():
         nb_switch = chp.calc_nb_on_off_switching()
 
         assert nb_switch == 8
+
+    def test_op_calc_all_results_array(self, fixture_chp_th, fixture_chp_el):
+        """
+        Test checks, if array versions of th_op_calc_all_results and
+        el_op_calc_all_results return same results as scalar versions
+        """
+
+        #  Negative, below part load, part load, nominal and above nominal
+        array_ratio = np.array([-0.1, 0, 0.3, 0.7, 1, 1.5])
+
+        for (chp, nominal, calc_scalar, calc_array) in \
+                [(fixture_chp_th, fixture_chp_th.qNominal,
+                  fixture_chp_th.th_op_calc_all_results,
+                  fixture_chp_th.th_op_calc_all_results_array),
+                 (fixture_chp_el, fixture_chp_el.pNominal,
+                  fixture_chp_el.el_op_calc_all_results,
+                  fixture_chp_el.el_op_calc_all_results_array)]:
+
+            control_signals = array_ratio * nominal
+
+            list_res = [calc_scalar(control_signals[i], time_index=i)
+                        for i in range(len(control_signals))]
+
+            (th_power, el_power, fuel_power) = \
+                calc_array(control_signals, time_index=10)
+
+            assert np.allclose(th_power, [res[0] for res in list_res])
+            assert np.allclose(el_power, [res[1] for res in list_res])
+            assert np.allclose(fuel_power, [res[2] for res in list_res])
+
+            #  Results are saved with offset time_index
+            assert np.allclose(chp.totalQOutput[10:16], th_power)
+            assert np.allclose(chp.array_fuel_power[10:16],
+                               chp.array_fuel_power[0:6])
@@ -156,3 +156,34 @@ class Test_City():
         assert abs(city.get_total_annual_th_demand(nodelist=[1001, 1002]) - 2 *
                    (ref_energy + 13000)) \
                / (2 * (ref_energy + 13000)) <= 0.001
+
+    def test_edge_index(self, fixture_environment):
+
+        city = cit.City(environment=fixture_environment)
+
+        for i in range(5):
+            city.add_node(i, position=point.Point(i, 0))
+
+        city.add_edge(0, 1, network_type='heating')
+        city.add_edges_from([(1, 2), (3, 4)], network_type='electricity')
+        city.add_edge(2, 3, network_type='street')
+
+        assert sorted(city.get_edges_of_network_type('electricity')) == \
+               [(1, 2), (3, 4)]
+        assert city.get_nodes_of_network_type(['heating', 'street']) == \
+               {0, 1, 2, 3}
+
+        #  Overwrite network_type of existing edge
+        city.add_edge(2, 1, network_type='heating_and_deg')
+        assert city.get_edges_of_network_type('electricity') == [(3, 4)]
+        assert len(city.get_edges_of_network_type('heating_and_deg')) == 1
+
+        city.remove_edge(0, 1)
+        assert city.get_edges_of_network_type('heating') == []
+
+        city.remove_node(4)
+        assert city.get_edges_of_network_type('electricity') == []
+
+        index_before = dict(city._edge_net_type)
+        city.rebuild_edge_index()
+        assert city._edge_net_type == index_before
@@ -8,6 +8,7 @@ from __future__ import division
 import os
 import copy
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 import shapely.geometry.point as point
 
 import pycity_base.classes.supply.BES as BES
@@ -803,3 +804,87 @@ class TestCityEnergyBalance():
         energy_balance.calc_co2_emissions()
 
         #  ##################################################################
+
+    def test_city_eb_with_executor(self, fixture_city):
+        """
+        Compare sequential city energy balance with energy balance, which
+        solves stand-alone buildings and LHN subcities in worker processes
+        """
+
+        city = copy.deepcopy(fixture_city)
+
+        timestep = city.environment.timer.timeDiscretization
+        nb_timesteps = int(365 * 24 * 3600 / timestep)
+
+        list_pos = [(0, 0), (50, 0), (0, 500), (50, 500), (500, 500)]
+        list_feeder = [True, False, True, False, True]
+
+        for i in range(len(list_pos)):
+            building = build.BuildingExtended(environment=city.environment)
+            apartment = Apartment.Apartment(environment=city.environment)
+            building.addEntity(apartment)
+
+            building.apartments[0].demandSpaceheating.loadcurve = \
+                np.ones(nb_timesteps) * (3000 + 1000 * i)
+            building.apartments[0].power_el.loadcurve = \
+                np.ones(nb_timesteps) * 500
+
+            if list_feeder[i]:
+                boiler = boil.BoilerExtended(environment=city.environment,
+                                             q_nominal=20000, eta=1)
+                bes = BES.BES(environment=city.environment)
+                bes.addDevice(boiler)
+                building.addEntity(bes)
+
+            city.add_extended_building(extended_building=building,
+                                       position=point.Point(list_pos[i]))
+
+        #  Two separate LHN subcities and one stand-alone building
+        dimnet.add_lhn_to_city(city=city, list_build_node_nb=[1001, 1002])
+        dimnet.add_lhn_to_city(city=city, list_build_node_nb=[1003, 1004])
+
+        city_eb_seq = cityeb.CityEBCalculator(city=copy.deepcopy(city))
+        city_eb_seq.calc_city_energy_balance()
+
+        city_eb_par = cityeb.CityEBCalculator(city=city)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            city_eb_par.calc_city_energy_balance(executor=executor,
+                                                 nb_build_per_job=1)
+
+        #  Worker results do not hold environment
+        dict_res = cityeb.get_build_eb_results(city.nodes[1005]['entity'])
+        assert 'environment' not in dict_res['bes']
+        assert 'environment' not in dict_res['bes']['boiler']
+
+        #  Worker jobs only hold load curves and energy system parameters
+        dict_input = cityeb.get_build_eb_input(city.nodes[1005]['entity'])
+        (bes_class, dict_bes) = dict_input['bes']
+        assert 'environment' not in dict_bes
+        assert 'environment' not in dict_bes['boiler'][1]
+        assert np.allclose(dict_input['sh'], 7000)
+
+        assert len(city_eb_par.list_pump_energy) == 2
+        assert np.allclose(city_eb_seq.list_pump_energy,
+                           city_eb_par.list_pump_energy)
+
+        for n in [1001, 1003, 1005]:
+            build_seq = city_eb_seq.city.nodes[n]['entity']
+            build_par = city.nodes[n]['entity']
+
+            #  Results are merged into original building objects
+            assert build_par.environment is city.environment
+            assert np.allclose(build_seq.bes.boiler.totalQOutput,
+                               build_par.bes.boiler.totalQOutput)
+            assert max(build_par.bes.boiler.totalQOutput) > 0
+
+        #  Electric energy balance of all buildings (incl. LHN connected)
+        for n in range(1001, 1006):
+            build_seq = city_eb_seq.city.nodes[n]['entity']
+            build_par = city.nodes[n]['entity']
+            assert np.allclose(build_seq.dict_el_eb_res['grid_import_dem'],
+                               build_par.dict_el_eb_res['grid_import_dem'])
+
+        fe_seq = city_eb_seq.calc_final_energy_balance_city()
+        fe_par = city_eb_par.calc_final_energy_balance_city()
+        for key in fe_seq:
+            assert abs(fe_seq[key] - fe_par[key]) <= 0.001
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Pytest script for city_visual
+"""
+from __future__ import division
+
+import os
+import numpy as np
+import shapely.geometry.point as point
+
+import pycity_calc.visualization.city_visual as citvis
+
+from pycity_calc.test.pycity_calc_fixtures import fixture_environment, \
+    fixture_city, fixture_building, fixture_apartment, fixture_th_demand, \
+    fixture_el_demand
+
+
+class TestCityVisual(object):
+
+    def test_thin_segments(self):
+
+        segments = np.array([[[0.1, 0.1], [0.4, 0.2]],  # Within one cell
+                             [[0.2, 0.2], [1.5, 0.5]],
+                             [[1.2, 0.7], [0.8, 0.1]],  # Duplicate
+                             [[0.5, 0.5], [0.5, 2.5]]])
+
+        segments_thin = citvis.thin_segments(segments, lod_dist=1)
+
+        assert segments_thin.shape == (2, 2, 2)
+        assert np.allclose(segments_thin[0], [[0.5, 0.5], [0.5, 2.5]])
+        assert np.allclose(segments_thin[1], [[0.5, 0.5], [1.5, 0.5]])
+
+        pos_thin = citvis.thin_positions(np.array([[0.1, 0.1], [0.9, 0.2],
+                                                   [2.1, 0.1]]), lod_dist=1)
+
+        assert np.allclose(pos_thin, [[0.5, 0.5], [2.5, 0.5]])
+
+    def test_plot_city_district_fast(self, fixture_city, fixture_building,
+                                     tmpdir):
+
+        fixture_city.add_extended_building(extended_building=fixture_building,
+                                           position=point.Point(0, 0))
+
+        list_str = []
+        for i in range(4):
+            list_str.append(fixture_city.add_street_node(
+                position=point.Point(10 + 20 * i, 5)))
+        for i in range(3):
+            fixture_city.add_edge(list_str[i], list_str[i + 1],
+                                  network_type='street')
+
+        (nodelist, pos_array) = citvis.get_pos_array(fixture_city,
+                                                     nodelist=list_str)
+
+        assert nodelist == list_str
+        assert np.allclose(pos_array[:, 0], [10, 30, 50, 70])
+
+        segments = citvis.get_edge_segments(fixture_city,
+                                            [(list_str[0], list_str[1])])
+
+        assert np.allclose(segments, [[[10, 5], [30, 5]]])
+
+        assert citvis.get_street_nodes_in_dist(fixture_city, max_dist=35) \
+               == list_str[:2]
+
+        save_path = os.path.join(str(tmpdir), 'city.png')
+
+        for lod_dist in [None, 'auto']:
+            fig = citvis.plot_city_district_fast(city=fixture_city,
+                                                 plot_str_dist=35,
+                                                 lod_dist=lod_dist,
+                                                 save_path=save_path,
+                                                 auto_close=True)
+
+            assert os.path.isfile(save_path)
+            assert len(fig.axes[0].collections) == 3
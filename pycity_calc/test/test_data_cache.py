@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Pytest script for data_cache
+"""
+from __future__ import division
+
+import os
+import numpy as np
+
+import pycity_calc.environments.data_cache as dcache
+
+
+class TestDataCache(object):
+
+    def test_load_data_file(self, tmpdir):
+
+        path_data = os.path.join(str(tmpdir), 'data')
+        path_cache = os.path.join(str(tmpdir), 'cache')
+        os.makedirs(path_data)
+
+        path = os.path.join(path_data, 'data.txt')
+        np.savetxt(path, np.array([[1, 2], [3, 4]]), delimiter='\t',
+                   header='Header')
+
+        dcache.clear_cache()
+
+        #  Without cache directory, no sidecar file is written
+        array = dcache.load_data_file(path, delimiter='\t', skip_header=1)
+        assert np.array_equal(array, [[1, 2], [3, 4]])
+        assert os.listdir(path_data) == ['data.txt']
+        assert not os.path.isdir(path_cache)
+
+        #  Returned arrays are copies of cached data
+        array[0, 0] = 10
+        array = dcache.load_data_file(path, delimiter='\t', skip_header=1)
+        assert array[0, 0] == 1
+
+        #  Sidecar file is written to cache directory
+        dcache.clear_cache()
+        array = dcache.load_data_file(path, delimiter='\t', skip_header=1,
+                                      path_cache=path_cache)
+        assert os.listdir(path_data) == ['data.txt']
+        list_sidecars = [name for name in os.listdir(path_cache)
+                         if name.endswith('.cache.npy')]
+        assert len(list_sidecars) == 1
+
+        #  New process (cleared cache) loads sidecar file
+        dcache.clear_cache()
+        array = dcache.load_data_file(path, delimiter='\t', skip_header=1,
+                                      path_cache=path_cache)
+        assert np.array_equal(array, [[1, 2], [3, 4]])
+
+        dcache.clear_cache(path_cache=path_cache)
+        assert not any(name.endswith('.cache.npy')
+                       for name in os.listdir(path_cache))
@@ -6,10 +6,41 @@
 from __future__ import division
 
 import os
+import copy
+import warnings
+import numpy as np
+import pytest
+import shapely.geometry.point as point
+from concurrent.futures import ThreadPoolExecutor
 
 import pycity_calc.toolbox.data_enrichment.occupants.enrich_input_file as en_in_file
 import pycity_calc.cities.scripts.city_generator.city_generator as citgen
 import pycity_calc.toolbox.data_enrichment.enrich_app_occ_and_retrofit as eaor
+import pycity_calc.toolbox.data_enrichment.retrofit_state.estimate_retrofit \
+    as estretro
+import pycity_calc.toolbox.teaser_usage.teaser_use as teas_use
+
+from pycity_calc.test.pycity_calc_fixtures import fixture_environment, \
+    fixture_city, fixture_detailed_building
+
+
+def fake_vdi6007(exbuild, add_th_load, t_set_heat, t_night, **kwargs):
+    """
+    Replaces VDI 6007 simulation of teaser_use with constant space heating
+    power, which depends on mod_year and t_night
+    """
+
+    timestep = exbuild.environment.timer.timeDiscretization
+    nb_timesteps = int(365 * 24 * 3600 / timestep)
+
+    q_heat = np.ones(nb_timesteps) * \
+             ((2030 - exbuild.mod_year) * 100 + t_night)
+
+    if add_th_load:
+        estretro._add_sh_curve_to_building(exbuild, q_heat)
+
+    return (None, q_heat, None, None)
+
 
 class Test_DataEnrich():
 
@@ -131,3 +162,101 @@ class Test_DataEnrich():
 
             eaor.est_mod_year(district_data=district_data,
                               environment=environment)
+
+    def test_search_closest_retro_year(self):
+
+        list_years = [1977, 1982, 1995, 2002, 2009, 2014]
+        dict_dem = {1977: 300, 1982: 250, 1995: 200, 2002: 150, 2009: 100,
+                    2014: 50}
+
+        list_called = []
+
+        def calc_sh_dem(retro_year):
+            list_called.append(retro_year)
+            return dict_dem[retro_year]
+
+        for sh_ann_demand in [0, 49, 120, 125, 130, 260, 1000]:
+            (year_lin, dict_lin) = \
+                estretro.search_closest_retro_year(list_years, sh_ann_demand,
+                                                   calc_sh_dem,
+                                                   search_mode='linear')
+
+            del list_called[:]
+
+            (year_ord, dict_ord) = \
+                estretro.search_closest_retro_year(list_years, sh_ann_demand,
+                                                   calc_sh_dem,
+                                                   search_mode='ordered')
+
+            assert year_lin == year_ord
+            assert len(list_called) <= 4
+
+        (year, dict_sh) = estretro.search_closest_retro_year([], 100,
+                                                              calc_sh_dem)
+        assert year is None
+
+    def test_retrofit_surrogate(self):
+
+        class DummyBuilding(object):
+            def __init__(self):
+                self.build_type = 0
+                self.build_year = 1960
+                self.net_floor_area = 100
+
+        surrogate = estretro.RetrofitSurrogate()
+
+        building = DummyBuilding()
+
+        assert surrogate.has_surface(building) is False
+
+        surrogate.add_surface(building,
+                              dict_spec_dem={1977: 200, 1995: 150, 2014: 50})
+
+        assert surrogate.has_surface(building)
+
+        assert surrogate.estimate_retro_year(building, 16000) == 1995
+
+        building_2 = DummyBuilding()
+        building_2.net_floor_area = 400
+        assert surrogate.estimate_retro_year(building_2, 16000) == 2014
+
+    def test_estimate_city_retrofit_with_executor(
+            self, fixture_city, fixture_detailed_building, monkeypatch):
+
+        monkeypatch.setattr(teas_use, 'calc_th_load_build_vdi6007_ex_build',
+                            fake_vdi6007)
+
+        city = copy.deepcopy(fixture_city)
+        for i in range(2):
+            building = copy.deepcopy(fixture_detailed_building)
+            city.add_extended_building(extended_building=building,
+                                       position=point.Point(0, 10 * i))
+        city.nodes[1002]['entity'].build_year = None
+
+        city_seq = estretro.estimate_city_retrofit(city=city,
+                                                   overwrite_sh=True,
+                                                   t_night=15)
+
+        with warnings.catch_warnings(record=True) as list_warn:
+            warnings.simplefilter('always')
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                city_par = estretro.estimate_city_retrofit(
+                    city=city, overwrite_sh=True, t_night=15,
+                    executor=executor)
+
+        assert any('No build_year found' in str(warn.message)
+                   for warn in list_warn)
+
+        for n in [1001, 1002]:
+            build_seq = city_seq.nodes[n]['entity']
+            build_par = city_par.nodes[n]['entity']
+
+            assert build_par.build_year == build_seq.build_year
+            assert build_par.mod_year == build_seq.mod_year
+            assert np.allclose(build_par.get_space_heating_power_curve(),
+                               build_seq.get_space_heating_power_curve())
+            #  Space heating curve has been regenerated with t_night
+            assert build_par.get_space_heating_power_curve()[0] == \
+                   pytest.approx((2030 - build_par.mod_year) * 100 + 15)
+
+        assert city_par.nodes[1002]['entity'].build_year == 1920
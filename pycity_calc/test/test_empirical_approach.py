@@ -5,6 +5,7 @@ from __future__ import division
 
 import os
 import copy
+from concurrent.futures import ProcessPoolExecutor
 
 import networkx as nx
 import shapely.geometry.point as point
@@ -24,7 +25,7 @@ import pycity_calc.toolbox.dimensioning.emp_approach.dim_devices as dev
 
 from pycity_calc.test.pycity_calc_fixtures import fixture_building, \
     fixture_environment, fixture_city, fixture_apartment, fixture_th_demand, \
-    fixture_el_demand
+    fixture_el_demand, fixture_detailed_building
 
 class empirical_approach():
     def test_run_approach(self):
@@ -427,3 +428,62 @@ class empirical_approach():
         assert dev.get_bafa_subs_hp(q_nom=20, spf=4) == 1300
         assert dev.get_bafa_subs_hp(q_nom=40, spf=4) == 1600
 
+
+class TestRunApproach(object):
+    def test_run_approach_with_executor(self, fixture_city,
+                                        fixture_detailed_building):
+        """
+        Compare sequential scenario evaluation with evaluation of scenarios
+        in worker processes
+        """
+
+        for i in range(3):
+            fixture_city.add_extended_building(
+                extended_building=copy.deepcopy(fixture_detailed_building),
+                position=point.Point(0, 20 * i))
+
+        scenarios = [{'type': ['centralized', 'decentralized'],
+                      'base': ['boiler'], 'peak': ['']},
+                     {'type': ['decentralized'], 'base': ['hp_air'],
+                      'peak': ['boiler']},
+                     {'type': ['decentralized'], 'base': ['hp_geo'],
+                      'peak': ['']}]
+
+        shared_data = emp.get_shared_data(city=fixture_city)
+
+        assert shared_data['dhn_elig'] == 3
+        assert shared_data['building_age'] == 'old'
+        assert shared_data['lhn_th_LDC_orig'][0] == \
+               max(shared_data['lhn_th_curve_orig'])
+
+        list_seq = emp.run_approach(city=fixture_city, scenarios=scenarios)
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            list_par = emp.run_approach(city=fixture_city,
+                                        scenarios=scenarios,
+                                        executor=executor)
+
+        assert len(list_seq) == len(list_par) == 4
+
+        #  Input city is not changed
+        for n in fixture_city.nodelist_building:
+            assert not fixture_city.nodes[n]['entity'].hasBes
+
+        #  Centralized boiler scenario with lhn
+        assert len(list_seq[0].edges()) == len(list_par[0].edges()) == 2
+
+        for (city_seq, city_par) in zip(list_seq, list_par):
+            for n in fixture_city.nodelist_building:
+                build_seq = city_seq.nodes[n]['entity']
+                build_par = city_par.nodes[n]['entity']
+
+                assert build_seq.hasBes == build_par.hasBes
+
+                if build_seq.hasBes:
+                    for attr in ['hasBoiler', 'hasHeatpump',
+                                 'hasElectricalHeater', 'hasTes']:
+                        assert getattr(build_seq.bes, attr) == \
+                               getattr(build_par.bes, attr)
+
+        assert list_seq[2].nodes[1001]['entity'].bes.heatpump.qNominal == \
+               list_par[2].nodes[1001]['entity'].bes.heatpump.qNominal
@@ -27,6 +27,12 @@ class Test_GermanMarket():
         assert gmarket.get_sub_chp_self(p_nom=99000) == 0.03
         assert gmarket.get_sub_chp_self(p_nom=110000) == 0
 
+        array_sub = gmarket.get_sub_chp(p_nom=[49000, 50000, 90000, 2100000])
+        assert list(array_sub) == [0.08, 0.08, 0.06, 0.031]
+
+        array_sub = gmarket.get_sub_chp_self(p_nom=[49000, 99000, 110000])
+        assert list(array_sub) == [0.04, 0.03, 0]
+
     def test_pv_subsidies(self):
         gmarket = germanmarket.GermanMarket()
 
@@ -37,6 +43,9 @@ class Test_GermanMarket():
         assert gmarket.get_sub_pv(pv_peak_load=99000, is_res=True) == 0.1028
         assert gmarket.get_sub_pv(pv_peak_load=99000, is_res=False) == 0.0818
 
+        array_sub = gmarket.get_sub_pv(pv_peak_load=[9000, 39000, 99000])
+        assert list(array_sub) == [0.1183, 0.115, 0.1028]
+
     def test_get_eeg_payments(self):
         gmarket = germanmarket.GermanMarket()
 
@@ -4,6 +4,8 @@
 Test script for BoilerExtended class
 """
 from __future__ import division
+import numpy as np
+
 import pycity_calc.energysystems.heatPumpSimple as hp
 
 from pycity_calc.test.pycity_calc_fixtures import fixture_environment
@@ -126,3 +128,53 @@ class Test_heatPumpSimple():
         p_el_in = heatpump.calc_hp_el_power_input(control_signal,
                                                   t_source=t_source)
         assert p_el_in == 2000
+
+    def test_cop_array(self, fixture_environment):
+        heatpump = hp.heatPumpSimple(environment=fixture_environment,
+                                     q_nominal=10000,
+                                     hp_type='aw',
+                                     t_sink=45)
+
+        temp = fixture_environment.weather.tAmbient
+
+        cop = heatpump.get_cop_array()
+
+        assert len(cop) == len(temp)
+        for i in range(0, len(temp), 97):
+            assert cop[i] == \
+                heatpump.calc_hp_cop_with_quality_grade(temp_source=temp[i])
+
+        #  Cached profile is reused
+        assert heatpump.get_cop_array() is cop
+
+        #  Changed sink temperature leads to recalculation
+        heatpump.t_sink = 35
+        cop_35 = heatpump.get_cop_array()
+        assert cop_35 is not cop
+        assert cop_35[0] == \
+            heatpump.calc_hp_cop_with_quality_grade(temp_source=temp[0])
+
+    def test_calc_hp_all_results_array(self, fixture_environment):
+        heatpump = hp.heatPumpSimple(environment=fixture_environment,
+                                     q_nominal=10000,
+                                     hp_type='aw',
+                                     t_sink=45,
+                                     lower_activation_limit=0.5)
+
+        control_signals = np.array([-1000, 0, 2000, 6000, 10000, 12000])
+        t_source = np.array([0, 5, 10, 20, 30, 50])
+
+        (th_power, el_power) = \
+            heatpump.calc_hp_all_results_array(control_signals,
+                                               t_source=t_source,
+                                               time_index=10)
+
+        for i in range(len(control_signals)):
+            (th_ref, el_ref) = heatpump.calc_hp_all_results(
+                control_signals[i], t_source=t_source[i], time_index=i)
+
+            assert th_power[i] == th_ref
+            assert abs(el_power[i] - el_ref) < 1e-9
+
+        assert np.allclose(heatpump.totalQOutput[10:16], th_power)
+        assert np.allclose(heatpump.array_el_power_in[10:16], el_power)
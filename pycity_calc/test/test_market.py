@@ -3,6 +3,8 @@
 Pytest file for market class
 """
 from __future__ import division
+import numpy as np
+
 import pycity_calc.environments.market as mark
 from pycity_calc.test.pycity_calc_fixtures import fixture_market
 
@@ -43,3 +45,22 @@ class Test_Market(object):
         spec_cost = fixture_market.get_spec_el_cost(type='ind', year=year,
                                                      annual_demand=ind_demand)
         assert spec_cost == 0.1297
+
+    def test_price_arrays(self, fixture_market):
+
+        array_demand = np.array([3000, 15000, 300000])
+
+        array_cost = fixture_market.get_spec_gas_cost(type='res', year=2012,
+                                                      annual_demand=
+                                                      array_demand)
+
+        for i in range(len(array_demand)):
+            assert array_cost[i] == \
+                   fixture_market.get_spec_gas_cost(type='res', year=2012,
+                                                    annual_demand=
+                                                    array_demand[i])
+
+        array_cost = fixture_market.get_spec_el_cost(type='res',
+                                                     year=[2010, 2012],
+                                                     annual_demand=3000)
+        assert array_cost[1] == 0.2676
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Pytest script for mc_convergence
+"""
+from __future__ import division
+
+import numpy as np
+
+import pycity_calc.toolbox.mc_helpers.mc_convergence as mcconv
+
+
+class TestMcConvergence(object):
+
+    def test_calc_run_stats(self):
+
+        array_res = np.array([1, 2, 3, 4, 5])
+
+        dict_stats = mcconv.calc_run_stats(array_res, confidence=0.95,
+                                           quantiles=(0.5,))
+
+        assert dict_stats['mean'] == 3
+        assert abs(dict_stats['std'] - np.sqrt(2.5)) < 1e-12
+        #  t(0.975, 4) = 2.776
+        assert abs(dict_stats['ci_half_width']
+                   - 2.776445 * np.sqrt(2.5) / np.sqrt(5)) < 1e-5
+        assert dict_stats['rel_ci_width'] == dict_stats['ci_half_width'] / 3
+        assert dict_stats['quantiles'][0] == 3
+
+        dict_stats = mcconv.calc_run_stats(np.zeros(3))
+        assert dict_stats['rel_ci_width'] == 0
+
+    def run_monitor(self, conv_monitor, array_res, list_failed_runs=[]):
+
+        dict_mc_res = {'annuity': array_res}
+
+        conv_monitor.start()
+
+        for i in range(len(array_res)):
+            if conv_monitor.check(dict_mc_res=dict_mc_res, nb_runs=i + 1,
+                                  list_failed_runs=list_failed_runs):
+                break
+
+        return conv_monitor.nb_runs
+
+    def test_monitor_convergence(self):
+
+        np.random.seed(1)
+        array_res = np.random.normal(loc=1000, scale=100, size=10000)
+
+        conv_monitor = mcconv.McConvergenceMonitor(list_keys=['annuity'],
+                                                   rel_tol=0.01,
+                                                   min_runs=20,
+                                                   check_interval=10)
+
+        nb_runs = self.run_monitor(conv_monitor, array_res)
+
+        #  Approx. (1.96 * 0.1 / 0.01) ** 2 = 384 runs required
+        assert conv_monitor.converged
+        assert conv_monitor.stop_reason == 'converged'
+        assert 200 < nb_runs < 700
+        assert nb_runs % 10 == 0
+        assert len(conv_monitor.list_trace) == nb_runs // 10
+
+        (array_nb_runs, array_width) = \
+            conv_monitor.get_trace_array('annuity')
+        assert array_nb_runs[-1] == nb_runs
+        assert array_width[-1] <= 0.01
+        assert array_width[-2] > 0.01
+
+        #  Failed runs are not taken into account
+        array_res[:50] = 0
+        conv_monitor.start()
+        self.run_monitor(conv_monitor, array_res,
+                         list_failed_runs=list(range(50)))
+        assert conv_monitor.list_trace[-1]['nb_valid'] == \
+               conv_monitor.nb_runs - 50
+        assert conv_monitor.list_trace[-1]['annuity']['mean'] > 900
+
+    def test_monitor_quantiles_and_budget(self):
+
+        np.random.seed(2)
+        array_res = np.random.lognormal(size=5000)
+
+        conv_monitor = mcconv.McConvergenceMonitor(list_keys=['annuity'],
+                                                   rel_tol=None,
+                                                   quantile_tol=0.01,
+                                                   check_interval=50)
+
+        nb_runs = self.run_monitor(conv_monitor, array_res)
+
+        assert conv_monitor.converged
+        assert nb_runs < 5000
+        assert conv_monitor.list_trace[-1]['annuity']['quant_change'] <= 0.01
+
+        #  Exhausted time budget
+        conv_monitor = mcconv.McConvergenceMonitor(list_keys=['annuity'],
+                                                   rel_tol=1e-9,
+                                                   time_budget=0)
+
+        nb_runs = self.run_monitor(conv_monitor, array_res)
+
+        assert nb_runs == 1
+        assert not conv_monitor.converged
+        assert conv_monitor.stop_reason == 'time_budget'
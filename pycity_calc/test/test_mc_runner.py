@@ -6,6 +6,7 @@ Script to test mc_runner.py McRunner class
 from __future__ import division
 
 import os
+import numpy as np
 
 import pycity_calc.toolbox.mc_helpers.mc_runner as mcrun
 import pycity_calc.toolbox.modifiers.mod_city_esys_size as modesys
@@ -271,6 +272,25 @@ class TestMcRunner():
                                prevent_printing=False,
                                sampling_method='random')
 
+        #  Random sampling design is reproducible with seed
+        (dict_const_1, dict_esys_1) = \
+            mc_run.perform_sampling(nb_runs=3, save_samples=False, seed=1)
+        (dict_const_2, dict_esys_2) = \
+            mc_run.perform_sampling(nb_runs=3, save_samples=False, seed=1)
+
+        for key in ['interest', 'ch_cap', 'temp_ground', 'lhn_inv']:
+            assert len(dict_const_1['city'][key]) == 3
+            assert np.allclose(dict_const_1['city'][key],
+                               dict_const_2['city'][key])
+
+        for n in mc_run._list_build_ids:
+            assert np.allclose(dict_const_1[str(n)]['sh_dem'],
+                               dict_const_2[str(n)]['sh_dem'])
+            for dev in dict_esys_1[str(n)].keys():
+                for key in dict_esys_1[str(n)][dev].keys():
+                    assert np.allclose(dict_esys_1[str(n)][dev][key],
+                                       dict_esys_2[str(n)][dev][key])
+
     def test_perform_mc_run2(self):
         this_path = os.path.dirname(os.path.abspath(__file__))
 
@@ -523,3 +543,14 @@ class TestMcRunner():
                                do_sampling=True,
                                prevent_printing=False,
                                sampling_method='lhc')
+
+        #  Run latin hypercube sampling with study engine
+        engine = mc_run.gen_study_engine(failure_tolerance=1)
+
+        (array_values, dict_res, list_failed) = \
+            engine.run_sampling(nb_samples=2, seed=1)
+
+        assert array_values.shape == (2, len(engine.registry))
+        assert engine.nb_evals == 2
+        for key in dict_res.keys():
+            assert len(dict_res[key]) == 2
@@ -5,7 +5,10 @@
 """
 from __future__ import division
 
+import os
 import copy
+import pickle
+import pytest
 import numpy as np
 import shapely.geometry.point as point
 
@@ -13,6 +16,7 @@ import pycity_calc.cities.city as city
 import pycity_calc.toolbox.mc_helpers.building.build_unc_set_gen as mcbuild
 import pycity_calc.toolbox.mc_helpers.user.user_unc_sampling as mcuse
 import pycity_calc.toolbox.mc_helpers.weather.gen_weather_set as mcweat
+import pycity_calc.toolbox.mc_helpers.weather.weather_ensemble as weaens
 import pycity_calc.toolbox.mc_helpers.city.city_sampling as citsamp
 import pycity_calc.toolbox.mc_helpers.esys.esyssampling as esyssamp
 import pycity_calc.toolbox.mc_helpers.demand_unc_single_build as mc_build
@@ -367,6 +371,46 @@ class Test_MC_Sampling():
         assert min(list_wea[0].tAmbient) >= -25
         assert max(list_wea[0].tAmbient) <= 50
 
+    def test_gen_weather_ensemble(self, tmpdir):
+
+        dict_weather = mcweat.get_warm_cold_regular_weather()
+
+        array_factors = np.array([0, 1, -1, 0.4, -0.3])
+
+        path = os.path.join(str(tmpdir), 'weather_ensemble.npy')
+
+        ensemble = mcweat.calc_lin_ipl_ensemble(weath_dict=dict_weather,
+                                                array_factors=array_factors,
+                                                path=path)
+
+        assert len(ensemble) == 5
+        assert ensemble.array.shape == (5, 8760, 3)
+
+        #  Same results as interpolation of single weather objects
+        for i in range(len(array_factors)):
+            weather_ref = mcweat.calc_lin_ipl_weath(weath_dict=dict_weather,
+                                                    factor=array_factors[i])
+            for attr in ['tAmbient', 'qDirect', 'qDiffuse']:
+                assert np.array_equal(getattr(ensemble[i], attr),
+                                      getattr(weather_ref, attr))
+
+        #  Weather views share base weather data and cannot be modified
+        weather = ensemble[3]
+        assert weather.vWind is ensemble.base_weather.vWind
+        with pytest.raises(ValueError):
+            weather.tAmbient[0] = 0
+        with pytest.raises(IndexError):
+            ensemble.get_weather(5)
+
+        #  Pickled memory-mapped ensemble only holds path
+        ensemble_load = pickle.loads(pickle.dumps(ensemble))
+        assert ensemble_load.array is not None
+        assert np.array_equal(ensemble_load.get_values(4, 'qDirect'),
+                              ensemble.get_values(4, 'qDirect'))
+
+        ensemble_list = weaens.WeatherEnsemble.from_weathers(list(ensemble))
+        assert np.array_equal(ensemble_list.array, ensemble.array)
+
     def test_run_mc_sh_uncertain_single_building(self,
                                                  fixture_detailed_building):
 
@@ -579,6 +623,22 @@ class Test_MC_Sampling():
         assert len(list_array_heat) == nb_samples
         assert len(list_array_heat[0]) == 1
 
+        #  Samples are reproducible with seed
+        assert np.allclose(citsamp.sample_interest(nb_samples, seed=1),
+                           citsamp.sample_interest(nb_samples, seed=1))
+
+        list_heat_1 = citsamp.\
+            sample_list_sum_heat_on_arrays(nb_samples,
+                                           array_ratio_on=array_ratio_on,
+                                           list_b_ids=list_b_ids, seed=1)
+        list_heat_2 = citsamp.\
+            sample_list_sum_heat_on_arrays(nb_samples,
+                                           array_ratio_on=array_ratio_on,
+                                           list_b_ids=list_b_ids, seed=1)
+
+        for i in range(nb_samples):
+            assert np.array_equal(list_heat_1[i], list_heat_2[i])
+
     def test_esys_sampling(self):
 
         nb_samples = 2
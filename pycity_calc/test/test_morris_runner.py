@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Pytest script for morris_runner
+"""
+from __future__ import division
+
+import os
+import copy
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+import shapely.geometry.point as point
+
+import pycity_base.classes.supply.BES as BES
+import pycity_base.classes.demand.Apartment as Apartment
+
+import pycity_calc.buildings.building as build
+import pycity_calc.energysystems.boiler as boil
+import pycity_calc.environments.germanmarket as gmarket
+import pycity_calc.economic.annuity_calculation as annu
+import pycity_calc.economic.city_economic_calc as citecon
+import pycity_calc.simulation.energy_balance.city_eb_calc as citeb
+import pycity_calc.toolbox.dimensioning.dim_networks as dimnet
+import pycity_calc.toolbox.mc_helpers.study_engine as stueng
+import pycity_calc.toolbox.mc_helpers.morris_runner as morrun
+
+from pycity_calc.test.pycity_calc_fixtures import fixture_environment, \
+    fixture_city
+
+
+class StagedObject(object):
+    """
+    Simple study object with economic factor and two building values
+    """
+
+    def __init__(self):
+        self.factor = 1
+        self.dict_build = {1: 1, 2: 1}
+        self.dict_eb = {}
+
+
+class StagedEvaluator(object):
+    """
+    Evaluator of StagedObject with separate economic and building
+    evaluation. Building 2 cannot be evaluated separately.
+    """
+
+    def __call__(self, obj):
+        obj.dict_eb = dict((n, val ** 2) for (n, val)
+                           in obj.dict_build.items())
+        return self.eval_eco(obj)
+
+    def eval_eco(self, obj):
+        return {'y': obj.factor * sum(obj.dict_eb.values())}
+
+    def can_eval_buildings(self, obj, list_ids):
+        return 2 not in list_ids
+
+    def reset_buildings(self, obj, list_ids, obj_src):
+        for n in list_ids:
+            obj.dict_build[n] = obj_src.dict_build[n]
+
+    def eval_buildings(self, obj, list_ids):
+        for n in list_ids:
+            obj.dict_eb[n] = obj.dict_build[n] ** 2
+        return self.eval_eco(obj)
+
+
+class BuildSetter(object):
+    def __init__(self, node_id):
+        self.node_id = node_id
+
+    def __call__(self, obj, value):
+        obj.dict_build[self.node_id] = value
+
+
+def gen_staged_registry():
+    registry = stueng.ParameterRegistry()
+    registry.add_parameter(name='factor', setter='factor',
+                           dict_dist={'min_val': 1, 'max_val': 2},
+                           stage='eco')
+    for n in [1, 2]:
+        registry.add_parameter(name='build_' + str(n),
+                               setter=BuildSetter(node_id=n),
+                               dict_dist={'min_val': 0, 'max_val': 1},
+                               stage='building')
+    return registry
+
+
+class TestMorrisRunner(object):
+
+    def test_morris_runner_reuse_and_resume(self, tmpdir):
+
+        registry = gen_staged_registry()
+
+        assert morrun.get_eval_mode(registry, [0]) == ('eco', [])
+        assert morrun.get_eval_mode(registry, [0, 2]) == ('building', [2])
+
+        path_save = os.path.join(str(tmpdir), 'morris.pkl')
+
+        runner = morrun.MorrisRunner(base_obj=StagedObject(),
+                                     registry=registry,
+                                     evaluator=StagedEvaluator(),
+                                     path_save=path_save)
+        runner.gen_design(nb_traj=6, seed=2)
+
+        #  Evaluate first half of trajectories only (interrupted study)
+        runner.dict_study['array_done'][3:] = True
+        runner.run()
+        runner.dict_study['array_done'][3:] = False
+        runner.save()
+
+        #  Resume study from file
+        runner = morrun.MorrisRunner(base_obj=StagedObject(),
+                                     registry=registry,
+                                     evaluator=StagedEvaluator(),
+                                     path_save=path_save)
+        assert np.sum(runner.dict_study['array_done']) == 3
+
+        list_traj_done = []
+        dict_morris = runner.run(
+            callback=lambda t, list_res: list_traj_done.append(t))
+
+        assert sorted(list_traj_done) == [3, 4, 5]
+        assert np.all(runner.dict_study['array_done'])
+
+        #  Results match full evaluations
+        engine = stueng.StudyEngine(base_obj=StagedObject(),
+                                    registry=registry,
+                                    evaluator=StagedEvaluator())
+        (dict_res, list_failed) = \
+            engine.run(runner.dict_study['array_values'])
+
+        assert np.allclose(runner.dict_study['dict_res']['y'], dict_res['y'])
+
+        #  Economic and building 1 steps reuse previous results, building 2
+        #  steps are fully evaluated
+        array_modes = runner.dict_study['array_modes']
+        array_idx = np.argmax(np.abs(np.diff(
+            runner.dict_study['design'].reshape(6, 4, 3), axis=1)), axis=2)
+        dict_ref_modes = {0: 'eco', 1: 'building', 2: 'city'}
+        for t in range(6):
+            assert array_modes[t][0] == 'city'
+            for j in range(3):
+                assert array_modes[t][j + 1] == \
+                       dict_ref_modes[array_idx[t, j]]
+
+        assert dict_morris['y']['mu_star'].shape == (3,)
+
+    def test_morris_runner_city_eco(self, fixture_city):
+
+        city = copy.deepcopy(fixture_city)
+        city.environment.prices = gmarket.GermanMarket()
+
+        timestep = city.environment.timer.timeDiscretization
+        nb_timesteps = int(365 * 24 * 3600 / timestep)
+
+        list_pos = [(0, 0), (0, 500), (50, 500)]
+        list_feeder = [True, True, False]
+
+        for i in range(len(list_pos)):
+            building = build.BuildingExtended(environment=city.environment,
+                                              build_year=1990, build_type=0)
+            apartment = Apartment.Apartment(environment=city.environment)
+            building.addEntity(apartment)
+
+            building.apartments[0].demandSpaceheating.loadcurve = \
+                np.ones(nb_timesteps) * (3000 + 1000 * i)
+            building.apartments[0].power_el.loadcurve = \
+                np.ones(nb_timesteps) * 500
+
+            if list_feeder[i]:
+                boiler = boil.BoilerExtended(environment=city.environment,
+                                             q_nominal=20000, eta=0.9)
+                bes = BES.BES(environment=city.environment)
+                bes.addDevice(boiler)
+                building.addEntity(bes)
+
+            city.add_extended_building(extended_building=building,
+                                       position=point.Point(list_pos[i]))
+
+        #  Building 1002 feeds LHN, building 1001 is stand-alone
+        dimnet.add_lhn_to_city(city=city, list_build_node_nb=[1002, 1003])
+
+        city_eco_calc = citecon.CityAnnuityCalc(
+            annuity_obj=annu.EconomicCalculation(),
+            energy_balance=citeb.CityEBCalculator(city=city))
+
+        registry = stueng.ParameterRegistry()
+        registry.add_parameter(name='interest',
+                               setter='annuity_obj.interest',
+                               dict_dist={'min_val': 1.01,
+                                          'max_val': 1.0675},
+                               stage='eco')
+        for n in [1001, 1002]:
+            registry.add_parameter(
+                name='eta_boi_' + str(n),
+                setter=stueng.BuildingParSetter(node_id=n,
+                                                par_name='eta_boi'),
+                dict_dist={'min_val': 0.8, 'max_val': 0.95},
+                stage='building')
+
+        evaluator = stueng.CityEcoEvaluator()
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            runner = morrun.MorrisRunner(base_obj=city_eco_calc,
+                                         registry=registry,
+                                         evaluator=evaluator,
+                                         executor=executor)
+            runner.gen_design(nb_traj=2, seed=1)
+            dict_morris = runner.run()
+
+        array_modes = runner.dict_study['array_modes']
+        assert 'eco' in list(array_modes.flatten())
+        assert 'building' in list(array_modes.flatten())
+
+        engine = stueng.StudyEngine(base_obj=city_eco_calc,
+                                    registry=registry, evaluator=evaluator)
+        (dict_res, list_failed) = \
+            engine.run(runner.dict_study['array_values'])
+
+        for key in ['annuity', 'co2', 'gas_boiler']:
+            assert np.allclose(runner.dict_study['dict_res'][key],
+                               dict_res[key])
+
+        #  Boiler efficiency of stand-alone building changes gas demand
+        assert dict_morris['gas_boiler']['mu_star'][1] > 0
+        assert dict_morris['gas_boiler']['mu_star'][0] == 0
@@ -537,3 +537,86 @@ class Test_NetworkOperations(object):
 
         assert mst_nodes == [node_1, node_2, node_3, 1007, 1008, 1009]
         assert list_new_nodes == [1007, 1008, 1009]
+
+    def test_street_segment_index(self):
+        graph = nx.Graph()
+        graph.add_node(0, position=point.Point(0, 0), node_type='street')
+        graph.add_node(1, position=point.Point(10, 0), node_type='street')
+        graph.add_node(2, position=point.Point(10, 10), node_type='street')
+        graph.add_node(3, position=point.Point(5, 5), node_type='building')
+        graph.add_edges_from([(0, 1), (1, 2)], network_type='street')
+        graph.add_edge(2, 3)
+
+        seg_index = netop.StreetSegmentIndex(graph)
+
+        #  Edge to building node is not a street segment
+        assert len(seg_index) == 2
+
+        (closest_point, segment) = seg_index.query(point.Point(4, -3))
+        assert closest_point == point.Point(4, 0)
+        assert segment == (0, 1)
+
+        (closest_point, segment) = seg_index.query(point.Point(12, 7))
+        assert closest_point == point.Point(10, 7)
+        assert segment == (1, 2)
+
+        #  Split segment (0, 1) with new node 4 on (4, 0)
+        seg_index.split_segment((0, 1), 4, point.Point(4, 0))
+
+        (closest_point, segment) = seg_index.query(point.Point(2, 1))
+        assert closest_point == point.Point(2, 0)
+        assert segment == (0, 4)
+
+        (closest_point, segment) = seg_index.query(point.Point(6, 1))
+        assert closest_point == point.Point(6, 0)
+        assert segment == (4, 1)
+
+    def test_calc_min_span_tree_compact(self):
+        graph = nx.Graph()
+        graph.add_node(0, position=point.Point(0, 0))
+        graph.add_node(1, position=point.Point(0, 5))
+        graph.add_node(2, position=point.Point(5, 5))
+        graph.add_node(3, position=point.Point(20, 20))
+        graph.add_edges_from([(0, 1), (1, 2), (0, 2)], network_type='street')
+
+        netop.add_weights_to_edges(graph)
+
+        min_span_graph = netop.calc_min_span_tree_compact(graph)
+
+        assert sorted(min_span_graph.nodes()) == [0, 1, 2, 3]
+        assert sorted(tuple(sorted(e)) for e in min_span_graph.edges()) == \
+               [(0, 1), (1, 2)]
+        assert min_span_graph.edges[0, 1]['network_type'] == 'street'
+        assert min_span_graph.nodes[3]['position'] == point.Point(20, 20)
+
+    def test_prune_str_nodes_degree_one(self):
+        graph = nx.Graph()
+        graph.add_edges_from([(0, 1), (1, 2), (2, 3), (1, 4), (4, 5)])
+
+        netop.prune_str_nodes_degree_one(graph, nodelist=[0, 3])
+
+        assert sorted(graph.nodes()) == [0, 1, 2, 3]
+
+    def test_get_network_components(self):
+
+        graph = nx.Graph()
+        graph.add_edges_from([(1, 2), (2, 3), (5, 6)], network_type='heating')
+        graph.add_edge(3, 4, network_type='heating_and_deg')
+        graph.add_edge(4, 5, network_type='street')
+
+        list_comp = netop.get_network_components(
+            graph, network_type=['heating', 'heating_and_deg'])
+
+        assert sorted(sorted(comp) for comp in list_comp) == \
+               [[1, 2, 3, 4], [5, 6]]
+
+        assert sorted(netop.get_network_components(graph,
+                                                   network_type='heating',
+                                                   search_node=2)[0]) == \
+               [1, 2, 3]
+
+        assert netop.get_network_components(graph, network_type='heating',
+                                            search_node=4) == []
+
+        assert netop.search_lhn(graph)
+        assert len(netop.search_lhn_all_edges(graph)) == 4
@@ -6,10 +6,16 @@ Pytest script for city generators
 from __future__ import division
 
 import os
+import copy
+import pytest
+import utm
+import numpy as np
+import shapely.geometry.point as point
 
 import pycity_calc.cities.scripts.osm_call as osm_call
 import pycity_calc.cities.scripts.city_generator.city_generator as citgen
 import pycity_calc.cities.scripts.city_generator_based_on_osm_files as osmgen
+import pycity_calc.cities.scripts.osm_pipeline as osmpipe
 
 from pycity_calc.test.pycity_calc_fixtures import fixture_building, \
     fixture_environment, fixture_city, fixture_apartment, fixture_th_demand, \
@@ -362,3 +368,184 @@ class Test_OSM():
                          deleted_buildings=deleted_buildings,
                          nodelist_buildings=nodelist_buildings,
                          generate_nodelist_from_function_of_citydistrict=generate_nodelist_from_function_of_citydistrict)
+
+    def test_building_geometry(self, fixture_city):
+
+        #  Three terraced houses, detached house with garage and far building
+        list_x_min = [0, 10, 20, 40, 50, 500]
+        list_width = [10, 10, 10, 10, 4, 10]
+        list_comment = ['house', 'house', 'house', 'house', 'garage', 'house']
+
+        for i in range(len(list_x_min)):
+            x_min = list_x_min[i]
+            x_max = x_min + list_width[i]
+            outlines = [(x_min, 0), (x_max, 0), (x_max, 10), (x_min, 10),
+                        (x_min, 0)]
+
+            fixture_city.add_building(
+                position=point.Point((x_min + x_max) / 2, 5),
+                outlines=outlines, area=list_width[i] * 10,
+                comment=list_comment[i])
+
+        nodelist_all = fixture_city.get_list_id_of_spec_node_type()
+
+        dict_geometry = osmgen.get_building_geometry(
+            city=fixture_city, considered_area=10000,
+            nodelist_buildings=nodelist_all)
+
+        deleted_buildings, nodelist_buildings = \
+            osmgen.delete_not_relevant_buildings(
+                city=fixture_city, min_house_area=50,
+                generate_nodelist_from_function_of_citydistrict=True)
+
+        assert len(deleted_buildings) == 1
+        assert len(nodelist_buildings) == 5
+
+        #  Geometry of all buildings is reused for relevant buildings
+        for dict_geo in [None, dict_geometry]:
+            res_square = osmgen.get_buildings_within_spezified_square(
+                city=fixture_city, zone_number=32, considered_area=10000,
+                min_house_area=50, nodelist_buildings=nodelist_buildings,
+                dict_geometry=dict_geo)
+            res_neighbours = osmgen.get_neighbour_building(
+                city=fixture_city, zone_number=32,
+                considered_area_around_buildings=10000, min_house_area=50,
+                nodelist_buildings=nodelist_buildings, dict_geometry=dict_geo)
+            res_district = osmgen.get_district_type(
+                city=fixture_city, zone_number=32,
+                considered_area_around_building=10000, min_house_area=50,
+                nodelist_buildings=nodelist_buildings, dict_geometry=dict_geo)
+
+            if dict_geo is None:
+                list_res_ref = [res_square, res_neighbours, res_district]
+            else:
+                assert [res_square, res_neighbours, res_district] == \
+                       list_res_ref
+
+        (buildings_neighbours, number_neighbour_buildings) = \
+            list_res_ref[1][:2]
+        assert [number_neighbour_buildings[n] for n in nodelist_buildings] \
+               == [1, 2, 1, 0, 0]
+        assert dict_geometry['buildings_neighbours'][nodelist_all[3]] == \
+               [nodelist_all[4]]
+
+        #  Shared walls are stored in geometry and restricted to relevant
+        #  buildings
+        assert sorted(dict_geometry['coordinates_of_shared_walls']) == \
+               sorted(nodelist_all)
+        assert sorted(list_res_ref[1][-1]) == sorted(nodelist_buildings)
+
+        dict_geo_walls = copy.deepcopy(dict_geometry)
+        dict_geo_walls['coordinates_of_shared_walls'][nodelist_all[3]] = \
+            {nodelist_all[4]: [1, 2]}
+        dict_walls = osmgen.get_neighbour_building(
+            city=fixture_city, zone_number=32,
+            considered_area_around_buildings=10000, min_house_area=50,
+            nodelist_buildings=nodelist_all,
+            dict_geometry=dict_geo_walls)[-1]
+        assert dict_walls[nodelist_all[3]] == {nodelist_all[4]: [1, 2]}
+        dict_walls = osmgen.get_neighbour_building(
+            city=fixture_city, zone_number=32,
+            considered_area_around_buildings=10000, min_house_area=50,
+            nodelist_buildings=nodelist_buildings,
+            dict_geometry=dict_geo_walls)[-1]
+        assert dict_walls[nodelist_all[3]] == {}
+
+        with pytest.raises(AssertionError):
+            osmgen.get_buildings_within_spezified_square(
+                city=fixture_city, zone_number=32, considered_area=2500,
+                min_house_area=50, nodelist_buildings=nodelist_buildings,
+                dict_geometry=dict_geometry)
+
+    def test_osm_pipeline(self, tmpdir):
+
+        this_path = os.path.dirname(os.path.abspath(__file__))
+        osm_path = os.path.join(this_path, 'input_generator', 'example_ac.osm')
+
+        path_cache = str(tmpdir)
+
+        pipeline = osmpipe.OSMCityPipeline(osm_path=osm_path,
+                                           path_cache=path_cache)
+
+        (city, res_enrich) = pipeline.gen_city(min_house_area=50, seed=1)
+
+        #  Changed min_house_area and build year method reuse geometry
+        pipeline.gen_city(min_house_area=80, seed=1)
+        pipeline.gen_city(min_house_area=50, seed=1,
+                          user_defined_build_year=False)
+
+        assert pipeline.dict_nb_calc == {'topology': 1, 'utm': 0,
+                                         'geometry': 1, 'enrichment': 3}
+
+        #  Stages are loaded from cache folder
+        pipeline = osmpipe.OSMCityPipeline(osm_path=osm_path,
+                                           path_cache=path_cache)
+        (city_2, res_enrich_2) = pipeline.gen_city(min_house_area=50, seed=1)
+
+        assert pipeline.dict_nb_calc == {'topology': 0, 'utm': 0,
+                                         'geometry': 0, 'enrichment': 0}
+        assert sorted(city_2.nodes()) == sorted(city.nodes())
+        assert res_enrich_2[0] == res_enrich[0]
+
+        #  Enrichment without seed is re-calculated (not cached)
+        pipeline.gen_city(min_house_area=50)
+        pipeline.gen_city(min_house_area=50)
+        assert pipeline.dict_nb_calc['enrichment'] == 2
+
+        with pytest.raises(ValueError):
+            pipeline.gen_city(unknown_parameter=1)
+
+    def test_packed_outlines(self, fixture_city):
+
+        #  Rectangle, triangle (closed outline) and L-shaped building
+        list_outlines = [[(0, 0), (10, 0), (10, 5), (0, 5)],
+                         [(20, 0), (26, 0), (20, 6), (20, 0)],
+                         [(30, 0), (34, 0), (34, 2), (32, 2), (32, 4),
+                          (30, 4)]]
+
+        for outlines in list_outlines:
+            fixture_city.add_building(position=point.Point(outlines[0]),
+                                      outlines=outlines)
+        #  Building without outlines is skipped
+        fixture_city.add_building(position=point.Point(50, 50))
+
+        packed = osm_call.PackedOutlines.from_city(city=fixture_city)
+
+        assert len(packed) == 3
+        assert np.allclose(packed.get_outline(1), list_outlines[1])
+        assert np.allclose(packed.calc_areas(), [50, 18, 12])
+        assert np.allclose(packed.calc_centroids(),
+                           [[5, 2.5], [22, 2], [95 / 3, 5 / 3]])
+        assert np.allclose(packed.calc_bounding_boxes(),
+                           [[0, 0, 10, 5], [20, 0, 26, 6], [30, 0, 34, 4]])
+
+    def test_conv_long_lat_to_utm(self, fixture_city):
+
+        list_lat_long = [(50.775, 6.083), (50.776, 6.084), (59.9, 10.7),
+                         (-33.9, 18.4)]
+
+        for (lat, long) in list_lat_long:
+            fixture_city.add_building(position=point.Point(long, lat),
+                                      outlines=[(lat, long),
+                                                (lat + 0.001, long)])
+
+        list_ids = fixture_city.get_list_id_of_spec_node_type()
+
+        packed = osm_call.PackedOutlines.from_city(city=fixture_city)
+        packed.conv_lat_long_to_utm().write_to_city(city=fixture_city)
+
+        osm_call.conv_city_long_lat_to_utm(city=fixture_city)
+
+        for i in range(len(list_ids)):
+            (lat, long) = list_lat_long[i]
+            (x, y, zone_nb, zone_str) = utm.from_latlon(lat, long)
+
+            assert fixture_city.nodes[list_ids[i]]['outlines'][0] == \
+                   pytest.approx((x, y))
+            assert fixture_city.nodes[list_ids[i]]['position'].x == \
+                   pytest.approx(x)
+            assert fixture_city.nodes[list_ids[i]]['position'].y == \
+                   pytest.approx(y)
+
+        assert fixture_city.graph['zone_nb'] == zone_nb
+        assert fixture_city.graph['zone_str'] == zone_str
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Pytest script for profile_pool
+"""
+from __future__ import division
+
+import os
+import copy
+import pickle
+import numpy as np
+import shapely.geometry.point as point
+
+import pycity_calc.toolbox.mc_helpers.lhc_sampling.profile_pool as profpool
+import pycity_calc.toolbox.mc_helpers.lhc_sampling.lhc_sample_run as lhcrun
+
+from pycity_calc.test.pycity_calc_fixtures import fixture_environment, \
+    fixture_city, fixture_detailed_building
+
+
+class TestProfilePool(object):
+
+    def gen_dict_profiles(self):
+
+        dict_profiles = {}
+
+        for key in [1001, 1002]:
+            dict_profiles[key] = \
+                {'el_profiles': np.random.rand(3, 48) * key,
+                 'dhw_profiles': np.random.rand(3, 48) * key + 1}
+
+        return dict_profiles
+
+    def test_profile_pool_in_memory(self):
+
+        dict_profiles = self.gen_dict_profiles()
+
+        pool = profpool.ProfilePool.from_dict(dict_profiles)
+
+        assert pool.array.shape == (12, 48)
+        assert len(pool) == 2
+        assert sorted(pool.keys()) == [1001, 1002]
+        assert 1001 in pool
+
+        for key in dict_profiles.keys():
+            for prof_type in ['el_profiles', 'dhw_profiles']:
+                assert np.array_equal(pool[key][prof_type],
+                                      dict_profiles[key][prof_type])
+
+            #  Profiles are views on pool array
+            assert np.shares_memory(pool[key]['el_profiles'], pool.array)
+            assert np.shares_memory(pool.get_profile(key, 'dhw_profiles', 2),
+                                    pool.array)
+            assert np.array_equal(pool.get_profile(key, 'dhw_profiles', 2),
+                                  dict_profiles[key]['dhw_profiles'][2])
+
+        assert pool.get_nb_profiles(1001) == 3
+
+        pool_copy = pickle.loads(pickle.dumps(pool))
+        assert np.array_equal(pool_copy.array, pool.array)
+
+        dict_back = pool.to_dict()
+        assert np.array_equal(dict_back[1002]['el_profiles'],
+                              dict_profiles[1002]['el_profiles'])
+
+    def test_profile_pool_memmap(self, tmpdir):
+
+        dict_profiles = self.gen_dict_profiles()
+
+        path_pool = os.path.join(str(tmpdir), 'pool.npy')
+
+        pool = profpool.ProfilePool.from_dict(dict_profiles, path=path_pool,
+                                              dtype=np.float32)
+
+        assert isinstance(pool.array, np.memmap)
+        assert os.path.isfile(path_pool)
+
+        #  Pickle only holds path and index
+        pickled = pickle.dumps(pool)
+        assert len(pickled) < pool.array.nbytes
+
+        pool_load = pickle.loads(pickled)
+
+        assert isinstance(pool_load.array, np.memmap)
+        assert not pool_load.array.flags.writeable
+        assert np.allclose(pool_load[1002]['dhw_profiles'],
+                           dict_profiles[1002]['dhw_profiles'])
+
+        #  Apartment load curves are computed from pool rows
+        loadcurve = pool_load[1001]['el_profiles'][1] / 2
+        loadcurve *= 2
+        assert np.allclose(loadcurve, dict_profiles[1001]['el_profiles'][1])
+
+    def test_gen_profile_pool(self, fixture_city, fixture_detailed_building,
+                              tmpdir):
+
+        fixture_city.add_extended_building(
+            extended_building=copy.deepcopy(fixture_detailed_building),
+            position=point.Point(0, 0))
+
+        nb_samples = 2
+
+        (dict_city_sample, dict_build_samples) = \
+            lhcrun.gen_empty_res_dicts(city=fixture_city,
+                                       nb_samples=nb_samples)
+
+        for key in dict_build_samples.keys():
+            dict_build_samples[key]['app_nb_occ'][:] = 2
+
+        path_pool = os.path.join(str(tmpdir), 'pool.npy')
+
+        pool = lhcrun.gen_profile_pool(city=fixture_city,
+                                       nb_samples=nb_samples,
+                                       dict_build_samples=dict_build_samples,
+                                       share_profiles=0.5,
+                                       path_pool=path_pool)
+
+        assert isinstance(pool.array, np.memmap)
+
+        for key in dict_build_samples.keys():
+            assert pool[key]['el_profiles'].shape == (1, 35040)
+            assert np.sum(pool[key]['el_profiles']) > 0
+            assert np.sum(pool[key]['dhw_profiles']) > 0
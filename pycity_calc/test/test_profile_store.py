@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Pytest script for profile_store
+"""
+from __future__ import division
+
+import numpy as np
+import pytest
+
+import pycity_base.functions.changeResolution as chres
+
+import pycity_calc.toolbox.profile_store as profsto
+
+from pycity_calc.test.pycity_calc_fixtures import fixture_environment
+
+
+class TestProfileStore(object):
+
+    def test_resample_profile(self):
+
+        values = np.arange(8, dtype=float)
+
+        assert np.allclose(profsto.resample_profile(values, 900, 1800,
+                                                    method='hold'),
+                           [0.5, 2.5, 4.5, 6.5])
+        assert np.allclose(profsto.resample_profile(values, 1800, 900,
+                                                    method='hold'),
+                           np.repeat(values, 2))
+        assert np.allclose(profsto.resample_profile(values, 900, 1800,
+                                                    method='sum'),
+                           chres.changeResolution(values, 900, 1800,
+                                                  method='sum'))
+
+        with pytest.raises(ValueError):
+            profsto.resample_profile(values, 900, 1800, method='max')
+
+    def test_profile_store(self):
+
+        store = profsto.ProfileStore()
+
+        values = np.random.rand(96)
+        store.add_profile(name='temp', values=values, timestep=900)
+
+        assert store.has_profile('temp')
+        assert store.get_base_timestep('temp') == 900
+
+        view = store.get_profile(name='temp', timestep=3600, copy=False)
+        assert np.allclose(view, chres.changeResolution(values, 900, 3600))
+        assert not view.flags.writeable
+
+        #  Cached view is reused
+        assert store.get_profile(name='temp', timestep=3600,
+                                 copy=False).base is view.base
+
+        #  Unchanged profile keeps cached views, changed profile replaces them
+        store.add_profile(name='temp', values=values, timestep=900)
+        assert ('temp', 3600, 'mean') in store._dict_views
+
+        store.add_profile(name='temp', values=values * 2, timestep=900)
+        assert ('temp', 3600, 'mean') not in store._dict_views
+        assert np.allclose(store.get_profile(name='temp', timestep=3600),
+                           chres.changeResolution(values * 2, 900, 3600))
+
+        store.remove_profile('temp')
+        assert not store.has_profile('temp')
+
+        with pytest.raises(KeyError):
+            store.get_profile(name='temp')
+
+    def test_get_weather_profile(self, fixture_environment):
+
+        t_out = profsto.get_weather_profile(environment=fixture_environment,
+                                            name='tAmbient', timestep=3600)
+
+        timestep = fixture_environment.timer.timeDiscretization
+        t_ref = chres.changeResolution(
+            fixture_environment.weather.tAmbient, timestep, 3600)
+
+        assert np.allclose(t_out, t_ref)
+        assert fixture_environment.profile_store.has_profile(
+            'weather.tAmbient')
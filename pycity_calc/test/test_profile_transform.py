@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Pytest script for profile_transform
+"""
+from __future__ import division
+
+import numpy as np
+
+import pycity_calc.toolbox.modifiers.profile_transform as proftrans
+import pycity_calc.toolbox.modifiers.slp_th_manipulator as slpman
+import pycity_calc.toolbox.modifiers.mod_resc_peak_load_day as rescpeak
+
+
+class TestProfileTransform(object):
+
+    def test_seq_sum(self):
+
+        array = np.array([[1e16, 1, 1, 1], [0.1, 0.2, 0.3, 0.4]])
+
+        assert list(proftrans.seq_sum(array)) == [sum(array[0]),
+                                                  sum(array[1])]
+
+    def test_calc_daily_means(self):
+
+        temp = np.repeat(np.arange(365), 24) + np.tile(np.arange(24), 365)
+
+        assert np.allclose(proftrans.calc_daily_means(temp),
+                           np.arange(365) + 11.5)
+
+    def test_cut_off_warm_days(self):
+
+        temp = np.ones(8760) * 5
+        temp[24:48] = 15  # Second day is warm
+
+        curves = np.ones((2, 8760)) * 1000
+        curves[1] *= 2
+
+        curves_mod = slpman.slp_th_manipulator(timestep=3600,
+                                               th_slp_curve=curves,
+                                               temp_array=temp)
+
+        assert curves_mod.shape == (2, 8760)
+        assert np.allclose(curves_mod[:, 24:48], 0)
+        assert np.allclose(np.sum(curves_mod, axis=1),
+                           np.sum(curves, axis=1))
+
+        #  Single curve is processed like row of batch
+        assert np.array_equal(
+            slpman.slp_th_manipulator(timestep=3600,
+                                      th_slp_curve=curves[1],
+                                      temp_array=temp),
+            curves_mod[1])
+
+    def test_resc_peak_load_days(self):
+
+        curve = np.ones(8760) * 1000
+        curve[50] = 5000  # Peak load at third day
+
+        curve_mod = rescpeak.resc_sh_peak_load(loadcurve=curve,
+                                               timestep=3600,
+                                               resc_factor=2)
+
+        assert curve_mod[50] == 10000
+        assert curve_mod[48] == 2000
+        #  Values outside of peak load day are normalized with ratio of
+        #  original and rescaled energy demand
+        assert abs(curve_mod[0] - 1000 * sum(curve) / (sum(curve) + 28000)) \
+               <= 0.001
+
+        curves_mod = proftrans.resc_peak_load_days(profiles=[curve, curve],
+                                                   timestep=3600,
+                                                   resc_factor=2)
+
+        assert np.array_equal(curves_mod[0], curve_mod)
+        assert np.array_equal(curves_mod[1], curve_mod)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Pytest script for sampling_engine
+"""
+from __future__ import division
+
+import copy
+import numpy as np
+import pytest
+import shapely.geometry.point as point
+from scipy import stats
+
+import pycity_calc.toolbox.mc_helpers.sampling_engine as sampeng
+import pycity_calc.toolbox.mc_helpers.lhc_sampling.lhc_sample_run as lhcrun
+
+from pycity_calc.test.pycity_calc_fixtures import fixture_environment, \
+    fixture_city, fixture_detailed_building
+
+
+class TestSamplingEngine(object):
+
+    def test_sobol_design(self):
+
+        #  First points of unscrambled sequence
+        design = sampeng.sobol_design(nb_samples=4, nb_par=2, scramble=False)
+
+        assert np.allclose(design, [[0, 0], [0.5, 0.5], [0.75, 0.25],
+                                    [0.25, 0.75]])
+
+        nb_samples = 2 ** 10
+
+        for scramble in [False, True]:
+            design = sampeng.sobol_design(nb_samples=nb_samples, nb_par=40,
+                                          scramble=scramble, seed=1)
+
+            assert design.shape == (nb_samples, 40)
+            assert np.min(design) > 0
+            assert np.max(design) < 1
+
+            #  One point within each interval of length 1 / nb_samples
+            for j in range(40):
+                assert len(np.unique(np.floor(design[:, j] * nb_samples))) \
+                       == nb_samples
+
+            #  One point within each 32 x 32 cell of first two dimensions
+            array_cells = np.floor(design[:, 0] * 32) * 32 \
+                          + np.floor(design[:, 1] * 32)
+            assert len(np.unique(array_cells)) == nb_samples
+
+        #  Reproducible with seed
+        assert np.array_equal(sampeng.sobol_design(100, 5, seed=2),
+                              sampeng.sobol_design(100, 5, seed=2))
+        assert not np.array_equal(sampeng.sobol_design(100, 5, seed=2),
+                                  sampeng.sobol_design(100, 5, seed=3))
+
+    def test_sobol_joe_kuo(self):
+
+        #  First points of published Sobol sequence (Joe-Kuo direction
+        #  numbers, new-joe-kuo-6.21201)
+        design = sampeng.sobol_design(nb_samples=8, nb_par=5, scramble=False)
+
+        assert np.allclose(design,
+                           [[0, 0, 0, 0, 0],
+                            [0.5, 0.5, 0.5, 0.5, 0.5],
+                            [0.75, 0.25, 0.25, 0.25, 0.75],
+                            [0.25, 0.75, 0.75, 0.75, 0.25],
+                            [0.375, 0.375, 0.625, 0.875, 0.375],
+                            [0.875, 0.875, 0.125, 0.375, 0.875],
+                            [0.625, 0.125, 0.875, 0.625, 0.625],
+                            [0.125, 0.625, 0.375, 0.125, 0.125]])
+
+        #  Dimensions 20, 40 and 101 (last one of Joe-Kuo table)
+        design = sampeng.sobol_design(nb_samples=16, nb_par=101,
+                                      scramble=False)
+
+        dict_ref = {20: [0, 8, 4, 12, 2, 10, 6, 14, 5, 13, 1, 9, 7, 15, 3, 11],
+                    40: [0, 8, 4, 12, 14, 6, 10, 2, 9, 1, 13, 5, 7, 15, 3, 11],
+                    101: [0, 8, 4, 12, 10, 2, 14, 6, 1, 9, 5, 13, 11, 3, 15,
+                          7]}
+
+        for dim in dict_ref:
+            assert np.allclose(design[:, dim - 1] * 16, dict_ref[dim])
+
+        #  Warning for dimensions beyond Joe-Kuo table
+        with pytest.warns(UserWarning):
+            array_dir = sampeng.get_sobol_direction_numbers(102)
+        assert array_dir.shape == (102, sampeng._SOBOL_BITS)
+
+    def test_lhs_design(self):
+
+        nb_samples = 50
+
+        for criterion in [None, 'center', 'maximin', 'centermaximin',
+                          'correlation']:
+            design = sampeng.lhs_design(nb_samples=nb_samples, nb_par=4,
+                                        criterion=criterion, seed=1)
+
+            assert design.shape == (nb_samples, 4)
+
+            for j in range(4):
+                assert sorted(np.floor(design[:, j] * nb_samples)) == \
+                       list(range(nb_samples))
+
+        design = sampeng.lhs_design(nb_samples=4, nb_par=2,
+                                    criterion='center', seed=1)
+        assert sorted(design[:, 0]) == [0.125, 0.375, 0.625, 0.875]
+
+        #  Reproducible with seed and legacy numpy seed
+        assert np.array_equal(sampeng.lhs_design(10, 3, seed=5),
+                              sampeng.lhs_design(10, 3, seed=5))
+
+        np.random.seed(1)
+        design_1 = sampeng.gen_design(10, 3, method='lhc')
+        np.random.seed(1)
+        design_2 = sampeng.gen_design(10, 3, method='lhc')
+        assert np.array_equal(design_1, design_2)
+
+    def test_ppf(self):
+
+        array_u = np.linspace(0.001, 0.999, 100)
+
+        assert np.allclose(sampeng.ppf_uniform(array_u, 2, 4),
+                           2 + 2 * array_u)
+        assert np.array_equal(sampeng.ppf_normal(array_u, mean=0.95,
+                                                 std=0.005),
+                              stats.norm(loc=0.95, scale=0.005).ppf(array_u))
+        assert np.array_equal(sampeng.ppf_lognormal(array_u, sigma=0.3),
+                              stats.lognorm(s=0.3).ppf(array_u))
+        assert np.min(sampeng.ppf_normal(array_u, mean=1, std=1,
+                                         min_val=0)) == 0
+
+        array_val = sampeng.ppf_discrete([0, 0.2, 0.5, 0.7, 0.99],
+                                         values=[1, 2, 3],
+                                         probs=[2, 2, 1])
+        assert list(array_val) == [1, 1, 2, 2, 3]
+
+        dict_samples = sampeng.sample_parameters(
+            nb_samples=1024,
+            dict_par={'a': ('uniform', {'min_val': 0, 'max_val': 10}),
+                      'b': ('normal', {'mean': 5, 'std': 1}),
+                      'c': ('discrete', {'values': [0, 1]})},
+            method='sobol', seed=1)
+
+        assert abs(np.mean(dict_samples['a']) - 5) < 0.01
+        assert abs(np.mean(dict_samples['b']) - 5) < 0.01
+        assert np.sum(dict_samples['c']) == 512
+
+    def test_select_subsets(self):
+
+        list_subsets = sampeng.select_subsets(array_ids=[1001, 1002, 1003],
+                                              array_nb=[0, 2, 3], seed=1)
+
+        assert len(list_subsets[0]) == 0
+        assert len(set(list_subsets[1])) == 2
+        assert sorted(list_subsets[2]) == [1001, 1002, 1003]
+
+    def test_legacy_generator(self, monkeypatch):
+
+        #  numpy < 1.17 has no default_rng
+        monkeypatch.delattr(np.random, 'default_rng')
+
+        rng = sampeng.get_rng(seed=1)
+        assert isinstance(rng, sampeng.LegacyGenerator)
+
+        for method in ['random', 'lhc', 'sobol']:
+            design = sampeng.gen_design(nb_samples=16, nb_par=3,
+                                        method=method, seed=2)
+            assert design.shape == (16, 3)
+            assert np.min(design) >= 0
+            assert np.max(design) < 1
+
+            #  Reproducible with seed
+            assert np.array_equal(design,
+                                  sampeng.gen_design(nb_samples=16, nb_par=3,
+                                                     method=method, seed=2))
+
+        list_subsets = sampeng.select_subsets(array_ids=[1001, 1002, 1003],
+                                              array_nb=[2, 3], rng=rng)
+        assert len(set(list_subsets[0])) == 2
+        assert sorted(list_subsets[1]) == [1001, 1002, 1003]
+
+        assert 0 <= rng.integers(5) < 5
+        assert rng.choice([-1, 1], size=4).shape == (4,)
+        assert sorted(rng.permutation(4)) == [0, 1, 2, 3]
+
+    def test_do_lhc_city_sampling(self, fixture_city,
+                                  fixture_detailed_building):
+
+        for i in range(2):
+            fixture_city.add_extended_building(
+                extended_building=copy.deepcopy(fixture_detailed_building),
+                position=point.Point(i * 10, 0))
+
+        nb_samples = 16
+
+        list_res = []
+        for i in range(2):
+            (dict_city_sample, dict_build_samples) = \
+                lhcrun.gen_empty_res_dicts(city=fixture_city,
+                                           nb_samples=nb_samples)
+
+            lhcrun.do_lhc_city_sampling(
+                city=fixture_city,
+                nb_par=lhcrun.calc_nb_unc_par(city=fixture_city),
+                nb_samples=nb_samples,
+                dict_city_sample=dict_city_sample,
+                dict_build_samples=dict_build_samples,
+                design_method='sobol', seed=1)
+
+            list_res.append((dict_city_sample, dict_build_samples))
+
+        (dict_city_sample, dict_build_samples) = list_res[0]
+
+        assert np.min(dict_city_sample['interest']) >= 1.01
+        assert np.max(dict_city_sample['interest']) <= 1.0675
+        assert len(dict_city_sample['list_sum_on']) == nb_samples
+
+        for key in dict_build_samples.keys():
+            dict_samples = dict_build_samples[key]
+
+            assert np.min(dict_samples['sh_dem']) >= 0
+            assert np.min(dict_samples['beta']) >= 0
+            assert np.max(dict_samples['beta']) <= 60
+            assert np.min(dict_samples['app_nb_occ']) >= 1
+            assert np.min(dict_samples['app_el_dem']) > 0
+            assert np.min(dict_samples['app_dhw_dem']) > 0
+
+            #  Design part of samples is reproducible with seed
+            for parkey in ['sh_dem', 'eta_boi', 'chp_inv', 'gamma']:
+                assert np.array_equal(dict_samples[parkey],
+                                      list_res[1][1][key][parkey])
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Pytest script for save_bulk_data
+"""
+from __future__ import division
+
+import os
+import copy
+import numpy as np
+import pytest
+import shapely.geometry.point as point
+
+import pycity_calc.toolbox.analyze.save_bulk_data as savbulk
+
+from pycity_calc.test.pycity_calc_fixtures import fixture_environment, \
+    fixture_city, fixture_detailed_building
+
+
+def add_buildings(city, building):
+    """
+    Add three copies of building to city and dummy energy balance results
+    to first building
+    """
+
+    for i in range(3):
+        build = copy.deepcopy(building)
+        city.add_extended_building(extended_building=build,
+                                   position=point.Point(0, i))
+
+    build = city.nodes[1001]['entity']
+    nb_timesteps = len(build.get_electric_power_curve())
+    build.dict_el_eb_res = {'grid_import_dem':
+                                build.get_electric_power_curve(),
+                            'pv_feed': np.zeros(nb_timesteps)}
+
+
+def check_save_and_load(city, file_format, save_dir):
+    """
+    Save bulk data of city in file_format, load it and compare to profiles
+    of city
+    """
+
+    dict_ref = savbulk.get_build_profiles(city=city)
+
+    save_path = os.path.join(save_dir, 'profiles')
+
+    path = savbulk.save_bulk_data(city=city, save_path=save_path,
+                                  file_format=file_format, chunk_size=5000)
+
+    assert path == save_path + savbulk.dict_ext[file_format]
+
+    dict_data = savbulk.load_bulk_data(path)
+
+    assert list(dict_data['node_ids']) == [1001, 1002, 1003]
+    assert np.allclose(dict_data['time'], dict_ref['time'])
+    for key in ['sh', 'el', 'dhw']:
+        assert np.allclose(dict_data[key], dict_ref[key])
+
+    assert np.allclose(dict_data['eb_grid_import_dem'][0],
+                       dict_ref['el'][0])
+    assert np.all(np.isnan(dict_data['eb_pv_feed'][1:]))
+
+
+class TestSaveBulkData(object):
+
+    def test_save_and_load_bulk_data(self, fixture_city,
+                                     fixture_detailed_building, tmpdir):
+
+        add_buildings(fixture_city, fixture_detailed_building)
+
+        dict_ref = savbulk.get_build_profiles(city=fixture_city)
+        nb_timesteps = len(dict_ref['time'])
+
+        assert list(dict_ref['node_ids']) == [1001, 1002, 1003]
+        assert dict_ref['sh'].shape == (3, nb_timesteps)
+        assert np.allclose(dict_ref['el'][1],
+                           fixture_city.nodes[1002][
+                               'entity'].get_electric_power_curve())
+
+        for file_format in ['npz', 'txt']:
+            check_save_and_load(city=fixture_city, file_format=file_format,
+                                save_dir=str(tmpdir))
+
+    def test_save_and_load_parquet(self, fixture_city,
+                                   fixture_detailed_building, tmpdir):
+
+        pytest.importorskip('pandas')
+        if not (savbulk._is_importable('pyarrow') or
+                savbulk._is_importable('fastparquet')):
+            pytest.skip('Requires pyarrow or fastparquet')
+
+        add_buildings(fixture_city, fixture_detailed_building)
+
+        check_save_and_load(city=fixture_city, file_format='parquet',
+                            save_dir=str(tmpdir))
+
+        if savbulk._is_importable('pyarrow'):
+            import pyarrow.parquet as pq
+
+            #  One row group per chunk of 5000 timesteps
+            nb_timesteps = len(savbulk.get_build_profiles(
+                city=fixture_city)['time'])
+            file = pq.ParquetFile(os.path.join(str(tmpdir),
+                                               'profiles.parquet'))
+            assert file.num_row_groups == int(np.ceil(nb_timesteps / 5000))
+
+    def test_save_and_load_hdf5(self, fixture_city,
+                                fixture_detailed_building, tmpdir):
+
+        pytest.importorskip('h5py')
+
+        add_buildings(fixture_city, fixture_detailed_building)
+
+        check_save_and_load(city=fixture_city, file_format='hdf5',
+                            save_dir=str(tmpdir))
+
+    def test_get_file_format(self):
+
+        assert savbulk.get_file_format('auto') in ['parquet', 'hdf5', 'npz']
+        assert savbulk.get_file_format('txt') == 'txt'
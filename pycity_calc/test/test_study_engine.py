@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Pytest script for study_engine
+"""
+from __future__ import division
+
+import numpy as np
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+import shapely.geometry.point as point
+
+import pycity_base.classes.supply.BES as BES
+
+import pycity_calc.energysystems.boiler as boil
+import pycity_calc.toolbox.mc_helpers.study_engine as stueng
+
+from pycity_calc.test.pycity_calc_fixtures import fixture_environment, \
+    fixture_city, fixture_building, fixture_apartment, fixture_th_demand, \
+    fixture_el_demand
+
+
+class StudyObject(object):
+    """
+    Simple study object with two parameters
+    """
+
+    def __init__(self):
+        self.a = 1
+        self.b = 1
+
+
+def eval_study_object(obj):
+    """
+    Linear test function, which fails for negative values of a
+    """
+
+    if obj.a < 0:
+        raise ValueError('Negative value')
+
+    return {'y': 2 * obj.a + 0.1 * obj.b}
+
+
+def gen_study_registry():
+    registry = stueng.ParameterRegistry()
+    registry.add_parameter(name='a', setter='a',
+                           dict_dist={'min_val': 0, 'max_val': 1})
+    registry.add_parameter(name='b', setter='b',
+                           dict_dist={'min_val': 0, 'max_val': 1})
+    return registry
+
+
+class TestStudyEngine(object):
+
+    def test_run_and_cache(self):
+
+        registry = gen_study_registry()
+
+        with pytest.raises(ValueError):
+            registry.add_parameter(name='a', setter='a')
+
+        assert np.allclose(registry.transform(np.array([[0.5, 0.25]])),
+                           [[0.5, 0.25]])
+
+        base_obj = StudyObject()
+        engine = stueng.StudyEngine(base_obj=base_obj, registry=registry,
+                                    evaluator=eval_study_object,
+                                    batch_size=2)
+
+        array_values = np.array([[1, 0], [0, 1], [1, 0], [0.5, 0.5]])
+
+        list_streamed = []
+        (dict_res, list_failed) = engine.run(
+            array_values,
+            callback=lambda idx, res: list_streamed.append(idx))
+
+        assert np.allclose(dict_res['y'], [2, 0.1, 2, 1.05])
+        assert sorted(list_streamed) == [0, 1, 2, 3]
+        assert list_failed == []
+        #  Duplicated row is only evaluated once, base object is unchanged
+        assert engine.nb_evals == 3
+        assert base_obj.a == 1
+
+        (dict_res, list_failed) = engine.run(array_values[:2])
+        assert engine.nb_evals == 3
+
+        #  Failed evaluations
+        engine.failure_exceptions = (ValueError,)
+        engine.failure_tolerance = 0.5
+        (dict_res, list_failed) = engine.run(np.array([[-1, 0], [1, 1]]))
+
+        assert list_failed == [0]
+        assert np.isnan(dict_res['y'][0])
+
+        with pytest.raises(stueng.StudyToleranceException):
+            engine.run(np.array([[-2, 0], [-3, 0], [1, 0.5]]))
+
+    def test_morris_and_sobol(self):
+
+        engine = stueng.StudyEngine(base_obj=StudyObject(),
+                                    registry=gen_study_registry(),
+                                    evaluator=eval_study_object)
+
+        design = stueng.gen_morris_design(nb_traj=5, nb_par=3, nb_levels=4,
+                                          seed=1)
+        assert design.shape == (20, 3)
+        #  Consecutive points differ in one parameter
+        for traj in design.reshape(5, 4, 3):
+            assert np.all(np.sum(np.diff(traj, axis=0) != 0, axis=1) == 1)
+
+        (array_values, dict_res, dict_morris) = \
+            engine.run_morris(nb_traj=10, seed=1)
+
+        assert array_values.shape == (30, 2)
+        #  Linear function has constant elementary effects (unit space)
+        assert np.allclose(dict_morris['y']['mu_star'], [1.5, 0.075])
+        assert np.allclose(dict_morris['y']['sigma'], 0)
+
+        (array_values, dict_res, dict_sobol) = \
+            engine.run_sobol_indices(nb_samples=256, seed=1)
+
+        assert array_values.shape == (256 * 4, 2)
+        s1_ref = np.array([4, 0.01]) / 4.01
+        assert np.allclose(dict_sobol['y']['S1'], s1_ref, atol=0.05)
+        assert np.allclose(dict_sobol['y']['ST'], s1_ref, atol=0.05)
+
+    def test_run_with_executor(self):
+
+        registry = gen_study_registry()
+
+        engine = stueng.StudyEngine(base_obj=StudyObject(),
+                                    registry=registry,
+                                    evaluator=eval_study_object)
+
+        (array_values, dict_res, list_failed) = \
+            engine.run_sampling(nb_samples=20, method='sobol', seed=1)
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            engine_par = stueng.StudyEngine(base_obj=StudyObject(),
+                                            registry=registry,
+                                            evaluator=eval_study_object,
+                                            executor=executor, batch_size=3)
+            (dict_res_par, list_failed) = engine_par.run(array_values)
+
+        assert np.allclose(dict_res['y'], dict_res_par['y'])
+
+    def test_building_par_setter(self, fixture_city, fixture_building):
+
+        bes = BES.BES(environment=fixture_city.environment)
+        bes.addDevice(boil.BoilerExtended(
+            environment=fixture_city.environment, q_nominal=10000, eta=0.9))
+        fixture_building.addEntity(bes)
+
+        n = fixture_city.add_extended_building(
+            extended_building=fixture_building, position=point.Point(0, 0))
+
+        sh_dem = fixture_building.get_annual_space_heat_demand()
+
+        registry = stueng.ParameterRegistry()
+        for par_name in ['eta_boi', 'sh_dem']:
+            registry.add_parameter(
+                name=par_name,
+                setter=stueng.BuildingParSetter(node_id=n, par_name=par_name,
+                                                city_path=''))
+
+        registry.apply(fixture_city, [0.8, 1.5])
+
+        build = fixture_city.nodes[n]['entity']
+        assert build.bes.boiler.eta == 0.8
+        assert abs(build.get_annual_space_heat_demand() - 1.5 * sh_dem) \
+               <= 0.001 * sh_dem
+
+        with pytest.raises(ValueError):
+            stueng.BuildingParSetter(node_id=n, par_name='unknown')
+
+    def test_mc_sample_setter(self):
+
+        obj = StudyObject()
+
+        registry = stueng.ParameterRegistry()
+        registry.add_parameter(
+            name='lhn_loss',
+            setter=stueng.McSampleSetter(par_name='lhn_loss'))
+        registry.add_parameter(
+            name='boi_inv_1001',
+            setter=stueng.McSampleSetter(par_name='boi_inv', node_id=1001))
+
+        registry.apply(obj, [0.9, 1.2])
+
+        dict_kwargs = stueng.CityEcoEvaluator._get_mc_kwargs(obj)
+
+        assert dict_kwargs['sampling_method'] == 'lhc'
+        assert dict_kwargs['dict_city_sample_lhc']['lhn_loss'][0] == 0.9
+        assert dict_kwargs['dict_city_sample_lhc']['lhn_inv'][0] == 1
+        assert dict_kwargs['dict_build_samples_lhc'][1001]['boi_inv'][0] \
+               == 1.2
+        assert dict_kwargs['dict_build_samples_lhc'][1001]['chp_inv'][0] \
+               == 1
+
+        assert stueng.CityEcoEvaluator._get_mc_kwargs(StudyObject()) == {}
+
+        with pytest.raises(ValueError):
+            stueng.McSampleSetter(par_name='boi_inv')
@@ -0,0 +1,22 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Pytest script for teaser_use
+"""
+from __future__ import division
+
+import sys
+import subprocess
+
+
+class TestTeaserUse(object):
+
+    def test_lazy_teaser_import(self):
+
+        #  Run in new interpreter to get unaffected sys.modules
+        code = 'import sys; ' \
+               'import pycity_calc.toolbox.teaser_usage.teaser_use as tusage; ' \
+               'assert tusage.Project is None; ' \
+               'assert "teaser" not in sys.modules'
+
+        subprocess.check_call([sys.executable, '-c', code])
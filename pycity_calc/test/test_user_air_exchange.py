@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Pytest script for user_air_exchange
+"""
+from __future__ import division
+
+import random
+import numpy as np
+
+import pycity_calc.toolbox.user.user_air_exchange as usair
+import pycity_calc.toolbox.profile_store as profsto
+
+
+class TestUserAirExchange(object):
+
+    def test_get_window_temp_bands(self):
+
+        temp = np.array([-5, 5, 12, 18, 22, 30])
+
+        bands = usair.get_window_temp_bands(temp_profile=temp, set_temp=20)
+
+        assert list(bands) == [0, 0, 1, 2, 3, 4]
+
+    def test_gen_user_air_ex_rate(self):
+
+        occ_profile = np.ones(8760)
+        temp_profile = np.ones(8760) * 5
+
+        #  Windows stay closed below 10 degree Celsius
+        air_ex = usair.gen_user_air_ex_rate(occ_profile=occ_profile,
+                                            temp_profile=temp_profile,
+                                            inf_rate=0.2)
+
+        assert len(air_ex) == 8760
+        assert np.allclose(air_ex, 0.2)
+
+        #  Same seed leads to same profile
+        temp_profile = np.ones(8760) * 26
+
+        random.seed(1)
+        air_ex_1 = usair.gen_user_air_ex_rate(occ_profile=occ_profile,
+                                              temp_profile=temp_profile)
+        random.seed(1)
+        air_ex_2 = usair.gen_user_air_ex_rate(occ_profile=occ_profile,
+                                              temp_profile=temp_profile)
+
+        assert np.array_equal(air_ex_1, air_ex_2)
+        assert max(air_ex_1) == 8.8
+
+    def test_gen_user_air_ex_rates(self):
+
+        temp_profile = np.ones(8760) * 15
+
+        list_occ_profiles = [np.ones(8760), np.zeros(8760), np.ones(8760)]
+
+        air_ex = usair.gen_user_air_ex_rates(
+            list_occ_profiles=list_occ_profiles, temp_profile=temp_profile,
+            seed=1)
+
+        assert air_ex.shape == (3, 8760)
+        assert np.allclose(air_ex[1], 0)
+        assert max(air_ex[0]) == 1.2
+        assert not np.array_equal(air_ex[0], air_ex[2])
+
+        #  Stationary share of partially opened windows below 16 degree C
+        #  is 0.2 / (0.2 + 0.85)
+        assert abs(np.mean(air_ex[[0, 2]]) / 1.2 - 0.2 / 1.05) < 0.02
+
+        air_ex_2 = usair.gen_user_air_ex_rates(
+            list_occ_profiles=list_occ_profiles, temp_profile=temp_profile,
+            seed=1)
+
+        assert np.array_equal(air_ex, air_ex_2)
+
+        #  Cached temperature profile of profile store leads to same results
+        store = profsto.ProfileStore()
+        for i in range(2):
+            air_ex_3 = usair.gen_user_air_ex_rates(
+                list_occ_profiles=list_occ_profiles,
+                temp_profile=temp_profile, seed=1, profile_store=store)
+
+            assert np.array_equal(air_ex, air_ex_3)
+
+        #  Without rng and seed, legacy numpy random state is used
+        np.random.seed(3)
+        air_ex_4 = usair.gen_user_air_ex_rates(
+            list_occ_profiles=list_occ_profiles, temp_profile=temp_profile)
+        np.random.seed(3)
+        air_ex_5 = usair.gen_user_air_ex_rates(
+            list_occ_profiles=list_occ_profiles, temp_profile=temp_profile)
+
+        assert np.array_equal(air_ex_4, air_ex_5)
+
+        #  Direct output with 900 s timestep (mean of 5 minute values)
+        air_ex_900 = usair.gen_user_air_ex_rates(
+            list_occ_profiles=list_occ_profiles, temp_profile=temp_profile,
+            rng=np.random.default_rng(2), timestep=900, inf_rate=0.1)
+
+        assert air_ex_900.shape == (3, 35040)
+        assert np.allclose(air_ex_900[1], 0.1)
+        assert abs(np.mean(air_ex_900[0] - 0.1) / 1.2 - 0.2 / 1.05) < 0.02
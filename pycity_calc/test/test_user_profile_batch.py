@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Pytest script for user_profile_batch
+"""
+from __future__ import division
+
+import numpy as np
+
+import pycity_calc.toolbox.user.user_profile_batch as upbatch
+
+from pycity_calc.test.pycity_calc_fixtures import fixture_environment
+
+
+class TestUserProfileBatch(object):
+
+    def test_get_weekend_days(self):
+
+        array_we = upbatch.get_weekend_days(nb_days=8, initial_day=1)
+
+        assert list(np.where(array_we)[0]) == [5, 6]
+
+    def test_gen_occ_profiles(self):
+
+        array_nb_occ = np.array([1, 3, 5])
+
+        occ_profiles = upbatch.gen_occ_profiles(array_nb_occ=array_nb_occ,
+                                                nb_days=7, seed=1)
+
+        assert occ_profiles.shape == (3, 7 * 144)
+        assert np.all(occ_profiles >= 0)
+        assert np.all(occ_profiles <= array_nb_occ[:, np.newaxis])
+
+        #  Reproducible with seed
+        occ_profiles_2 = upbatch.gen_occ_profiles(array_nb_occ=array_nb_occ,
+                                                  nb_days=7, seed=1)
+        assert np.array_equal(occ_profiles, occ_profiles_2)
+
+    def test_gen_el_profiles(self):
+
+        nb_days = 7
+        array_nb_occ = np.array([2, 2, 4])
+
+        occ_profiles = upbatch.gen_occ_profiles(array_nb_occ=array_nb_occ,
+                                                nb_days=nb_days, seed=2)
+
+        #  Simple irradiance profile (hourly)
+        irradiance = np.tile(np.maximum(0, 500 * np.sin(
+            np.pi * (np.arange(24) - 6) / 12)), nb_days)
+
+        el_profiles = upbatch.gen_el_profiles(occ_profiles=occ_profiles,
+                                              array_nb_occ=array_nb_occ,
+                                              irradiance=irradiance,
+                                              timestep=3600,
+                                              annual_demands=3000,
+                                              do_normalization=True,
+                                              seed=3)
+
+        assert el_profiles.shape == (3, nb_days * 24)
+        assert np.all(el_profiles >= 0)
+        #  Normalized to annual demand in kWh
+        assert np.allclose(np.sum(el_profiles, axis=1) / 1000, 3000)
+
+        #  Sum up profiles per group
+        el_groups = upbatch.gen_el_profiles(occ_profiles=occ_profiles,
+                                            array_nb_occ=array_nb_occ,
+                                            irradiance=irradiance,
+                                            timestep=3600,
+                                            annual_demands=3000,
+                                            do_normalization=True,
+                                            group_ids=[0, 0, 1],
+                                            seed=3)
+
+        assert el_groups.shape == (2, nb_days * 24)
+        assert np.allclose(el_groups[0], el_profiles[0] + el_profiles[1])
+        assert np.allclose(el_groups[1], el_profiles[2])
+
+    def test_gen_dhw_profiles(self):
+
+        nb_days = 7
+        array_nb_occ = np.array([1, 3])
+
+        occ_profiles = upbatch.gen_occ_profiles(array_nb_occ=array_nb_occ,
+                                                nb_days=nb_days, seed=4)
+
+        (water, heat) = \
+            upbatch.gen_dhw_profiles(occ_profiles=occ_profiles,
+                                     timestep=900, temp_diff=35,
+                                     daily_volumes=[50, 150], seed=5)
+
+        assert water.shape == (2, nb_days * 96)
+        assert heat.shape == (2, nb_days * 96)
+
+        #  Rescaled to daily hot water volumes in liters
+        assert np.allclose(np.sum(water, axis=1) * 900 / 3600 / nb_days,
+                           [50, 150])
+        assert np.all(heat[water == 0] == 0)
+
+    def test_gen_apartment_profiles(self, fixture_environment):
+
+        dict_profiles = \
+            upbatch.gen_apartment_profiles(environment=fixture_environment,
+                                           array_nb_occ=[1, 2, 3, 4],
+                                           annual_el_demands=2500,
+                                           do_normalization=True,
+                                           dhw_volumes=100,
+                                           group_ids=[0, 0, 0, 0],
+                                           seed=6)
+
+        nb_timesteps = fixture_environment.timer.timestepsTotal
+
+        assert dict_profiles['occ'].shape == (4, 365 * 144)
+        assert dict_profiles['el'].shape == (1, nb_timesteps)
+        assert dict_profiles['dhw_heat'].shape == (1, nb_timesteps)
+
+        timestep = fixture_environment.timer.timeDiscretization
+        el_dem = np.sum(dict_profiles['el']) * timestep / (3600 * 1000)
+        assert abs(el_dem - 4 * 2500) < 1e-6
+        dhw_vol = np.sum(dict_profiles['dhw_water']) * timestep / 3600
+        assert abs(dhw_vol - 4 * 100 * 365) < 1e-6
@@ -0,0 +1,451 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Bulk export of building load profiles (space heating, electric, hot water)
+and electric energy balance results of all buildings of a city object into
+a single, columnar file.
+
+Supported file formats:
+- 'parquet': Wide table (one column per building and profile type, e.g.
+  sh_1001), written chunk by chunk in row groups with compression (requires
+  pandas and pyarrow or fastparquet)
+- 'hdf5': One 2d dataset (nb_buildings x nb_timesteps) per profile type,
+  chunked and gzip compressed (requires h5py)
+- 'npz': One 2d array per profile type in compressed numpy archive (always
+  available)
+- 'txt': Wide, tab separated text file, written chunk-wise (always
+  available, but large and slow)
+
+With file_format='auto', the first available format out of parquet, hdf5 and
+npz is used.
+"""
+from __future__ import division
+
+import os
+import importlib
+import numpy as np
+
+#  File extensions of supported formats
+dict_ext = {'parquet': '.parquet', 'hdf5': '.h5', 'npz': '.npz',
+            'txt': '.txt'}
+
+
+def get_build_profiles(city, list_ids=None, dtype=np.float64):
+    """
+    Returns load profiles of buildings as 2d arrays (preallocated, one row
+    per building)
+
+    Parameters
+    ----------
+    city : object
+        City object of pyCity_calc
+    list_ids : list (of ints), optional
+        List of building node ids (default: None). If None, uses all
+        building entities of city.
+    dtype : np.dtype, optional
+        Data type of profile arrays (default: np.float64)
+
+    Returns
+    -------
+    dict_data : dict
+        Dictionary with keys 'node_ids' (array of building node ids),
+        'time' (time array in seconds) and 'sh', 'el', 'dhw' (2d arrays with
+        space heating, electric and hot water power in Watt, shape
+        (nb_buildings, nb_timesteps))
+    """
+
+    if list_ids is None:
+        list_ids = city.get_list_build_entity_node_ids()
+
+    timestep = city.environment.timer.timeDiscretization
+    nb_timesteps = int(365 * 24 * 3600 / timestep)
+
+    dict_data = {'node_ids': np.array(list_ids, dtype=np.int64),
+                 'time': np.arange(0, nb_timesteps * timestep, timestep)}
+
+    for key in ['sh', 'el', 'dhw']:
+        dict_data[key] = np.zeros((len(list_ids), nb_timesteps), dtype=dtype)
+
+    for i in range(len(list_ids)):
+        build = city.nodes[list_ids[i]]['entity']
+
+        dict_data['sh'][i] = build.get_space_heating_power_curve()
+        dict_data['el'][i] = build.get_electric_power_curve()
+        dict_data['dhw'][i] = build.get_dhw_power_curve()
+
+    return dict_data
+
+
+def get_build_eb_results(city, list_ids=None, dtype=np.float64):
+    """
+    Returns electric energy balance results (dict_el_eb_res of buildings,
+    e.g. grid_import_dem, chp_feed, pv_feed) as 2d arrays. Requires
+    energy balance calculation of city (see city_eb_calc). Buildings without
+    results (or without specific result) are filled with np.nan.
+
+    Parameters
+    ----------
+    city : object
+        City object of pyCity_calc
+    list_ids : list (of ints), optional
+        List of building node ids (default: None). If None, uses all
+        building entities of city.
+    dtype : np.dtype, optional
+        Data type of result arrays (default: np.float64)
+
+    Returns
+    -------
+    dict_data : dict
+        Dictionary with keys 'eb_' + result name and 2d result arrays in
+        Watt (shape (nb_buildings, nb_timesteps)) as values. Empty, if no
+        building holds energy balance results.
+    """
+
+    if list_ids is None:
+        list_ids = city.get_list_build_entity_node_ids()
+
+    timestep = city.environment.timer.timeDiscretization
+    nb_timesteps = int(365 * 24 * 3600 / timestep)
+
+    dict_data = {}
+
+    for i in range(len(list_ids)):
+        build = city.nodes[list_ids[i]]['entity']
+
+        dict_el_eb_res = getattr(build, 'dict_el_eb_res', None)
+        if dict_el_eb_res is None:
+            continue
+
+        for key in sorted(dict_el_eb_res.keys()):
+            res = dict_el_eb_res[key]
+            if np.ndim(res) != 1 or len(res) != nb_timesteps:
+                continue
+
+            name = 'eb_' + key
+            if name not in dict_data:
+                dict_data[name] = np.zeros((len(list_ids), nb_timesteps),
+                                           dtype=dtype) * np.nan
+
+            dict_data[name][i] = res
+
+    return dict_data
+
+
+def _get_profile_keys(dict_data):
+    """
+    Returns sorted list of profile keys (2d arrays) of dict_data
+    """
+
+    list_keys = [key for key in ['sh', 'el', 'dhw'] if key in dict_data]
+    list_keys += sorted([key for key in dict_data.keys()
+                         if key not in list_keys + ['node_ids', 'time']])
+
+    return list_keys
+
+
+def _is_importable(module_name):
+    """
+    Returns True, if module can be imported
+    """
+
+    try:
+        importlib.import_module(module_name)
+        return True
+    except ImportError:
+        return False
+
+
+def get_file_format(file_format='auto'):
+    """
+    Returns usable file format
+
+    Parameters
+    ----------
+    file_format : str, optional
+        Requested file format (default: 'auto').
+        Options: 'auto', 'parquet', 'hdf5', 'npz', 'txt'
+        If 'auto', returns first available format out of parquet, hdf5 and
+        npz.
+
+    Returns
+    -------
+    file_format : str
+        Usable file format
+    """
+
+    if file_format not in ['auto', 'parquet', 'hdf5', 'npz', 'txt']:
+        msg = 'Unknown file_format ' + str(file_format) + '. Options are ' \
+              'auto, parquet, hdf5, npz and txt.'
+        raise ValueError(msg)
+
+    if file_format in ['auto', 'parquet']:
+        if _is_importable('pandas') and (_is_importable('pyarrow') or
+                                         _is_importable('fastparquet')):
+            return 'parquet'
+        elif file_format == 'parquet':
+            msg = 'Saving as parquet requires pandas and pyarrow or ' \
+                  'fastparquet. Please install via pip.'
+            raise ImportError(msg)
+
+    if file_format in ['auto', 'hdf5']:
+        if _is_importable('h5py'):
+            return 'hdf5'
+        elif file_format == 'hdf5':
+            msg = 'Saving as hdf5 requires h5py. Please install via pip.'
+            raise ImportError(msg)
+
+    if file_format == 'auto':
+        return 'npz'
+
+    return file_format
+
+
+def _save_parquet(save_path, dict_data, list_keys, chunk_size, compress):
+    """
+    Save wide table chunk by chunk (one row group per chunk of timesteps)
+    as parquet file with pyarrow or fastparquet
+    """
+
+    import pandas as pd
+
+    node_ids = dict_data['node_ids']
+    time_array = dict_data['time']
+
+    list_columns = ['time']
+    for key in list_keys:
+        for i in range(len(node_ids)):
+            list_columns.append(key + '_' + str(node_ids[i]))
+
+    def get_chunk(start, stop):
+        dict_columns = {'time': time_array[start:stop]}
+        for key in list_keys:
+            for i in range(len(node_ids)):
+                dict_columns[key + '_' + str(node_ids[i])] = \
+                    dict_data[key][i, start:stop]
+        return pd.DataFrame(dict_columns, columns=list_columns)
+
+    list_starts = range(0, len(time_array), chunk_size)
+
+    if _is_importable('pyarrow'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for start in list_starts:
+                table = pa.Table.from_pandas(
+                    get_chunk(start, start + chunk_size),
+                    preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(
+                        save_path, table.schema,
+                        compression='snappy' if compress else 'none')
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    else:
+        import fastparquet
+
+        for start in list_starts:
+            fastparquet.write(save_path, get_chunk(start, start + chunk_size),
+                              compression='SNAPPY' if compress else None,
+                              write_index=False, append=start > 0)
+
+
+def save_bulk_data(city, save_path, file_format='auto', list_ids=None,
+                   with_eb_res=True, dtype=np.float64, chunk_size=8760,
+                   compress=True):
+    """
+    Save load profiles (and electric energy balance results) of all buildings
+    of city into single file.
+
+    Parameters
+    ----------
+    city : object
+        City object of pyCity_calc
+    save_path : str
+        Path to save file to. File extension is set according to used file
+        format (e.g. city_profiles.npz)
+    file_format : str, optional
+        File format (default: 'auto').
+        Options: 'auto', 'parquet', 'hdf5', 'npz', 'txt'
+        (see get_file_format)
+    list_ids : list (of ints), optional
+        List of building node ids (default: None). If None, uses all
+        building entities of city.
+    with_eb_res : bool, optional
+        Defines, if electric energy balance results (dict_el_eb_res) of
+        buildings should be saved, too (default: True)
+    dtype : np.dtype, optional
+        Data type of saved profiles (default: np.float64). np.float32 halves
+        file size.
+    chunk_size : int, optional
+        Number of timesteps per chunk / row group (default: 8760)
+    compress : bool, optional
+        Defines, if data should be compressed (default: True). Ignored for
+        txt.
+
+    Returns
+    -------
+    save_path : str
+        Path of saved file
+    """
+
+    file_format = get_file_format(file_format=file_format)
+
+    save_path = os.path.splitext(save_path)[0] + dict_ext[file_format]
+
+    dict_data = get_build_profiles(city=city, list_ids=list_ids, dtype=dtype)
+
+    if with_eb_res:
+        dict_data.update(get_build_eb_results(city=city, list_ids=list_ids,
+                                              dtype=dtype))
+
+    save_dir = os.path.dirname(save_path)
+    if save_dir != '' and not os.path.exists(save_dir):
+        os.makedirs(save_dir)
+
+    list_keys = _get_profile_keys(dict_data)
+    node_ids = dict_data['node_ids']
+    time_array = dict_data['time']
+
+    if file_format == 'parquet':
+        _save_parquet(save_path=save_path, dict_data=dict_data,
+                      list_keys=list_keys, chunk_size=chunk_size,
+                      compress=compress)
+
+    elif file_format == 'hdf5':
+        import h5py
+
+        if compress:
+            compression = 'gzip'
+        else:
+            compression = None
+
+        with h5py.File(save_path, mode='w') as file:
+            file.create_dataset('node_ids', data=node_ids)
+            file.create_dataset('time', data=time_array)
+            for key in list_keys:
+                chunks = (max(1, min(len(node_ids), 64)),
+                          min(chunk_size, len(time_array)))
+                file.create_dataset(key, data=dict_data[key],
+                                    chunks=chunks if len(node_ids) else None,
+                                    compression=compression)
+
+    elif file_format == 'npz':
+        if compress:
+            np.savez_compressed(save_path, **dict_data)
+        else:
+            np.savez(save_path, **dict_data)
+
+    elif file_format == 'txt':
+        header = 'time'
+        for key in list_keys:
+            for i in range(len(node_ids)):
+                header += '\t' + key + '_' + str(node_ids[i])
+
+        with open(save_path, mode='wb') as file:
+            file.write((header + '\n').encode('utf-8'))
+
+            #  Write chunk-wise to limit memory usage of (wide) text output
+            for start in range(0, len(time_array), chunk_size):
+                stop = min(start + chunk_size, len(time_array))
+
+                chunk = np.zeros((stop - start,
+                                  1 + len(list_keys) * len(node_ids)))
+                chunk[:, 0] = time_array[start:stop]
+                for j in range(len(list_keys)):
+                    chunk[:, 1 + j * len(node_ids):
+                             1 + (j + 1) * len(node_ids)] = \
+                        dict_data[list_keys[j]][:, start:stop].T
+
+                np.savetxt(file, chunk, delimiter='\t')
+
+    return save_path
+
+
+def load_bulk_data(path):
+    """
+    Load bulk data file, saved with save_bulk_data
+
+    Parameters
+    ----------
+    path : str
+        Path to bulk data file (.parquet, .h5, .npz or .txt)
+
+    Returns
+    -------
+    dict_data : dict
+        Dictionary with keys 'node_ids', 'time' and 2d arrays with shape
+        (nb_buildings, nb_timesteps) per profile type (e.g. 'sh', 'el',
+        'dhw', 'eb_grid_import_dem')
+    """
+
+    ext = os.path.splitext(path)[1]
+
+    if ext == dict_ext['npz']:
+        with np.load(path) as file:
+            return dict((key, file[key]) for key in file.files)
+
+    elif ext == dict_ext['hdf5']:
+        import h5py
+
+        with h5py.File(path, mode='r') as file:
+            return dict((key, file[key][()]) for key in file.keys())
+
+    if ext == dict_ext['parquet']:
+        import pandas as pd
+
+        df = pd.read_parquet(path)
+        list_columns = list(df.columns)
+        dict_columns = dict((name, df[name].values) for name in list_columns)
+
+    elif ext == dict_ext['txt']:
+        with open(path, mode='r') as file:
+            list_columns = file.readline().strip().split('\t')
+
+        data = np.loadtxt(path, delimiter='\t', skiprows=1, ndmin=2)
+        dict_columns = dict((list_columns[j], data[:, j])
+                            for j in range(len(list_columns)))
+
+    else:
+        msg = 'Unknown file extension ' + str(ext) + ' of path ' + str(path)
+        raise ValueError(msg)
+
+    #  Regroup wide table columns (key_id) to 2d arrays
+    dict_data = {'time': dict_columns['time']}
+    list_ids = []
+    dict_key_cols = {}
+    for name in list_columns[1:]:
+        (key, node_id) = name.rsplit('_', 1)
+        if int(node_id) not in list_ids:
+            list_ids.append(int(node_id))
+        dict_key_cols.setdefault(key, []).append(name)
+
+    dict_data['node_ids'] = np.array(list_ids, dtype=np.int64)
+    for key in dict_key_cols:
+        dict_data[key] = np.vstack([dict_columns[name]
+                                    for name in dict_key_cols[key]])
+
+    return dict_data
+
+
+if __name__ == '__main__':
+    import pycity_calc.examples.example_city as excity
+
+    this_path = os.path.dirname(os.path.abspath(__file__))
+
+    #  Generate city object via example_city.py run (3 buildings)
+    city = excity.run_example()
+
+    out_path = os.path.join(this_path, 'output', 'example_city_profiles')
+
+    path = save_bulk_data(city=city, save_path=out_path, file_format='auto')
+
+    print('Saved building profiles to ' + str(path))
+
+    dict_data = load_bulk_data(path)
+    for key in sorted(dict_data.keys()):
+        print(key, dict_data[key].shape)
@@ -21,6 +21,8 @@ except:
           'pip or set save_as_xlsx to False.'
     warnings.warn(msg)
 
+import pycity_calc.toolbox.analyze.save_bulk_data as savbulk
+
 
 def save_city_data_to_file(city, save_path, with_esys=False,
                            use_german=False, save_as_xlsx=False):
@@ -287,48 +289,25 @@ def extract_and_save_building_load_profiles(city, save_path):
         City object of pycity_calc
     save_path : str
         Path to save file to
-    """
-
-    nb_buildings = city.get_nb_of_building_entities()
-
-    #  Nb. columns 1 + 3 * nb_buildings
-
-    timestep = city.environment.timer.timeDiscretization
-
-    nb_timesteps = 365 * 24 * 3600 / timestep
-    print(nb_timesteps)
-
-    time_array = np.arange(start=0, stop=nb_timesteps*timestep, step=timestep)
-
-    list_processed_ids = []
-
-    for n in city.nodes():
-
-        #  If node holds attribute 'node_type'
-        if 'node_type' in city.nodes[n]:
 
-            #  If node_type is building
-            if city.nodes[n]['node_type'] == 'building':
-
-                if 'entity' in city.nodes[n]:
-
-                    #  If entity is kind building
-                    if city.nodes[n]['entity']._kind == 'building':
-
-                        curr_b = city.nodes[n]['entity']
-
-                        sh_curve = curr_b.get_space_heating_power_curve()
-                        time_array = np.vstack((time_array, sh_curve))
-
-                        el_curve = curr_b.get_electric_power_curve()
-                        time_array = np.vstack((time_array, el_curve))
+    See also
+    --------
+    save_bulk_data.save_bulk_data : Compressed, columnar export (parquet,
+        hdf5, npz) of profiles and energy balance results of all buildings
+    """
 
-                        dhw_curve = curr_b.get_dhw_power_curve()
-                        time_array = np.vstack((time_array, dhw_curve))
+    #  Profiles of all buildings as (nb_buildings x nb_timesteps) arrays
+    dict_data = savbulk.get_build_profiles(city=city)
 
-                        list_processed_ids.append(n)
+    list_processed_ids = list(dict_data['node_ids'])
 
-    res_array = np.transpose(time_array)
+    #  Nb. columns 1 + 3 * nb_buildings (sh, el, dhw per building)
+    res_array = np.zeros((len(dict_data['time']),
+                          1 + 3 * len(list_processed_ids)))
+    res_array[:, 0] = dict_data['time']
+    res_array[:, 1::3] = dict_data['sh'].T
+    res_array[:, 2::3] = dict_data['el'].T
+    res_array[:, 3::3] = dict_data['dhw'].T
 
     #  Generate header
     header = 'Time in seconds\t'
@@ -340,8 +319,6 @@ def extract_and_save_building_load_profiles(city, save_path):
     for elem in list_processed_ids:
         header += 'Space heating in W\tEl. power in W\tHot water power in W\t'
 
-    print(header)
-
     np.savetxt(save_path, res_array, delimiter='\t', header=header)
 
 
@@ -22,6 +22,7 @@ except:
 import pycity_calc.visualization.city_visual as citvis
 import pycity_calc.cities.scripts.city_generator.city_generator as citgen
 import pycity_calc.toolbox.analyze.save_city_data as savcit
+import pycity_calc.toolbox.analyze.save_bulk_data as savbulk
 
 
 def gen_path_if_not_existent(dir):
@@ -242,13 +243,9 @@ def extract_build_profiles(city, id, file_path, do_plot=False,
     year_in_seconds = 365 * 24 * 3600
     time_array = np.arange(0, year_in_seconds, timestep)
 
-    #  Stack results together
-    res_array = np.vstack((time_array, sh_profile))
-    res_array = np.vstack((res_array, el_profile))
-    res_array = np.vstack((res_array, dhw_profile))
-
-    #  Transpose array
-    res_array = np.transpose(res_array)
+    #  Stack results together (one column per profile)
+    res_array = np.column_stack((time_array, sh_profile, el_profile,
+                                 dhw_profile))
 
     #  Define header
     if use_german:
@@ -597,13 +594,9 @@ def extract_city_profiles(city, city_path, do_plot, use_german=False,
     year_in_seconds = 365 * 24 * 3600
     time_array = np.arange(0, year_in_seconds, timestep)
 
-    #  Stack results together
-    res_array = np.vstack((time_array, sh_profile))
-    res_array = np.vstack((res_array, el_profile))
-    res_array = np.vstack((res_array, dhw_profile))
-
-    #  Transpose array
-    res_array = np.transpose(res_array)
+    #  Stack results together (one column per profile)
+    res_array = np.column_stack((time_array, sh_profile, el_profile,
+                                 dhw_profile))
 
     if use_german:
         #  Define header
@@ -811,7 +804,8 @@ def extract_city_data(city, out_path, do_plot=False, use_german=False,
 
 
 def extract_city_n_build_data(city, out_path, use_german=False,
-                              save_tikz=False, save_as_xlsx=True):
+                              save_tikz=False, save_as_xlsx=True,
+                              bulk_format=None):
     """
 
     Parameters
@@ -828,10 +822,22 @@ def extract_city_n_build_data(city, out_path, use_german=False,
     save_as_xlsx : bool, optional
         Define, if load curves should also be saved as xlsx files
         (default: True)
+    bulk_format : str, optional
+        If not None, profiles and energy balance results of all buildings
+        are additionally saved into single file buildings_profiles.<ext>
+        within out_path (default: None).
+        Options: 'auto', 'parquet', 'hdf5', 'npz', 'txt'
+        (see save_bulk_data.save_bulk_data)
     """
     #  Get all building nodes
     list_ids = city.get_list_build_entity_node_ids()
 
+    if bulk_format is not None:
+        savbulk.save_bulk_data(city=city,
+                               save_path=os.path.join(out_path,
+                                                      'buildings_profiles'),
+                               file_format=bulk_format, list_ids=list_ids)
+
     #  Extract city data
     extract_city_data(city=city, out_path=out_path, do_plot=True,
                       use_german=use_german, save_tikz=save_tikz,
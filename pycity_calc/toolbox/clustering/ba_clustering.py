@@ -12,9 +12,10 @@ import matplotlib as mpl
 import matplotlib.colorbar
 import sys
 import pycity_calc.toolbox.networks.network_ops as netops
-from scipy.spatial import distance, ConvexHull, Delaunay
+from scipy.spatial import distance, ConvexHull, Delaunay, cKDTree
 #  Annotation: convex hull only works for clusters with more than 3 buildings
 from operator import itemgetter
+from collections import Counter
 from copy import deepcopy
 
 def centeroidnp(arr):
@@ -53,85 +54,214 @@ def distance_neighbor_ok(district, b10, b20, b15, b25, d_neighbor, mode):
 
     return dst_ok
 
+
+class DisjointSet(object):
+    """
+    Disjoint-set (union-find) structure with path compression and union by
+    size. Elements are the integers 0, ..., n - 1.
+    """
+
+    def __init__(self, n):
+        """
+        Constructor of disjoint-set
+
+        Parameters
+        ----------
+        n : int
+            Number of elements
+        """
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, i):
+        """
+        Returns root element of set, which holds element i
+
+        Parameters
+        ----------
+        i : int
+            Element
+
+        Returns
+        -------
+        root : int
+            Root element of set
+        """
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        #  Path compression
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, i, j):
+        """
+        Merge sets holding elements i and j
+
+        Parameters
+        ----------
+        i : int
+            Element 1
+        j : int
+            Element 2
+        """
+        root_i = self.find(i)
+        root_j = self.find(j)
+        if root_i == root_j:
+            return
+        if self.size[root_i] < self.size[root_j]:
+            root_i, root_j = root_j, root_i
+        self.parent[root_j] = root_i
+        self.size[root_i] += self.size[root_j]
+
+
+def get_node_coords(district, nodelist):
+    """
+    Returns x-/y-coordinates of nodes as numpy array
+
+    Parameters
+    ----------
+    district:   uesgraph
+    nodelist:   list of node ids
+
+    Returns
+    -------
+    coords:     np.array (len(nodelist) x 2) with x- and y-coordinates
+    """
+    coords = np.zeros((len(nodelist), 2))
+    for i in range(len(nodelist)):
+        pos = district.nodes[nodelist[i]]['position']
+        coords[i, 0] = pos.x
+        coords[i, 1] = pos.y
+    return coords
+
+
+def find_neighbor_pairs(district, buildings, d_neighbor, mode='street'):
+    """
+    Find all pairs of neighbored buildings with KD-tree search. Neighborhood
+    is defined as in distance_neighbor_ok.
+
+    Parameters
+    ----------
+    district:   uesgraph
+    buildings:  building_list
+    d_neighbor: max. distance between neighbored buildings
+    mode:       'building' or 'street'
+
+    Returns
+    -------
+    pairs:      np.array (n_pairs x 2) with sorted pairs of positions in
+                buildings (i < j)
+    """
+    if mode not in ['building', 'street']:
+        return np.zeros((0, 2), dtype=int)
+    if len(buildings) < 2:
+        return np.zeros((0, 2), dtype=int)
+
+    str_coords = get_node_coords(district, [b[5] for b in buildings])
+
+    #  KD-tree search is inclusive (<=), distance_neighbor_ok uses <
+    pairs = cKDTree(str_coords).query_pairs(r=d_neighbor,
+                                            output_type='ndarray')
+    pairs = pairs[np.linalg.norm(str_coords[pairs[:, 0]] -
+                                 str_coords[pairs[:, 1]], axis=1)
+                  < d_neighbor]
+
+    if mode == 'building':
+        b_coords = get_node_coords(district, [b[0] for b in buildings])
+        pairs = pairs[np.linalg.norm(b_coords[pairs[:, 0]] -
+                                     b_coords[pairs[:, 1]], axis=1)
+                      < d_neighbor]
+
+    return pairs
+
+
 def grouping(district, buildings, d_neighbor, mode='street'):
     """
-    Find groups of nodes (buildings) in district by looping over list of buildings and find neighbors.
+    Find groups of nodes (buildings) in district by searching neighbors with
+    KD-tree and merging them with disjoint-set (union-find).
 
     Parameters
     ----------
     district:   uesgraph
     buildings:  building_list
     d_neighbor: float
+    mode:       'building' or 'street' (default: 'street')
 
     Returns
     -------
     groups: list of groups containing list of buildings (building_list)
     """
 
+    dis_set = DisjointSet(len(buildings))
+    for (b1, b2) in find_neighbor_pairs(district, buildings, d_neighbor,
+                                        mode=mode):
+        dis_set.union(int(b1), int(b2))
+
+    # collect groups (ordered by first building in building_list)
+    dict_groups = {}
+    for b in range(len(buildings)):
+        dict_groups.setdefault(dis_set.find(b), []).append(buildings[b])
+
     groups = []
-    for b1 in range(len(buildings)):
-        for b2 in range(b1 + 1, len(buildings)):
-            # distance between building nodes and building nodes on street < d_neighbor
-            # if (netops.calc_node_distance(quarter, buildings[b1][0], buildings[b2][0]) < d_neighbor) and \
-            # if (netops.calc_node_distance(district, buildings[b1][5], buildings[b2][5]) < d_neighbor):
-
-            if distance_neighbor_ok(district, buildings[b1][0], buildings[b2][0], buildings[b1][5], buildings[b2][5],
-                                    d_neighbor, mode):
-
-                # compare with existing groups
-                new = True
-                stop_b2 = False
-                count_b1 = 0
-                count_b2 = 0
-                # both buildings are in one group or different groups-------------------------------------------------------
-                for g in groups:
-                    if buildings[b1] in g and buildings[b2] in g:   # both buildings are already in one group
-                        stop_b2 = True
-                        break
-                    elif buildings[b1] in g:    # b1 is part of an existing group
-                        count_b1 += 1
-                        group1 = g
-                    elif buildings[b2] in g:    # b2 is part of another existing group
-                        count_b2 += 1
-                        group2 = g
-                if count_b1 == 1 and count_b2 == 1:     # both buildings are part of different groups
-                    # connect the two groups
-                    for i in group2:
-                        group1.append(i)    # add buildings of group2 to group1
-                    groups.remove(group2)   # delete old group2
-                elif stop_b2:
-                    continue    # go to next b2
-
-                # one building is grouped or both buildings were not grouped------------------------------------------------
-                else:
-                    for g in groups:
-                        if buildings[b1] in g:    # b1 already in group -> add b2
-                            g.append(buildings[b2])
-                            new = False
-                            break
-                        elif buildings[b2] in g:    # b2 already in group -> add b1
-                            g.append(buildings[b1])
-                            new = False
-                            break
+    single_groups = []
+    for g in dict_groups.values():
+        if len(g) > 1:
+            groups.append(g)
+        else:
+            single_groups.append(g)     # residual buildings as single group
 
-                    if new:     # both buildings were not grouped
-                        groups.append([buildings[b1], buildings[b2]])   # add new neighbors
+    return groups + single_groups
 
-    # add residual buildings as single group
-    for b in buildings:
-        g = 0
-        b_in_group = False
-        while g != len(groups):
-            if b in groups[g]:      # building in group
-                b_in_group = True
-                break
-            else:       # building not in group
-                b_in_group = False
-            g += 1
-        if not b_in_group:
-            groups.append([b])  # add building as single group
 
-    return groups
+def find_closest_streets(building_list, quarter, streetedges):
+    """
+    Find closest street edge and closest point on street for each building
+    (vectorized projection of building positions on all street edges).
+
+    Parameters
+    ----------
+    building_list:  building_list (position 4 holds position of building)
+    quarter:        uesgraph
+    streetedges:    list of street edges
+
+    Returns
+    -------
+    list_idx:   np.array with index of closest edge in streetedges per
+                building
+    x_min:      np.array with x-position of closest point on street
+    y_min:      np.array with y-position of closest point on street
+    """
+    streetedges = list(streetedges)
+    a = get_node_coords(quarter, [e[0] for e in streetedges])  # start points
+    u = get_node_coords(quarter, [e[1] for e in streetedges]) - a  # dir. vec.
+    u_sq = np.sum(u ** 2, axis=1)
+
+    list_idx = np.zeros(len(building_list), dtype=int)
+    x_min = np.zeros(len(building_list))
+    y_min = np.zeros(len(building_list))
+
+    # chunk buildings to limit memory usage (chunk x number of edges)
+    chunk = max(1, int(1e6 // max(len(streetedges), 1)))
+    for start in range(0, len(building_list), chunk):
+        p = np.array([[b[4].x, b[4].y]
+                      for b in building_list[start:start + chunk]])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lam = ((p[:, 0:1] - a[:, 0]) * u[:, 0] +
+                   (p[:, 1:2] - a[:, 1]) * u[:, 1]) / u_sq
+        lam = np.clip(np.nan_to_num(lam), 0, 1)  # degenerated edges -> 0
+        x_pos = a[:, 0] + lam * u[:, 0]
+        y_pos = a[:, 1] + lam * u[:, 1]
+        dis = np.sqrt((x_pos - p[:, 0:1]) ** 2 + (y_pos - p[:, 1:2]) ** 2)
+        idx = np.argmin(dis, axis=1)
+        rows = np.arange(len(p))
+        list_idx[start:start + len(p)] = idx
+        x_min[start:start + len(p)] = x_pos[rows, idx]
+        y_min[start:start + len(p)] = y_pos[rows, idx]
+
+    return list_idx, x_min, y_min
+
 
 def show_demand_map(quarter, building_list, dem):
     # plot streetnetwork
@@ -271,7 +401,6 @@ def get_clusters_street(district, street_type='real_simple', n_max=10, side_stre
     clusterlist = []   # list of clusters
     node_number_list = quarter.nodelist_building   # list of building node numbers belonging to buildings in city
     building_list = []    # list of all building objects
-    streetnodes = quarter.nodelist_street   # list of all street nodes in quarter
     street_graph = netops.get_street_subgraph(quarter)     # copy of street network of quarter
     streetedges = street_graph.edges()  # list of all street edges in quarter
     streetlist = []    # several streetedges form one street in streetlist
@@ -715,70 +844,35 @@ def get_clusters_street(district, street_type='real_simple', n_max=10, side_stre
     # Add building nodes on street
     print('------------------------------------\n')
     print('Find node on street for each building...')
-    streets = []
-    for i in range(len(streetedges)):  # every street gets a name
-        streets.append(100 + i)  # name street with a letter
-
-    x_start = {}
-    y_start = {}
-    x_end = {}
-    y_end = {}
-    a = 0
-    for i in streets:
-        x_start[i] = quarter.nodes[streetedges[a][0]]['position'].x     # get start x-position of node i
-        y_start[i] = quarter.nodes[streetedges[a][0]]['position'].y     # get start y-position of node i
-        x_end[i] = quarter.nodes[streetedges[a][1]]['position'].x       # get end x-position of node i
-        y_end[i] = quarter.nodes[streetedges[a][1]]['position'].y       # get end y-position of node i
-        a += 1
-
-    # find minimal distance from building to street & add node on street
-    xPos_min = {}
-    yPos_min = {}
-    dis = {}
+    streetedges = list(streetedges)
+
+    # find minimal distance from building to street (vectorized over streets)
+    list_idx, xPos_min, yPos_min = find_closest_streets(building_list, quarter,
+                                                        streetedges)
+
+    # index of streets in streetlist per edge
+    edge_streets = {}
+    for street in range(len(streetlist)):
+        if street_type == 'real' or street_type == 'real_simple':
+            for ed in streetlist[street][1]:
+                edge_streets.setdefault(ed, []).append(street)
+        elif street_type == 'normal':
+            edge_streets.setdefault(streetlist[street][1][0], []).append(street)
+
+    # add node on street
     for i in range(len(building_list)):
-        for n in streets:
-            a = [x_start[n], y_start[n]]  # start point street
-            u = [x_end[n] - x_start[n], y_end[n] - y_start[n]]  # direction vector street
-            p = [building_list[i][4].x, building_list[i][4].y]  # position of building
-            lam = (float((u[0] * (p[0] - a[0]) + u[1] * (p[1] - a[1])))
-                   / float((u[0] ** 2 + u[1] ** 2)))
-            if lam > 1:  # check boundary nodes, if optimum lays not in the range of street
-                lam = 1  # set lam = 1 to check upper boundary nodes
-            if lam < 0:
-                lam = 0  # set lam = 0 to check lower boundary nodes
-            xPos_min[n] = a[0] + lam * u[0]  # get x-position with minimum distance to building on street
-            yPos_min[n] = a[1] + lam * u[1]  # get y-position with minimum distance to building on street
-            dis[n] = math.sqrt(
-                (xPos_min[n] - building_list[i][4].x) ** 2 +  # solve distance between street point and building
-                (yPos_min[n] - building_list[i][4].y) ** 2)
-        next_str = min(dis, key=dis.get)  # find street with minimum distance to building i
+        next_str = 100 + list_idx[i]  # street with minimum distance to building i
         nn = int(str(99)+str(i)+str(next_str))    # name for new node
         # TODO: implement type 'building_street' to streetnetwork/quarter
         quarter.add_node(nn, node_type='building_street',
-                         position=point.Point(xPos_min[next_str], yPos_min[next_str]))   # add node on street
+                         position=point.Point(xPos_min[i], yPos_min[i]))   # add node on street
         building_list[i].append(nn)     # add node on street to building in building_list
 
         # save information in building_list and streetlist
-        next_node1 = [x_start[next_str], y_start[next_str]]
-        next_node2 = [x_end[next_str], y_end[next_str]]
-        for no in streetnodes:  # search for nodes with positions of next_str
-            if quarter.nodes[no]['position'] == point.Point(next_node1):
-                nd_one = no
-            elif quarter.nodes[no]['position'] == point.Point(next_node2):
-                nd_two = no
-        for ed in streetedges:  # search for edge with nodes of next_str
-            if nd_one in ed and nd_two in ed:
-                building_list[i].append(ed)  # add edge to building_list
-                break
-        for street in range(len(streetlist)):
-            if street_type == 'real' or street_type == 'real_simple':
-                if building_list[i][6] in streetlist[street][1]:
-                    building_list[i].append(streetlist[street][0])   # add streetnumber to building in building_list
-                    streetlist[street][3].append(i)    # add position in building_list to street in streetlist
-            elif street_type == 'normal':
-                if building_list[i][6] == streetlist[street][1][0]:
-                    building_list[i].append(streetlist[street][0])   # add streetnumber to building in building_list
-                    streetlist[street][3].append(i)    # add position in building_list to street in streetlist
+        building_list[i].append(streetedges[list_idx[i]])  # add edge to building_list
+        for street in edge_streets.get(building_list[i][6], []):
+            building_list[i].append(streetlist[street][0])   # add streetnumber to building in building_list
+            streetlist[street][3].append(i)    # add position in building_list to street in streetlist
 
         # add new edge between building node and building node on street
         quarter.add_edge(nn, building_list[i][0])
@@ -1090,8 +1184,7 @@ def get_clusters_demand(district, n_max=10, demand_mode='thermal', dst_center_mi
                               quarter.nodes[n]['position']])   # position of building
 
     # combine quarter with streetnetwork
-    streetnodes = quarter.nodelist_street  # list of all nodes in streetnetwork
-    streetedges = quarter.edges()  # list of all edges in streetnetwork
+    streetedges = list(quarter.edges())  # list of all edges in streetnetwork
     streetlist = []    # several streetedges form one street in streetlist
     streetnumber = 0
 
@@ -1102,68 +1195,33 @@ def get_clusters_demand(district, n_max=10, demand_mode='thermal', dst_center_mi
     #   #---------------------------------------------------------------------------------------------------------------
     # Add building nodes on street (code by Stefan)
     # Find shortest connection from building to an edge and add nodes and edge to quarter
-    streets = []
-    for i in range(len(streetedges)):  # every street gets a name
-        streets.append(100 + i)  # name street with a letter
-
-    x_start = {}
-    y_start = {}
-    x_end = {}
-    y_end = {}
-    a = 0
-    for i in streets:
-        x_start[i] = quarter.nodes[streetedges[a][0]]['position'].x     # get start x-position of node i
-        y_start[i] = quarter.nodes[streetedges[a][0]]['position'].y     # get start y-position of node i
-        x_end[i] = quarter.nodes[streetedges[a][1]]['position'].x       # get end x-position of node i
-        y_end[i] = quarter.nodes[streetedges[a][1]]['position'].y       # get end y-position of node i
-        a += 1
-
-    # find minimal distance from building to street
-    xPos_min = {}
-    yPos_min = {}
-    dis = {}
+
+    # find minimal distance from building to street (vectorized over streets)
+    list_idx, xPos_min, yPos_min = find_closest_streets(building_list, quarter,
+                                                        streetedges)
+
+    # index of streets in streetlist per edge
+    edge_streets = {}
+    for street in range(len(streetlist)):
+        edge_streets.setdefault(streetlist[street][1], []).append(street)
+
     nodelist_building_street = []
     for i in range(len(building_list)):
-        for n in streets:
-            a = [x_start[n], y_start[n]]  # start point street
-            u = [x_end[n] - x_start[n], y_end[n] - y_start[n]]  # direction vector street
-            p = [building_list[i][4].x, building_list[i][4].y]  # position of building
-            lam = (float((u[0] * (p[0] - a[0]) + u[1] * (p[1] - a[1])))
-                   / float((u[0] ** 2 + u[1] ** 2)))
-            if lam > 1:  # check boundary nodes, if optimum lays not in the range of street
-                lam = 1  # set lam = 1 to check upper boundary nodes
-            if lam < 0:
-                lam = 0  # set lam = 0 to check lower boundary nodes
-            xPos_min[n] = a[0] + lam * u[0]  # get x-position with minimum distance to building on street
-            yPos_min[n] = a[1] + lam * u[1]  # get y-position with minimum distance to building on street
-            dis[n] = math.sqrt(
-                (xPos_min[n] - building_list[i][4].x) ** 2 +  # solve distance between street point and building
-                (yPos_min[n] - building_list[i][4].y) ** 2)
-        next_str = min(dis, key=dis.get)  # find street with minimum distance to building i
+        next_str = 100 + list_idx[i]  # street with minimum distance to building i
         nn = int(str(99)+str(i)+str(next_str))    # name for new node
         nodelist_building_street.append(nn)
         # TODO: implement type 'building_street' in quarter
         # add node on street
         quarter.add_node(nn, node_type='building_street',
-                         position=point.Point(xPos_min[next_str], yPos_min[next_str]))
+                         position=point.Point(xPos_min[i], yPos_min[i]))
 
         # save information in building_list and streetlist
         building_list[i].append(nn)     # add building node on street to building in building_list
-        next_node1 = [x_start[next_str], y_start[next_str]]
-        next_node2 = [x_end[next_str], y_end[next_str]]
-        for no in streetnodes:  # search for nodes with positions of next_str
-            if quarter.nodes[no]['position'] == point.Point(next_node1):
-                nd_one = no
-            elif quarter.nodes[no]['position'] == point.Point(next_node2):
-                nd_two = no
-        for ed in streetedges:  # search for edge with nodes of next_str
-            if nd_one in ed and nd_two in ed:
-                building_list[i].append(ed)  # add edge to building_list
-                break
-        for street in range(len(streetlist)):
-            if building_list[i][6] == streetlist[street][1]:
-                building_list[i].append(streetlist[street][0])   # add streetnumber to building in building_list
-                streetlist[street][3].append(i)    # add position in building_list to street in streetlist
+        (nd_one, nd_two) = streetedges[list_idx[i]]
+        building_list[i].append(streetedges[list_idx[i]])  # add edge to building_list
+        for street in edge_streets.get(building_list[i][6], []):
+            building_list[i].append(streetlist[street][0])   # add streetnumber to building in building_list
+            streetlist[street][3].append(i)    # add position in building_list to street in streetlist
 
         # add edges from building node on street to next nodes and to building node to quarter (later: shortest_path)
         quarter.add_edge(nn, nd_one)
@@ -1206,12 +1264,11 @@ def get_clusters_demand(district, n_max=10, demand_mode='thermal', dst_center_mi
 
     if grouping_mode == 'street':
         # check nodes for n_max
+        count_pos = Counter(map(tuple, get_node_coords(
+            quarter, [b[5] for b in building_list])))
         for b1 in building_list:
-            count_nodes = 0
             pos = quarter.nodes[b1[5]]['position']
-            for b2 in building_list:
-                if quarter.nodes[b2[5]]['position'] == pos:
-                    count_nodes += 1
+            count_nodes = count_pos[(pos.x, pos.y)]
             if count_nodes > n_max:
                 warnings.warn('There are more than n_max nodes (' + str(count_nodes) + ') on same position on street! Try grouping_mode=building or set n_max to a higher value.')
                 sys.exit(1)
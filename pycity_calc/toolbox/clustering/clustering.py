@@ -739,6 +739,9 @@ class StreetCluster(object):
         str_node_dict = {}
         str_edge_dict = {}
 
+        #  Spatial index of street segments (reused for all buildings)
+        seg_index = netop.StreetSegmentIndex(self.street)
+
         #  Loop over all building nodes
         for i in range(len(self.city.nodelist_building)):
             node_id = self.city.nodelist_building[i]
@@ -750,7 +753,8 @@ class StreetCluster(object):
                     #  Find str node or edge closest to building node
                     closest_point, seg_point_1, seg_point_2 = \
                         netop.calc_graph_pos_closest_to(graph=self.street,
-                                                        target_point=build_pos)
+                                                        target_point=build_pos,
+                                                        seg_index=seg_index)
 
                     #  If closest point and segment end point are identical
                     #  Add only closest point
@@ -5,6 +5,12 @@ Requires city object with existing net space heating load curves on
 every building. Script calls TEASER VDI 6007 simulation core to
 calculate space heating energy demand for different retrofit states
 until simulated values is close to input value.
+
+Besides the linear search over all retrofit years, an ordered (bisection)
+search and a surrogate mode are available. The surrogate mode simulates one
+representative building per archetype and reuses its specific space heating
+demand per retrofit year (response surface) for every other building of the
+same archetype.
 """
 from __future__ import division
 import os
@@ -14,16 +20,353 @@ import pickle
 import numpy as np
 
 import pycity_base.classes.demand.Occupancy as occ
+import pycity_base.classes.demand.SpaceHeating as spheat
 
 import pycity_calc.toolbox.teaser_usage.teaser_use as teas_use
 
 
+def calc_sh_dem_vdi6007(building, t_set_heat=20, t_night=16,
+                        return_curve=False):
+    """
+    Calculate annual net space heating energy demand of building with
+    VDI 6007 simulation core of TEASER (with current mod_year of building).
+
+    Parameters
+    ----------
+    building : object
+        Building extended object instance of pycity_calc
+    t_set_heat : float, optional
+        Heating set temperature in degree Celsius (default: 20)
+    t_night : float, optional
+        Night setback temperature in degree Celsius (default: 16)
+    return_curve : bool, optional
+        Defines, if heating power curve in W should be returned, too
+        (default: False)
+
+    Returns
+    -------
+    sh_dem_vdi : float
+        Annual space heating net energy demand in kWh
+    heat_array : np.array (only, if return_curve is True)
+        Space heating power curve in W
+    """
+
+    #  Perfom VDI 6007 simulation of space heating load
+    (temp_in, q_heat_cool, q_in_wall, q_out_wall) = teas_use. \
+        calc_th_load_build_vdi6007_ex_build(exbuild=building,
+                                            add_th_load=False,
+                                            array_vent_rate=None,
+                                            vent_factor=0.5,
+                                            t_set_heat=t_set_heat,
+                                            t_set_cool=70,
+                                            t_night=t_night,
+                                            alpha_rad=None,
+                                            project_name='project',
+                                            build_name='build_name',
+                                            heat_lim_val=10000000,
+                                            cool_lim_val=10000000)
+
+    #  Extract heating, only
+    heat_array = np.clip(np.array(q_heat_cool, dtype=float), a_min=0,
+                         a_max=None)
+
+    timestep = building.environment.timer.timeDiscretization
+
+    # Energy sum in kWh
+    sh_dem_vdi = sum(heat_array) / (1000 * timestep/3600)
+
+    if sh_dem_vdi < 0.1:
+        msg = 'Building thermal space heating demand of' \
+              ' ' + str(sh_dem_vdi) + ' is too low!'
+        warnings.warn(msg)
+
+    if return_curve:
+        return (sh_dem_vdi, heat_array)
+    return sh_dem_vdi
+
+
+def search_closest_retro_year(list_retro_years, sh_ann_demand, calc_sh_dem,
+                              search_mode='linear', print_output=False):
+    """
+    Search year of retrofit with simulated space heating demand closest to
+    reference value.
+
+    Parameters
+    ----------
+    list_retro_years : list (of ints)
+        Sorted list of possible years of retrofit
+    sh_ann_demand : float
+        Annual space heating net energy demand in kWh (reference value)
+    calc_sh_dem : callable
+        Function, which returns simulated annual space heating demand in kWh
+        for given year of retrofit
+    search_mode : str, optional
+        Search mode (default: 'linear'). Options:
+        'linear' : Simulate every year of retrofit
+        'ordered' : Bisection search. Assumes space heating demand to be
+        non-increasing with year of retrofit. Skips years, which cannot
+        be closer to reference value. Requires
+        log2(len(list_retro_years)) + 1 simulations.
+    print_output : bool, optional
+        Defines, if output should be printed out (default: False)
+
+    Returns
+    -------
+    closest_r_year : int
+        Closest year of retrofit (None, if list_retro_years is empty)
+    dict_sh_dem : dict
+        Dictionary with years of retrofit as keys and simulated space heating
+        demands in kWh as values (only for simulated years)
+    """
+
+    assert search_mode in ['linear', 'ordered'], 'Unknown search_mode'
+
+    dict_sh_dem = {}
+
+    def get_sh_dem(retro_year):
+        if retro_year not in dict_sh_dem:
+            if print_output:
+                print('Current year of retrofit: ', retro_year)
+            dict_sh_dem[retro_year] = calc_sh_dem(retro_year)
+            if print_output:
+                print('Simulated space heating demand in kWh: ',
+                      dict_sh_dem[retro_year])
+                print('Difference to reference value:')
+                print(abs(dict_sh_dem[retro_year] - sh_ann_demand))
+                print()
+        return dict_sh_dem[retro_year]
+
+    if search_mode == 'linear':
+        list_cand = list_retro_years
+    else:
+        #  Find first year with demand <= reference value
+        low = 0
+        high = len(list_retro_years)
+        while low < high:
+            mid = (low + high) // 2
+            if get_sh_dem(list_retro_years[mid]) <= sh_ann_demand:
+                high = mid
+            else:
+                low = mid + 1
+        list_cand = list_retro_years[max(low - 1, 0):low + 1]
+
+    #  Dummy value for space heat closest to reference value
+    closest_vdi_sh = None
+    #  Dummy value for closest retrofit year
+    closest_r_year = None
+
+    for retro_year in list_cand:
+        sh_dem_vdi = get_sh_dem(retro_year)
+
+        #  Check if energy value is close to reference value
+        if closest_vdi_sh is None or \
+                abs(sh_ann_demand - sh_dem_vdi) < abs(sh_ann_demand -
+                                                      closest_vdi_sh):
+            closest_vdi_sh = sh_dem_vdi
+            closest_r_year = retro_year
+
+    return (closest_r_year, dict_sh_dem)
+
+
+class RetrofitSurrogate(object):
+    """
+    Response surface of specific annual space heating demand
+    (in kWh/m2 net floor area) over years of retrofit per building archetype.
+    Archetypes are defined by building attributes (e.g. build_type as usage,
+    build_year, nb_of_floors...). Surfaces are generated with VDI 6007
+    simulations of the first building of an archetype and reused for all
+    further buildings of the same archetype.
+    """
+
+    def __init__(self, list_retro_years=None, list_key_attr=None,
+                 t_set_heat=20, t_night=16):
+        """
+        Constructor of surrogate model for retrofit estimation
+
+        Parameters
+        ----------
+        list_retro_years : list (of ints), optional
+            List holding retrofit years, used for analysis (default: None).
+            If None, uses [1977, 1982, 1995, 2002, 2009, 2014]
+        list_key_attr : list (of str), optional
+            List of building attribute names, which define archetype
+            (default: None). If None, uses build_type, build_year,
+            nb_of_floors, residential_layout, neighbour_buildings, attic,
+            cellar, dormer and construction_type.
+        t_set_heat : float, optional
+            Heating set temperature in degree Celsius (default: 20)
+        t_night : float, optional
+            Night setback temperature in degree Celsius (default: 16)
+        """
+
+        if list_retro_years is None:
+            list_retro_years = [1977, 1982, 1995, 2002, 2009, 2014]
+        if list_key_attr is None:
+            list_key_attr = ['build_type', 'build_year', 'nb_of_floors',
+                             'residential_layout', 'neighbour_buildings',
+                             'attic', 'cellar', 'dormer', 'construction_type']
+
+        self.list_retro_years = sorted(list_retro_years)
+        self.list_key_attr = list_key_attr
+        self.t_set_heat = t_set_heat
+        self.t_night = t_night
+
+        #  Dict with archetype keys and dicts {retro_year: spec. demand}
+        self.dict_surfaces = {}
+
+    def get_key(self, building):
+        """
+        Returns archetype key of building
+
+        Parameters
+        ----------
+        building : object
+            Building extended object instance of pycity_calc
+
+        Returns
+        -------
+        key : tuple
+            Archetype key
+        """
+        return tuple(getattr(building, attr, None)
+                     for attr in self.list_key_attr)
+
+    def get_retro_years(self, building):
+        """
+        Returns list of years of retrofit, which are newer than build_year
+
+        Parameters
+        ----------
+        building : object
+            Building extended object instance of pycity_calc
+
+        Returns
+        -------
+        list_years : list (of ints)
+            List of possible years of retrofit
+        """
+        return [y for y in self.list_retro_years if y > building.build_year]
+
+    def calc_surface(self, building):
+        """
+        Calculate response surface for archetype of building (does not add
+        it to surrogate; see add_surface). Building is not modified.
+
+        Parameters
+        ----------
+        building : object
+            Building extended object instance of pycity_calc (representative
+            building of archetype with net_floor_area)
+
+        Returns
+        -------
+        dict_spec_dem : dict
+            Dictionary with years of retrofit as keys and specific space
+            heating demands in kWh/m2 as values
+        """
+
+        assert building.net_floor_area is not None
+        assert building.net_floor_area > 0
+
+        mod_year_org = building.mod_year
+
+        dict_spec_dem = {}
+        for retro_year in self.get_retro_years(building):
+            building.mod_year = retro_year
+            dict_spec_dem[retro_year] = \
+                calc_sh_dem_vdi6007(building, t_set_heat=self.t_set_heat,
+                                    t_night=self.t_night) / \
+                building.net_floor_area
+
+        building.mod_year = mod_year_org
+
+        return dict_spec_dem
+
+    def add_surface(self, building, dict_spec_dem=None):
+        """
+        Add response surface for archetype of building
+
+        Parameters
+        ----------
+        building : object
+            Building extended object instance of pycity_calc
+        dict_spec_dem : dict, optional
+            Precalculated surface (see calc_surface) (default: None).
+            If None, surface is calculated.
+        """
+        if dict_spec_dem is None:
+            dict_spec_dem = self.calc_surface(building)
+        self.dict_surfaces[self.get_key(building)] = dict_spec_dem
+
+    def has_surface(self, building):
+        """
+        Returns True, if response surface exists for archetype of building
+        """
+        return self.get_key(building) in self.dict_surfaces
+
+    def estimate_retro_year(self, building, sh_ann_demand):
+        """
+        Estimate year of retrofit of building with response surface of its
+        archetype (generates surface, if not existent).
+
+        Parameters
+        ----------
+        building : object
+            Building extended object instance of pycity_calc
+        sh_ann_demand : float
+            Annual space heating net energy demand in kWh
+
+        Returns
+        -------
+        closest_r_year : int
+            Closest year of retrofit (None, if no year of retrofit is newer
+            than build_year)
+        """
+
+        if not self.has_surface(building):
+            self.add_surface(building)
+
+        dict_spec_dem = self.dict_surfaces[self.get_key(building)]
+        list_years = sorted(dict_spec_dem.keys())
+
+        if len(list_years) == 0:
+            return None
+
+        array_spec_dem = np.array([dict_spec_dem[y] for y in list_years])
+
+        #  argmin returns first (oldest) year for equal differences
+        idx = np.argmin(np.abs(array_spec_dem - sh_ann_demand /
+                               building.net_floor_area))
+
+        return list_years[int(idx)]
+
+
+def set_default_build_year(building, build_year=1920):
+    """
+    Set default year of construction, if building has no build_year
+    (with warning)
+
+    Parameters
+    ----------
+    building : object
+        Building extended object instance of pycity_calc
+    build_year : int, optional
+        Default year of construction (default: 1920)
+    """
+
+    if building.build_year is None:
+        warnings.warn('No build_year found. Going to use '
+                      + str(build_year) + '.')
+        building.build_year = build_year
+
+
 def estimate_build_retrofit(building, sh_ann_demand,
                             overwrite_sh=False,
                             list_retro_years=
                             [1977, 1982, 1995, 2002, 2009, 2014],
                             print_output=False, overwrite_mod=True,
-                            t_set_heat=20, t_night=16):
+                            t_set_heat=20, t_night=16,
+                            search_mode='linear', surrogate=None):
     """
     Estimate retrofit state of single building instance, based on annual
     net thermal energy demand value on space heating instance.
@@ -46,6 +389,7 @@ def estimate_build_retrofit(building, sh_ann_demand,
         List holding retrofit years, used for analysis
          (default: [1977, 1982, 1995, 2002, 2009, 2014]).
         Currently TEASER only supports retrofit years 1977 and higher.
+        Ignored, if surrogate is used (uses list_retro_years of surrogate).
     print_output : bool, optional
         Defines, if output should be printed out (default: False)
     overwrite_mod : bool, optional
@@ -58,6 +402,16 @@ def estimate_build_retrofit(building, sh_ann_demand,
         t_set_heat, model is going to be heated up. (default: 20)
     t_night : float, optional
         Night setback temperature in degree Celsius (default: 16)
+    search_mode : str, optional
+        Search mode of VDI 6007 based estimation (default: 'linear').
+        Options: 'linear' (simulate every year of retrofit) or 'ordered'
+        (bisection search, assuming space heating demand to decrease with
+        newer years of retrofit). See search_closest_retro_year.
+    surrogate : object, optional
+        RetrofitSurrogate object instance (default: None). If set, year of
+        retrofit is estimated with response surface of building archetype
+        (surface is generated, if archetype is unknown). Falls back to
+        search_mode, if building has no net_floor_area.
     """
 
     for ap in building.apartments:
@@ -68,82 +422,40 @@ def estimate_build_retrofit(building, sh_ann_demand,
 
     # Check if year of construction is set
     #  If not, set default build_year of 1920
-    if building.build_year is None:
-        warnings.warn('No build_year found. Going to use 1920.')
-        building.build_year = 1920
+    set_default_build_year(building)
 
     # Sort list, in case it is unsorted
     list_retro_years.sort()
 
-    #  Dummy value for space heat closest to reference value
-    closest_vdi_sh = None
-    #  Dummy value for closest retrofit year
-    closest_r_year = None
-
     if building.mod_year is not None and overwrite_mod is False:
         msg = 'Building already has mod_year. Going to keep this value.'
         warnings.warn(msg)
     else:
-        #  Loop over possible modernization years
-        for retro_year in list_retro_years:
-
-            #  Skip retro_years, which are older than year of construction
-            if retro_year > building.build_year:
+        if surrogate is not None and building.net_floor_area is None:
+            msg = 'Building has no net_floor_area. Thus, surrogate cannot ' \
+                  'be used. Going to use search_mode ' + str(search_mode)
+            warnings.warn(msg)
 
-                if print_output:
-                    print('Current year of retrofit: ', retro_year)
+        if surrogate is not None and building.net_floor_area is not None:
+            closest_r_year = surrogate.estimate_retro_year(
+                building=building, sh_ann_demand=sh_ann_demand)
 
+        else:
+            def calc_sh_dem(retro_year):
                 #  Set retrofit year
                 building.mod_year = retro_year
+                return calc_sh_dem_vdi6007(building, t_set_heat=t_set_heat,
+                                           t_night=t_night)
 
-                #  Perfom VDI 6007 simulation of space heating load
-                (temp_in, q_heat_cool, q_in_wall, q_out_wall) = teas_use. \
-                    calc_th_load_build_vdi6007_ex_build(exbuild=building,
-                                                        add_th_load=False,
-                                                        array_vent_rate=None,
-                                                        vent_factor=0.5,
-                                                        t_set_heat=t_set_heat,
-                                                        t_set_cool=70,
-                                                        t_night=t_night,
-                                                        alpha_rad=None,
-                                                        project_name='project',
-                                                        build_name='build_name',
-                                                        heat_lim_val=10000000,
-                                                        cool_lim_val=10000000)
-
-                #  Extract heating, only
-                heat_array = np.zeros(len(q_heat_cool))
-                for i in range(len(q_heat_cool)):
-                    if q_heat_cool[i] > 0:
-                        heat_array[i] = q_heat_cool[i]
-                    else:
-                        heat_array[i] = 0
-
-                timestep = building.environment.timer.timeDiscretization
-
-                # Energy sum in kWh
-                sh_dem_vdi = sum(heat_array) / (1000 * timestep/3600)
-
-                if sh_dem_vdi < 0.1:
-                    msg = 'Building thermal space heating demand of' \
-                          ' ' + str(sh_dem_vdi) + ' is too low!'
-                    warnings.warn(msg)
-
-                if print_output:
-                    print('Simulated space heating demand in kWh: ', sh_dem_vdi)
-                    print('Difference to reference value:')
-                    print(abs(sh_dem_vdi - sh_ann_demand))
-                    print()
-
-                #  Check if energy value is close to reference value
-                if closest_vdi_sh is None:
-                    closest_vdi_sh = sh_dem_vdi
-                    closest_r_year = retro_year
-                else:
-                    if abs(sh_ann_demand - sh_dem_vdi) < abs(sh_ann_demand -
-                                                                     closest_vdi_sh):
-                        closest_vdi_sh = sh_dem_vdi
-                        closest_r_year = retro_year
+            #  Skip retro_years, which are older than year of construction
+            (closest_r_year, dict_sh_dem) = \
+                search_closest_retro_year(
+                    list_retro_years=[y for y in list_retro_years
+                                      if y > building.build_year],
+                    sh_ann_demand=sh_ann_demand,
+                    calc_sh_dem=calc_sh_dem,
+                    search_mode=search_mode,
+                    print_output=print_output)
 
         # Set new retrofit year
         building.mod_year = closest_r_year
@@ -168,9 +480,67 @@ def estimate_build_retrofit(building, sh_ann_demand,
                                                      cool_lim_val=10000000)
 
 
+def _estimate_build_retrofit_worker(building, sh_ann_demand, dict_kwargs):
+    """
+    Worker function for parallel estimation of retrofit. Estimates year of
+    retrofit on copy of building in worker process.
+
+    Returns
+    -------
+    res_tuple : tuple
+        (mod_year, sh_curve)
+        mod_year : int
+            Estimated year of retrofit
+        sh_curve : np.array
+            Space heating power curve in W (None, if overwrite_sh is False)
+    """
+
+    overwrite_sh = dict_kwargs.pop('overwrite_sh')
+
+    estimate_build_retrofit(building=building, sh_ann_demand=sh_ann_demand,
+                            overwrite_sh=False, **dict_kwargs)
+
+    sh_curve = None
+    if overwrite_sh:
+        (sh_dem, sh_curve) = \
+            calc_sh_dem_vdi6007(building,
+                                t_set_heat=dict_kwargs['t_set_heat'],
+                                t_night=dict_kwargs['t_night'],
+                                return_curve=True)
+
+    return (building.mod_year, sh_curve)
+
+
+def _add_sh_curve_to_building(building, sh_curve):
+    """
+    Add space heating power curve (equally split) as space heating objects
+    to apartments of building (as done by calc_th_load_build_vdi6007_ex_build
+    with add_th_load=True).
+
+    Parameters
+    ----------
+    building : object
+        Building extended object instance of pycity_calc
+    sh_curve : array-like
+        Space heating power curve of building in W
+    """
+
+    curr_th_load = np.array(sh_curve) / len(building.apartments)
+
+    for apartment in building.apartments:
+        #  Generate space heating object instance
+        space_heating = \
+            spheat.SpaceHeating(environment=building.environment, method=0,
+                                loadcurve=curr_th_load)
+
+        #  Add space heating to current apartment
+        apartment.addEntity(space_heating)
+
+
 def estimate_city_retrofit(city, overwrite_sh=False, print_output=False,
-                           overwrite_mod=True, t_set_heat=20,
-                           skip_non_res=True):
+                           overwrite_mod=True, t_set_heat=20, t_night=16,
+                           skip_non_res=True, search_mode='linear',
+                           surrogate=None, executor=None):
     """
     Estimate last year of retrofit per building, based on annual thermal space
     heating demand per building. Requires city with buildings, apartments,
@@ -193,11 +563,24 @@ def estimate_city_retrofit(city, overwrite_sh=False, print_output=False,
     t_set_heat : float, optional
         Heating set temperature in degree Celsius. If temperature drops below
         t_set_heat, model is going to be heated up. (default: 20)
+    t_night : float, optional
+        Night setback temperature in degree Celsius (default: 16)
     skip_non_res : float, optional
         Defines, if all non residential buildings should be skipped
         (default: True). If True, only processes residential buildings.
         If False, trys to process every other building type, which
         is usable within TEASER type building logic (e.g. office or institutes)
+    search_mode : str, optional
+        Search mode of VDI 6007 based estimation (default: 'linear').
+        Options: 'linear' or 'ordered' (see estimate_build_retrofit)
+    surrogate : object, optional
+        RetrofitSurrogate object instance (default: None). If set, uses
+        response surfaces per building archetype (fast estimation mode).
+        Surfaces of new archetypes are added to surrogate.
+    executor : object, optional
+        concurrent.futures executor (e.g. ProcessPoolExecutor) to process
+        buildings (and response surfaces of surrogate) in parallel
+        (default: None). If None, buildings are processed sequentially.
 
     Returns
     -------
@@ -209,6 +592,9 @@ def estimate_city_retrofit(city, overwrite_sh=False, print_output=False,
     #  Copy city object instance
     city_new = copy.deepcopy(city)
 
+    #  List of tuples (node id, space heating demand in kWh)
+    list_build_sh = []
+
     #  Loop over buildings
     for n in city_new.nodes():
         #  If node holds attribute 'node_type'
@@ -223,9 +609,6 @@ def estimate_city_retrofit(city, overwrite_sh=False, print_output=False,
                             city_new.nodes[n]['entity'].build_type != 0:
                             pass
                         else:
-                            print('Processing building ', n)
-                            print()
-
                             #  Check if apartments within building have
                             #  occupancy objects with profiles
                             if city_new.nodes[n]['entity'].hasApartments:
@@ -258,16 +641,62 @@ def estimate_city_retrofit(city, overwrite_sh=False, print_output=False,
                                       'kWh seems to be very high (ID: ' + str(n) + ').'
                                 warnings.warn(msg)
 
-                            #  Estimate and set new retrofit years on building
-                            estimate_build_retrofit(building=city_new.nodes[n]['entity'],
-                                                    sh_ann_demand=sh_dem,
-                                                    overwrite_sh=overwrite_sh,
-                                                    print_output=print_output,
-                                                    overwrite_mod=overwrite_mod,
-                                                    t_set_heat=t_set_heat)
+                            list_build_sh.append((n, sh_dem))
+
+    dict_kwargs = {'overwrite_sh': overwrite_sh,
+                   'print_output': print_output,
+                   'overwrite_mod': overwrite_mod,
+                   't_set_heat': t_set_heat,
+                   't_night': t_night,
+                   'search_mode': search_mode,
+                   'surrogate': surrogate}
 
-                            print('Processing building ', n)
-                            print()
+    if executor is None:
+        for (n, sh_dem) in list_build_sh:
+            print('Processing building ', n)
+            print()
+
+            #  Estimate and set new retrofit years on building
+            estimate_build_retrofit(building=city_new.nodes[n]['entity'],
+                                    sh_ann_demand=sh_dem,
+                                    **dict_kwargs)
+
+    else:
+        #  Set default build_year before buildings are copied to workers
+        for (n, sh_dem) in list_build_sh:
+            set_default_build_year(city_new.nodes[n]['entity'])
+
+        if surrogate is not None:
+            #  Generate missing response surfaces (one building per
+            #  archetype) in parallel
+            dict_futures = {}
+            for (n, sh_dem) in list_build_sh:
+                building = city_new.nodes[n]['entity']
+                key = surrogate.get_key(building)
+                if (building.net_floor_area is not None and
+                        not surrogate.has_surface(building) and
+                        key not in dict_futures):
+                    dict_futures[key] = (building, executor.submit(
+                        surrogate.calc_surface, building))
+            for key in dict_futures:
+                (building, future) = dict_futures[key]
+                surrogate.add_surface(building, future.result())
+
+        list_futures = []
+        for (n, sh_dem) in list_build_sh:
+            list_futures.append(executor.submit(
+                _estimate_build_retrofit_worker,
+                city_new.nodes[n]['entity'], sh_dem, dict(dict_kwargs)))
+
+        for ((n, sh_dem), future) in zip(list_build_sh, list_futures):
+            (mod_year, sh_curve) = future.result()
+
+            building = city_new.nodes[n]['entity']
+            building.mod_year = mod_year
+            if sh_curve is not None:
+                _add_sh_curve_to_building(building, sh_curve)
+
+            print('Processed building ', n)
 
     #  TODO: Add log-function to write retrofit years to file, if desired
 
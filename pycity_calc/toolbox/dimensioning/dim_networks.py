@@ -222,23 +222,21 @@ def add_lhn_to_city(city, list_build_node_nb=None, temp_vl=90,
         list_build_node_nb = city.get_list_build_entity_node_ids()
     else:
         #  Check if all node ids within list_build_node_nb belong to buildings
+        set_build_ids = set(city.get_list_build_entity_node_ids())
         for n in list_build_node_nb:
-            assert n in city.get_list_build_entity_node_ids(), \
+            assert n in set_build_ids, \
                 ('Node ' + str(n) + ' does not have a building entity.')
 
     # Check if one building is already connected to lhn
     #  If existing heating connection is found, ValueError is raised
-    for u in list_build_node_nb:
-        for v in city.nodes():
-            if city.has_edge(u, v):
-                if 'network_type' in city.edges[u, v]:
-                    if (city.edges[u, v]['network_type'] == 'heating' or
-                                city.edges[u, v][
-                                    'network_type'] == 'heating_and_deg'):
-                        print('u', u)
-                        print('v', v)
-                        raise ValueError('Building within building list ' +
-                                         'already holds lhn network!')
+    set_build_node_nb = set(list_build_node_nb)
+    for u, v in netop.get_edges_of_network_type(
+            city, network_type=['heating', 'heating_and_deg']):
+        if u in set_build_node_nb or v in set_build_node_nb:
+            print('u', u)
+            print('v', v)
+            raise ValueError('Building within building list ' +
+                             'already holds lhn network!')
 
     print('Start process to add LHN to city\n')
     #  # Start with lhn processing
@@ -307,17 +305,17 @@ def add_lhn_to_city(city, list_build_node_nb=None, temp_vl=90,
     #  Use street networks
     #  #------------------------------------------------------------------
     if use_street_network:
-        # create a list which saves information about created LHN nodes
-        # hold created LHN nodes and the min_span_tree_node from which
-        # it was created. This prevents multiple LHN node creation
-        list_lhn_node=[[],[]]
+        # create a dict which saves information about created LHN nodes
+        # (min_span_tree_node as key, created LHN node as value).
+        # This prevents multiple LHN node creation
+        dict_lhn_node = {}
         #  Loop over all edges of minimum spanning graph
         for u, v in min_span_graph.edges():
             # check if u and v are buildingnodes or if they have already been used to create an LHN node
 
-            if u not in list_build_node_nb:
+            if u not in set_build_node_nb:
                 #u is not a buildingnode
-                if u not in list_lhn_node[0]:
+                if u not in dict_lhn_node:
                     # u was not set already as a LHN node
                     #  Get current position
                     pos_curr = min_span_graph.nodes[u]['position']
@@ -327,26 +325,22 @@ def add_lhn_to_city(city, list_build_node_nb=None, temp_vl=90,
                     while id1 in city.nodes():
                         id1 += 1
 
-                    list_lhn_node[0].append(u) # save the min_span_tree_node
-                    list_lhn_node[1].append(id1) # save the new_lhn_node
+                    dict_lhn_node[u] = id1  # save the new_lhn_node
                     #  Add new network node to city
                     city.add_node(id1, position=pos_curr,
                                   node_type=network_type)
                 else:
                     # u was set already as a LHN node
                     # look up which id the LHN node has
-                    for i in range(len(list_lhn_node[0])):
-                        if list_lhn_node[0][i] == u:
-                            index = i
-                    id1 = list_lhn_node[1][index]
+                    id1 = dict_lhn_node[u]
             else:
                 # u is a buildingnode
                 id1=u
 
 
-            if v not in list_build_node_nb:
+            if v not in set_build_node_nb:
                 # v is not a buildingnode
-                if v not in list_lhn_node[0]:
+                if v not in dict_lhn_node:
                     # v was not set already as a LHN node
                     #  Get current position
                     pos_curr = min_span_graph.nodes[v]['position']
@@ -356,18 +350,14 @@ def add_lhn_to_city(city, list_build_node_nb=None, temp_vl=90,
                     while id2 in city.nodes():
                         id2 += 1
 
-                    list_lhn_node[0].append(v) # save the min_span_tree_node
-                    list_lhn_node[1].append(id2) # save the new_lhn_node
+                    dict_lhn_node[v] = id2  # save the new_lhn_node
                     #  Add new network node to city
                     city.add_node(id2, position=pos_curr,
                                   node_type=network_type)
                 else:
                     # v was set already as a LHN node
                     # look up which id the LHN node has
-                    for i in range(len(list_lhn_node[0])):
-                        if list_lhn_node[0][i] == v:
-                            index = i
-                    id2 = list_lhn_node[1][index]
+                    id2 = dict_lhn_node[v]
             else:
                 # v is a buildingnode
                 id2 = v
@@ -442,16 +432,18 @@ def add_deg_to_city(city, list_build_node_nb=None, use_street_network=False):
         list_build_node_nb = city.get_list_build_entity_node_ids()
     else:
         #  Check if all node ids within list_build_node_nb belong to buildings
+        set_build_ids = set(city.get_list_build_entity_node_ids())
         for n in list_build_node_nb:
-            assert n in city.get_list_build_entity_node_ids(), \
+            assert n in set_build_ids, \
                 ('Node ' + str(n) + ' does not have a building entity.')
 
     #  Check if all node ids within list_build_node_nb belong to buildings
+    set_build_ids = set(city.get_list_build_entity_node_ids())
     for n in list_build_node_nb:
-        assert n in city.get_list_build_entity_node_ids(), ('Node ' + str(n) +
-                                                            ' does not have' +
-                                                            ' a building ' +
-                                                            'entity.')
+        assert n in set_build_ids, ('Node ' + str(n) + ' does not have' +
+                                    ' a building entity.')
+
+    set_build_node_nb = set(list_build_node_nb)
 
     print('Start process to add DEG to city\n')
 
@@ -496,17 +488,17 @@ def add_deg_to_city(city, list_build_node_nb=None, use_street_network=False):
     #  Use street networks
     #  #------------------------------------------------------------------
     if use_street_network:
-        # create a list which saves information about created DEG nodes
-        # hold created DEG nodes and the min_span_tree_node from which
-        # it was created. This prevents multiple DEG node creation
-        list_deg_node = [[], []]
+        # create a dict which saves information about created DEG nodes
+        # (min_span_tree_node as key, created DEG node as value).
+        # This prevents multiple DEG node creation
+        dict_deg_node = {}
         #  Loop over all edges of minimum spanning graph
         for u, v in min_span_graph.edges():
             # check if u and v are buildingnodes or if they have already been used to create an deg node
 
-            if u not in list_build_node_nb:
+            if u not in set_build_node_nb:
                 # u is not a buildingnode
-                if u not in list_deg_node[0]:
+                if u not in dict_deg_node:
                     # u was not set already as a deg node
                     #  Get current position
                     pos_curr = min_span_graph.nodes[u]['position']
@@ -516,25 +508,21 @@ def add_deg_to_city(city, list_build_node_nb=None, use_street_network=False):
                     while id1 in city.nodes():
                         id1 += 1
 
-                    list_deg_node[0].append(u)  # save the min_span_tree_node
-                    list_deg_node[1].append(id1)  # save the new_deg_node
+                    dict_deg_node[u] = id1  # save the new_deg_node
                     #  Add new network node to city
                     city.add_node(id1, position=pos_curr,
                                   node_type='electricity')
                 else:
                     # u was set already as a deg node
                     # look up which id the deg node has
-                    for i in range(len(list_deg_node[0])):
-                        if list_deg_node[0][i] == u:
-                            index = i
-                    id1 = list_deg_node[1][index]
+                    id1 = dict_deg_node[u]
             else:
                 # u is a buildingnode
                 id1 = u
 
-            if v not in list_build_node_nb:
+            if v not in set_build_node_nb:
                 # v is not a buildingnode
-                if v not in list_deg_node[0]:
+                if v not in dict_deg_node:
                     # v was not set already as a deg node
                     #  Get current position
                     pos_curr = min_span_graph.nodes[v]['position']
@@ -544,18 +532,14 @@ def add_deg_to_city(city, list_build_node_nb=None, use_street_network=False):
                     while id2 in city.nodes():
                         id2 += 1
 
-                    list_deg_node[0].append(v)  # save the min_span_tree_node
-                    list_deg_node[1].append(id2)  # save the new_deg_node
+                    dict_deg_node[v] = id2  # save the new_deg_node
                     #  Add new network node to city
                     city.add_node(id2, position=pos_curr,
                                   node_type='electricity')
                 else:
                     # v was set already as a deg node
                     # look up which id the deg node has
-                    for i in range(len(list_deg_node[0])):
-                        if list_deg_node[0][i] == v:
-                            index = i
-                    id2 = list_deg_node[1][index]
+                    id2 = dict_deg_node[v]
             else:
                 # v is a buildingnode
                 id2 = v
@@ -15,7 +15,8 @@ import pycity_calc.economic.energy_sys_cost.boiler_cost as boiler_cost
 import pycity_calc.energysystems.heatPumpSimple as HP
 
 
-def dim_decentral_hp(environment, sh_curve, t_biv=-2, hp_type='aw', lowerActivationLimit=0.5, tSink=35, temp_norm=-12, t_blocked=4):
+def dim_decentral_hp(environment, sh_curve, t_biv=-2, hp_type='aw', lowerActivationLimit=0.5, tSink=35, temp_norm=-12, t_blocked=4,
+                     t_dem_ldc=None, temp_sorted=None):
     """
     Dimensioning of air/water and brine/water heat pump.
 
@@ -28,6 +29,12 @@ def dim_decentral_hp(environment, sh_curve, t_biv=-2, hp_type='aw', lowerActivat
     lowerActivationLimit : lower activation limit of heat pump
     tSink : minimal flow temperature
     temp_norm : -12°C for Aachen
+    t_dem_ldc : list, optional
+        space heating demand sorted by outside temperature (default: None).
+        If None, list is generated with get_t_demand_list (only relevant for 'aw')
+    temp_sorted : array, optional
+        sorted outside temperatures (default: None). If None, tAmbient of environment
+        is sorted (only relevant for 'aw')
 
     Returns
     -------
@@ -49,38 +56,36 @@ def dim_decentral_hp(environment, sh_curve, t_biv=-2, hp_type='aw', lowerActivat
         # monoenergetic operation mode
 
         # get ldc with sh-demand and tAmbient
-        t_dem_ldc = get_t_demand_list(temp_curve=environment.weather.tAmbient,
-                                      th_curve=sh_curve)
+        if t_dem_ldc is None:
+            t_dem_ldc = get_t_demand_list(temp_curve=environment.weather.tAmbient,
+                                          th_curve=sh_curve)
 
-        # plot temp-sorted demand curve
-        # plt.plot(sorted(environment.weather.tAmbient), t_dem_ldc)
+        if temp_sorted is None:
+            temp_sorted = np.sort(environment.weather.tAmbient)
 
-        # Find bivalence point and necessary thermal power of heat pump
-        for i in range(len(t_dem_ldc)):
+        # plot temp-sorted demand curve
+        # plt.plot(temp_sorted, t_dem_ldc)
 
-            # iterate through temp from min to max until temp is bigger than t_biv
-            if sorted(environment.weather.tAmbient)[i] > t_biv:
+        # Find bivalence point (first temperature in sorted temp curve, which is bigger than t_biv)
+        i = int(np.searchsorted(temp_sorted, t_biv, side='right'))
 
-                # get index of bivalence point in sorted temp curve
-                biv_ind = i - 1
+        if i >= len(t_dem_ldc):
+            raise Exception('Error in demand calculation at bivalence point')
 
-                # th. power in bivalence point (straight line between max(sh-demand) at temp_norm and 0 kW at 20°C)
-                q_hp_biv = max(sh_curve) / (temp_norm - 20) * (t_biv - 20)
+        # get index of bivalence point in sorted temp curve
+        biv_ind = i - 1
 
-                # calculate produced heat by peak supply
-                q2 = 0
-                for q in sh_curve:
-                    if q > q_hp_biv:
-                        q2 += q - q_hp_biv
+        # th. power in bivalence point (straight line between max(sh-demand) at temp_norm and 0 kW at 20°C)
+        q_hp_biv = max(sh_curve) / (temp_norm - 20) * (t_biv - 20)
 
-                # If curves are generated with method 1 (SLP by Hellwig), ratio is always 0.91% - maybe bc curves are only scaled up?
-                print('peak supply produces ' + str(np.round(q2*100/np.sum(sh_curve),2)) + '% of annual heat demand.')
+        # calculate produced heat by peak supply
+        sh_array = np.asarray(sh_curve)
+        q2 = np.sum(sh_array[sh_array > q_hp_biv] - q_hp_biv)
 
-                ee_ratio = 1 - q2 / np.sum(sh_curve)
+        # If curves are generated with method 1 (SLP by Hellwig), ratio is always 0.91% - maybe bc curves are only scaled up?
+        print('peak supply produces ' + str(np.round(q2*100/np.sum(sh_curve),2)) + '% of annual heat demand.')
 
-                break
-        else:
-            raise Exception('Error in demand calculation at bivalence point')
+        ee_ratio = 1 - q2 / np.sum(sh_curve)
 
         # Choose heat pump from catalogue
         q_nom, cop_list, tMax, tSink = choose_hp(q_ideal=q_hp_biv,
@@ -36,7 +36,7 @@ import pycity_calc.toolbox.dimensioning.emp_approach.dim_devices as dim_devices
 
 
 
-def run_approach(city,scenarios):
+def run_approach(city, scenarios, executor=None):
     """
     Main method to coordinate planning process
 
@@ -44,15 +44,103 @@ def run_approach(city,scenarios):
     ----------
     city:           standard city_object from pyCity_base
     scenarios:      list of dictionaries with common configurations of devices and suitability for (de)centralized usage
+    executor:       concurrent.futures executor (e.g. ProcessPoolExecutor) to evaluate scenarios in parallel
+                    (default: None). If None, scenarios are evaluated sequentially.
 
     Returns
     -------
     solutions:      list of city_objects with installed building energy systems, depending on scenarios
     """
 
-    solutions = []
+    # Demand curves, load duration curves, building age, net length and district type are calculated once
+    # and shared (read-only) by all scenarios
+    shared_data = get_shared_data(city)
+
+    # --------------------------- Dimensioning of devices -----------------------------
+
+    # Check Eligibility for District Heating Network
+    dhn_elig = shared_data['dhn_elig']
+
+    if dhn_elig > 4:
+        # District Heating eligible (not necessary to plan decentralized supply systems)
+        list_types = ['centralized']
+
+    elif dhn_elig < 2:
+        # District Heating not eligible (Decentralized supply system should be implemented)
+        list_types = ['decentralized']
+
+    else:
+        # District Heating solutions might be eligible - check decentralized and centralized scenarios
+        list_types = ['centralized', 'decentralized']
+
+    # List of scenario jobs (scenario number, supply type, scenario)
+    list_jobs = []
+
+    for (i, scenario) in enumerate(scenarios):
+        for supply_type in list_types:
+            if supply_type in scenario['type']:
+                list_jobs.append((i, supply_type, scenario))
+
+    if executor is None:
+        solutions = [_run_scenario(city, shared_data, *job) for job in list_jobs]
+
+    else:
+        list_futures = [executor.submit(_run_scenario, city, shared_data, *job) for job in list_jobs]
+        solutions = [future.result() for future in list_futures]
+
+    return solutions
+
+
+def _run_scenario(city, shared_data, nb_scenario, supply_type, scenario):
+    """
+    Dimension single scenario on copy of city (worker function of run_approach)
+
+    Parameters
+    ----------
+    city : pyCity_Calc city object
+    shared_data : dict with data of city, which is shared by all scenarios (see get_shared_data)
+    nb_scenario : int
+        number of scenario
+    supply_type : string
+        'centralized' or 'decentralized'
+    scenario : dictionary with common configuration of devices
+
+    Returns
+    -------
+    city : city object
+        copy of city including energysystems of scenario
+    """
+
+    print('')
+    print('-' * 10 + ' ' + supply_type.capitalize() + ' ' + str(nb_scenario) + ': '
+          + scenario['base'][0] + ' // ' + scenario['peak'][0] + ' ' + '-' * 10)
+
+    if supply_type == 'centralized':
+        return dim_centralized(city=deepcopy(city),
+                               slp_city=None,
+                               scenario=scenario,
+                               district_type=shared_data['district_type'],
+                               shared_data=shared_data)
+
+    return dim_decentralized(city=deepcopy(city),
+                             slp_city=None,
+                             scenario=scenario,
+                             shared_data=shared_data)
+
+
+def get_slp_city(city):
+    """
+    Returns copy of city, where SpaceHeatingDemand of apartments is changed to method 1 (SLP)
+
+    Parameters
+    ----------
+    city:       pyCity_Calc city object
+
+    Returns
+    -------
+    slp_city:   city_object with SLP for space heating demand
+    """
 
-    # Change SpaceHeatingDemand of apartments to method 1 (SLP)
     slp_city = deepcopy(city)
 
     for n in slp_city.nodelist_building:
@@ -66,63 +154,94 @@ def run_approach(city,scenarios):
                                                                   livingArea=ap.net_floor_area,
                                                                   specificDemand=spec_th_dem)
 
-    # --------------------------- Dimensioning of devices -----------------------------
+    return slp_city
 
-    # Check Eligibility for District Heating Network
-    dhn_elig, district_type = get_eligibility_dhn(city, method=1)
 
-    if dhn_elig > 4:
-        # District Heating eligible (not necessary to plan decentralized supply systems)
+def get_shared_data(city, slp_city=None, district_type=None):
+    """
+    Calculates data, which does not depend on scenario and can be shared by all scenarios
+    (see dim_centralized and dim_decentralized). Data must not be changed by scenarios.
 
-        for scenario in scenarios:
+    Parameters
+    ----------
+    city:       pyCity_Calc city object
+    slp_city:   city_object with SLP for space heating demand (default: None). If None, slp_city is generated
+                with get_slp_city.
+    district_type : string, optional
+        district type for transmission efficiency of lhn (default: None). If None, uses district type of city
+        (see get_eligibility_dhn).
 
-            if 'centralized' in scenario['type']:
-                print('')
-                print('-' * 10 + ' Centralized ' + str(scenarios.index(scenario)) + ': '
-                      + scenario['base'][0] + ' // ' + scenario['peak'][0] + ' ' + '-' * 10)
+    Returns
+    -------
+    shared_data : dict
+        'building_age' : 'old' or 'new'
+        'net_len' : length of heating network in m
+        'dhn_elig' : eligibility for district heating network (see get_eligibility_dhn)
+        'district_type' : 'big', 'medium' or 'small'
+        'el_demand' : annual el. demand of city in kWh
+        'lhn_th_curve_slp', 'lhn_th_curve_orig' : combined th. demand curves (SLP type and standard)
+                                                  incl. lhn transmission losses
+        'lhn_th_LDC_slp', 'lhn_th_LDC_orig' : load duration curves of combined th. demand curves
+        'temp_sorted' : sorted outside temperatures
+        'buildings' : dict with building node ids as keys and dicts of building demand curves as values
+                      ('sh_curve_slp', 'dhw_curve_slp', 'sh_curve_orig', 'dhw_curve_orig', 'th_LDC_slp',
+                      't_dem_ldc', 'q_max')
+    """
 
-                solutions.append(dim_centralized(city=deepcopy(city),
-                                                 slp_city=slp_city,
-                                                 scenario=scenario,
-                                                 district_type=district_type))
+    if slp_city is None:
+        slp_city = get_slp_city(city)
 
-    elif dhn_elig < 2:
-        # District Heating not eligible (Decentralized supply system should be implemented)
+    net_len = get_net_len(city)
 
-        for scenario in scenarios:
-            if 'decentralized' in scenario['type']:
-                print('')
-                print('-' * 10 + ' Decentralized ' + str(scenarios.index(scenario)) + ': '
-                      + scenario['base'][0] + ' // ' + scenario['peak'][0] + ' ' + '-' * 10)
+    dhn_elig, district_type_city = get_eligibility_dhn(city, method=1, net_len=net_len)
 
-                solutions.append(dim_decentralized(city=deepcopy(city),
-                                                   slp_city=slp_city,
-                                                   scenario=scenario))
+    if district_type is None:
+        district_type = district_type_city
 
-    else:
-        # District Heating solutions might be eligible - check decentralized and centralized scenarios
+    # get transmission efficiency
+    eta_transmission = get_eta_transmission(district_type)
 
-        for scenario in scenarios:
-            if 'centralized' in scenario['type']:
-                print('')
-                print('-' * 10 + ' Centralized ' + str(scenarios.index(scenario)) + ': '
-                      + scenario['base'][0] + ' // ' + scenario['peak'][0] + ' ' + '-' * 10)
+    # calculate combined th. demand curves (SLP type and standard)
+    lhn_th_curve_slp = (slp_city.get_aggr_dhw_power_curve(current_values=False) +
+                        slp_city.get_aggr_space_h_power_curve(current_values=False)) / eta_transmission
 
-                solutions.append(dim_centralized(city=deepcopy(city),
-                                                 slp_city=slp_city,
-                                                 scenario=scenario,
-                                                 district_type=district_type))
+    lhn_th_curve_orig = (city.get_aggr_dhw_power_curve(current_values=False) +
+                         city.get_aggr_space_h_power_curve(current_values=False)) / eta_transmission
 
-            if 'decentralized' in scenario['type']:
-                print('')
-                print('-' * 10 + ' Decentralized ' + str(scenarios.index(scenario)) + ': '
-                      + scenario['base'][0] + ' // ' + scenario['peak'][0] + ' ' + '-' * 10)
+    temp_ambient = city.environment.weather.tAmbient
 
-                solutions.append(dim_decentralized(city=deepcopy(city),
-                                                   slp_city=slp_city,
-                                                   scenario=scenario))
+    shared_data = {'building_age': get_building_age(city),
+                   'net_len': net_len,
+                   'dhn_elig': dhn_elig,
+                   'district_type': district_type,
+                   'el_demand': city.get_annual_el_demand() / 1000,
+                   'lhn_th_curve_slp': lhn_th_curve_slp,
+                   'lhn_th_curve_orig': lhn_th_curve_orig,
+                   'lhn_th_LDC_slp': dim_devices.get_LDC(lhn_th_curve_slp),
+                   'lhn_th_LDC_orig': dim_devices.get_LDC(lhn_th_curve_orig),
+                   'temp_sorted': np.sort(temp_ambient),
+                   'buildings': {}}
 
-    return solutions
+    for b_node in city.nodelist_building:
+        building = city.nodes[b_node]['entity']
+        building_slp = slp_city.nodes[b_node]['entity']
+
+        sh_curve_slp = building_slp.get_space_heating_power_curve()
+        dhw_curve_slp = building_slp.get_dhw_power_curve()
+        sh_curve_orig = building.get_space_heating_power_curve()
+        dhw_curve_orig = building.get_dhw_power_curve()
+
+        shared_data['buildings'][b_node] = \
+            {'sh_curve_slp': sh_curve_slp,
+             'dhw_curve_slp': dhw_curve_slp,
+             'sh_curve_orig': sh_curve_orig,
+             'dhw_curve_orig': dhw_curve_orig,
+             'th_LDC_slp': dim_devices.get_LDC(sh_curve_slp + dhw_curve_slp),
+             't_dem_ldc': dim_devices.get_t_demand_list(temp_curve=temp_ambient,
+                                                        th_curve=sh_curve_orig),
+             'q_max': max(sh_curve_orig / 1000 + dhw_curve_orig / 1000)}
+
+    return shared_data
 
 
 def get_building_age(city):
@@ -225,7 +344,7 @@ def get_district_type(city, net_len=None):
     return district_type
 
 
-def get_eligibility_dhn(city, method=1):
+def get_eligibility_dhn(city, method=1, net_len=None):
     """
     Calculates the eligibility for using a district heating network (dhn)
 
@@ -235,6 +354,8 @@ def get_eligibility_dhn(city, method=1):
     method  :   int
         0 : Calculate Waermeliniendichten (use only if spaceHeating in district was calculated with method 0)
         1 : Use Matrix from Wolff & Jagnow 2011
+    net_len :   float, optional
+        length of heating network in m (default: None). If None, net_len is calculated with get_net_len.
 
     Returns
     -------
@@ -248,7 +369,8 @@ def get_eligibility_dhn(city, method=1):
     th_total_elig = city.get_annual_space_heating_demand() + city.get_annual_dhw_demand()  # in kWh/a
 
     # get total net length
-    net_len = get_net_len(city)  # in meter
+    if net_len is None:
+        net_len = get_net_len(city)  # in meter
 
     # get combined thermal demand curve (sh and dhw)
     th_curve = ((city.get_aggr_dhw_power_curve(current_values=False) +
@@ -400,17 +522,20 @@ def get_eta_transmission(district_type):
     return eta_transmission
 
 
-def dim_centralized(city, slp_city, scenario, district_type):
+def dim_centralized(city, slp_city, scenario, district_type, shared_data=None):
     """
     Set sizes of devices in centralized supply system
 
     Parameters
     ----------
     city : pyCity_Calc city object
-    slp_city : city_object with SLP for space heating demand
+    slp_city : city_object with SLP for space heating demand (only used, if shared_data is None)
     scenario : dictionary with common configuration of devices and suitability for centralized usage
     district_type : string
         'big', 'medium', 'small'
+    shared_data : dict, optional
+        data of city, which is shared by all scenarios (default: None), see get_shared_data.
+        If None, shared data is calculated with city and slp_city.
 
     Returns
     -------
@@ -418,23 +543,21 @@ def dim_centralized(city, slp_city, scenario, district_type):
         city object including energysystem - BES only in first building
     """
 
-    # get transmission efficiency
-    eta_transmission = get_eta_transmission(district_type)
+    if shared_data is None or shared_data['district_type'] != district_type:
+        shared_data = get_shared_data(city=city, slp_city=slp_city, district_type=district_type)
 
-    # calculate combined th. demand curve (SLP type)
-    th_curve_slp = (slp_city.get_aggr_dhw_power_curve(current_values=False) +
-                    slp_city.get_aggr_space_h_power_curve(current_values=False)) / eta_transmission
+    # get combined th. demand curve (SLP type)
+    th_curve_slp = shared_data['lhn_th_curve_slp']
 
-    # calculate combined th. demand curve (standard)
-    th_curve_orig = (city.get_aggr_dhw_power_curve(current_values=False) +
-                     city.get_aggr_space_h_power_curve(current_values=False)) / eta_transmission
+    # get combined th. demand curve (standard)
+    th_curve_orig = shared_data['lhn_th_curve_orig']
 
     # get load demand curve and total demand for SLP
-    th_LDC_slp = dim_devices.get_LDC(th_curve_slp)
+    th_LDC_slp = shared_data['lhn_th_LDC_slp']
     q_total_slp = sum(th_curve_slp)
 
     # get load demand curve and total demand for standard curve
-    th_LDC_orig = dim_devices.get_LDC(th_curve_orig)
+    th_LDC_orig = shared_data['lhn_th_LDC_orig']
     q_total_orig = sum(th_curve_orig)
 
     people_total = 0
@@ -504,7 +627,8 @@ def dim_centralized(city, slp_city, scenario, district_type):
         # Check if CHP is according to EEWaermeG
         if not check_eewaermeg(city=city,
                                device=chp,
-                               ee_ratio=chp_ee_ratio):
+                               ee_ratio=chp_ee_ratio,
+                               building_age=shared_data['building_age']):
             raise Warning('Energysystem with CHP not according to EEWaermeG!')
 
         # Calculate gas demand for chp in kWh/yr
@@ -582,7 +706,8 @@ def dim_centralized(city, slp_city, scenario, district_type):
         # Check if CHP is according to EEWaermeG
         if not check_eewaermeg(city=city,
                                device=boiler,
-                               ee_ratio=0):
+                               ee_ratio=0,
+                               building_age=shared_data['building_age']):
             raise Warning('Energy system with only Boiler not according to EEWaermeG!')
 
 
@@ -594,7 +719,7 @@ def dim_centralized(city, slp_city, scenario, district_type):
     city.nodes[city.nodelist_building[0]]['entity'].addEntity(bes)
 
     # Get total electricity demand in kWh/yr
-    w_el.append(city.get_annual_el_demand()/1000)
+    w_el.append(shared_data['el_demand'])
 
     # Calculate costs and emissions
     calc_costs(city=city,
@@ -602,47 +727,54 @@ def dim_centralized(city, slp_city, scenario, district_type):
                w_el_in=w_el,
                w_el_out=chp_el_prod,
                bafa_lhn=bafa_lhn,
-               bafa_chp_tes=bafa_chp_tes)
+               bafa_chp_tes=bafa_chp_tes,
+               shared_data=shared_data)
 
     print('** CO2 per year: ' + str(round(calc_emissions(q_gas, w_el), 2)) + ' kgCO2/a **')
 
     return city
 
 
-def dim_decentralized(city, slp_city, scenario):
+def dim_decentralized(city, slp_city, scenario, shared_data=None):
     """
     Set sizes of devices in decentralized supply system
 
     Parameters
     ----------
     city : pyCity_Calc city object
-    slp_city : city_object with SLP for space heating demand
+    slp_city : city_object with SLP for space heating demand (only used, if shared_data is None)
     scenario : dictionary with common configuration of devices and suitability for decentralized usage
+    shared_data : dict, optional
+        data of city, which is shared by all scenarios (default: None), see get_shared_data.
+        If None, shared data is calculated with city and slp_city.
 
     Returns
     -------
 
     """
 
+    if shared_data is None:
+        shared_data = get_shared_data(city=city, slp_city=slp_city)
+
     for b_node in city.nodelist_building:
         print('')
         print('-'*5 + ' Building ' + str(b_node) + ' ' + 5*'-')
 
         building = city.nodes[b_node]['entity']
-        building_slp = slp_city.nodes[b_node]['entity']
+        build_data = shared_data['buildings'][b_node]
 
         # Get power curves
-        sh_curve_slp = building_slp.get_space_heating_power_curve()
+        sh_curve_slp = build_data['sh_curve_slp']
         sh_total_slp = np.sum(sh_curve_slp)
-        dhw_curve_slp = building_slp.get_dhw_power_curve()
+        dhw_curve_slp = build_data['dhw_curve_slp']
         dhw_total_slp = np.sum(dhw_curve_slp)
         q_total_slp = sh_total_slp + dhw_total_slp
 
-        sh_curve_orig = building.get_space_heating_power_curve()
+        sh_curve_orig = build_data['sh_curve_orig']
         sh_total_orig = np.sum(sh_curve_orig)
-        dhw_curve_orig = building.get_dhw_power_curve()
+        dhw_curve_orig = build_data['dhw_curve_orig']
         dhw_total_orig = np.sum(dhw_curve_orig)
-        th_curve_orig = building.get_space_heating_power_curve() + building.get_dhw_power_curve()
+        th_curve_orig = sh_curve_orig + dhw_curve_orig
         q_total_orig = np.sum(th_curve_orig)
 
         # Calculate total number of inhabitants
@@ -663,7 +795,7 @@ def dim_decentralized(city, slp_city, scenario):
             if device == 'chp':
 
                 # get load demand curve
-                th_LDC_slp = dim_devices.get_LDC(sh_curve_slp + dhw_curve_slp)
+                th_LDC_slp = build_data['th_LDC_slp']
 
                 # get most suitable CHP
                 chp_sol = dim_devices.dim_decentral_chp(th_LDC_slp, q_total_slp, method=0)
@@ -690,7 +822,8 @@ def dim_decentralized(city, slp_city, scenario):
                 # Check if CHP is according to EEWaermeG
                 if not check_eewaermeg(city=city,
                                        device=chp,
-                                       ee_ratio=chp_ee_ratio):
+                                       ee_ratio=chp_ee_ratio,
+                                       building_age=shared_data['building_age']):
                     raise Warning('Energysystem with CHP not according to EEWaermeG!')
 
                 # Calculate gas demand for chp in kWh/yr
@@ -707,6 +840,7 @@ def dim_decentralized(city, slp_city, scenario):
 
                 # Add TES
                 tes = TES.thermalEnergyStorageExtended(environment=city.environment,
+                                                       t_max=90,
                                                        t_init=68,
                                                        capacity=v_tes)
                 bes.addDevice(tes)
@@ -753,7 +887,9 @@ def dim_decentralized(city, slp_city, scenario):
 
                 # Calculate most suitable heat pump
                 q_nom, cop_list, tMax, lowerActivationLimit, tSink, t_dem_ldc, biv_ind, hp_ee_ratio = \
-                    dim_devices.dim_decentral_hp(city.environment, sh_curve_orig, t_biv=t_biv)
+                    dim_devices.dim_decentral_hp(city.environment, sh_curve_orig, t_biv=t_biv,
+                                                 t_dem_ldc=build_data['t_dem_ldc'],
+                                                 temp_sorted=shared_data['temp_sorted'])
 
                 # Add heat pump
                 heatPump = HP.heatPumpSimple(environment=city.environment,
@@ -767,10 +903,12 @@ def dim_decentralized(city, slp_city, scenario):
                 print('Added HP: Q_nom = ' + str(q_nom / 1000) + ' kW')
 
                 # Calculate el. demand for heat pump
-                w_el_hp = 0
-
-                for t in range(len(sh_curve_orig)):
-                    w_el_hp += heatPump.calc_hp_el_power_input(sh_curve_orig[t], city.environment.weather.tAmbient[t])
+                (q_hp_array, el_hp_array) = \
+                    heatPump.calc_hp_all_results_array(control_signals=sh_curve_orig,
+                                                       t_source=city.environment.weather.tAmbient[
+                                                                :len(sh_curve_orig)],
+                                                       save_res=False)
+                w_el_hp = np.sum(el_hp_array)
 
                 w_el.append(w_el_hp/1000)   # el. power demand in kWh/yr
 
@@ -784,7 +922,8 @@ def dim_decentralized(city, slp_city, scenario):
                 if not check_eewaermeg(city=city,
                                        device=heatPump,
                                        ee_ratio=hp_ee_ratio,
-                                       spf=spf):
+                                       spf=spf,
+                                       building_age=shared_data['building_age']):
                     raise Warning('Energysystem not according to EEWaermeG!')
 
                 # Add peak supply
@@ -853,6 +992,7 @@ def dim_decentralized(city, slp_city, scenario):
                 v_tes = 35*q_nom/1000   # in liter
 
                 tes = TES.thermalEnergyStorageExtended(environment=city.environment,
+                                                       t_max=90,
                                                        t_init=68,
                                                        capacity=v_tes)
 
@@ -883,9 +1023,11 @@ def dim_decentralized(city, slp_city, scenario):
                 print('Added S/W-HP: Q_nom = ' + str(q_nom / 1000) + ' kW')
 
                 # Calculate el. demand for heat pump
-                w_el_hp = 0
-                for sh in sh_curve_orig:
-                    w_el_hp += heatPump.calc_hp_el_power_input(sh, city.environment.temp_ground)
+                (q_hp_array, el_hp_array) = \
+                    heatPump.calc_hp_all_results_array(control_signals=sh_curve_orig,
+                                                       t_source=city.environment.temp_ground,
+                                                       save_res=False)
+                w_el_hp = np.sum(el_hp_array)
                 w_el.append(w_el_hp / 1000)  # el. power demand in kWh/yr
 
                 # Calculate seasonal performance factor (SPF)
@@ -899,7 +1041,8 @@ def dim_decentralized(city, slp_city, scenario):
                 if not check_eewaermeg(city=city,
                                        device=heatPump,
                                        ee_ratio=ee_ratio,
-                                       spf=spf):
+                                       spf=spf,
+                                       building_age=shared_data['building_age']):
                     raise Warning('Energysystem not according to EEWaermeG!')
 
                 # Add elHeater (DHW supply)
@@ -953,7 +1096,8 @@ def dim_decentralized(city, slp_city, scenario):
                 # Check if CHP is according to EEWaermeG
                 if not check_eewaermeg(city=city,
                                        device=boiler,
-                                       ee_ratio=0):
+                                       ee_ratio=0,
+                                       building_age=shared_data['building_age']):
                     raise Warning('Energysystem with CHP not according to EEWaermeG!')
 
         # --------------- Add BES ---------------
@@ -961,14 +1105,15 @@ def dim_decentralized(city, slp_city, scenario):
         city.nodes[b_node]['entity'].addEntity(bes)
 
         # Get total electricity demand in kWh/yr
-        w_el.append(city.get_annual_el_demand() / 1000)
+        w_el.append(shared_data['el_demand'])
 
         # Calculate costs and emissions
         calc_costs(city=city,
                    q_gas=q_gas,
                    w_el_in=w_el,
                    w_el_out=chp_el_prod,
-                   bafa_chp_tes=bafa_chp_tes)
+                   bafa_chp_tes=bafa_chp_tes,
+                   shared_data=shared_data)
 
         print('** CO2 per year: ' + str(round(calc_emissions(q_gas, w_el), 2)) + ' kgCO2/a **')
 
@@ -1017,20 +1162,14 @@ def calc_hp_spf(heatPump, environment, sh_curve, cop=(2.9, 3.7, 4.4), method=0):
             hp_spf = f_d_theta/(f_theta1/cop_n1 + f_theta2/cop_n2 + f_theta3/cop_n3)
 
         elif method == 1:
-            cop_array = np.zeros(8760)
-            el_in_array = np.zeros(8760)
-            q_out_array = np.zeros(8760)
-
             #  Get temperature array (source: outdoor air)
             array_temp = environment.weather.tAmbient
 
-            for i in range(8760):
-                curr_temp = array_temp[i]
-                curr_q_dem = sh_curve[i]
-
-                q_out_array[i] = heatPump.calc_hp_th_power_output(control_signal=curr_q_dem)
-                cop_array[i] = heatPump.calc_hp_cop_with_quality_grade(temp_source=curr_temp)
-                el_in_array[i] = heatPump.calc_hp_el_power_input(control_signal=q_out_array[i], t_source=curr_temp)
+            #  Thermal output and el. input for all hours at once
+            (q_out_array, el_in_array) = \
+                heatPump.calc_hp_all_results_array(
+                    control_signals=sh_curve[:8760],
+                    t_source=array_temp[:8760], save_res=False)
 
             hp_spf = np.round(np.sum(q_out_array) / np.sum(el_in_array),2)
 
@@ -1086,7 +1225,7 @@ def check_enev(area_total):
         raise Warning('Commissioning of condensing boiler not according to EnEV!!')
 
 
-def check_eewaermeg(city, device, ee_ratio, spf=None):
+def check_eewaermeg(city, device, ee_ratio, spf=None, building_age=None):
     """
     Checks for compliance with EEWaermeG.
     Works only for districts where all buildings have same building age (see get_building_age())
@@ -1097,13 +1236,17 @@ def check_eewaermeg(city, device, ee_ratio, spf=None):
     device : pyCity_calc class : HeatpumpExtended, ChpExtended, BoilerExtended
     ee_ratio : float : ratio of renewable
     spf : float : seasonal performance factor
+    building_age : string : 'old' or 'new' (default: None). If None, building age is calculated with get_building_age()
 
     Returns
     -------
     Compliance with EEWaermeG : bool
     """
 
-    if get_building_age(city) == 'new':
+    if building_age is None:
+        building_age = get_building_age(city)
+
+    if building_age == 'new':
         print('EEWaermeG is obligatory!')
 
         # ----------- CHP -----------
@@ -1179,7 +1322,8 @@ def calc_emissions(q_gas, w_el):
     return co2_total
 
 
-def calc_costs(city, q_gas, w_el_in, w_el_out, i=0.08, price_gas=0.0661, price_el=0.29, el_feedin_epex=0.02978, bafa_lhn=False, bafa_chp_tes=False):
+def calc_costs(city, q_gas, w_el_in, w_el_out, i=0.08, price_gas=0.0661, price_el=0.29, el_feedin_epex=0.02978, bafa_lhn=False, bafa_chp_tes=False,
+               shared_data=None):
     """
     Calculate estimated costs (in EUR/yr):
     - Capital related costs
@@ -1210,6 +1354,9 @@ def calc_costs(city, q_gas, w_el_in, w_el_out, i=0.08, price_gas=0.0661, price_e
         indicates if BAFA funding for lhn is applicable
     bafa_chp_tes:   bool
         indicates if BAFA funding for TES with CHP is applicable
+    shared_data:    dict, optional
+        data of city, which is shared by all scenarios (see get_shared_data). If set, th. peak loads of buildings
+        are taken from shared_data (default: None)
 
     Returns
     -------
@@ -1392,9 +1539,12 @@ def calc_costs(city, q_gas, w_el_in, w_el_out, i=0.08, price_gas=0.0661, price_e
 
         # LHN station for every building
         for b in city.nodelist_building:
-            building = city.nodes[b]['entity']
-            q_max = max(
-                building.get_space_heating_power_curve() / 1000 + building.get_dhw_power_curve() / 1000)
+            if shared_data is not None:
+                q_max = shared_data['buildings'][b]['q_max']
+            else:
+                building = city.nodes[b]['entity']
+                q_max = max(
+                    building.get_space_heating_power_curve() / 1000 + building.get_dhw_power_curve() / 1000)
             lhn_station_invest.append(
                 lhn_cost.calc_invest_single_lhn_station(q_max))
 
@@ -99,9 +99,7 @@ def calc_inf_samples(nb_samples, mean=0, sdev=1, max_val=2):
     array_inf /= 6
 
     #  Reset values larger than 2 to 0.26
-    for i in range(len(array_inf)):
-        if array_inf[i] > max_val:
-            array_inf[i] = 0.26
+    array_inf[array_inf > max_val] = 0.26
 
     return array_inf
 
@@ -130,9 +128,7 @@ def calc_sh_demand_samples(nb_samples, sh_ref, norm_std=0.25):
     array_sh = np.random.normal(loc=sh_ref, scale=norm_std * sh_ref,
                                 size=nb_samples)
 
-    for i in range(len(array_sh)):
-        if array_sh[i] < 0:
-            array_sh[i] = 0
+    array_sh[array_sh < 0] = 0
 
     return array_sh
 
@@ -165,12 +161,8 @@ def calc_sh_summer_on_off_samples(nb_samples, change_on=0.5):
     array_sh_on_off = np.random.randint(low=0, high=1000000, size=nb_samples) \
                       / 1000000
 
-    for i in range(len(array_sh_on_off)):
-        x = array_sh_on_off[i]
-        if x <= change_on:
-            array_sh_on_off[i] = 1  # On during summer
-        else:
-            array_sh_on_off[i] = 0  # Off during summer
+    #  On (1) or off (0) during summer
+    array_sh_on_off = np.where(array_sh_on_off <= change_on, 1.0, 0.0)
 
     print(array_sh_on_off)
 
@@ -2,13 +2,51 @@
 # -*- coding: utf-8 -*-
 """
 Script to generate samples for economic calculation
+
+Samples are drawn with the sampling engine (random design on unit
+hypercube, converted with inverse cumulative distribution functions).
+Pass rng or seed to get reproducible samples.
 """
 from __future__ import division
 
 import numpy as np
 
+import pycity_calc.toolbox.mc_helpers.sampling_engine as sampeng
+
+
+def _sample_uniform(nb_samples, minval, maxval, rng=None, seed=None):
+    """
+    Returns array of uniformly distributed samples
+
+    Parameters
+    ----------
+    nb_samples : int
+        Number of samples
+    minval : float
+        Minimal value
+    maxval : float
+        Maximal value
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None). Only relevant, if rng is None
+
+    Returns
+    -------
+    array_samples : np.array
+        Array with samples
+    """
+
+    assert nb_samples > 0
+
+    design = sampeng.gen_design(nb_samples=nb_samples, nb_par=1,
+                                method='random', rng=rng, seed=seed)
+
+    return sampeng.ppf_uniform(design[:, 0], min_val=minval, max_val=maxval)
 
-def sample_interest(nb_samples, minval=1.01, maxval=1.0675):
+
+def sample_interest(nb_samples, minval=1.01, maxval=1.0675, rng=None,
+                    seed=None):
     """
     Returns array of interest rate samples
 
@@ -20,6 +58,10 @@ def sample_interest(nb_samples, minval=1.01, maxval=1.0675):
         Minimal possible interest rate (default: 1.01)
     maxval : float, optional
         Maximal possible interest rate (default: 1.0675)
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None). Only relevant, if rng is None
 
     Returns
     -------
@@ -27,15 +69,14 @@ def sample_interest(nb_samples, minval=1.01, maxval=1.0675):
         Array with interest rate samples
     """
 
-    assert nb_samples > 0
-
-    array_interest = np.random.uniform(low=minval, high=maxval,
-                                       size=nb_samples)
+    array_interest = _sample_uniform(nb_samples=nb_samples, minval=minval,
+                                     maxval=maxval, rng=rng, seed=seed)
 
     return array_interest
 
 
-def sample_price_ch_cap(nb_samples, minval=1.0, maxval=1.0575):
+def sample_price_ch_cap(nb_samples, minval=1.0, maxval=1.0575, rng=None,
+                        seed=None):
     """
     Returns samples for price change rates on capital
 
@@ -47,6 +88,10 @@ def sample_price_ch_cap(nb_samples, minval=1.0, maxval=1.0575):
         Minimal value (default: 1.0)
     maxval : float, optional
         Maximal value (default: 1.0575)
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None). Only relevant, if rng is None
 
     Returns
     -------
@@ -54,15 +99,14 @@ def sample_price_ch_cap(nb_samples, minval=1.0, maxval=1.0575):
         Numpy array holding price change rate samples for capital
     """
 
-    assert nb_samples > 0
-
-    array_ch_cap = np.random.uniform(low=minval, high=maxval,
-                                     size=nb_samples)
+    array_ch_cap = _sample_uniform(nb_samples=nb_samples, minval=minval,
+                                   maxval=maxval, rng=rng, seed=seed)
 
     return array_ch_cap
 
 
-def sample_price_ch_dem_gas(nb_samples, minval=0.96, maxval=1.06):
+def sample_price_ch_dem_gas(nb_samples, minval=0.96, maxval=1.06, rng=None,
+                            seed=None):
     """
     Returns samples for price change rates on demand related cost for gas
 
@@ -74,6 +118,10 @@ def sample_price_ch_dem_gas(nb_samples, minval=0.96, maxval=1.06):
         Minimal value (default: 0.96)
     maxval : float, optional
         Maximal value (default: 1.06)
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None). Only relevant, if rng is None
 
     Returns
     -------
@@ -82,15 +130,14 @@ def sample_price_ch_dem_gas(nb_samples, minval=0.96, maxval=1.06):
         for gas
     """
 
-    assert nb_samples > 0
-
-    array_ch_dem_gas = np.random.uniform(low=minval, high=maxval,
-                                         size=nb_samples)
+    array_ch_dem_gas = _sample_uniform(nb_samples=nb_samples, minval=minval,
+                                       maxval=maxval, rng=rng, seed=seed)
 
     return array_ch_dem_gas
 
 
-def sample_price_ch_dem_el(nb_samples, minval=0.98, maxval=1.1):
+def sample_price_ch_dem_el(nb_samples, minval=0.98, maxval=1.1, rng=None,
+                           seed=None):
     """
     Returns samples for price change rates for demand related cost on
     electricity
@@ -103,6 +150,10 @@ def sample_price_ch_dem_el(nb_samples, minval=0.98, maxval=1.1):
         Minimal value (default: 0.98)
     maxval : float, optional
         Maximal value (default: 1.1)
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None). Only relevant, if rng is None
 
     Returns
     -------
@@ -111,15 +162,14 @@ def sample_price_ch_dem_el(nb_samples, minval=0.98, maxval=1.1):
         for electricity
     """
 
-    assert nb_samples > 0
-
-    array_ch_dem_el = np.random.uniform(low=minval, high=maxval,
-                                        size=nb_samples)
+    array_ch_dem_el = _sample_uniform(nb_samples=nb_samples, minval=minval,
+                                      maxval=maxval, rng=rng, seed=seed)
 
     return array_ch_dem_el
 
 
-def sample_price_ch_op(nb_samples, minval=1, maxval=1.0575):
+def sample_price_ch_op(nb_samples, minval=1, maxval=1.0575, rng=None,
+                       seed=None):
     """
     Returns samples for price change rates for operation related cost
 
@@ -131,6 +181,10 @@ def sample_price_ch_op(nb_samples, minval=1, maxval=1.0575):
         Minimal value (default: 1)
     maxval : float, optional
         Maximal value (default: 1.0575)
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None). Only relevant, if rng is None
 
     Returns
     -------
@@ -139,15 +193,14 @@ def sample_price_ch_op(nb_samples, minval=1, maxval=1.0575):
         related cost
     """
 
-    assert nb_samples > 0
-
-    array_ch_op = np.random.uniform(low=minval, high=maxval,
-                                    size=nb_samples)
+    array_ch_op = _sample_uniform(nb_samples=nb_samples, minval=minval,
+                                  maxval=maxval, rng=rng, seed=seed)
 
     return array_ch_op
 
 
-def sample_price_ch_eeg_chp(nb_samples, minval=0.98, maxval=1.02):
+def sample_price_ch_eeg_chp(nb_samples, minval=0.98, maxval=1.02, rng=None,
+                            seed=None):
     """
     Returns samples for price change rates for CHP EEG payment
 
@@ -159,6 +212,10 @@ def sample_price_ch_eeg_chp(nb_samples, minval=0.98, maxval=1.02):
         Minimal value (default: 0.98)
     maxval : float, optional
         Maximal value (default: 1.02)
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None). Only relevant, if rng is None
 
     Returns
     -------
@@ -166,15 +223,14 @@ def sample_price_ch_eeg_chp(nb_samples, minval=0.98, maxval=1.02):
         Numpy array holding price change rate samples for CHP EEG payment
     """
 
-    assert nb_samples > 0
-
-    array_ch_eeg_chp = np.random.uniform(low=minval, high=maxval,
-                                         size=nb_samples)
+    array_ch_eeg_chp = _sample_uniform(nb_samples=nb_samples, minval=minval,
+                                       maxval=maxval, rng=rng, seed=seed)
 
     return array_ch_eeg_chp
 
 
-def sample_price_ch_eeg_pv(nb_samples, minval=0.98, maxval=1.02):
+def sample_price_ch_eeg_pv(nb_samples, minval=0.98, maxval=1.02, rng=None,
+                           seed=None):
     """
     Returns samples for price change rates for PV EEG payment
 
@@ -186,6 +242,10 @@ def sample_price_ch_eeg_pv(nb_samples, minval=0.98, maxval=1.02):
         Minimal value (default: 0.98)
     maxval : float, optional
         Maximal value (default: 1.02)
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None). Only relevant, if rng is None
 
     Returns
     -------
@@ -193,15 +253,14 @@ def sample_price_ch_eeg_pv(nb_samples, minval=0.98, maxval=1.02):
         Numpy array holding price change rate samples for PV EEG payment
     """
 
-    assert nb_samples > 0
-
-    array_ch_eeg_pv = np.random.uniform(low=minval, high=maxval,
-                                        size=nb_samples)
+    array_ch_eeg_pv = _sample_uniform(nb_samples=nb_samples, minval=minval,
+                                      maxval=maxval, rng=rng, seed=seed)
 
     return array_ch_eeg_pv
 
 
-def sample_price_ch_eex(nb_samples, minval=0.94, maxval=1.02):
+def sample_price_ch_eex(nb_samples, minval=0.94, maxval=1.02, rng=None,
+                        seed=None):
     """
     Returns samples for price change rates for EEX baseload price
 
@@ -213,6 +272,10 @@ def sample_price_ch_eex(nb_samples, minval=0.94, maxval=1.02):
         Minimal value (default: 0.94)
     maxval : float, optional
         Maximal value (default: 1.02)
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None). Only relevant, if rng is None
 
     Returns
     -------
@@ -220,15 +283,14 @@ def sample_price_ch_eex(nb_samples, minval=0.94, maxval=1.02):
         Numpy array holding price change rate samples for EEX baseload price
     """
 
-    assert nb_samples > 0
-
-    array_ch_eex = np.random.uniform(low=minval, high=maxval,
-                                     size=nb_samples)
+    array_ch_eex = _sample_uniform(nb_samples=nb_samples, minval=minval,
+                                   maxval=maxval, rng=rng, seed=seed)
 
     return array_ch_eex
 
 
-def sample_price_ch_grid_use(nb_samples, minval=0.98, maxval=1.04):
+def sample_price_ch_grid_use(nb_samples, minval=0.98, maxval=1.04, rng=None,
+                             seed=None):
     """
     Returns samples for price change rates for grid usage fee
 
@@ -240,6 +302,10 @@ def sample_price_ch_grid_use(nb_samples, minval=0.98, maxval=1.04):
         Minimal value (default: 0.98)
     maxval : float, optional
         Maximal value (default: 1.04)
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None). Only relevant, if rng is None
 
     Returns
     -------
@@ -247,15 +313,14 @@ def sample_price_ch_grid_use(nb_samples, minval=0.98, maxval=1.04):
         Numpy array holding price change rate samples for grid usage fee
     """
 
-    assert nb_samples > 0
-
-    array_ch_grid_use = np.random.uniform(low=minval, high=maxval,
-                                          size=nb_samples)
+    array_ch_grid_use = _sample_uniform(nb_samples=nb_samples, minval=minval,
+                                        maxval=maxval, rng=rng, seed=seed)
 
     return array_ch_grid_use
 
 
-def sample_grid_av_fee(nb_samples, minval=0.0001, maxval=0.015):
+def sample_grid_av_fee(nb_samples, minval=0.0001, maxval=0.015, rng=None,
+                       seed=None):
     """
     Returns samples for grid usage avoidance fee in Euro/kWh
 
@@ -267,6 +332,10 @@ def sample_grid_av_fee(nb_samples, minval=0.0001, maxval=0.015):
         Minimal value (default: 0.0001)
     maxval : float, optional
         Maximal value (default: 0.015)
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None). Only relevant, if rng is None
 
     Returns
     -------
@@ -274,15 +343,14 @@ def sample_grid_av_fee(nb_samples, minval=0.0001, maxval=0.015):
         Numpy array holding samples for grid usage avoicance fee
     """
 
-    assert nb_samples > 0
-
-    array_grid_av_fee = np.random.uniform(low=minval, high=maxval,
-                                          size=nb_samples)
+    array_grid_av_fee = _sample_uniform(nb_samples=nb_samples, minval=minval,
+                                        maxval=maxval, rng=rng, seed=seed)
 
     return array_grid_av_fee
 
 
-def sample_temp_ground(nb_samples, minval=8, maxval=12):
+def sample_temp_ground(nb_samples, minval=8, maxval=12, rng=None,
+                       seed=None):
     """
     Returns samples for ground temperature in degree Celsius (relevant for
     LHN loss estimation)
@@ -295,6 +363,10 @@ def sample_temp_ground(nb_samples, minval=8, maxval=12):
         Minimal value (default: 8)
     maxval : float, optional
         Maximal value (default: 12)
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None). Only relevant, if rng is None
 
     Returns
     -------
@@ -302,15 +374,14 @@ def sample_temp_ground(nb_samples, minval=8, maxval=12):
         Numpy array holding price change rate samples for grid usage fee
     """
 
-    assert nb_samples > 0
-
-    array_temp_ground = np.random.uniform(low=minval, high=maxval,
-                                          size=nb_samples)
+    array_temp_ground = _sample_uniform(nb_samples=nb_samples, minval=minval,
+                                        maxval=maxval, rng=rng, seed=seed)
 
     return array_temp_ground
 
 
-def sample_quota_summer_heat_on(nb_samples, minval=0, maxval=1):
+def sample_quota_summer_heat_on(nb_samples, minval=0, maxval=1, rng=None,
+                                seed=None):
     """
     Returns sample array with ratios of buildings where heating is activated
     during summer.
@@ -323,6 +394,10 @@ def sample_quota_summer_heat_on(nb_samples, minval=0, maxval=1):
         Minimal possible interest rate (default: 0)
     maxval : float, optional
         Maximal possible interest rate (default: 1)
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None). Only relevant, if rng is None
 
     Returns
     -------
@@ -330,18 +405,18 @@ def sample_quota_summer_heat_on(nb_samples, minval=0, maxval=1):
         Array with interest rate samples
     """
 
-    assert nb_samples > 0
-
     lowv = minval * 100
     highv = maxval * 100
 
-    array_interest = np.random.\
-                         randint(low=lowv, high=highv, size=nb_samples) / 100
+    #  Ratios in steps of 0.01 within [minval, maxval)
+    array_interest = np.floor(_sample_uniform(nb_samples=nb_samples,
+                                              minval=lowv, maxval=highv,
+                                              rng=rng, seed=seed)) / 100
 
     return array_interest
 
 
-def sample_ids_houses_summer_on(ratio_on, list_b_ids):
+def sample_ids_houses_summer_on(ratio_on, list_b_ids, rng=None, seed=None):
     """
     Returns array with samples of list of building ids, which use heating
     during summer. Length of output array is defined by ratio_on and
@@ -356,6 +431,10 @@ def sample_ids_houses_summer_on(ratio_on, list_b_ids):
         during summer)
     list_b_ids : list (of ints)
         List of building node ids
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None). Only relevant, if rng is None
 
     Returns
     -------
@@ -371,13 +450,15 @@ def sample_ids_houses_summer_on(ratio_on, list_b_ids):
 
     nb_build_heat = int(round(nb_buildings * ratio_on, ndigits=0))
 
-    array_heat_ids = np.random.choice(a=list_b_ids, size=nb_build_heat,
-                                      replace=False)
+    array_heat_ids = sampeng.select_subsets(array_ids=list_b_ids,
+                                            array_nb=[nb_build_heat],
+                                            rng=rng, seed=seed)[0]
 
     return array_heat_ids
 
 
-def sample_list_sum_heat_on_arrays(nb_samples, array_ratio_on, list_b_ids):
+def sample_list_sum_heat_on_arrays(nb_samples, array_ratio_on, list_b_ids,
+                                   rng=None, seed=None):
     """
     Returns list with arrays holding building node ids for each run
 
@@ -391,6 +472,10 @@ def sample_list_sum_heat_on_arrays(nb_samples, array_ratio_on, list_b_ids):
         during summer)
     list_b_ids : list (of ints)
         List of building node ids
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None). Only relevant, if rng is None
 
     Returns
     -------
@@ -398,13 +483,17 @@ def sample_list_sum_heat_on_arrays(nb_samples, array_ratio_on, list_b_ids):
         List holding arrays with building node ids with heating during summer
     """
 
-    list_sum_heat_id_arrays = []
+    array_ratio_on = np.asarray(array_ratio_on[:nb_samples])
+
+    assert np.all(array_ratio_on >= 0)
+    assert np.all(array_ratio_on <= 1)
+
+    #  Number of buildings with heating during summer per sample
+    array_nb = np.round(len(list_b_ids) * array_ratio_on).astype(int)
 
-    for i in range(nb_samples):
-        ratio_on = array_ratio_on[i]
-        array_ids = sample_ids_houses_summer_on(ratio_on=ratio_on,
-                                                list_b_ids=list_b_ids)
-        list_sum_heat_id_arrays.append(array_ids)
+    list_sum_heat_id_arrays = \
+        sampeng.select_subsets(array_ids=list_b_ids, array_nb=array_nb,
+                               rng=rng, seed=seed)
 
     return list_sum_heat_id_arrays
 
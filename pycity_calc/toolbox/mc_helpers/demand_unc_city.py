@@ -72,10 +72,10 @@ def run_mc_sh_uncertain_city(city, nb_samples,
 
     #  1. Sampling of city uncertain parameters
     #  #####################################################################
-    list_wea = weaunc.gen_set_of_weathers(nb_weath=nb_samples,
-                                           year=weather_year,
-                                           timestep=timestep,
-                                           region_nb=weather_region)
+    list_wea = weaunc.gen_weather_ensemble(nb_weath=nb_samples,
+                                            year=weather_year,
+                                            timestep=timestep,
+                                            region_nb=weather_region)
 
     #  2. Perform sampling and
     #  3. Monte-Carlo simulation
@@ -368,8 +368,9 @@ def mod_single_build_w_samples(exbuilding, dict_samples, list_wea,
         'attic' : Holding attic samples list
         'const_type' : Holding construction type samples list
         'net_floor_area' : Holding net floor area samples list
-    list_wea : list (of weather objects)
-        List holding weather objects from sampling
+    list_wea : list (of weather objects) or WeatherEnsemble
+        List holding weather objects from sampling or weather ensemble
+        (see weather_ensemble.py)
     i : int
         Sampling index (0 to nb_samples - 1)
     MC_analysis: boolean, optional
@@ -523,9 +524,9 @@ def mc_call_single_building(exbuilding, dict_samples, list_wea,
         'const_type' : Holding construction type samples list
         'net_floor_area' : Holding net floor area samples list
         'height_of_floor': Holding average_height_of_floor list
-    list_wea : list (of weather objects)
+    list_wea : list (of weather objects) or WeatherEnsemble
         List holding different pycity weather objects for uncertainty
-        analysis
+        analysis or weather ensemble (see weather_ensemble.py)
     MC_analysis: boolean, optional
             Defines extra modifications for monte carlo analysis
             (dormer,attic,cellar, construction_type, net_floor_area)
@@ -779,8 +780,8 @@ def run_mc_sh_uncertain_single_building(building, nb_samples,
     #  #####################################
 
     list_wea = \
-        weaunc.gen_set_of_weathers(nb_weath=nb_samples, year=weather_year,
-                                   timestep=timestep, region_nb=weather_region)
+        weaunc.gen_weather_ensemble(nb_weath=nb_samples, year=weather_year,
+                                    timestep=timestep, region_nb=weather_region)
 
     print('Finished uncertain parameter sampling for single building')
     print()
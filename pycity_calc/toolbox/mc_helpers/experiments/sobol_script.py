@@ -3,106 +3,14 @@
 """
 Script for sobol sampling
 
-https://people.sc.fsu.edu/~jburkardt/py_src/sobol/sobol_lib.py
+Uses scrambled Sobol sequence of sampling engine
+(pycity_calc.toolbox.mc_helpers.sampling_engine)
 """
+from __future__ import division
 
-import math
-import numpy as np
 import random as rd
 
-
-def i4_uniform(a, b, seed):
-    # *****************************************************************************80
-    #
-    ## I4_UNIFORM returns a scaled pseudorandom I4.
-    #
-    #  Discussion:
-    #
-    #    The pseudorandom number will be scaled to be uniformly distributed
-    #    between A and B.
-    #
-    #  Licensing:
-    #
-    #    This code is distributed under the MIT license.
-    #
-    #  Modified:
-    #
-    #    22 February 2011
-    #
-    #  Author:
-    #
-    #    Original MATLAB version by John Burkardt.
-    #    PYTHON version by Corrado Chisari
-    #
-    #  Reference:
-    #
-    #    Paul Bratley, Bennett Fox, Linus Schrage,
-    #    A Guide to Simulation,
-    #    Springer Verlag, pages 201-202, 1983.
-    #
-    #    Pierre L'Ecuyer,
-    #    Random Number Generation,
-    #    in Handbook of Simulation,
-    #    edited by Jerry Banks,
-    #    Wiley Interscience, page 95, 1998.
-    #
-    #    Bennett Fox,
-    #    Algorithm 647:
-    #    Implementation and Relative Efficiency of Quasirandom
-    #    Sequence Generators,
-    #    ACM Transactions on Mathematical Software,
-    #    Volume 12, Number 4, pages 362-376, 1986.
-    #
-    #    Peter Lewis, Allen Goodman, James Miller
-    #    A Pseudo-Random Number Generator for the System/360,
-    #    IBM Systems Journal,
-    #    Volume 8, pages 136-143, 1969.
-    #
-    #  Parameters:
-    #
-    #    Input, integer A, B, the minimum and maximum acceptable values.
-    #
-    #    Input, integer SEED, a seed for the random number generator.
-    #
-    #    Output, integer C, the randomly chosen integer.
-    #
-    #    Output, integer SEED, the updated seed.
-    #
-    assert seed !=0, 'I4_UNIFORM - Fatal error!'
-
-    seed = math.floor(seed)
-
-    a = round(a)
-    b = round(b)
-
-    seed = np.mod(seed, 2147483647)
-
-    if (seed < 0):
-        seed = seed + 2147483647
-
-    k = math.floor(seed / 127773)
-
-    seed = 16807 * (seed - k * 127773) - k * 2836
-
-    if (seed < 0):
-        seed = seed + 2147483647
-
-    r = seed * 4.656612875E-10
-    #
-    #	Scale R to lie between A-0.5 and B+0.5.
-    #
-    r = (1.0 - r) * (min(a, b) - 0.5) + r * (max(a, b) + 0.5)
-    #
-    #	Use rounding to convert R to an integer between A and B.
-    #
-    value = round(r)
-
-    value = max(value, min(a, b))
-    value = min(value, max(a, b))
-
-    c = value
-
-    return [c, int(seed)]
+import pycity_calc.toolbox.mc_helpers.sampling_engine as sampeng
 
 
 def do_sobol_sampling(min_val, max_val, nb_samples, seed=1, do_print=False):
@@ -119,7 +27,7 @@ def do_sobol_sampling(min_val, max_val, nb_samples, seed=1, do_print=False):
     nb_samples : int
         Number of samples for list_of_cs
     seed : int, optional
-        Seed for random number generation (default: 1)
+        Seed for scrambling of Sobol sequence (default: 1)
     do_print : bool, optional
         Defines, if list should be printed out (default: False)
 
@@ -129,28 +37,21 @@ def do_sobol_sampling(min_val, max_val, nb_samples, seed=1, do_print=False):
         List with chosen values
     """
 
-    #  Increase float input values. This is done to prevent generation of
-    #  repeating int output values
-    min_val *= 1000000
-    max_val *= 1000000
+    design = sampeng.sobol_design(nb_samples=nb_samples, nb_par=1,
+                                  scramble=True, seed=seed)
 
-    list_of_cs = []
+    array_val = sampeng.ppf_uniform(design[:, 0], min_val=min_val,
+                                    max_val=max_val)
 
-    while len(list_of_cs) < nb_samples:
-        [c, seed] = i4_uniform(a=min_val, b=max_val, seed=seed)
-        if c not in list_of_cs:
-            list_of_cs.append(c)
-        if do_print:
-            print(list_of_cs)
+    list_of_cs = [round(float(val), 4) for val in array_val]
 
-    #  Reconvert list values
-    for i in range(len(list_of_cs)):
-        val = list_of_cs[i]
-        val /= 1000000
-        list_of_cs[i] = round(val, 4)
+    if do_print:
+        print(list_of_cs)
 
-        assert val >= min_val / 1000000, 'Sampling values is smaller than min.'
-        assert val <= max_val / 1000000, 'Sampling values is larger than max.'
+    assert min(list_of_cs) >= round(min_val, 4), \
+        'Sampling values is smaller than min.'
+    assert max(list_of_cs) <= round(max_val, 4), \
+        'Sampling values is larger than max.'
 
     return list_of_cs
 
@@ -7,20 +7,16 @@ from __future__ import division
 
 import os
 import pickle
-import random as rd
 import numpy as np
 import warnings
-import pyDOE
 import matplotlib.pylab as plt
-import scipy.stats.distributions as distr
 from scipy import stats
-from scipy.stats import lognorm
-
-import pycity_base.classes.demand.Occupancy as occu
-import pycity_base.classes.demand.ElectricalDemand as eldem
-import pycity_base.classes.demand.DomesticHotWater as dhwdem
 
 import pycity_calc.toolbox.mc_helpers.user.user_unc_sampling as useunc
+import pycity_calc.toolbox.mc_helpers.sampling_engine as sampeng
+import pycity_calc.toolbox.mc_helpers.study_engine as stueng
+import pycity_calc.toolbox.mc_helpers.lhc_sampling.profile_pool as profpool
+import pycity_calc.toolbox.user.user_profile_batch as upbatch
 
 
 def main():
@@ -376,9 +372,11 @@ def calc_nb_unc_par(city, nb_city_unc_par=15,
 
 def do_lhc_city_sampling(city, nb_par, nb_samples, dict_city_sample,
                          dict_build_samples, load_sh_mc_res=False,
-                         path_mc_res_folder=None, dem_unc=True):
+                         path_mc_res_folder=None, dem_unc=True,
+                         design_method='lhc', lhc_criterion='center',
+                         rng=None, seed=None):
     """
-    Performs latin hypercube sampling and adds samples to empty
+    Performs latin hypercube (or Sobol) sampling and adds samples to empty
     dict_city_sample, dict_build_samples
 
     Parameters
@@ -408,120 +406,59 @@ def do_lhc_city_sampling(city, nb_par, nb_samples, dict_city_sample,
         Defines, if thermal, el. and dhw demand are assumed to be uncertain
         (default: True). If True, samples demands. If False, uses reference
         demands.
+    design_method : str, optional
+        Design method (default: 'lhc')
+        Options:
+        - 'lhc' : Latin hypercube design
+        - 'sobol' : Scrambled Sobol sequence
+        - 'random' : Pseudo random numbers
+    lhc_criterion : str, optional
+        Latin hypercube criterion (default: 'center'). Only relevant for
+        design_method 'lhc'. See sampling_engine.lhs_design
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed for reproducible sampling (default: None). Only relevant,
+        if rng is None
     """
 
     list_build_ids = city.get_list_build_entity_node_ids()
 
+    rng = sampeng.get_rng(rng=rng, seed=seed)
+
     design_count = 0
 
-    #  Perform lhc design call
-    design = pyDOE.lhs(n=nb_par, samples=nb_samples, criterion='center')
+    #  Generate design on unit hypercube
+    design = sampeng.gen_design(nb_samples=nb_samples, nb_par=nb_par,
+                                method=design_method,
+                                criterion=lhc_criterion, rng=rng)
 
     # print(design)
     # plt.plot(sorted(design[0]))
     # plt.show()
     # plt.close()
 
-    #  Assumes equal distributions for given parameters (except lhn_inv!)
-    dict_ref_val_city = {'interest': [1.01, 1.0675],
-                         'price_ch_cap': [1.0, 1.0575],
-                         'price_ch_dem_gas': [0.96, 1.06],
-                         'price_ch_dem_el': [0.98, 1.1],
-                         'price_ch_op': [1, 1.0575],
-                         'price_ch_eeg_chp': [0.98, 1.02],
-                         'price_ch_eeg_pv': [0.98, 1.02],
-                         'price_ch_eex': [0.94, 1.02],
-                         'price_ch_grid_use': [0.98, 1.04],
-                         'temp_ground': [8, 12],
-                         'list_sum_on': [0, 1],
-                         'lhn_loss': [0.75, 1.25],
-                         'grid_av_fee': [0.0001, 0.015],
-                         'lhn_inv': [0, 0.5]  # log mean, std
-                         }
-
-    for key in dict_ref_val_city.keys():
-        if key != 'lhn_inv' and key != 'list_sum_on':
-            for i in range(len(design[:, design_count])):
-                val_lhc = design[i, design_count]
-
-                min_val = dict_ref_val_city[key][0]
-                max_val = dict_ref_val_city[key][1]
-
-                val_conv = val_lhc * (max_val - min_val) + min_val
-
-                dict_city_sample[key][i] = val_conv
-        elif key == 'lhn_inv':
-
-            # log_mean = dict_ref_val_city[key][0]
-            log_scale = dict_ref_val_city[key][1]
-
-            array_conv = lognorm(s=log_scale).ppf(design[:, design_count])
-
-            dict_city_sample[key] = array_conv
-
-        elif key == 'list_sum_on':
-            for i in range(len(design[:, design_count])):
-                val_lhc = design[i, design_count]
-
-                min_val = dict_ref_val_city[key][0]
-                max_val = dict_ref_val_city[key][1]
-
-                val_conv = val_lhc * (max_val - min_val) + min_val
-                #  val_conv defines share of buildings, which should have
-                #  heating on during summer --> Select buildings with
-                #  heating on
-
-                #  Define number of buildings, which should have heating on
-                #  during summer
-                nb_heat_on = int(val_conv * len(list_build_ids))
-
-                #  Randomly select number of buildings, until share is correct
-                array_heat_on = np.random.choice(a=list_build_ids,
-                                                 size=nb_heat_on,
-                                                 replace=False)
-
-                dict_city_sample[key].append(array_heat_on)
+    #  Distributions of city parameters (see study_engine)
+    for (key, dist, dict_dist) in stueng.list_city_par_dist:
+        array_conv = sampeng.dict_ppf[dist](design[:, design_count],
+                                            **dict_dist)
+
+        if key == 'list_sum_on':
+            #  Share of buildings, which should have heating on during summer
+            #  Define number of buildings, which should have heating on
+            #  during summer
+            array_nb_heat_on = (array_conv
+                                * len(list_build_ids)).astype(int)
+
+            #  Randomly select number of buildings, until share is correct
+            dict_city_sample[key].extend(
+                sampeng.select_subsets(array_ids=list_build_ids,
+                                       array_nb=array_nb_heat_on, rng=rng))
+        else:
+            dict_city_sample[key][:] = array_conv
 
         design_count += 1
 
-    dict_ref_val_build = {'sh_dem': [1, 0.5791],  # mean, std
-                          'el_dem': [1, 0.2],  # mean, std
-                          'dhw_dem': [1, 0.2],  # mean, std
-                          'self_discharge': [0.00001, 0.001],
-                          'eta_charge': [0.95, 0.005],  # mean, std
-                          'eta_discharge': [0.9, 0.005],  # mean, std
-                          # 'bat_lifetime': [0.9, 0.005],  # curr. const.
-                          # 'bat_maintain': [0.9, 0.005],  # curr. const.
-                          'bat_inv': [0, 0.3],  # log mean, std
-                          'eta_boi': [0.95, 0.005],  # mean, std
-                          # 'boi_lifetime': [0.9, 0.005],  # curr. const.
-                          # 'boi_maintain': [0.9, 0.005],  # curr. const.
-                          'boi_inv': [0, 0.2],  # log mean, std
-                          'omega_chp': [0.9, 0.02],  # mean, std
-                          # 'chp_lifetime': [0.9, 0.005],  # curr. const.
-                          # 'chp_maintain': [0.9, 0.005],  # curr. const.
-                          'chp_inv': [0, 0.3],  # log mean, std
-                          'qual_grade_ww': [0.38, 0.48],
-                          'qual_grade_aw': [0.29, 0.39],
-                          't_sink': [31, 55],
-                          # 'hp_lifetime': [0.9, 0.005],  # curr. const.
-                          # 'hp_maintain': [0.9, 0.005],  # curr. const.
-                          'hp_inv': [0, 0.2],  # log mean, std
-                          # 'eh_lifetime': [0.9, 0.005],  # curr. const.
-                          # 'eh_maintain': [0.9, 0.005],  # curr. const.
-                          'eh_inv': [0, 0.2],  # log mean, std
-                          'k_loss': [0.1, 0.5],
-                          # 'tes_lifetime': [0.9, 0.005],  # curr. const.
-                          # 'tes_maintain': [0.9, 0.005],  # curr. const.
-                          'tes_inv': [0, 0.2],  # log mean, std
-                          'eta_pv': [0.1275, 0.02],  # mean, std
-                          'beta': [0, 60],
-                          'gamma': [-180, 180],
-                          # 'pv_lifetime': [0.9, 0.005],  # curr. const.
-                          # 'pv_maintain': [0.9, 0.005],  # curr. const.
-                          'pv_inv': [0, 0.3],  # log mean, std
-                          }
-
     #  Try to load space heating uncertainty run results for sampling
     #  ##################################################################
     if load_sh_mc_res:
@@ -574,45 +511,12 @@ def do_lhc_city_sampling(city, nb_par, nb_samples, dict_city_sample,
     #  ####################################################################
     #  Loop over building ids
     for key in dict_build_samples.keys():
-        #  Loop over parameters
-        for parkey in dict_ref_val_build.keys():
-            if parkey in ['self_discharge', 'qual_grade_ww', 'qual_grade_aw',
-                          'k_loss', 'beta', 'gamma', 't_sink']:
-                #  Equal distribution
-                #  Loop over single parameter values
-                for i in range(len(design[:, design_count])):
-                    val_lhc = design[i, design_count]
-
-                    min_val = dict_ref_val_build[parkey][0]
-                    max_val = dict_ref_val_build[parkey][1]
-
-                    val_conv = val_lhc * (max_val - min_val) + min_val
-
-                    dict_build_samples[key][parkey][i] = val_conv
-
-            elif parkey in ['eta_charge', 'eta_discharge', 'eta_boi',
-                            'omega_chp', 'eta_pv']:
-                # Gaussian distribution
-
-                mean_val = dict_ref_val_build[parkey][0]
-                std_val = dict_ref_val_build[parkey][1]
-
-                array_conv = stats.norm(loc=mean_val,
-                                        scale=std_val).ppf(
-                    design[:, design_count])
-
-                dict_build_samples[key][parkey] = array_conv
-
-            elif parkey in ['bat_inv', 'boi_inv', 'chp_inv', 'hp_inv',
-                            'eh_inv', 'tes_inv', 'pv_inv']:
-                # Log normal distribution
-
-                # log_mean = dict_ref_val_build[parkey][0]
-                log_scale = dict_ref_val_build[parkey][1]
-
-                array_conv = lognorm(s=log_scale).ppf(design[:, design_count])
-
-                dict_build_samples[key][parkey] = array_conv
+        #  Loop over parameters (distributions see study_engine)
+        for (parkey, dist, dict_dist) in stueng.list_build_par_dist:
+            if parkey not in ['sh_dem', 'el_dem', 'dhw_dem']:
+                dict_build_samples[key][parkey] = \
+                    sampeng.dict_ppf[dist](design[:, design_count],
+                                           **dict_dist)
 
             elif parkey in ['sh_dem']:
                 #  (log normal distribution)
@@ -641,21 +545,19 @@ def do_lhc_city_sampling(city, nb_par, nb_samples, dict_city_sample,
                         shape, loc, scale = stats.lognorm.fit(data=list_sh_res,
                                                               floc=0)
 
-                        array_conv = distr.lognorm(s=shape).ppf(design[:,
-                                                                design_count])
+                        array_conv = \
+                            sampeng.ppf_lognormal(design[:, design_count],
+                                                  sigma=shape)
                         array_conv *= sh_dem_ref
                     else:
-                        mean_val = sh_dem_ref * dict_ref_val_build[parkey][0]
-                        std_val = sh_dem_ref * dict_ref_val_build[parkey][1]
-
-                        array_conv = stats.norm(loc=mean_val,
-                                                scale=std_val).ppf(
-                            design[:, design_count])
+                        mean_val = sh_dem_ref * dict_dist['mean']
+                        std_val = sh_dem_ref * dict_dist['std']
 
                         #  Eliminate negative values, if necessary
-                        for j in range(len(array_conv)):
-                            if array_conv[j] < 0:
-                                array_conv[j] = 0
+                        array_conv = \
+                            sampeng.ppf_normal(design[:, design_count],
+                                               mean=mean_val, std=std_val,
+                                               min_val=0)
                 else:
 
                     #  Demand is certain
@@ -690,20 +592,17 @@ def do_lhc_city_sampling(city, nb_par, nb_samples, dict_city_sample,
                         mean, std = stats.norm.fit(data=list_el_res)
 
                         array_conv = \
-                            distr.norm(loc=mean, scale=std).ppf(design[:,
-                                                                design_count])
+                            sampeng.ppf_normal(design[:, design_count],
+                                               mean=mean, std=std)
                     else:
-                        mean_val = el_dem_ref * dict_ref_val_build[parkey][0]
-                        std_val = el_dem_ref * dict_ref_val_build[parkey][1]
-
-                        array_conv = stats.norm(loc=mean_val,
-                                                scale=std_val).ppf(
-                            design[:, design_count])
+                        mean_val = el_dem_ref * dict_dist['mean']
+                        std_val = el_dem_ref * dict_dist['std']
 
                         #  Eliminate negative values, if necessary
-                        for j in range(len(array_conv)):
-                            if array_conv[j] < 0:
-                                array_conv[j] = 0
+                        array_conv = \
+                            sampeng.ppf_normal(design[:, design_count],
+                                               mean=mean_val, std=std_val,
+                                               min_val=0)
                 else:
 
                     #  Demand is certain
@@ -738,21 +637,19 @@ def do_lhc_city_sampling(city, nb_par, nb_samples, dict_city_sample,
                         shape, loc, scale = \
                             stats.lognorm.fit(data=list_dhw_res, floc=0)
 
-                        array_conv = distr.lognorm(s=shape).ppf(design[:,
-                                                                design_count])
+                        array_conv = \
+                            sampeng.ppf_lognormal(design[:, design_count],
+                                                  sigma=shape)
                         array_conv *= dhw_dem_ref
                     else:
-                        mean_val = dhw_dem_ref * dict_ref_val_build[parkey][0]
-                        std_val = dhw_dem_ref * dict_ref_val_build[parkey][1]
-
-                        array_conv = stats.norm(loc=mean_val,
-                                                scale=std_val).ppf(
-                            design[:, design_count])
+                        mean_val = dhw_dem_ref * dict_dist['mean']
+                        std_val = dhw_dem_ref * dict_dist['std']
 
                         #  Eliminate negative values, if necessary
-                        for j in range(len(array_conv)):
-                            if array_conv[j] < 0:
-                                array_conv[j] = 0
+                        array_conv = \
+                            sampeng.ppf_normal(design[:, design_count],
+                                               mean=mean_val, std=std_val,
+                                               min_val=0)
                 else:
 
                     #  Demand is certain
@@ -785,31 +682,32 @@ def do_lhc_city_sampling(city, nb_par, nb_samples, dict_city_sample,
                 #  Save array to results dict
                 dict_build_samples[key]['app_nb_occ'][i, :] = array_nb_occ
 
-                for k in range(len(array_nb_occ)):
-                    #  Sample el. demand value per apartment
-                    el_dem_per_app = useunc. \
+                #  Sample el. and dhw demands for all samples with same
+                #  number of occupants at once
+                for nb_occ in np.unique(array_nb_occ):
+                    mask_occ = array_nb_occ == nb_occ
+                    nb_occ_samples = np.count_nonzero(mask_occ)
+
+                    #  Sample el. demand values per apartment
+                    array_el_dem = useunc. \
                         calc_sampling_el_demand_per_apartment(
-                        nb_samples=1,
-                        nb_persons=array_nb_occ[k], type=res_type)[0]
-                    #  Sample dhw demand value per apartment
+                        nb_samples=nb_occ_samples,
+                        nb_persons=nb_occ, type=res_type)
 
                     #  Hot water volume per apartment
-                    dhw_vol_per_app = useunc. \
-                        calc_sampling_dhw_per_apartment(nb_samples=1,
-                                                        nb_persons=
-                                                        array_nb_occ[k],
-                                                        b_type=res_type)
-
-                    #  Convert liters/app*day to kWh/app*year
-                    dhw_dem_per_app = \
-                        useunc.recalc_dhw_vol_to_energy(vol=dhw_vol_per_app)
+                    array_dhw_vol = useunc. \
+                        calc_sampling_dhw_per_apartment(
+                        nb_samples=nb_occ_samples,
+                        nb_persons=nb_occ,
+                        b_type=res_type)
 
                     #  Save el. demand
-                    dict_build_samples[key]['app_el_dem'][i, k] = \
-                        el_dem_per_app
-                    #  Save dhw demand
-                    dict_build_samples[key]['app_dhw_dem'][i, k] = \
-                        dhw_dem_per_app
+                    dict_build_samples[key]['app_el_dem'][i, mask_occ] = \
+                        array_el_dem
+                    #  Convert liters/app*day to kWh/app*year and save
+                    #  dhw demand
+                    dict_build_samples[key]['app_dhw_dem'][i, mask_occ] = \
+                        useunc.recalc_dhw_vol_to_energy(vol=array_dhw_vol)
 
                     # plt.plot(sorted(dict_build_samples[1001]['eta_pv']))
                     # plt.show()
@@ -860,7 +758,8 @@ def do_lhc_city_sampling(city, nb_par, nb_samples, dict_city_sample,
                     dhw_per_app
 
 
-def gen_profile_pool(city, nb_samples, dict_build_samples, share_profiles=1):
+def gen_profile_pool(city, nb_samples, dict_build_samples, share_profiles=1,
+                     path_pool=None, seed=None):
     """
     Generate profile pool of user, el. load and dhw profiles for each building
 
@@ -878,73 +777,72 @@ def gen_profile_pool(city, nb_samples, dict_build_samples, share_profiles=1):
         Defines share on nb_samples to define nb. of profiles (default: 1).
         E.g. 0.5 with 20 nb_samples means, that 10 el. profiles are generated
         for profile pool
+    path_pool : str, optional
+        Path to .npy file (default: None). If set, profiles are written to
+        memory-mapped file instead of being held in memory.
+    seed : int, optional
+        Seed for profile generation (default: None)
 
     Returns
     -------
-    dict_profiles : dict
-        Dict holding building ids as keys and numpy.arrays with different
-        el. load profiles per building
+    dict_profiles : object
+        ProfilePool object (see profile_pool.py). Holds building ids as keys
+        and dicts with views on el. and dhw profile arrays
+        ('el_profiles', 'dhw_profiles') per building as values
     """
     assert nb_samples > 0
 
     print()
     print('Start generation of profile pool')
 
-    dict_profiles = {}
-
     profile_length = len(city.environment.weather.tAmbient)
 
     #  Estimate nb. of different profiles per building
     nb_profiles = int(nb_samples * share_profiles)
 
-    #  Loop over buildings
+    dict_nb_profiles = {}
     for key in dict_build_samples.keys():
+        dict_nb_profiles[key] = nb_profiles
 
-        print('Generate profiles for building ', key)
-
-        dict_profiles_build = {}
+    dict_profiles = profpool.ProfilePool(dict_nb_profiles=dict_nb_profiles,
+                                         nb_timesteps=profile_length,
+                                         path=path_pool)
 
-        #  Generate results arrays with zeros
-        el_profiles = np.zeros((nb_profiles, profile_length))
-        dhw_profiles = np.zeros((nb_profiles, profile_length))
+    rng = sampeng.get_rng(seed=seed)
 
-        #  Access building sample dict
-        dict_samples = dict_build_samples[key]
+    #  Loop over buildings
+    for key in dict_build_samples.keys():
 
-        #  Access occupants per apartment
-        occ_array = dict_samples['app_nb_occ']
+        if nb_profiles == 0:
+            break
 
-        #  Loop over nb. of profiles
-        for i in range(nb_profiles):
-            for a in range(len(city.nodes[key]['entity'].apartments)):
-                occupancy = occu.Occupancy(environment=city.environment,
-                                           number_occupants=int(occ_array[a,
-                                                                          i]))
+        print('Generate profiles for building ', key)
 
-                el_dem_obj = eldem. \
-                    ElectricalDemand(environment=city.environment,
-                                     method=2,
-                                     total_nb_occupants=int(occ_array[a, i]),
-                                     randomizeAppliances=True,
-                                     lightConfiguration=rd.randint(0, 10),
-                                     occupancy=occupancy.occupancy,
-                                     prev_heat_dev=True)
+        #  Access occupants per apartment (apartments x samples)
+        occ_array = dict_build_samples[key]['app_nb_occ']
+        nb_app = len(city.nodes[key]['entity'].apartments)
 
-                dhw_dem_obj = dhwdem. \
-                    DomesticHotWater(city.environment,
-                                     tFlow=60,
-                                     thermal=True,
-                                     method=2,
-                                     supplyTemperature=20,
-                                     occupancy=occupancy.occupancy)
+        #  Generate all apartment profiles of building at once and sum them
+        #  up per profile
+        array_nb_occ = occ_array[:nb_app, :nb_profiles].T.reshape(-1)
 
-                el_profiles[i, :] += el_dem_obj.loadcurve
-                dhw_profiles[i, :] += dhw_dem_obj.loadcurve
+        dict_app_prof = \
+            upbatch.gen_apartment_profiles(
+                environment=city.environment,
+                array_nb_occ=array_nb_occ.astype(int),
+                light_config=rng.integers(0, 11, len(array_nb_occ)),
+                prev_heat_dev=True,
+                t_supply=20,
+                group_ids=np.repeat(np.arange(nb_profiles), nb_app),
+                rng=rng)
 
-        dict_profiles_build['el_profiles'] = el_profiles
-        dict_profiles_build['dhw_profiles'] = dhw_profiles
+        #  Write profiles to profile pool arrays
+        dict_profiles.get_profiles(key, 'el_profiles')[:] = \
+            dict_app_prof['el']
+        dict_profiles.get_profiles(key, 'dhw_profiles')[:] = \
+            dict_app_prof['dhw_heat']
 
-        dict_profiles[key] = dict_profiles_build
+    dict_profiles.flush()
 
     print()
     print('Finished profile pool generation')
@@ -963,7 +861,11 @@ def run_overall_lhc_sampling(city, nb_samples,
                              load_city_n_build_samples=False,
                              path_city_sample_dict=None,
                              path_build_sample_dict=None,
-                             dem_unc=True):
+                             dem_unc=True,
+                             design_method='lhc',
+                             lhc_criterion='center',
+                             seed=None,
+                             path_pool=None):
     """
     Generates empty sample dicts and performs latin hypercube sampling.
     Adds samples to dict_city_sample, dict_build_samples
@@ -1008,6 +910,22 @@ def run_overall_lhc_sampling(city, nb_samples,
         Defines, if thermal, el. and dhw demand are assumed to be uncertain
         (default: True). If True, samples demands. If False, uses reference
         demands.
+    design_method : str, optional
+        Design method (default: 'lhc')
+        Options:
+        - 'lhc' : Latin hypercube design
+        - 'sobol' : Scrambled Sobol sequence
+        - 'random' : Pseudo random numbers
+    lhc_criterion : str, optional
+        Latin hypercube criterion (default: 'center'). Only relevant for
+        design_method 'lhc'. See sampling_engine.lhs_design
+    seed : int, optional
+        Seed for reproducible sampling of new sample dicts and profile pool
+        (default: None)
+    path_pool : str, optional
+        Path to .npy file for memory-mapped profile pool (default: None).
+        Only relevant, if profile pool is generated. If None, profile pool
+        is held in memory.
 
     Returns
     -------
@@ -1021,9 +939,11 @@ def run_overall_lhc_sampling(city, nb_samples,
             Dict. holding building ids as keys and dict of samples as values.
             These dicts hold paramter names as keys and numpy arrays with
             samples as dict values
-        dict_profiles : dict
-            Dict. holding building ids as keys and dict with numpy arrays
-            with different el. and dhw profiles for each building as value
+        dict_profiles : object
+            ProfilePool object (or dict, if loaded from former profile dict
+            pickle file) holding building ids as keys and dict with numpy
+            arrays with different el. and dhw profiles for each building as
+            value
             fict_profiles_build['el_profiles'] = el_profiles
             dict_profiles_build['dhw_profiles'] = dhw_profiles
             When use_profile_pool is False, dict_profiles is None
@@ -1111,7 +1031,10 @@ def run_overall_lhc_sampling(city, nb_samples,
                              dict_build_samples=dict_build_samples,
                              load_sh_mc_res=load_sh_mc_res,
                              path_mc_res_folder=path_mc_res_folder,
-                             dem_unc=dem_unc)
+                             dem_unc=dem_unc,
+                             design_method=design_method,
+                             lhc_criterion=lhc_criterion,
+                             seed=seed)
 
     if use_profile_pool:
         if gen_use_prof_method == 0:
@@ -1123,7 +1046,9 @@ def run_overall_lhc_sampling(city, nb_samples,
             dict_profiles = \
                 gen_profile_pool(city=city, nb_samples=nb_samples,
                                  dict_build_samples=dict_build_samples,
-                                 share_profiles=share_profiles)
+                                 share_profiles=share_profiles,
+                                 path_pool=path_pool,
+                                 seed=None if seed is None else seed + 1)
 
         elif gen_use_prof_method == 1:
             #  Load profiles from pickle file
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Profile pool for Monte-Carlo runs with latin hypercube sampling.
+
+ProfilePool stores el. and dhw load profiles of all buildings in a single
+2d array (one profile per row) with a row index per building and profile
+type. If a path is given, the array is a memory-mapped .npy file, so that
+the pool does not have to fit into RAM and can be shared by several
+processes (the operating system shares the file pages).
+
+ProfilePool behaves like the former profile dict:
+pool[build_id]['el_profiles'] and pool[build_id]['dhw_profiles'] return
+2d views (profiles x timesteps) on the pool array, not copies.
+
+Pickling a memory-mapped pool only stores path and index; the profile
+array is re-opened (read-only) on unpickling, e.g. in worker processes.
+"""
+from __future__ import division
+
+import numpy as np
+
+
+class ProfilePool(object):
+    """
+    Pool of load profiles of multiple buildings within single (memory-mapped)
+    array
+    """
+
+    def __init__(self, dict_nb_profiles, nb_timesteps, path=None,
+                 dtype=np.float64,
+                 list_types=('el_profiles', 'dhw_profiles')):
+        """
+        Constructor of ProfilePool. Allocates profile array with zeros.
+
+        Parameters
+        ----------
+        dict_nb_profiles : dict
+            Dict holding building ids as keys and number of profiles per
+            profile type as values
+        nb_timesteps : int
+            Number of timesteps per profile
+        path : str, optional
+            Path to .npy file (default: None). If set, profile array is
+            memory-mapped to path (existing file is overwritten). If None,
+            profile array is held in memory.
+        dtype : np.dtype, optional
+            Data type of profiles (default: np.float64)
+        list_types : tuple (of str), optional
+            Profile types per building
+            (default: ('el_profiles', 'dhw_profiles'))
+        """
+
+        self.path = path
+        self.list_types = tuple(list_types)
+
+        #  Holding building ids as keys and dicts with profile types as keys
+        #  and tuples (start row, stop row) as values
+        self._dict_index = {}
+
+        row = 0
+        for key in dict_nb_profiles.keys():
+            self._dict_index[key] = {}
+            for prof_type in self.list_types:
+                self._dict_index[key][prof_type] = \
+                    (row, row + int(dict_nb_profiles[key]))
+                row += int(dict_nb_profiles[key])
+
+        shape = (row, int(nb_timesteps))
+
+        if path is None:
+            self.array = np.zeros(shape, dtype=dtype)
+        else:
+            self.array = np.lib.format.open_memmap(path, mode='w+',
+                                                   dtype=dtype, shape=shape)
+
+    @classmethod
+    def from_dict(cls, dict_profiles, path=None, dtype=np.float64):
+        """
+        Generate ProfilePool out of profile dict (building ids as keys and
+        dicts with 'el_profiles' and 'dhw_profiles' arrays as values)
+
+        Parameters
+        ----------
+        dict_profiles : dict
+            Profile dict (e.g. loaded from former profile pool pickle file)
+        path : str, optional
+            Path to .npy file for memory-mapped pool (default: None)
+        dtype : np.dtype, optional
+            Data type of profiles (default: np.float64)
+
+        Returns
+        -------
+        pool : object
+            ProfilePool object
+        """
+
+        list_keys = list(dict_profiles.keys())
+
+        if len(list_keys) == 0:
+            return cls(dict_nb_profiles={}, nb_timesteps=0, path=path,
+                       dtype=dtype)
+
+        dict_first = dict_profiles[list_keys[0]]
+        list_types = list(dict_first.keys())
+
+        dict_nb_profiles = {}
+        for key in list_keys:
+            dict_nb_profiles[key] = len(dict_profiles[key][list_types[0]])
+
+            for prof_type in list_types:
+                assert len(dict_profiles[key][prof_type]) == \
+                       dict_nb_profiles[key]
+
+        pool = cls(dict_nb_profiles=dict_nb_profiles,
+                   nb_timesteps=np.shape(dict_first[list_types[0]])[1],
+                   path=path, dtype=dtype, list_types=list_types)
+
+        for key in list_keys:
+            for prof_type in list_types:
+                pool.get_profiles(key, prof_type)[:] = \
+                    dict_profiles[key][prof_type]
+
+        pool.flush()
+
+        return pool
+
+    def get_profiles(self, key, prof_type):
+        """
+        Returns view on profiles of building
+
+        Parameters
+        ----------
+        key : int
+            Building id
+        prof_type : str
+            Profile type (e.g. 'el_profiles')
+
+        Returns
+        -------
+        profiles : np.array
+            2d view (nb. of profiles x nb. of timesteps) on pool array
+        """
+
+        (start, stop) = self._dict_index[key][prof_type]
+
+        return self.array[start:stop]
+
+    def get_profile(self, key, prof_type, idx):
+        """
+        Returns view on single profile of building
+
+        Parameters
+        ----------
+        key : int
+            Building id
+        prof_type : str
+            Profile type (e.g. 'el_profiles')
+        idx : int
+            Profile index
+
+        Returns
+        -------
+        profile : np.array
+            1d view on pool array
+        """
+
+        (start, stop) = self._dict_index[key][prof_type]
+
+        if idx < 0 or idx >= stop - start:
+            msg = 'Profile index ' + str(idx) + ' is out of range!'
+            raise IndexError(msg)
+
+        return self.array[start + idx]
+
+    def get_nb_profiles(self, key, prof_type='el_profiles'):
+        """
+        Returns number of profiles of building and profile type
+        """
+
+        (start, stop) = self._dict_index[key][prof_type]
+
+        return stop - start
+
+    def flush(self):
+        """
+        Write changes of memory-mapped pool to disk
+        """
+
+        if self.path is not None:
+            self.array.flush()
+
+    def to_dict(self):
+        """
+        Returns profile dict with copies of profile arrays
+
+        Returns
+        -------
+        dict_profiles : dict
+            Dict holding building ids as keys and dicts with profile types
+            as keys and profile arrays as values
+        """
+
+        dict_profiles = {}
+
+        for key in self.keys():
+            dict_profiles[key] = {}
+            for prof_type in self.list_types:
+                dict_profiles[key][prof_type] = \
+                    np.array(self.get_profiles(key, prof_type))
+
+        return dict_profiles
+
+    def keys(self):
+        return self._dict_index.keys()
+
+    def __getitem__(self, key):
+        dict_build = {}
+        for prof_type in self.list_types:
+            dict_build[prof_type] = self.get_profiles(key, prof_type)
+        return dict_build
+
+    def __contains__(self, key):
+        return key in self._dict_index
+
+    def __iter__(self):
+        return iter(self._dict_index)
+
+    def __len__(self):
+        return len(self._dict_index)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self.path is not None:
+            #  Only store path and index of memory-mapped pool
+            self.flush()
+            state['array'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.path is not None:
+            self.array = np.load(self.path, mmap_mode='r')
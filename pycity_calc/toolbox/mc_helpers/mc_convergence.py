@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Convergence monitoring for Monte-Carlo runs (adaptive number of runs).
+
+McConvergenceMonitor tracks running statistics (mean, standard deviation,
+confidence interval width and quantiles) of Monte-Carlo outputs, e.g.
+annuity, CO2 emissions and demands, and decides if further runs are
+required. Runs are stopped, when all tolerances are met (convergence) or
+the time budget is exhausted. All statistics are stored in a convergence
+trace.
+
+Adaptive stopping works with the first samples of the sample set. Use
+random or Sobol designs (sampling_engine) for adaptive runs, as the first
+samples of a latin hypercube design are not stratified.
+"""
+from __future__ import division
+
+import time
+import numpy as np
+import scipy.stats as stats
+
+
+def calc_run_stats(array_res, confidence=0.95, quantiles=(0.05, 0.5, 0.95)):
+    """
+    Calculate statistics of Monte-Carlo results
+
+    Parameters
+    ----------
+    array_res : np.array
+        Results of valid runs
+    confidence : float, optional
+        Confidence level of confidence interval of mean (default: 0.95)
+    quantiles : tuple (of floats), optional
+        Quantiles (default: (0.05, 0.5, 0.95))
+
+    Returns
+    -------
+    dict_stats : dict
+        Dictionary holding statistics
+        dict_stats['mean'] : Mean value
+        dict_stats['std'] : Standard deviation (sample)
+        dict_stats['ci_half_width'] : Half width of confidence interval of
+        mean (Student t distribution)
+        dict_stats['rel_ci_width'] : ci_half_width related to absolute mean
+        dict_stats['quantiles'] : Array with quantile values
+    """
+
+    array_res = np.asarray(array_res, dtype=float)
+    nb_res = len(array_res)
+
+    assert nb_res > 0
+
+    dict_stats = {}
+
+    mean = np.mean(array_res)
+
+    if nb_res > 1:
+        std = np.std(array_res, ddof=1)
+        ci_half_width = stats.t.ppf((1 + confidence) / 2, nb_res - 1) \
+                        * std / np.sqrt(nb_res)
+    else:
+        std = np.inf
+        ci_half_width = np.inf
+
+    if mean != 0:
+        rel_ci_width = ci_half_width / abs(mean)
+    elif ci_half_width == 0:
+        rel_ci_width = 0
+    else:
+        rel_ci_width = np.inf
+
+    dict_stats['mean'] = mean
+    dict_stats['std'] = std
+    dict_stats['ci_half_width'] = ci_half_width
+    dict_stats['rel_ci_width'] = rel_ci_width
+    dict_stats['quantiles'] = np.quantile(array_res, quantiles)
+
+    return dict_stats
+
+
+class McConvergenceMonitor(object):
+    """
+    Monitor for adaptive Monte-Carlo runs. Hand over to
+    McRunner.run_mc_analysis (or perform_mc_runs) as conv_monitor.
+    nb_runs of McRunner then defines the maximum number of runs.
+    """
+
+    def __init__(self, list_keys=None, rel_tol=0.01, quantile_tol=None,
+                 confidence=0.95, quantiles=(0.05, 0.5, 0.95), min_runs=20,
+                 check_interval=10, time_budget=None):
+        """
+        Constructor of McConvergenceMonitor
+
+        Parameters
+        ----------
+        list_keys : list (of str), optional
+            Keys of Monte-Carlo results (dict_mc_res), which are monitored
+            (default: None). If None, uses
+            ['annuity', 'co2', 'sh_dem', 'el_dem', 'dhw_dem']
+        rel_tol : float or dict, optional
+            Tolerance of confidence interval half width of mean, related
+            to mean (default: 0.01). Can be dict with result keys as keys
+            and tolerances as values. If None, confidence interval is not
+            used as stopping criterion.
+        quantile_tol : float, optional
+            Tolerance of quantile changes between two checks, related to
+            the standard deviation of the results (default: None). If None,
+            quantiles are not used as stopping criterion.
+        confidence : float, optional
+            Confidence level of confidence interval (default: 0.95)
+        quantiles : tuple (of floats), optional
+            Monitored quantiles (default: (0.05, 0.5, 0.95))
+        min_runs : int, optional
+            Minimal number of valid runs before convergence is checked
+            (default: 20)
+        check_interval : int, optional
+            Number of runs between two convergence checks (default: 10)
+        time_budget : float, optional
+            Time budget for runs in seconds (default: None). If set, runs
+            are stopped, when time budget is exhausted.
+        """
+
+        if list_keys is None:
+            list_keys = ['annuity', 'co2', 'sh_dem', 'el_dem', 'dhw_dem']
+
+        assert min_runs > 1
+        assert check_interval > 0
+        if rel_tol is None and quantile_tol is None and time_budget is None:
+            msg = 'At least one of rel_tol, quantile_tol and time_budget ' \
+                  'has to be defined!'
+            raise AssertionError(msg)
+
+        self.list_keys = list_keys
+        self.rel_tol = rel_tol
+        self.quantile_tol = quantile_tol
+        self.confidence = confidence
+        self.quantiles = quantiles
+        self.min_runs = min_runs
+        self.check_interval = check_interval
+        self.time_budget = time_budget
+
+        self.list_trace = []  # List of dicts with statistics per check
+        self.converged = False
+        self.stop_reason = None
+        self.nb_runs = 0  # Number of performed runs
+
+        self._start_time = None
+        self._dict_quant_prev = {}
+
+    def start(self):
+        """
+        Reset trace and start timer
+        """
+
+        self.list_trace = []
+        self.converged = False
+        self.stop_reason = None
+        self.nb_runs = 0
+
+        self._start_time = time.time()
+        self._dict_quant_prev = {}
+
+    def get_rel_tol(self, key):
+        """
+        Returns relative confidence interval tolerance of result key
+        """
+
+        if isinstance(self.rel_tol, dict):
+            return self.rel_tol.get(key, None)
+        return self.rel_tol
+
+    def check(self, dict_mc_res, nb_runs, list_failed_runs=None):
+        """
+        Update trace and check, if Monte-Carlo runs can be stopped
+
+        Parameters
+        ----------
+        dict_mc_res : dict (of arrays)
+            Dictionary with result arrays of McRunner
+        nb_runs : int
+            Number of performed runs (valid and failed)
+        list_failed_runs : list (of ints), optional
+            Indexes of failed runs (default: None)
+
+        Returns
+        -------
+        stop : bool
+            True, if runs can be stopped
+        """
+
+        if self._start_time is None:
+            self.start()
+
+        self.nb_runs = nb_runs
+        elapsed = time.time() - self._start_time
+
+        if self.time_budget is not None and elapsed >= self.time_budget:
+            self._add_trace(dict_mc_res, nb_runs, list_failed_runs, elapsed)
+            self.stop_reason = 'time_budget'
+            return True
+
+        if nb_runs % self.check_interval != 0:
+            return False
+
+        dict_trace = self._add_trace(dict_mc_res, nb_runs, list_failed_runs,
+                                     elapsed)
+
+        if dict_trace['nb_valid'] < self.min_runs:
+            return False
+
+        if self.rel_tol is None and self.quantile_tol is None:
+            return False
+
+        for key in self.list_keys:
+            if key not in dict_trace:
+                return False
+
+            rel_tol = self.get_rel_tol(key)
+            if rel_tol is not None and \
+                    dict_trace[key]['rel_ci_width'] > rel_tol:
+                return False
+
+            if self.quantile_tol is not None and \
+                    dict_trace[key]['quant_change'] > self.quantile_tol:
+                return False
+
+        self.converged = True
+        self.stop_reason = 'converged'
+        return True
+
+    def _add_trace(self, dict_mc_res, nb_runs, list_failed_runs, elapsed):
+        """
+        Calculate statistics of valid runs and add them to trace
+        """
+
+        array_valid = np.ones(nb_runs, dtype=bool)
+        if list_failed_runs:
+            array_failed = np.array(list_failed_runs, dtype=int)
+            array_valid[array_failed[array_failed < nb_runs]] = False
+
+        dict_trace = {'nb_runs': nb_runs,
+                      'nb_valid': int(np.count_nonzero(array_valid)),
+                      'time': elapsed}
+
+        if dict_trace['nb_valid'] > 0:
+            for key in self.list_keys:
+                if key not in dict_mc_res:
+                    continue
+
+                dict_stats = \
+                    calc_run_stats(dict_mc_res[key][:nb_runs][array_valid],
+                                   confidence=self.confidence,
+                                   quantiles=self.quantiles)
+
+                #  Max. quantile change since last check (related to std)
+                if key in self._dict_quant_prev and dict_stats['std'] > 0:
+                    dict_stats['quant_change'] = \
+                        np.max(np.abs(dict_stats['quantiles']
+                                      - self._dict_quant_prev[key])) \
+                        / dict_stats['std']
+                elif key in self._dict_quant_prev:
+                    dict_stats['quant_change'] = \
+                        np.max(np.abs(dict_stats['quantiles']
+                                      - self._dict_quant_prev[key]))
+                else:
+                    dict_stats['quant_change'] = np.inf
+
+                self._dict_quant_prev[key] = dict_stats['quantiles']
+
+                dict_trace[key] = dict_stats
+
+        self.list_trace.append(dict_trace)
+
+        return dict_trace
+
+    def get_trace_array(self, key, stat='rel_ci_width'):
+        """
+        Returns arrays with number of runs and statistic value per check
+
+        Parameters
+        ----------
+        key : str
+            Result key (e.g. 'annuity')
+        stat : str, optional
+            Statistic (default: 'rel_ci_width')
+            Options: 'mean', 'std', 'ci_half_width', 'rel_ci_width',
+            'quant_change'
+
+        Returns
+        -------
+        tup_res : tuple (of arrays)
+            (array_nb_runs, array_stat)
+        """
+
+        list_entries = [entry for entry in self.list_trace if key in entry]
+
+        array_nb_runs = np.array([entry['nb_runs']
+                                  for entry in list_entries])
+        array_stat = np.array([entry[key][stat] for entry in list_entries])
+
+        return (array_nb_runs, array_stat)
+
+    def print_trace(self):
+        """
+        Print convergence trace
+        """
+
+        for entry in self.list_trace:
+            msg = 'Runs: ' + str(entry['nb_runs']) + ' (valid: ' \
+                  + str(entry['nb_valid']) + '), time: ' \
+                  + str(round(entry['time'], 1)) + ' s'
+            for key in self.list_keys:
+                if key in entry:
+                    msg += ', ' + key + ': ' \
+                           + str(round(entry[key]['mean'], 2)) + ' +/- ' \
+                           + str(round(entry[key]['ci_half_width'], 2))
+            print(msg)
+
+        if self.stop_reason is not None:
+            print('Stop reason: ' + str(self.stop_reason))
@@ -13,9 +13,6 @@ import pickle
 import time
 import random as rd
 import numpy as np
-import traceback
-
-import matplotlib.pyplot as plt
 
 import pycity_calc.economic.city_economic_calc as citecon
 import pycity_calc.environments.germanmarket as gmarket
@@ -27,15 +24,14 @@ import pycity_calc.toolbox.mc_helpers.city.city_sampling as citysample
 import pycity_calc.toolbox.mc_helpers.building.build_unc_set_gen as buildsample
 import pycity_calc.toolbox.mc_helpers.user.user_unc_sampling as usersample
 import pycity_calc.toolbox.mc_helpers.esys.esyssampling as esyssample
-import pycity_calc.toolbox.modifiers.mod_city_sh_dem as shmod
-import pycity_calc.toolbox.modifiers.mod_city_el_dem as elmod
-import pycity_calc.toolbox.modifiers.mod_city_dhw_dem as dhwmod
 import pycity_calc.toolbox.networks.network_ops as netop
 import pycity_calc.simulation.energy_balance.building_eb_calc as buildeb
 import pycity_calc.toolbox.modifiers.mod_city_esys_size as modesys
 import pycity_calc.energysystems.thermalEnergyStorage as tessys
 import pycity_calc.visualization.city_visual as citvis
 import pycity_calc.toolbox.mc_helpers.lhc_sampling.lhc_sample_run as lhcrun
+import pycity_calc.toolbox.mc_helpers.study_engine as stueng
+import pycity_calc.toolbox.mc_helpers.sampling_engine as sampeng
 import pycity_calc.cities.scripts.energy_sys_generator as esysgen
 
 
@@ -98,6 +94,230 @@ def penalize_switching(city, max_switch):
     return switching_okay
 
 
+#  Keys of city samples of random sampling (perform_sampling), which differ
+#  from keys of latin hypercube sampling (perform_lhc_sampling)
+dict_random_city_keys = {'price_ch_cap': 'ch_cap',
+                         'price_ch_dem_gas': 'ch_dem_gas',
+                         'price_ch_dem_el': 'ch_dem_el',
+                         'price_ch_op': 'ch_op',
+                         'price_ch_eeg_chp': 'ch_eeg_chp',
+                         'price_ch_eeg_pv': 'ch_eeg_pv',
+                         'price_ch_eex': 'ch_eex',
+                         'price_ch_grid_use': 'ch_grid_use'}
+
+#  Energy system parameters of latin hypercube sampling with device and
+#  parameter key of random sampling
+dict_random_esys_keys = {'self_discharge': ('bat', 'self_discharge'),
+                         'eta_charge': ('bat', 'eta_charge'),
+                         'eta_discharge': ('bat', 'eta_discharge'),
+                         'bat_inv': ('bat', 'bat_inv'),
+                         'eta_boi': ('boi', 'eta_boi'),
+                         'boi_inv': ('boi', 'boi_inv'),
+                         'omega_chp': ('chp', 'omega_chp'),
+                         'chp_inv': ('chp', 'chp_inv'),
+                         'qual_grade_aw': ('hp', 'quality_grade_aw'),
+                         'qual_grade_ww': ('hp', 'quality_grade_ww'),
+                         't_sink': ('hp', 't_sink'),
+                         'hp_inv': ('hp', 'hp_inv'),
+                         'eh_inv': ('eh', 'eh_inv'),
+                         'eta_pv': ('PV', 'eta_pv'),
+                         'beta': ('PV', 'beta'),
+                         'gamma': ('PV', 'gamma'),
+                         'pv_inv': ('PV', 'pv_inv'),
+                         'k_loss': ('tes', 'k_loss'),
+                         'tes_inv': ('tes', 'tes_inv')}
+
+#  Bes attribute, which defines, if device exists
+dict_random_esys_flags = {'bat': 'hasBattery', 'boi': 'hasBoiler',
+                          'chp': 'hasChp', 'hp': 'hasHeatpump',
+                          'eh': 'hasElectricalHeater', 'PV': 'hasPv',
+                          'tes': 'hasTes'}
+
+
+def conv_lhc_to_random_samples(city, dict_city_sample, dict_build_samples,
+                               list_build_ids=None):
+    """
+    Convert sample dicts of latin hypercube sampling to sample dicts of
+    random sampling (dict_samples_const, dict_samples_esys).
+
+    Electric and hot water demands of buildings are sums of apartment
+    demand samples.
+
+    Parameters
+    ----------
+    city : object
+        City object of pyCity_calc
+    dict_city_sample : dict
+        Dict holding city parameter names as keys and numpy arrays with
+        samples as dict values
+    dict_build_samples : dict
+        Dict. holding building ids as keys and dict of samples as values
+    list_build_ids : list (of ints), optional
+        List of building node ids (default: None). If None, uses all
+        building entity node ids of city
+
+    Returns
+    -------
+    tuple_res : tuple (of dicts)
+        2d tuple (dict_samples_const, dict_samples_esys) (see
+        McRunner.perform_sampling)
+    """
+
+    if list_build_ids is None:
+        list_build_ids = city.get_list_build_entity_node_ids()
+
+    dict_samples_const = {'city': {}}
+    dict_samples_esys = {}
+
+    for key in dict_city_sample.keys():
+        dict_samples_const['city'][dict_random_city_keys.get(key, key)] = \
+            dict_city_sample[key]
+
+    for n in list_build_ids:
+        build = city.nodes[n]['entity']
+        dict_samples = dict_build_samples[n]
+
+        dict_samples_const[str(n)] = \
+            {'occ': np.sum(dict_samples['app_nb_occ'], axis=0),
+             'el_dem': np.sum(dict_samples['app_el_dem'], axis=0),
+             'dhw_dem': np.sum(dict_samples['app_dhw_dem'], axis=0),
+             'sh_dem': dict_samples['sh_dem']}
+
+        dict_esys = {}
+
+        if build.hasBes:
+            for (key, (dev, par)) in dict_random_esys_keys.items():
+                if getattr(build.bes, dict_random_esys_flags[dev]):
+                    dict_esys.setdefault(dev, {})[par] = dict_samples[key]
+
+        dict_samples_esys[str(n)] = dict_esys
+
+    return (dict_samples_const, dict_samples_esys)
+
+
+def conv_random_to_lhc_samples(dict_samples_const, dict_samples_esys,
+                               list_build_ids):
+    """
+    Convert sample dicts of random sampling (dict_samples_const,
+    dict_samples_esys) to sample dicts of latin hypercube sampling
+
+    Parameters
+    ----------
+    dict_samples_const : dict (of dicts)
+        Dictionary holding dictionaries with constant sample data for MC run
+        (see McRunner.perform_sampling)
+    dict_samples_esys : dict (of dicts)
+        Dictionary holding dictionaries with energy system sampling data
+        for MC run (see McRunner.perform_sampling)
+    list_build_ids : list (of ints)
+        List of building node ids
+
+    Returns
+    -------
+    tuple_res : tuple (of dicts)
+        2d tuple (dict_city_sample, dict_build_samples) (see
+        McRunner.perform_lhc_sampling)
+    """
+
+    dict_city_rnd = dict_samples_const['city']
+
+    dict_city_sample = {}
+    for key in dict_city_rnd.keys():
+        dict_city_sample[key] = dict_city_rnd[key]
+    for (key, key_rnd) in dict_random_city_keys.items():
+        dict_city_sample[key] = dict_city_rnd[key_rnd]
+        del dict_city_sample[key_rnd]
+
+    dict_build_samples = {}
+    for n in list_build_ids:
+        dict_build_dem = dict_samples_const[str(n)]
+        dict_esys = dict_samples_esys[str(n)]
+
+        dict_build = {'sh_dem': dict_build_dem['sh_dem'],
+                      'el_dem': dict_build_dem['el_dem'],
+                      'dhw_dem': dict_build_dem['dhw_dem']}
+
+        for (key, (dev, par)) in dict_random_esys_keys.items():
+            if dev in dict_esys:
+                dict_build[key] = dict_esys[dev][par]
+
+        dict_build_samples[n] = dict_build
+
+    return (dict_city_sample, dict_build_samples)
+
+
+def get_mc_sample_values(registry, dict_city_sample, dict_build_samples,
+                         nb_runs, random_profile=False):
+    """
+    Returns parameter values of registry (see
+    study_engine.gen_city_eco_registry with mc_par, abs_dem and heating_off)
+    for each run from sample dicts of latin hypercube sampling
+
+    Parameters
+    ----------
+    registry : object
+        ParameterRegistry object
+    dict_city_sample : dict
+        Dict holding city parameter names as keys and numpy arrays with
+        samples as dict values
+    dict_build_samples : dict
+        Dict. holding building ids as keys and dict of samples as values
+    nb_runs : int
+        Number of runs
+    random_profile : bool, optional
+        Defines, if random profiles should be chosen from profile pool
+        (default: False). Profiles are also randomly chosen, if profile
+        pool holds less profiles than nb_runs. Otherwise, profile i is used
+        in run i.
+
+    Returns
+    -------
+    array_values : np.array
+        2d array (nb_runs x nb_par) with parameter values
+    """
+
+    array_values = np.zeros((nb_runs, len(registry)))
+
+    list_prof_idx = []
+
+    for j in range(len(registry)):
+        setter = registry.dict_setter[registry.list_names[j]]
+        node_id = getattr(setter, 'node_id', None)
+        par_name = getattr(setter, 'par_name', registry.list_names[j])
+
+        if isinstance(setter, stueng.ProfileSetter):
+            list_prof_idx.append(j)
+        elif par_name == stueng.BuildingParSetter.sum_heat_par:
+            array_values[:, j] = \
+                [node_id in dict_city_sample['list_sum_on'][i]
+                 for i in range(nb_runs)]
+        elif node_id is None:
+            array_values[:, j] = dict_city_sample[par_name][:nb_runs]
+        else:
+            array_values[:, j] = \
+                dict_build_samples[node_id][par_name][:nb_runs]
+
+    #  Profile pool indexes (random indexes are drawn run by run)
+    for i in range(nb_runs):
+        for j in list_prof_idx:
+            nb_profiles = \
+                len(registry.dict_setter[registry.list_names[j]].profiles)
+
+            if random_profile or nb_profiles < nb_runs:
+                if i == 0:
+                    msg = 'Number of profiles in profile pool ' \
+                          'is smaller than number of runs. Thus, ' \
+                          'profiles are randomly chosen instead ' \
+                          'of looping over them.'
+                    warnings.warn(msg)
+
+                array_values[i, j] = rd.randint(0, nb_profiles - 1)
+            else:
+                array_values[i, j] = i
+
+    return array_values
+
+
 class McToleranceException(Exception):
     def __init__(self, message):
         """
@@ -556,7 +776,7 @@ class McRunner(object):
 
         return dict_samples_esys
 
-    def perform_sampling_city(self, nb_runs):
+    def perform_sampling_city(self, nb_runs, rng=None, seed=None):
         """
         Perform sampling for city district parameters:
         - interest
@@ -574,6 +794,11 @@ class McRunner(object):
         ----------
         nb_runs : int
             Number of runs
+        rng : np.random.Generator, optional
+            Random Generator (default: None)
+        seed : int, optional
+            Seed for reproducible sampling (default: None). Only relevant,
+            if rng is None
 
         Returns
         -------
@@ -583,30 +808,44 @@ class McRunner(object):
 
         dict_city_samples = {}
 
-        array_interest = citysample.sample_interest(nb_samples=nb_runs)
-        array_ch_cap = citysample.sample_price_ch_cap(nb_samples=nb_runs)
+        rng = sampeng.get_rng(rng=rng, seed=seed)
+
+        array_interest = citysample.sample_interest(nb_samples=nb_runs,
+                                                    rng=rng)
+        array_ch_cap = citysample.sample_price_ch_cap(nb_samples=nb_runs,
+                                                      rng=rng)
         array_ch_dem_gas = citysample.sample_price_ch_dem_gas(nb_samples=
-                                                              nb_runs)
+                                                              nb_runs,
+                                                              rng=rng)
         array_ch_dem_el = citysample.sample_price_ch_dem_el(nb_samples=
-                                                            nb_runs)
-        array_ch_op = citysample.sample_price_ch_op(nb_samples=nb_runs)
+                                                            nb_runs,
+                                                            rng=rng)
+        array_ch_op = citysample.sample_price_ch_op(nb_samples=nb_runs,
+                                                    rng=rng)
         array_ch_eeg_chp = citysample.sample_price_ch_eeg_chp(nb_samples=
-                                                              nb_runs)
+                                                              nb_runs,
+                                                              rng=rng)
         array_ch_eeg_pv = citysample.sample_price_ch_eeg_pv(nb_samples=
-                                                            nb_runs)
-        array_ch_eex = citysample.sample_price_ch_eex(nb_samples=nb_runs)
+                                                            nb_runs,
+                                                            rng=rng)
+        array_ch_eex = citysample.sample_price_ch_eex(nb_samples=nb_runs,
+                                                      rng=rng)
         array_ch_grid_use = citysample.sample_price_ch_grid_use(nb_samples=
-                                                                nb_runs)
-        array_grid_av_fee = citysample.sample_grid_av_fee(nb_samples=nb_runs)
-        array_temp_ground = citysample.sample_temp_ground(nb_samples=nb_runs)
+                                                                nb_runs,
+                                                                rng=rng)
+        array_grid_av_fee = citysample.sample_grid_av_fee(nb_samples=nb_runs,
+                                                          rng=rng)
+        array_temp_ground = citysample.sample_temp_ground(nb_samples=nb_runs,
+                                                          rng=rng)
 
         array_summer_heat_on = citysample. \
-            sample_quota_summer_heat_on(nb_samples=nb_runs)
+            sample_quota_summer_heat_on(nb_samples=nb_runs, rng=rng)
 
         list_s_heat_on_id_arrays = citysample. \
             sample_list_sum_heat_on_arrays(nb_samples=nb_runs,
                                            array_ratio_on=array_summer_heat_on,
-                                           list_b_ids=self._list_build_ids)
+                                           list_b_ids=self._list_build_ids,
+                                           rng=rng)
 
         #  Only used, if LHN exists, but required to prevent ref.
         #  before assignment error #289
@@ -635,7 +874,8 @@ class McRunner(object):
 
         return dict_city_samples
 
-    def perform_sampling(self, nb_runs, save_samples=True, dem_unc=True):
+    def perform_sampling(self, nb_runs, save_samples=True, dem_unc=True,
+                         seed=None):
         """
         Perform parameter sampling for Monte-Carlo analysis
 
@@ -650,6 +890,8 @@ class McRunner(object):
             Defines, if thermal, el. and dhw demand are assumed to be uncertain
             (default: True). If True, samples demands. If False, uses reference
             demands.
+        seed : int, optional
+            Seed for reproducible sampling design (default: None)
 
         Returns
         -------
@@ -668,30 +910,23 @@ class McRunner(object):
                 (of building with id <building_id>)
         """
 
-        #  Initial sample dict. Holds further sample dicts for
-        #  'city' and each building node id
-        dict_samples_const = {}
-        dict_samples_esys = {}
-
-        #  Perform city sampling
-        dict_city_samples = self.perform_sampling_city(nb_runs=nb_runs)
-
-        dict_samples_const['city'] = dict_city_samples
-
-        #  Perform building sampling
-        #  Loop over node ids and add samples to result dict with building
-        #  id as key
-        for n in self._list_build_ids:
-            build = self._city_eco_calc.energy_balance.city.nodes[n]['entity']
-
-            dict_build_dem = self.perform_sampling_build_dem(nb_runs=nb_runs,
-                                                             building=build,
-                                                             dem_unc=dem_unc)
-            dict_esys = self.perform_sampling_build_esys(nb_runs=nb_runs,
-                                                         building=build)
+        city = self._city_eco_calc.energy_balance.city
 
-            dict_samples_const[str(n)] = dict_build_dem
-            dict_samples_esys[str(n)] = dict_esys
+        #  Sample with pseudo random design on unit hypercube, which is
+        #  converted with inverse cumulative distribution functions of
+        #  uncertain parameters
+        (dict_city_sample, dict_build_samples, dict_profiles) = \
+            lhcrun.run_overall_lhc_sampling(city=city, nb_samples=nb_runs,
+                                            dem_unc=dem_unc,
+                                            design_method='random',
+                                            seed=seed)
+
+        (dict_samples_const, dict_samples_esys) = \
+            conv_lhc_to_random_samples(
+                city=city,
+                dict_city_sample=dict_city_sample,
+                dict_build_samples=dict_build_samples,
+                list_build_ids=self._list_build_ids)
 
         if save_samples:
             #  Save sampling dict to MC runner object
@@ -711,7 +946,11 @@ class McRunner(object):
                              load_city_n_build_samples=False,
                              path_city_sample_dict=None,
                              path_build_sample_dict=None,
-                             dem_unc=True
+                             dem_unc=True,
+                             design_method='lhc',
+                             lhc_criterion='center',
+                             seed=None,
+                             path_pool=None
                              ):
         """
         Perform latin hypercube sampling
@@ -756,6 +995,21 @@ class McRunner(object):
             Defines, if thermal, el. and dhw demand are assumed to be uncertain
             (default: True). If True, samples demands. If False, uses reference
             demands.
+        design_method : str, optional
+            Design method (default: 'lhc')
+            Options:
+            - 'lhc' : Latin hypercube design
+            - 'sobol' : Scrambled Sobol sequence
+            - 'random' : Pseudo random numbers
+        lhc_criterion : str, optional
+            Latin hypercube criterion (default: 'center'). Only relevant for
+            design_method 'lhc'. See sampling_engine.lhs_design
+        seed : int, optional
+            Seed for reproducible sampling (default: None)
+        path_pool : str, optional
+            Path to .npy file for memory-mapped profile pool (default: None).
+            Only relevant, if profile pool is generated. If None, profile
+            pool is held in memory.
 
         Returns
         -------
@@ -800,7 +1054,11 @@ class McRunner(object):
             load_city_n_build_samples=load_city_n_build_samples,
             path_city_sample_dict=path_city_sample_dict,
             path_build_sample_dict=path_build_sample_dict,
-            dem_unc=dem_unc
+            dem_unc=dem_unc,
+            design_method=design_method,
+            lhc_criterion=lhc_criterion,
+            seed=seed,
+            path_pool=path_pool
         )
 
         if save_res:
@@ -815,7 +1073,7 @@ class McRunner(object):
                         heating_off=True, eeg_pv_limit=False,
                         random_profile=False, use_kwkg_lhn_sub=False,
                         calc_th_el_cov=False, el_mix_for_chp=True,
-                        el_mix_for_pv=True):
+                        el_mix_for_pv=True, conv_monitor=None):
         """
         Perform mc runs.
         - Extract sample values
@@ -864,6 +1122,13 @@ class McRunner(object):
             Defines, if el. mix should be used for PV fed-in electricity
             (default: True). If False, uses specific fed-in PV factor,
             defined in co2emissions object (co2_factor_pv_fed_in)
+        conv_monitor : object, optional
+            McConvergenceMonitor object for adaptive number of runs
+            (default: None). If set, nb_runs defines the maximum number of
+            runs. Runs are stopped, when conv_monitor reports convergence
+            or exhausted time budget. Result arrays are then shortened to
+            the number of performed runs (first samples) and
+            dict_mc_setup holds the convergence trace.
 
         Returns
         -------
@@ -890,6 +1155,11 @@ class McRunner(object):
                 dict_mc_setup['failure_tolerance'] = failure_tolerance
                 dict_mc_setup['heating_off'] = heating_off
                 dict_mc_setup['idx_failed_runs'] = self._list_failed_runs
+                If conv_monitor is set, further holds:
+                dict_mc_setup['max_nb_runs'] = nb_runs (input)
+                dict_mc_setup['converged'] = conv_monitor.converged
+                dict_mc_setup['stop_reason'] = conv_monitor.stop_reason
+                dict_mc_setup['conv_trace'] = conv_monitor.list_trace
             dict_mc_cov : dict
                 Dictionary holding thermal/electrical coverage factors
                 dict_mc_cov['th_cov_boi'] = array_th_cov_boi
@@ -909,10 +1179,6 @@ class McRunner(object):
             msg = 'nb_runs has to be larger than zero!'
             raise AssertionError(msg)
 
-        #  Initialize result dict an arrays
-        #  #################################################################
-        dict_mc_res = {}
-
         dict_mc_setup = {}
 
         #  Add chosen settings to dict_mc_setup
@@ -920,810 +1186,79 @@ class McRunner(object):
         dict_mc_setup['failure_tolerance'] = failure_tolerance
         dict_mc_setup['heating_off'] = heating_off
 
-        #  Initial zero result arrays
-        array_annuity = np.zeros(nb_runs)
-        array_co2 = np.zeros(nb_runs)
-
-        #  # Uncommented, as already existent on sampling dicts
-        array_net_sh = np.zeros(nb_runs)
-        array_net_el = np.zeros(nb_runs)
-        array_net_dhw = np.zeros(nb_runs)
-
-        array_gas_boiler = np.zeros(nb_runs)
-        array_gas_chp = np.zeros(nb_runs)
-        array_grid_imp_dem = np.zeros(nb_runs)
-        array_grid_imp_hp = np.zeros(nb_runs)
-        array_grid_imp_eh = np.zeros(nb_runs)
-        array_lhn_pump = np.zeros(nb_runs)
-        array_grid_exp_chp = np.zeros(nb_runs)
-        array_grid_exp_pv = np.zeros(nb_runs)
-
-        #  Set failure counter to zero
-        self._nb_failed_runs = 0
-        self._list_failed_runs = []
+        if sampling_method == 'random':
+            (dict_city_sample, dict_build_samples) = \
+                conv_random_to_lhc_samples(
+                    dict_samples_const=self._dict_samples_const,
+                    dict_samples_esys=self._dict_samples_esys,
+                    list_build_ids=self._list_build_ids)
+            dict_profiles = None
+        else:
+            dict_city_sample = self._dict_city_sample_lhc
+            dict_build_samples = self._dict_build_samples_lhc
+            dict_profiles = self._dict_profiles_lhc
+
+        #  Sample values are written into copies of city_eco_calc by setters
+        #  of parameter registry (profiles, absolute demands, energy
+        #  systems, summer heating mode, city and annuity parameters)
+        registry = stueng.gen_city_eco_registry(
+            city_eco_calc=self._city_eco_calc,
+            list_build_ids=self._list_build_ids,
+            mc_par=True,
+            heating_off=heating_off,
+            abs_dem=True,
+            dict_profiles=dict_profiles)
+
+        array_values = get_mc_sample_values(
+            registry=registry,
+            dict_city_sample=dict_city_sample,
+            dict_build_samples=dict_build_samples,
+            nb_runs=nb_runs,
+            random_profile=random_profile)
+
+        #  Evaluate runs one by one (convergence check after each run)
+        engine = self.gen_study_engine(registry=registry, batch_size=1,
+                                       failure_tolerance=failure_tolerance,
+                                       eeg_pv_limit=eeg_pv_limit,
+                                       use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                                       el_mix_for_chp=el_mix_for_chp,
+                                       el_mix_for_pv=el_mix_for_pv,
+                                       calc_th_el_cov=calc_th_el_cov,
+                                       use_cache=False)
+
+        try:
+            (dict_mc_res, list_failed) = \
+                engine.run(array_values, conv_monitor=conv_monitor)
+        except stueng.StudyToleranceException:
+            msg = 'Number of failed runs exceeds ' \
+                  'allowed limit of %d runs!' % (failure_tolerance * nb_runs)
+            raise McToleranceException(msg)
+
+        #  Failed runs hold zero values
+        for key in dict_mc_res.keys():
+            dict_mc_res[key][list_failed] = 0
 
         if calc_th_el_cov:
-            #  Calculate thermal and electric coverage by device
-
             dict_mc_cov = {}
-
-            array_th_cov_boi = np.zeros(nb_runs)
-            array_th_cov_chp = np.zeros(nb_runs)
-            array_th_cov_hp_aw = np.zeros(nb_runs)
-            array_th_cov_hp_ww = np.zeros(nb_runs)
-            array_th_cov_eh = np.zeros(nb_runs)
-
-            array_el_cov_chp = np.zeros(nb_runs)
-            array_el_cov_pv = np.zeros(nb_runs)
-            array_el_cov_grid = np.zeros(nb_runs)
+            for key in stueng.CityEcoEvaluator.list_cov_keys:
+                if key in dict_mc_res:
+                    dict_mc_cov[key] = dict_mc_res.pop(key)
         else:
             dict_mc_cov = None
 
-        #  Run energy balance and economic analysis
-        #  #################################################################
-        for i in range(nb_runs):
-            #  Copy city economic calculator, to prevent modification of
-            #  original objects
-            c_eco_copy = copy.deepcopy(self._city_eco_calc)
-
-            #  For simplification, add pointers to submodules of c_eco_copy
-            city = c_eco_copy.energy_balance.city
-            energy_balance = c_eco_copy.energy_balance
-            annuity_obj = c_eco_copy.annuity_obj
-            #  Add sampling results to environment, city and buildings
-            #  ###############################################################
-
-            # dict_build_samples : dict (of arrays and dicts)
-            # Dictionary storing building samples
-            # dict_build_samples['occ'] = array_occupants
-            # dict_build_samples['el_dem'] = array_el_dem
-            # dict_build_samples['dhw_dem'] = array_dhw_dem
-            # dict_build_samples['sh_dem'] = array_sh_dem
-            # dict_build_samples['on_off'] = array_sh_on_off
-
-            #  Add building sample input data
-            #  ###############################################################
-            if sampling_method == 'random':
-                for n in self._list_build_ids:
-                    curr_build = city.nodes[n]['entity']
-
-                    dict_build_dem = self._dict_samples_const[str(n)]
-                    dict_esys = self._dict_samples_esys[str(n)]
-
-                    #  Add function to rescale sh, el, dhw demands
-                    #  #######################################################
-
-                    sh_dem = dict_build_dem['sh_dem'][i]
-                    shmod.rescale_sh_dem_build(building=curr_build,
-                                               sh_dem=sh_dem)
+        self._nb_failed_runs = len(list_failed)
+        self._list_failed_runs = list_failed
 
-                    el_dem = dict_build_dem['el_dem'][i]
-                    elmod.rescale_el_dem_build(building=curr_build,
-                                               el_dem=el_dem)
+        # Save failed run information to dict_mc_setup
+        dict_mc_setup['idx_failed_runs'] = self._list_failed_runs
 
-                    dhw_dem = dict_build_dem['dhw_dem'][i]
-                    dhwmod.rescale_dhw_build(building=curr_build,
-                                             dhw_dem=dhw_dem)
-
-                    #  Add energy system data
-                    #  #######################################################
-
-                    if curr_build.hasBes:
-
-                        #  Check which devices do exist on bes
-                        if curr_build.bes.hasBattery:
-                            dict_bat = dict_esys['bat']
-
-                            bat = curr_build.bes.battery
-
-                            #  Add new parameters to battery
-                            bat.selfDischarge = dict_bat['self_discharge'][i]
-                            bat.etaCharge = dict_bat['eta_charge'][i]
-                            bat.etaDischarge = dict_bat['eta_discharge'][i]
-
-                        # dict_bat['bat_lifetime'] = \
-                        #         esyssample.sample_lifetime(nb_samples=nb_runs)
-                        #
-                        #     dict_bat['bat_maintain'] = \
-                        #         esyssample.sample_maintain(nb_samples=nb_runs)
-
-                        if curr_build.bes.hasBoiler:
-                            dict_boi = dict_esys['boi']
-
-                            boi = curr_build.bes.boiler
-
-                            #  Add new boiler parameters
-                            boi.eta = dict_boi['eta_boi'][i]
-
-                            # dict_boi['boi_lifetime'] = \
-                            #     esyssample.sample_lifetime(nb_samples=nb_runs)
-                            #
-                            # dict_boi['boi_maintain'] = \
-                            #     esyssample.sample_maintain(nb_samples=nb_runs)
-
-                        if curr_build.bes.hasChp:
-                            dict_chp = dict_esys['chp']
-
-                            chp = curr_build.bes.chp
-
-                            #  Get omega sample
-                            omega = dict_chp['omega_chp'][i]
-                            #  Get current nominal thermal power
-                            curr_th_eta = chp.qNominal
-
-                            #  Recalculate corresponding thermal and electrical
-                            #  nominal power values with new omega
-                            (th_power, el_power) = \
-                                chp.run_precalculation(q_nominal=curr_th_eta,
-                                                       p_nominal=None,
-                                                       eta_total=omega,
-                                                       thermal_operation_mode=True)
-
-                            #  Overwrite existing values
-                            chp.qNominal = th_power
-                            chp.pNominal = el_power
-
-                            # dict_chp['chp_lifetime'] = \
-                            #     esyssample.sample_lifetime(nb_samples=nb_runs)
-                            #
-                            # dict_chp['chp_maintain'] = \
-                            #     esyssample.sample_maintain(nb_samples=nb_runs)
-
-                        if curr_build.bes.hasHeatpump:
-                            dict_hp = dict_esys['hp']
-
-                            hp = curr_build.bes.heatpump
-
-                            hp.quality_grade_aw = dict_hp['quality_grade_aw'][
-                                i]
-                            hp.quality_grade_ww = dict_hp['quality_grade_ww'][
-                                i]
-                            hp.t_sink = dict_hp['t_sink'][i]
-
-                            # dict_hp['hp_lifetime'] = \
-                            #     esyssample.sample_lifetime(nb_samples=nb_runs)
-                            #
-                            # dict_hp['hp_maintain'] = \
-                            #     esyssample.sample_maintain(nb_samples=nb_runs)
-
-                        if curr_build.bes.hasElectricalHeater:
-                            dict_eh = dict_esys['eh']
-
-                            eh = curr_build.bes.electricalHeater
-
-                            # dict_eh['eh_lifetime'] = \
-                            #     esyssample.sample_lifetime(nb_samples=nb_runs)
-                            #
-                            # dict_eh['eh_maintain'] = \
-                            #     esyssample.sample_maintain(nb_samples=nb_runs)
-
-                        if curr_build.bes.hasPv:
-                            dict_pv = dict_esys['PV']
-
-                            pv = curr_build.bes.pv
-
-                            pv.eta = dict_pv['eta_pv'][i]
-
-                            pv.beta = dict_pv['beta'][i]
-
-                            pv.gamma = dict_pv['gamma'][i]
-
-                            # dict_pv['hp_lifetime'] = \
-                            #     esyssample.sample_lifetime(nb_samples=nb_runs)
-                            #
-                            # dict_pv['hp_maintain'] = \
-                            #     esyssample.sample_maintain(nb_samples=nb_runs)
-
-                        if curr_build.bes.hasTes:
-                            dict_tes = dict_esys['tes']
-
-                            tes = curr_build.bes.tes
-
-                            tes.k_loss = dict_tes['k_loss'][i]
-
-                            # dict_tes['hp_lifetime'] = \
-                            #     esyssample.sample_lifetime(nb_samples=nb_runs)
-                            #
-                            # dict_tes['hp_maintain'] = \
-                            #     esyssample.sample_maintain(nb_samples=nb_runs)
-
-            elif sampling_method == 'lhc':
-                #  #########################################################
-                for n in self._list_build_ids:
-                    curr_build = city.nodes[n]['entity']
-
-                    dict_build_lhc = self._dict_build_samples_lhc[n]
-
-                    #  If profile pool is given, overwrite existing profiles
-                    if self._dict_profiles_lhc is not None:
-                        el_prof_pool = \
-                            self._dict_profiles_lhc[n]['el_profiles']
-                        dhw_prof_pool = \
-                            self._dict_profiles_lhc[n]['dhw_profiles']
-
-                        #  Get number of apartments in current building
-                        nb_app = len(curr_build.apartments)
-
-                        #  Add new el. profile from profile pool
-                        if random_profile or len(el_prof_pool) < nb_runs:
-
-                            msg = 'Number of el. profiles in el_prof_pool ' \
-                                  'is smaller than number of runs. Thus, ' \
-                                  'profiles are randomly chosen instead ' \
-                                  'of looping over them.'
-                            warnings.warn(msg)
-
-                            idx = rd.randint(0, len(el_prof_pool) - 1)
-                            el_profile = el_prof_pool[idx]
-                            for app in city.nodes[n]['entity'].apartments:
-                                app.power_el.loadcurve = el_profile / nb_app
-                        else:
-                            for app in city.nodes[n]['entity'].apartments:
-                                app.power_el.loadcurve = el_prof_pool[i] / \
-                                                         nb_app
-
-                        if self._dict_profiles_lhc is not None:
-                            #  Add new dhw. profile from profile pool
-                            if random_profile or len(dhw_prof_pool) < nb_runs:
-                                #  Add new dhw. profile from profile pool, if
-                                #  available
-                                idx = rd.randint(0, len(dhw_prof_pool) - 1)
-                                dhw_profile = dhw_prof_pool[idx]
-                                for app in city.nodes[n]['entity'].apartments:
-                                    app.power_el.loadcurve = \
-                                        dhw_profile / nb_app
-                            else:
-                                for app in city.nodes[n]['entity'].apartments:
-                                    app.demandDomesticHotWater.loadcurve = \
-                                        dhw_prof_pool[i] / nb_app
-
-                    #  Add function to rescale sh, el, dhw demands
-                    #  #######################################################
-
-                    sh_dem = dict_build_lhc['sh_dem'][i]
-                    shmod.rescale_sh_dem_build(building=curr_build,
-                                               sh_dem=sh_dem)
-
-                    el_dem = dict_build_lhc['el_dem'][i]
-                    elmod.rescale_el_dem_build(building=curr_build,
-                                               el_dem=el_dem)
-
-                    dhw_dem = dict_build_lhc['dhw_dem'][i]
-                    dhwmod.rescale_dhw_build(building=curr_build,
-                                             dhw_dem=dhw_dem)
-
-                    #  Uncommented, due to issue #465
-                    #  ####################################################
-                    # el_dem = 0
-                    # for a in range(len(dict_build_lhc['app_el_dem'])):
-                    #     #  Sum up el. demand
-                    #     el_dem += dict_build_lhc['app_el_dem'][a][i]
-                    #
-                    # nb_app = len(city.nodes[n]['entity'].apartments)
-                    #
-                    # if self._dict_profiles_lhc is not None:
-                    #     #  Add new el. profile from profile pool, if available
-                    #     if random_profile or len(el_prof_pool) < nb_runs:
-                    #
-                    #         msg = 'Number of el. profiles in el_prof_pool ' \
-                    #               'is smaller than number of runs. Thus, ' \
-                    #               'profiles are randomly chosen instead ' \
-                    #               'of looping over them.'
-                    #         warnings.warn(msg)
-                    #
-                    #         idx = rd.randint(0, len(el_prof_pool) - 1)
-                    #         el_profile = el_prof_pool[idx]
-                    #         for app in city.nodes[n]['entity'].apartments:
-                    #             app.power_el.loadcurve = el_profile / nb_app
-                    #     else:
-                    #         for app in city.nodes[n]['entity'].apartments:
-                    #             app.power_el.loadcurve = el_prof_pool[i] / \
-                    #                                      nb_app
-                    #
-                    # #  Rescale profile to el_dem sample
-                    # elmod.rescale_el_dem_build(building=curr_build,
-                    #                            el_dem=el_dem)
-                    # dhw_dem = 0
-                    # for a in range(len(dict_build_lhc['app_dhw_dem'])):
-                    #     dhw_dem += dict_build_lhc['app_dhw_dem'][a][i]
-                    #
-                    # if self._dict_profiles_lhc is not None:
-                    #     #  Add new dhw. profile from profile pool, if available
-                    #     if random_profile or len(dhw_prof_pool) < nb_runs:
-                    #         #  Add new dhw. profile from profile pool, if
-                    #         #  available
-                    #         idx = rd.randint(0, len(dhw_prof_pool) - 1)
-                    #         dhw_profile = dhw_prof_pool[idx]
-                    #         for app in city.nodes[n]['entity'].apartments:
-                    #             app.power_el.loadcurve = dhw_profile / nb_app
-                    #     else:
-                    #         for app in city.nodes[n]['entity'].apartments:
-                    #             app.demandDomesticHotWater.loadcurve = \
-                    #                 dhw_prof_pool[i] / nb_app
-                    #
-                    # #  Rescale demand to dhw_dem sample
-                    # dhwmod.rescale_dhw_build(building=curr_build,
-                    #                          dhw_dem=dhw_dem)
-
-                    #  Add energy system data
-                    #  #######################################################
-
-                    if curr_build.hasBes:
-
-                        #  Check which devices do exist on bes
-                        if curr_build.bes.hasBattery:
-                            bat = curr_build.bes.battery
-
-                            #  Add new parameters to battery
-                            bat.selfDischarge = \
-                                dict_build_lhc['self_discharge'][i]
-                            bat.etaCharge = \
-                                dict_build_lhc['eta_charge'][i]
-                            bat.etaDischarge = \
-                                dict_build_lhc['eta_discharge'][i]
-
-                        # dict_bat['bat_lifetime'] = \
-                        #         esyssample.sample_lifetime(nb_samples=nb_runs)
-                        #
-                        #     dict_bat['bat_maintain'] = \
-                        #         esyssample.sample_maintain(nb_samples=nb_runs)
-
-                        if curr_build.bes.hasBoiler:
-                            boi = curr_build.bes.boiler
-
-                            #  Add new boiler parameters
-                            boi.eta = dict_build_lhc['eta_boi'][i]
-
-                            # dict_boi['boi_lifetime'] = \
-                            #     esyssample.sample_lifetime(nb_samples=nb_runs)
-                            #
-                            # dict_boi['boi_maintain'] = \
-                            #     esyssample.sample_maintain(nb_samples=nb_runs)
-
-                        if curr_build.bes.hasChp:
-                            chp = curr_build.bes.chp
-
-                            #  Get omega sample
-                            omega = dict_build_lhc['omega_chp'][i]
-                            #  Get current nominal thermal power
-                            curr_th_eta = chp.qNominal
-
-                            #  Recalculate corresponding thermal and electrical
-                            #  nominal power values with new omega
-                            (th_power, el_power) = \
-                                chp.run_precalculation(q_nominal=curr_th_eta,
-                                                       p_nominal=None,
-                                                       eta_total=omega,
-                                                       thermal_operation_mode=True)
-
-                            #  Overwrite existing values
-                            chp.qNominal = th_power
-                            chp.pNominal = el_power
-
-                            # dict_chp['chp_lifetime'] = \
-                            #     esyssample.sample_lifetime(nb_samples=nb_runs)
-                            #
-                            # dict_chp['chp_maintain'] = \
-                            #     esyssample.sample_maintain(nb_samples=nb_runs)
-
-                        if curr_build.bes.hasHeatpump:
-                            hp = curr_build.bes.heatpump
-
-                            hp.quality_grade_aw = \
-                                dict_build_lhc['qual_grade_aw'][i]
-                            hp.quality_grade_ww = \
-                                dict_build_lhc['qual_grade_ww'][i]
-                            hp.t_sink = dict_build_lhc['t_sink'][i]
-
-                            # dict_hp['hp_lifetime'] = \
-                            #     esyssample.sample_lifetime(nb_samples=nb_runs)
-                            #
-                            # dict_hp['hp_maintain'] = \
-                            #     esyssample.sample_maintain(nb_samples=nb_runs)
-
-                        if curr_build.bes.hasElectricalHeater:
-                            eh = curr_build.bes.electricalHeater
-
-                            # dict_eh['eh_lifetime'] = \
-                            #     esyssample.sample_lifetime(nb_samples=nb_runs)
-                            #
-                            # dict_eh['eh_maintain'] = \
-                            #     esyssample.sample_maintain(nb_samples=nb_runs)
-
-                        if curr_build.bes.hasPv:
-                            pv = curr_build.bes.pv
-
-                            pv.eta = dict_build_lhc['eta_pv'][i]
-
-                            pv.beta = dict_build_lhc['beta'][i]
-
-                            pv.gamma = dict_build_lhc['gamma'][i]
-
-                            # dict_pv['hp_lifetime'] = \
-                            #     esyssample.sample_lifetime(nb_samples=nb_runs)
-                            #
-                            # dict_pv['hp_maintain'] = \
-                            #     esyssample.sample_maintain(nb_samples=nb_runs)
-
-                        if curr_build.bes.hasTes:
-                            tes = curr_build.bes.tes
-
-                            tes.k_loss = dict_build_lhc['k_loss'][i]
-
-                            # dict_tes['hp_lifetime'] = \
-                            #     esyssample.sample_lifetime(nb_samples=nb_runs)
-                            #
-                            # dict_tes['hp_maintain'] = \
-                            #     esyssample.sample_maintain(nb_samples=nb_runs)
-
-            # Extract city sampling data
-            #  #############################################################
-            if sampling_method == 'random':
-
-                dict_city_samples = self._dict_samples_const['city']
-
-                # dict_city_samples['interest'] = array_interest
-                # dict_city_samples['ch_cap'] = array_ch_cap
-                # dict_city_samples['ch_dem_gas'] = array_ch_dem_gas
-                # dict_city_samples['ch_dem_el'] = array_ch_dem_el
-                # dict_city_samples['ch_op'] = array_ch_op
-                # dict_city_samples['ch_eeg_chp'] = array_ch_eeg_chp
-                # dict_city_samples['ch_eeg_pv'] = array_ch_eeg_pv
-                # dict_city_samples['ch_eex'] = array_ch_eex
-                # dict_city_samples['ch_grid_use'] = array_ch_grid_use
-                # dict_city_samples['grid_av_fee'] = array_grid_av_fee
-                # dict_city_samples['temp_ground'] = array_temp_ground
-                # dict_city_samples['list_sum_on'] = list_s_heat_on_id_arrays
-                # dict_city_samples['lhn_inv'] = array_lhn_inv
-                # dict_city_samples['lhn_loss'] = array_lhn_loss
-
-                if heating_off:
-                    #  Use sampling to switch demand of some heating systems off
-                    #  during summer period
-
-                    #  Get array with building ids with summer heating mode on
-                    array_heat_on = dict_city_samples['list_sum_on'][i]
-
-                    #  Calculate list of building ids, where heating is off during
-                    #  summer
-                    list_heat_off = list(set(self._list_build_ids) -
-                                         set(array_heat_on))
-
-                    for n in list_heat_off:
-                        curr_build = city.nodes[n]['entity']
-
-                        #  Modify space heating (switch off during summer)
-                        shmod.sh_curve_summer_off_build(building=curr_build)
-
-                # Save inputs to city, market and environment
-                city.environment.temp_ground = \
-                dict_city_samples['temp_ground'][i]
-                city.environment.prices.grid_av_fee = \
-                    dict_city_samples['grid_av_fee'][i]
-
-                #  Save inputs to annuity_obj
-                annuity_obj.interest = dict_city_samples['interest'][i]
-                annuity_obj.price_ch_cap = dict_city_samples['ch_cap'][i]
-                annuity_obj.price_ch_dem_gas = dict_city_samples['ch_dem_gas'][
-                    i]
-                annuity_obj.price_ch_dem_el = dict_city_samples['ch_dem_el'][i]
-                # Reuse ch_dem_el for hp price change
-                annuity_obj.price_ch_dem_el_hp = \
-                dict_city_samples['ch_dem_el'][i]
-                annuity_obj.price_ch_op = dict_city_samples['ch_op'][i]
-                annuity_obj.price_ch_eeg_chp = dict_city_samples['ch_eeg_chp'][
-                    i]
-                annuity_obj.price_ch_eeg_pv = dict_city_samples['ch_eeg_pv'][i]
-                annuity_obj.price_ch_eex = dict_city_samples['ch_eex'][i]
-                annuity_obj.price_ch_grid_use = \
-                dict_city_samples['ch_grid_use'][i]
-
-            elif sampling_method == 'lhc':
-
-                dict_city_lhc = self._dict_city_sample_lhc
-
-                # #  City sample dict
-                # #  Uncertain interest
-                # dict_city_sample['interest']
-                # #  Uncertain price change capital
-                # dict_city_sample['price_ch_cap']
-                # #  Uncertain price change demand gas
-                # dict_city_sample['price_ch_dem_gas']
-                # #  Uncertain price change demand electricity
-                # dict_city_sample['price_ch_dem_el']
-                # #  Uncertain price change operation
-                # dict_city_sample['price_ch_op']
-                # #  Uncertain price change eeg payments for self-con. chp el.
-                # dict_city_sample['price_ch_eeg_chp']
-                # #  Uncertain price change eeg payments for self-con. PV el.
-                # dict_city_sample['price_ch_eeg_pv']
-                # #  Uncertain price change EEX baseload price
-                # dict_city_sample['price_ch_eex']
-                # #  Uncertain price change grid usage fee
-                # dict_city_sample['price_ch_grid_use']
-                # #  Uncertain ground temperature
-                # dict_city_sample['temp_ground']
-                # #  Uncertain LHN loss factor change
-                # dict_city_sample['lhn_loss']
-                # #  Uncertain LHN investment cost change
-                # dict_city_sample['lhn_inv']
-                # # Uncertain summer mode on / off
-                # #  Holding list holding arrays with building node ids with
-                #  heating during
-                # # summer
-                # dict_city_sample['list_sum_on']
-
-                if heating_off:
-                    #  Use sampling to switch demand of some heating systems off
-                    #  during summer period
-
-                    #  Get array with building ids with summer heating mode on
-                    array_heat_on = dict_city_lhc['list_sum_on'][i]
-
-                    #  Calculate list of building ids, where heating is off during
-                    #  summer
-                    list_heat_off = list(set(self._list_build_ids) -
-                                         set(array_heat_on))
-
-                    for n in list_heat_off:
-                        curr_build = city.nodes[n]['entity']
-
-                        #  Modify space heating (switch off during summer)
-                        shmod.sh_curve_summer_off_build(building=curr_build)
-
-                # Save inputs to city, market and environment
-                city.environment.temp_ground = \
-                    dict_city_lhc['temp_ground'][i]
-                city.environment.prices.grid_av_fee = \
-                    dict_city_lhc['grid_av_fee'][i]
-
-                #  Save inputs to annuity_obj
-                annuity_obj.interest = dict_city_lhc['interest'][i]
-                annuity_obj.price_ch_cap = dict_city_lhc['price_ch_cap'][i]
-                annuity_obj.price_ch_dem_gas = \
-                dict_city_lhc['price_ch_dem_gas'][
-                    i]
-                annuity_obj.price_ch_dem_el = dict_city_lhc['price_ch_dem_el'][
-                    i]
-                # Reuse ch_dem_el for hp price change
-                annuity_obj.price_ch_dem_el_hp = \
-                    dict_city_lhc['price_ch_dem_el'][i]
-                annuity_obj.price_ch_op = dict_city_lhc['price_ch_op'][i]
-                annuity_obj.price_ch_eeg_chp = \
-                dict_city_lhc['price_ch_eeg_chp'][
-                    i]
-                annuity_obj.price_ch_eeg_pv = dict_city_lhc['price_ch_eeg_pv'][
-                    i]
-                annuity_obj.price_ch_eex = dict_city_lhc['price_ch_eex'][i]
-                annuity_obj.price_ch_grid_use = \
-                    dict_city_lhc['price_ch_grid_use'][i]
-
-            #  Rerun initial parameter calculation of annuity_obj
-            annuity_obj.initial_calc()
-            #  Necessary to recalculate values, that depend on sampling data
-
-            #  Run energy balance and annuity calculation
-            #  ###############################################################
-            try:
-                (total_annuity, co2) = c_eco_copy. \
-                    perform_overall_energy_balance_and_economic_calc(
-                    run_mc=True,
-                    sampling_method=sampling_method,
-                    dict_samples_const=self._dict_samples_const,
-                    dict_samples_esys=self._dict_samples_esys,
-                    dict_city_sample_lhc=self._dict_city_sample_lhc,
-                    dict_build_samples_lhc=self._dict_build_samples_lhc,
-                    run_idx=i,
-                    eeg_pv_limit=eeg_pv_limit,
-                    use_kwkg_lhn_sub=use_kwkg_lhn_sub,
-                    el_mix_for_chp=el_mix_for_chp,
-                    el_mix_for_pv=el_mix_for_pv
-                )
-
-                #  Extract further results
-                sh_dem = c_eco_copy.energy_balance. \
-                    city.get_annual_space_heating_demand()
-                el_dem = c_eco_copy.energy_balance. \
-                    city.get_annual_el_demand()
-                dhw_dem = c_eco_copy.energy_balance. \
-                    city.get_annual_dhw_demand()
-
-                gas_boiler = c_eco_copy.energy_balance.dict_fe_city_balance[
-                    'fuel_boiler']
-                gas_chp = c_eco_copy.energy_balance.dict_fe_city_balance[
-                    'fuel_chp']
-                grid_imp_dem = c_eco_copy.energy_balance.dict_fe_city_balance[
-                    'grid_import_dem']
-                grid_imp_hp = c_eco_copy.energy_balance.dict_fe_city_balance[
-                    'grid_import_hp']
-                grid_imp_eh = c_eco_copy.energy_balance.dict_fe_city_balance[
-                    'grid_import_eh']
-                lhn_pump = c_eco_copy.energy_balance.dict_fe_city_balance[
-                    'pump_energy']
-
-                grid_exp_chp = c_eco_copy.energy_balance.dict_fe_city_balance[
-                    'chp_feed']
-                grid_exp_pv = c_eco_copy.energy_balance.dict_fe_city_balance[
-                    'pv_feed']
-
-                #  Save results
-                array_annuity[i] = total_annuity
-                array_co2[i] = co2
-                array_net_sh[i] = sh_dem
-                array_net_el[i] = el_dem
-                array_net_dhw[i] = dhw_dem
-
-                array_gas_boiler[i] = gas_boiler
-                array_gas_chp[i] = gas_chp
-                array_grid_imp_dem[i] = grid_imp_dem
-                array_grid_imp_hp[i] = grid_imp_hp
-                array_grid_imp_eh[i] = grid_imp_eh
-                array_lhn_pump[i] = lhn_pump
-                array_grid_exp_chp[i] = grid_exp_chp
-                array_grid_exp_pv[i] = grid_exp_pv
-
-                dict_mc_res['annuity'] = array_annuity
-                dict_mc_res['co2'] = array_co2
-                dict_mc_res['sh_dem'] = array_net_sh
-                dict_mc_res['el_dem'] = array_net_el
-                dict_mc_res['dhw_dem'] = array_net_dhw
-                dict_mc_res['gas_boiler'] = array_gas_boiler
-                dict_mc_res['gas_chp'] = array_gas_chp
-                dict_mc_res['grid_imp_dem'] = array_grid_imp_dem
-                dict_mc_res['grid_imp_hp'] = array_grid_imp_hp
-                dict_mc_res['grid_imp_eh'] = array_grid_imp_eh
-                dict_mc_res['lhn_pump'] = array_lhn_pump
-                dict_mc_res['grid_exp_chp'] = array_grid_exp_chp
-                dict_mc_res['grid_exp_pv'] = array_grid_exp_pv
-
-                if calc_th_el_cov:
-                    #  #####################################################
-                    #  Calculate thermal and electric coverage by device
-
-                    timestep = city.environment.timer.timeDiscretization
-
-                    nb_timesteps = int((365 * 24 * 3600) / timestep)
-
-                    #  Initial zero result arrays (on city district level)
-                    array_chp_q_out = np.zeros(nb_timesteps)
-                    array_chp_el_out = np.zeros(nb_timesteps)
-                    array_boi_q_out = np.zeros(nb_timesteps)
-                    array_hp_aw_q_out = np.zeros(nb_timesteps)
-                    array_hp_aw_el_in = np.zeros(nb_timesteps)
-                    array_hp_ww_q_out = np.zeros(nb_timesteps)
-                    array_hp_ww_el_in = np.zeros(nb_timesteps)
-                    array_eh_q_out = np.zeros(nb_timesteps)
-                    array_pv_el_out = np.zeros(nb_timesteps)
-
-                    #  Loop over each building in city and extract generated
-                    #  power
-
-                    for n in c_eco_copy._list_buildings:
-                        curr_b = city.nodes[n]['entity']
-                        if curr_b.hasBes:
-                            if curr_b.bes.hasBoiler:
-                                array_boi_q_out += \
-                                    curr_b.bes.boiler.totalQOutput
-                            if curr_b.bes.hasChp:
-                                array_chp_q_out += \
-                                    curr_b.bes.chp.totalQOutput
-                                array_chp_el_out += \
-                                    curr_b.bes.chp.totalPOutput
-                            if curr_b.bes.hasHeatpump:
-                                if curr_b.bes.heatpump.hp_type == 'aw':
-                                    array_hp_aw_q_out += \
-                                        curr_b.bes.heatpump.totalQOutput
-                                    array_hp_aw_el_in += \
-                                        curr_b.bes.heatpump.array_el_power_in
-                                elif curr_b.bes.heatpump.hp_type == 'ww':
-                                    array_hp_ww_q_out += \
-                                        curr_b.bes.heatpump.totalQOutput
-                                    array_hp_ww_el_in += \
-                                        curr_b.bes.heatpump.array_el_power_in
-                                else:
-                                    msg = 'Unkown heat pump type'
-                                    raise AssertionError(msg)
-                            if curr_b.bes.hasElectricalHeater:
-                                array_eh_q_out += \
-                                    curr_b.bes.electricalHeater.totalQOutput
-                            if curr_b.bes.hasPv:
-                                array_pv_el_out += \
-                                    curr_b.bes.pv.totalPower
-
-                    #  Calculate coverage factors
-                    th_energy_boi = sum(array_boi_q_out) * timestep \
-                                    / (3600 * 1000)
-                    th_energy_chp = sum(array_chp_q_out) * timestep \
-                                    / (3600 * 1000)
-                    el_energy_chp = sum(array_chp_el_out) * timestep \
-                                    / (3600 * 1000)
-                    th_energy_hp_aw = sum(array_hp_aw_q_out) * timestep \
-                                    / (3600 * 1000)
-                    el_energy_hp_aw = sum(array_hp_aw_el_in) * timestep \
-                                      / (3600 * 1000)
-                    th_energy_hp_ww = sum(array_hp_ww_q_out) * timestep \
-                                      / (3600 * 1000)
-                    el_energy_hp_ww = sum(array_hp_ww_el_in) * timestep \
-                                      / (3600 * 1000)
-                    th_energy_eh = sum(array_eh_q_out) * timestep \
-                                      / (3600 * 1000)
-                    el_energy_pv = sum(array_pv_el_out) * timestep \
-                                   / (3600 * 1000)
-
-                    #  Also includes LHN and storage losses (thus, not using
-                    #  sh_dem value)
-                    th_energy_overall_gen = (th_energy_boi + th_energy_chp
-                                             + th_energy_hp_aw
-                                             + th_energy_hp_ww + th_energy_eh)
-
-                    #  Thermal coverage factors
-                    th_cov_boi = th_energy_boi / th_energy_overall_gen
-                    th_cov_chp = th_energy_chp / th_energy_overall_gen
-                    th_cov_hp_aw = th_energy_hp_aw / th_energy_overall_gen
-                    th_cov_hp_ww = th_energy_hp_ww / th_energy_overall_gen
-                    th_cov_eh = th_energy_eh / th_energy_overall_gen
-
-                    #  El. ref. demand (100 % eff. of electr. heater)
-                    el_ref_dem = (el_dem + el_energy_hp_aw + el_energy_hp_ww
-                                  + th_energy_eh)
-
-                    #  Electric coverage factors
-                    el_cov_chp = (el_energy_chp - grid_exp_chp) / el_ref_dem
-                    el_cov_pv = (el_energy_pv - grid_exp_pv) / el_ref_dem
-                    el_cov_grid = (grid_imp_dem + grid_imp_hp
-                                   + grid_imp_eh) / el_ref_dem
-
-                    #  Add coverage factors to results file
-                    array_th_cov_boi[i] = th_cov_boi
-                    array_th_cov_chp[i] = th_cov_chp
-                    array_th_cov_hp_aw[i] = th_cov_hp_aw
-                    array_th_cov_hp_ww[i] = th_cov_hp_ww
-                    array_th_cov_eh[i] = th_cov_eh
-
-                    array_el_cov_chp[i] = el_cov_chp
-                    array_el_cov_pv[i] = el_cov_pv
-                    array_el_cov_grid[i] = el_cov_grid
-
-                    #  Save results to dict
-                    dict_mc_cov['th_cov_boi'] = array_th_cov_boi
-                    dict_mc_cov['th_cov_chp'] = array_th_cov_chp
-                    dict_mc_cov['th_cov_hp_aw'] = array_th_cov_hp_aw
-                    dict_mc_cov['th_cov_hp_ww'] = array_th_cov_hp_ww
-                    dict_mc_cov['th_cov_eh'] = array_th_cov_eh
-                    dict_mc_cov['el_cov_chp'] = array_el_cov_chp
-                    dict_mc_cov['el_cov_pv'] = array_el_cov_pv
-                    dict_mc_cov['el_cov_grid'] = array_el_cov_grid
-
-            except buildeb.EnergyBalanceException as ermessage:
-                print(ermessage)
-                traceback.print_exc()
-                #  Count failure nb. up
-                self._nb_failed_runs += 1
-                self._list_failed_runs.append(i)
-                msg = 'Run %d failed with EnergyBalanceException' % (i)
-                warnings.warn(msg)
-
-            except tessys.TESChargingException as ermessage:
-                print(ermessage)
-                traceback.print_exc()
-                #  Count failure nb. up
-                self._nb_failed_runs += 1
-                self._list_failed_runs.append(i)
-                msg = 'Run %d failed with EnergyBalanceException' % (i)
-                warnings.warn(msg)
-
-            #  Write results to dict
-
-
-
-            if self._nb_failed_runs > failure_tolerance * nb_runs:
-                msg = 'Number of failed runs exceeds ' \
-                      'allowed limit of %d runs!' % (
-                              failure_tolerance * nb_runs)
-                raise McToleranceException(msg)
-
-            # Save failed run information to dict_mc_setup
-            dict_mc_setup['idx_failed_runs'] = self._list_failed_runs
+        if conv_monitor is not None:
+            #  Result arrays are shortened to number of performed runs
+            dict_mc_setup['nb_runs'] = len(dict_mc_res.get('annuity', []))
+            dict_mc_setup['max_nb_runs'] = nb_runs
+            dict_mc_setup['converged'] = conv_monitor.converged
+            dict_mc_setup['stop_reason'] = conv_monitor.stop_reason
+            dict_mc_setup['conv_trace'] = conv_monitor.list_trace
 
         return (dict_mc_res, dict_mc_setup, dict_mc_cov)
 
@@ -1748,7 +1283,12 @@ class McRunner(object):
                         calc_th_el_cov=False,
                         dem_unc=True,
                         el_mix_for_chp=True,
-                        el_mix_for_pv=True
+                        el_mix_for_pv=True,
+                        design_method='lhc',
+                        lhc_criterion='center',
+                        seed=None,
+                        conv_monitor=None,
+                        path_pool=None
                         ):
         """
         Perform monte-carlo run with:
@@ -1840,6 +1380,27 @@ class McRunner(object):
             Defines, if el. mix should be used for PV fed-in electricity
             (default: True). If False, uses specific fed-in PV factor,
             defined in co2emissions object (co2_factor_pv_fed_in)
+        design_method : str, optional
+            Design method for sampling_method 'lhc' (default: 'lhc')
+            Options:
+            - 'lhc' : Latin hypercube design
+            - 'sobol' : Scrambled Sobol sequence
+            - 'random' : Pseudo random numbers
+        lhc_criterion : str, optional
+            Latin hypercube criterion (default: 'center'). Only relevant for
+            design_method 'lhc'. See sampling_engine.lhs_design
+        seed : int, optional
+            Seed for reproducible sampling (default: None)
+        conv_monitor : object, optional
+            McConvergenceMonitor object (see mc_convergence.py) for adaptive
+            number of runs (default: None). If set, nb_runs defines the
+            maximum number of runs (and samples). Runs are stopped, when
+            tolerances of conv_monitor are met or time budget is exhausted.
+            Convergence trace is saved to dict_mc_setup['conv_trace'].
+        path_pool : str, optional
+            Path to .npy file for memory-mapped profile pool (default: None).
+            Only relevant, if profile pool is generated. If None, profile
+            pool is held in memory.
 
         Returns
         -------
@@ -1955,7 +1516,8 @@ class McRunner(object):
                 #  and _dict_samples_esys
                 (dict_samples_const, dict_samples_esys) = \
                     self.perform_sampling(nb_runs=nb_runs,
-                                          dem_unc=dem_unc)
+                                          dem_unc=dem_unc,
+                                          seed=seed)
             elif sampling_method == 'lhc':
                 #  Perform latin hypercube sampling
                 (dict_city_sample_lhc, dict_build_samples_lhc,
@@ -1971,7 +1533,11 @@ class McRunner(object):
                                          load_city_n_build_samples=load_city_n_build_samples,
                                          path_city_sample_dict=path_city_sample_dict,
                                          path_build_sample_dict=path_build_sample_dict,
-                                         dem_unc=dem_unc)
+                                         dem_unc=dem_unc,
+                                         design_method=design_method,
+                                         lhc_criterion=lhc_criterion,
+                                         seed=seed,
+                                         path_pool=path_pool)
         else:
             dict_samples_const = None
             dict_samples_esys = None
@@ -1993,7 +1559,8 @@ class McRunner(object):
                                  use_kwkg_lhn_sub=use_kwkg_lhn_sub,
                                  calc_th_el_cov=calc_th_el_cov,
                                  el_mix_for_chp=el_mix_for_chp,
-                                 el_mix_for_pv=el_mix_for_pv
+                                 el_mix_for_pv=el_mix_for_pv,
+                                 conv_monitor=conv_monitor
                                  )
 
         if prevent_printing:
@@ -2135,9 +1702,76 @@ class McRunner(object):
 
         return (total_annuity, co2, sh_dem, el_dem, dhw_dem)
 
+    def gen_study_engine(self, registry=None, executor=None,
+                         batch_size=None, failure_tolerance=0.05,
+                         eeg_pv_limit=False, use_kwkg_lhn_sub=False,
+                         el_mix_for_chp=True, el_mix_for_pv=True,
+                         calc_th_el_cov=False, use_cache=True):
+        """
+        Generate StudyEngine for CityAnnuityCalc object of McRunner, e.g. to
+        run random, latin hypercube or Sobol sampling, Morris screening or
+        Sobol indices with batched, parallel evaluation and result caching.
+
+        Parameters
+        ----------
+        registry : object, optional
+            ParameterRegistry object (default: None). If None, uses
+            study_engine.gen_city_eco_registry for buildings of McRunner.
+        executor : object, optional
+            concurrent.futures executor (e.g. ProcessPoolExecutor) to
+            evaluate batches in parallel (default: None)
+        batch_size : int, optional
+            Number of evaluations per batch (default: None)
+        failure_tolerance : float, optional
+            Allowed share of runs, which fail with EnergyBalanceException
+            or TESChargingException (default: 0.05)
+        eeg_pv_limit : bool, optional
+            Defines, if EEG PV feed-in limitation of 70 % of peak load is
+            active (default: False)
+        use_kwkg_lhn_sub : bool, optional
+            Defines, if KWKG LHN subsidies are used (default: False)
+        el_mix_for_chp : bool, optional
+            Defines, if el. mix should be used for CHP fed-in electricity
+            (default: True)
+        el_mix_for_pv : bool, optional
+            Defines, if el. mix should be used for PV fed-in electricity
+            (default: True)
+        calc_th_el_cov : bool, optional
+            Defines, if thermal and electric coverage of different types of
+            devices should be calculated (default: False)
+        use_cache : bool, optional
+            Defines, if results are cached per parameter value combination
+            (default: True)
+
+        Returns
+        -------
+        engine : object
+            StudyEngine object
+        """
+
+        if registry is None:
+            registry = stueng.gen_city_eco_registry(
+                city_eco_calc=self._city_eco_calc,
+                list_build_ids=self._list_build_ids)
+
+        evaluator = stueng.CityEcoEvaluator(eeg_pv_limit=eeg_pv_limit,
+                                            use_kwkg_lhn_sub=use_kwkg_lhn_sub,
+                                            el_mix_for_chp=el_mix_for_chp,
+                                            el_mix_for_pv=el_mix_for_pv,
+                                            calc_th_el_cov=calc_th_el_cov)
+
+        return stueng.StudyEngine(
+            base_obj=self._city_eco_calc, registry=registry,
+            evaluator=evaluator, executor=executor, batch_size=batch_size,
+            failure_exceptions=(buildeb.EnergyBalanceException,
+                                tessys.TESChargingException),
+            failure_tolerance=failure_tolerance, use_cache=use_cache)
+
 
 def main():
 
+    import matplotlib.pyplot as plt
+
     #  Generate city district or load city district
 
     #  Dimension energy systems, if not already included
@@ -0,0 +1,409 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Morris screening with trajectory reuse.
+
+Consecutive points of a Morris trajectory differ in a single parameter.
+Each trajectory is evaluated in one job (optionally in worker processes) and
+reuses the evaluated object of the previous point, depending on the stage
+of the changed parameter (see study_engine.ParameterRegistry.add_parameter):
+- 'eco' : Only the economic calculation is re-run (evaluator.eval_eco)
+- 'building' : Only the affected stand-alone buildings are copied from the
+  base object (evaluator.reset_buildings), their parameters are applied and
+  their energy balance is re-run (evaluator.eval_buildings)
+- 'city' : Full evaluation
+
+Evaluators without eval_eco / reset_buildings / eval_buildings methods (or
+buildings, which are connected to energy networks) fall back to full
+evaluations.
+
+Design, parameter values and results are saved to a pickle file after each
+finished job, so that interrupted screening studies can be resumed.
+"""
+from __future__ import division
+
+import os
+import copy
+import pickle
+import warnings
+import numpy as np
+from concurrent.futures import as_completed
+
+import pycity_calc.toolbox.mc_helpers.study_engine as stueng
+
+
+def get_eval_mode(registry, list_idx):
+    """
+    Returns evaluation mode for changed parameters
+
+    Parameters
+    ----------
+    registry : object
+        ParameterRegistry object
+    list_idx : list (of ints)
+        Indexes of changed parameters
+
+    Returns
+    -------
+    tup_mode : tuple
+        Tuple (mode, list_ids) with mode 'eco', 'building' or 'city' and
+        list of affected building node ids (only relevant for 'building')
+    """
+
+    list_stages = [registry.dict_stage[registry.list_names[i]]
+                   for i in list_idx]
+
+    if all(stage == 'eco' for (stage, node_id) in list_stages):
+        return ('eco', [])
+
+    if all(stage in ['eco', 'building'] for (stage, node_id) in list_stages):
+        list_ids = sorted(set(node_id for (stage, node_id) in list_stages
+                              if stage == 'building'))
+        return ('building', list_ids)
+
+    return ('city', [])
+
+
+def eval_morris_traj(base_obj, registry, evaluator, array_traj,
+                     failure_exceptions=()):
+    """
+    Evaluate points of Morris trajectory with reuse of unchanged results
+
+    Parameters
+    ----------
+    base_obj : object
+        Study object, which is copied for evaluations
+    registry : object
+        ParameterRegistry object
+    evaluator : callable
+        Evaluator (e.g. study_engine.CityEcoEvaluator object)
+    array_traj : np.array
+        2d array (nb_par + 1 x nb_par) with parameter values of trajectory
+        points
+    failure_exceptions : tuple (of exception classes), optional
+        Exceptions, which mark single evaluations as failed (default: ())
+
+    Returns
+    -------
+    tup_res : tuple
+        Tuple (list_res, list_modes) with result dict for each point (None,
+        if evaluation failed) and used evaluation mode for each point
+        ('city', 'eco' or 'building')
+    """
+
+    list_res = []
+    list_modes = []
+
+    #  Evaluated object of previous point
+    obj_last = None
+
+    for i in range(len(array_traj)):
+        values = array_traj[i]
+
+        if obj_last is None:
+            (mode, list_ids) = ('city', [])
+        else:
+            list_idx = list(np.nonzero(values != array_traj[i - 1])[0])
+            (mode, list_ids) = get_eval_mode(registry, list_idx)
+
+            if mode == 'eco' and not hasattr(evaluator, 'eval_eco'):
+                mode = 'city'
+            elif mode == 'building' and \
+                    (not hasattr(evaluator, 'reset_buildings') or
+                     not hasattr(evaluator, 'eval_buildings') or
+                     not evaluator.can_eval_buildings(obj_last, list_ids)):
+                mode = 'city'
+
+        try:
+            if mode == 'eco':
+                registry.apply(obj_last, values, list_idx=list_idx)
+                dict_res = evaluator.eval_eco(obj_last)
+            elif mode == 'building':
+                #  Changed economic parameters are applied to evaluated
+                #  object
+                list_idx_eco = [j for j in list_idx
+                                if registry.dict_stage[
+                                    registry.list_names[j]][0] == 'eco']
+                registry.apply(obj_last, values, list_idx=list_idx_eco)
+
+                #  Only affected buildings are copied from base object and
+                #  only their parameters are applied
+                evaluator.reset_buildings(obj_last, list_ids, base_obj)
+                list_idx_build = []
+                for j in range(len(registry)):
+                    (stage, node_id) = \
+                        registry.dict_stage[registry.list_names[j]]
+                    if stage == 'building' and node_id in list_ids:
+                        list_idx_build.append(j)
+                registry.apply(obj_last, values, list_idx=list_idx_build)
+
+                dict_res = evaluator.eval_buildings(obj_last, list_ids)
+            else:
+                obj_last = copy.deepcopy(base_obj)
+                registry.apply(obj_last, values)
+                dict_res = evaluator(obj_last)
+
+        except failure_exceptions as ermessage:
+            warnings.warn('Evaluation failed with ' + repr(ermessage))
+            dict_res = None
+            #  Evaluated object of failed point cannot be reused
+            obj_last = None
+
+        list_res.append(dict_res)
+        list_modes.append(mode)
+
+    return (list_res, list_modes)
+
+
+def eval_morris_trajs(base_obj, registry, evaluator, list_traj,
+                      failure_exceptions=()):
+    """
+    Evaluate multiple Morris trajectories (e.g. as job of worker process)
+
+    Parameters
+    ----------
+    base_obj : object
+        Study object, which is copied for evaluations
+    registry : object
+        ParameterRegistry object
+    evaluator : callable
+        Evaluator (e.g. study_engine.CityEcoEvaluator object)
+    list_traj : list (of np.arrays)
+        List of trajectories (see eval_morris_traj)
+    failure_exceptions : tuple (of exception classes), optional
+        Exceptions, which mark single evaluations as failed (default: ())
+
+    Returns
+    -------
+    list_traj_res : list (of tuples)
+        List holding results tuple of eval_morris_traj per trajectory
+    """
+
+    return [eval_morris_traj(base_obj=base_obj, registry=registry,
+                             evaluator=evaluator, array_traj=array_traj,
+                             failure_exceptions=failure_exceptions)
+            for array_traj in list_traj]
+
+
+class MorrisRunner(object):
+    """
+    Morris screening with trajectory reuse, parallel trajectory evaluation
+    and persistent design and results
+    """
+
+    def __init__(self, base_obj, registry, evaluator, executor=None,
+                 nb_traj_per_job=1, failure_exceptions=(), path_save=None):
+        """
+        Constructor of MorrisRunner
+
+        Parameters
+        ----------
+        base_obj : object
+            Study object (e.g. CityAnnuityCalc object)
+        registry : object
+            ParameterRegistry object (with stages of parameters)
+        evaluator : callable
+            Evaluator (e.g. study_engine.CityEcoEvaluator object)
+        executor : object, optional
+            concurrent.futures executor (e.g. ProcessPoolExecutor) to
+            evaluate trajectories in parallel (default: None)
+        nb_traj_per_job : int, optional
+            Number of trajectories per job (default: 1)
+        failure_exceptions : tuple (of exception classes), optional
+            Exceptions, which mark single evaluations as failed (default: ())
+        path_save : str, optional
+            Path to pickle file for design and results (default: None).
+            If file exists, design and finished trajectories are loaded and
+            only missing trajectories are evaluated.
+        """
+
+        self.base_obj = base_obj
+        self.registry = registry
+        self.evaluator = evaluator
+        self.executor = executor
+        self.nb_traj_per_job = nb_traj_per_job
+        self.failure_exceptions = tuple(failure_exceptions)
+        self.path_save = path_save
+
+        #  Dict with design, parameter values and results
+        self.dict_study = None
+
+        if path_save is not None and os.path.isfile(path_save):
+            self.load()
+
+    def gen_design(self, nb_traj, nb_levels=4, rng=None, seed=None):
+        """
+        Generate (and save) Morris trajectories. Existing results are
+        discarded.
+
+        Parameters
+        ----------
+        nb_traj : int
+            Number of trajectories
+        nb_levels : int, optional
+            Number of grid levels (default: 4)
+        rng : np.random.Generator, optional
+            Random Generator (default: None)
+        seed : int, optional
+            Seed (default: None)
+        """
+
+        nb_par = len(self.registry)
+
+        design = stueng.gen_morris_design(nb_traj=nb_traj, nb_par=nb_par,
+                                          nb_levels=nb_levels, rng=rng,
+                                          seed=seed)
+
+        array_values = self.registry.transform(
+            stueng.morris_to_unit(design, nb_levels=nb_levels))
+
+        self.dict_study = {'list_names': list(self.registry.list_names),
+                           'nb_levels': nb_levels,
+                           'design': design,
+                           'array_values': array_values,
+                           'dict_res': {},
+                           'array_modes': np.zeros((nb_traj, nb_par + 1),
+                                                   dtype=object),
+                           'array_done': np.zeros(nb_traj, dtype=bool)}
+
+        self.save()
+
+    def save(self):
+        """
+        Save design and results to path_save (if path_save is not None)
+        """
+
+        if self.path_save is None:
+            return
+
+        #  Write to temporary file first to keep existing file on abort
+        path_tmp = self.path_save + '.tmp'
+        with open(path_tmp, mode='wb') as file:
+            pickle.dump(self.dict_study, file)
+
+        if hasattr(os, 'replace'):
+            os.replace(path_tmp, self.path_save)
+        else:
+            #  Python 2.7 (os.rename fails for existing files on Windows)
+            if os.path.isfile(self.path_save):
+                os.remove(self.path_save)
+            os.rename(path_tmp, self.path_save)
+
+    def load(self):
+        """
+        Load design and results from path_save
+        """
+
+        with open(self.path_save, mode='rb') as file:
+            self.dict_study = pickle.load(file)
+
+        if self.dict_study['list_names'] != self.registry.list_names:
+            msg = 'Parameters of saved Morris study do not match registry.'
+            raise ValueError(msg)
+
+    def _add_traj_res(self, t, list_res, list_modes):
+        """
+        Add results of trajectory t to result arrays
+        """
+
+        nb_points = len(self.registry) + 1
+        nb_traj = len(self.dict_study['array_done'])
+        dict_res = self.dict_study['dict_res']
+
+        for j in range(nb_points):
+            if list_res[j] is None:
+                continue
+            for (key, val) in list_res[j].items():
+                if key not in dict_res:
+                    dict_res[key] = np.zeros(nb_traj * nb_points) * np.nan
+                dict_res[key][t * nb_points + j] = val
+
+        self.dict_study['array_modes'][t] = list_modes
+        self.dict_study['array_done'][t] = True
+
+    def run(self, callback=None):
+        """
+        Evaluate all unfinished trajectories of design
+
+        Parameters
+        ----------
+        callback : callable, optional
+            Function with signature callback(t, list_res), which is called
+            for each finished trajectory t (default: None)
+
+        Returns
+        -------
+        dict_morris : dict
+            Dict holding result names as keys and dicts with keys 'mu',
+            'mu_star' and 'sigma' as values (see calc_indices)
+        """
+
+        if self.dict_study is None:
+            msg = 'Morris design does not exist. Call gen_design first.'
+            raise AssertionError(msg)
+
+        nb_points = len(self.registry) + 1
+        array_values = self.dict_study['array_values']
+
+        list_todo = list(np.nonzero(~self.dict_study['array_done'])[0])
+        list_jobs = [list_todo[j:j + self.nb_traj_per_job]
+                     for j in range(0, len(list_todo),
+                                    self.nb_traj_per_job)]
+
+        def get_trajs(job):
+            return [array_values[t * nb_points:(t + 1) * nb_points]
+                    for t in job]
+
+        if self.executor is None:
+            iter_jobs = ((job, eval_morris_trajs(self.base_obj,
+                                                 self.registry,
+                                                 self.evaluator,
+                                                 get_trajs(job),
+                                                 self.failure_exceptions))
+                         for job in list_jobs)
+        else:
+            dict_futures = {}
+            for job in list_jobs:
+                future = self.executor.submit(eval_morris_trajs,
+                                              self.base_obj, self.registry,
+                                              self.evaluator, get_trajs(job),
+                                              self.failure_exceptions)
+                dict_futures[future] = job
+            iter_jobs = ((dict_futures[future], future.result())
+                         for future in as_completed(dict_futures))
+
+        for (job, list_traj_res) in iter_jobs:
+            for (t, (list_res, list_modes)) in zip(job, list_traj_res):
+                self._add_traj_res(t, list_res, list_modes)
+                if callback is not None:
+                    callback(t, list_res)
+            self.save()
+
+        return self.calc_indices()
+
+    def calc_indices(self):
+        """
+        Calculate Morris indices of finished trajectories
+
+        Returns
+        -------
+        dict_morris : dict
+            Dict holding result names as keys and dicts with keys 'mu',
+            'mu_star' and 'sigma' (arrays in order of registry.list_names)
+            as values
+        """
+
+        nb_par = len(self.registry)
+        nb_points = nb_par + 1
+
+        array_done = self.dict_study['array_done']
+        design = self.dict_study['design'].reshape(-1, nb_points, nb_par)
+
+        dict_morris = {}
+        for (key, array_res) in self.dict_study['dict_res'].items():
+            array_res = array_res.reshape(-1, nb_points)
+            dict_morris[key] = stueng.calc_morris_indices(
+                design=design[array_done], array_res=array_res[array_done],
+                nb_par=nb_par, nb_levels=self.dict_study['nb_levels'])
+
+        return dict_morris
@@ -15,12 +15,14 @@ import pycity_calc.toolbox.mc_helpers.building.build_unc_set_gen as bunc
 import pycity_calc.toolbox.mc_helpers.user.user_unc_sampling as usunc
 import pycity_calc.toolbox.teaser_usage.teaser_use as tus
 import pycity_calc.toolbox.user.user_air_exchange as usair
+import pycity_calc.toolbox.profile_store as profsto
+import pycity_calc.toolbox.mc_helpers.sampling_engine as sampeng
 
 
 def randomize_city_params(city, mod_year=False, inf=False, temp_set=False,
                           el=False, dhw=False, max_retro_year=2014,
                           time_sp_force_retro=40, set_temp=20,
-                          air_vent_mode=2):
+                          air_vent_mode=2, rng=None, seed=None):
     """
     Re-sample and overwrite specific parameters on city object and return
     new city object.
@@ -56,6 +58,14 @@ def randomize_city_params(city, mod_year=False, inf=False, temp_set=False,
         0 : Use constant value (vent_factor in 1/h)
         1 : Use deterministic, temperature-dependent profile
         2 : Use stochastic, user-dependent profile
+    rng : object, optional
+        numpy.random.Generator for stochastic air exchange rates
+        (default: None). If None, generator is initialized with seed
+        (see sampling_engine.get_rng)
+    seed : int, optional
+        Seed for stochastic air exchange rates (default: None). Only used,
+        if rng is None. If rng and seed are None, seed is drawn from the
+        legacy numpy random state.
 
     Returns
     -------
@@ -70,6 +80,10 @@ def randomize_city_params(city, mod_year=False, inf=False, temp_set=False,
     #  Get list with building entity node ids
     list_b_ids = city_new.get_list_build_entity_node_ids()
 
+    if air_vent_mode == 2:
+        #  Single random generator for air exchange rates of all buildings
+        rng = sampeng.get_rng(rng=rng, seed=seed)
+
     for n in list_b_ids:
 
         curr_b = city_new.nodes[n]['entity']
@@ -243,6 +257,8 @@ def randomize_city_params(city, mod_year=False, inf=False, temp_set=False,
                     #  Generate dummy array
                     array_vent = np.zeros(len(temp_out))
 
+                    list_occ_profiles = []
+
                     #  Loop over all apartments
                     for ap in curr_b.apartments:
 
@@ -257,14 +273,21 @@ def randomize_city_params(city, mod_year=False, inf=False, temp_set=False,
                                                        oldResolution=org_res,
                                                        newResolution=timestep)
 
-                        # Sum up air exchange rate profiles
-                        #  Get ventilation rate (in 1/h, related to building air volume)
-                        array_vent += \
-                            usair.gen_user_air_ex_rate(
-                                occ_profile=occ_profile,
-                                temp_profile=temp_out,
-                                b_type='res',
-                                inf_rate=0)
+                        list_occ_profiles.append(occ_profile)
+
+                    #  Sum up air exchange rate profiles of all apartments
+                    #  (window state chains of all apartments are simulated
+                    #  at once)
+                    #  Get ventilation rate (in 1/h, related to building air volume)
+                    array_vent += \
+                        usair.gen_user_air_ex_rates(
+                            list_occ_profiles=list_occ_profiles,
+                            temp_profile=temp_out,
+                            b_type='res',
+                            inf_rate=0,
+                            rng=rng,
+                            profile_store=profsto.get_profile_store(
+                                city.environment)).sum(axis=0)
 
                     # Finally, add infiltration rate of building
                     array_vent += sample_inf
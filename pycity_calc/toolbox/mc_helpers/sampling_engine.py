@@ -0,0 +1,823 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Sampling engine for Monte-Carlo analysis of pyCity_calc.
+
+Generates unit hypercube designs (random, latin hypercube or scrambled
+Sobol sequence) and converts them to physical parameter values with
+vectorized inverse cumulative distribution functions (uniform, normal,
+lognormal and discrete distributions).
+
+All random numbers are drawn from a numpy random Generator. Pass rng or
+seed to get reproducible designs. If neither is given, the Generator is
+seeded from the legacy numpy random state, so that scripts using
+np.random.seed() stay reproducible. With numpy < 1.17 (e.g. Python 2.7),
+which has no np.random.Generator, LegacyGenerator is used instead.
+"""
+from __future__ import division
+
+import warnings
+
+import numpy as np
+import scipy.special as special
+import scipy.spatial as spatial
+
+#  Number of bits of Sobol sequence points (supports up to 2 ** 30 samples)
+_SOBOL_BITS = 30
+
+#  Cache for Sobol direction numbers (list of arrays with _SOBOL_BITS
+#  direction numbers per dimension)
+_list_sobol_dir = []
+
+#  Initial direction numbers m_1, ..., m_s of dimensions 2 to 101 (all
+#  primitive polynomials up to degree 9) of Joe and Kuo (2008),
+#  file new-joe-kuo-6.21201 (https://web.maths.unsw.edu.au/~fkuo/sobol/)
+_SOBOL_JOE_KUO_M = (
+    (1,),
+    (1, 3),
+    (1, 3, 1),
+    (1, 1, 1),
+    (1, 1, 3, 3),
+    (1, 3, 5, 13),
+    (1, 1, 5, 5, 17),
+    (1, 1, 5, 5, 5),
+    (1, 1, 7, 11, 19),
+    (1, 1, 5, 1, 1),
+    (1, 1, 1, 3, 11),
+    (1, 3, 5, 5, 31),
+    (1, 3, 3, 9, 7, 49),
+    (1, 1, 1, 15, 21, 21),
+    (1, 3, 1, 13, 27, 49),
+    (1, 1, 1, 15, 7, 5),
+    (1, 3, 1, 15, 13, 25),
+    (1, 1, 5, 5, 19, 61),
+    (1, 3, 7, 11, 23, 15, 103),
+    (1, 3, 7, 13, 13, 15, 69),
+    (1, 1, 3, 13, 7, 35, 63),
+    (1, 3, 5, 9, 1, 25, 53),
+    (1, 3, 1, 13, 9, 35, 107),
+    (1, 3, 1, 5, 27, 61, 31),
+    (1, 1, 5, 11, 19, 41, 61),
+    (1, 3, 5, 3, 3, 13, 69),
+    (1, 1, 7, 13, 1, 19, 1),
+    (1, 3, 7, 5, 13, 19, 59),
+    (1, 1, 3, 9, 25, 29, 41),
+    (1, 3, 5, 13, 23, 1, 55),
+    (1, 3, 7, 3, 13, 59, 17),
+    (1, 3, 1, 3, 5, 53, 69),
+    (1, 1, 5, 5, 23, 33, 13),
+    (1, 1, 7, 7, 1, 61, 123),
+    (1, 1, 7, 9, 13, 61, 49),
+    (1, 3, 3, 5, 3, 55, 33),
+    (1, 3, 1, 15, 31, 13, 49, 245),
+    (1, 3, 5, 15, 31, 59, 63, 97),
+    (1, 3, 1, 11, 11, 11, 77, 249),
+    (1, 3, 1, 11, 27, 43, 71, 9),
+    (1, 1, 7, 15, 21, 11, 81, 45),
+    (1, 3, 7, 3, 25, 31, 65, 79),
+    (1, 3, 1, 1, 19, 11, 3, 205),
+    (1, 1, 5, 9, 19, 21, 29, 157),
+    (1, 3, 7, 11, 1, 33, 89, 185),
+    (1, 3, 3, 3, 15, 9, 79, 71),
+    (1, 3, 7, 11, 15, 39, 119, 27),
+    (1, 1, 3, 1, 11, 31, 97, 225),
+    (1, 1, 1, 3, 23, 43, 57, 177),
+    (1, 3, 7, 7, 17, 17, 37, 71),
+    (1, 3, 1, 5, 27, 63, 123, 213),
+    (1, 1, 3, 5, 11, 43, 53, 133),
+    (1, 3, 5, 5, 29, 17, 47, 173, 479),
+    (1, 3, 3, 11, 3, 1, 109, 9, 69),
+    (1, 1, 1, 5, 17, 39, 23, 5, 343),
+    (1, 3, 1, 5, 25, 15, 31, 103, 499),
+    (1, 1, 1, 11, 11, 17, 63, 105, 183),
+    (1, 1, 5, 11, 9, 29, 97, 231, 363),
+    (1, 1, 5, 15, 19, 45, 41, 7, 383),
+    (1, 3, 7, 7, 31, 19, 83, 137, 221),
+    (1, 1, 1, 3, 23, 15, 111, 223, 83),
+    (1, 1, 5, 13, 31, 15, 55, 25, 161),
+    (1, 1, 3, 13, 25, 47, 39, 87, 257),
+    (1, 1, 1, 11, 21, 53, 125, 249, 293),
+    (1, 1, 7, 11, 11, 7, 57, 79, 323),
+    (1, 1, 5, 5, 17, 13, 81, 3, 131),
+    (1, 1, 7, 13, 23, 7, 65, 251, 475),
+    (1, 3, 5, 1, 9, 43, 3, 149, 11),
+    (1, 1, 3, 13, 31, 13, 13, 255, 487),
+    (1, 3, 3, 1, 5, 63, 89, 91, 127),
+    (1, 1, 3, 3, 1, 19, 123, 127, 237),
+    (1, 1, 5, 7, 23, 31, 37, 243, 289),
+    (1, 1, 5, 11, 17, 53, 117, 183, 491),
+    (1, 1, 1, 5, 1, 13, 13, 209, 345),
+    (1, 1, 3, 15, 1, 57, 115, 7, 33),
+    (1, 3, 1, 11, 7, 43, 81, 207, 175),
+    (1, 3, 1, 1, 15, 27, 63, 255, 49),
+    (1, 3, 5, 3, 27, 61, 105, 171, 305),
+    (1, 1, 5, 3, 1, 3, 57, 249, 149),
+    (1, 1, 3, 5, 5, 57, 15, 13, 159),
+    (1, 1, 1, 11, 7, 11, 105, 141, 225),
+    (1, 3, 3, 5, 27, 59, 121, 101, 271),
+    (1, 3, 5, 9, 11, 49, 51, 59, 115),
+    (1, 1, 7, 1, 23, 45, 125, 71, 419),
+    (1, 1, 3, 5, 23, 5, 105, 109, 75),
+    (1, 1, 7, 15, 7, 11, 67, 121, 453),
+    (1, 3, 7, 3, 9, 13, 31, 27, 449),
+    (1, 3, 1, 15, 19, 39, 39, 89, 15),
+    (1, 1, 1, 1, 1, 33, 73, 145, 379),
+    (1, 3, 1, 15, 15, 43, 29, 13, 483),
+    (1, 1, 7, 3, 19, 27, 85, 131, 431),
+    (1, 3, 3, 3, 5, 35, 23, 195, 349),
+    (1, 3, 3, 7, 9, 27, 39, 59, 297),
+    (1, 1, 3, 9, 11, 17, 13, 241, 157),
+    (1, 3, 7, 15, 25, 57, 33, 189, 213),
+    (1, 1, 7, 1, 9, 55, 73, 83, 217),
+    (1, 3, 3, 13, 19, 27, 23, 113, 249),
+    (1, 3, 5, 3, 23, 43, 3, 253, 479),
+    (1, 1, 5, 5, 11, 5, 45, 117, 217),
+    (1, 3, 3, 7, 29, 37, 33, 123, 147),
+)
+
+
+class LegacyGenerator(object):
+    """
+    Random Generator for numpy < 1.17 (without np.random.Generator).
+    Provides the used subset of np.random.Generator methods based on
+    np.random.RandomState.
+    """
+
+    def __init__(self, seed=None):
+        """
+        Constructor of LegacyGenerator
+
+        Parameters
+        ----------
+        seed : int, optional
+            Seed of RandomState (default: None)
+        """
+
+        self.rand_state = np.random.RandomState(seed)
+
+    def integers(self, low, high=None, size=None, dtype=np.int64,
+                 endpoint=False):
+        if high is None:
+            (low, high) = (0, low)
+        if endpoint:
+            high += 1
+        return self.rand_state.randint(low, high, size=size, dtype=dtype)
+
+    def random(self, size=None):
+        return self.rand_state.random_sample(size)
+
+    def normal(self, loc=0.0, scale=1.0, size=None):
+        return self.rand_state.normal(loc, scale, size)
+
+    def standard_exponential(self, size=None):
+        return self.rand_state.standard_exponential(size)
+
+    def choice(self, a, size=None, replace=True, p=None):
+        return self.rand_state.choice(a, size=size, replace=replace, p=p)
+
+    def permutation(self, x):
+        return self.rand_state.permutation(x)
+
+
+def get_rng(rng=None, seed=None):
+    """
+    Returns numpy random Generator
+
+    Parameters
+    ----------
+    rng : np.random.Generator, optional
+        Random Generator (default: None). If set, rng is returned.
+    seed : int, optional
+        Seed for new Generator (default: None). If rng and seed are None,
+        seed is drawn from the legacy numpy random state.
+
+    Returns
+    -------
+    rng : np.random.Generator
+        Random Generator (LegacyGenerator for numpy < 1.17)
+    """
+
+    if rng is not None:
+        return rng
+
+    if seed is None:
+        seed = np.random.randint(0, 2 ** 31 - 1)
+
+    if not hasattr(np.random, 'default_rng'):
+        return LegacyGenerator(seed)
+
+    return np.random.default_rng(seed)
+
+
+def _poly_mulmod(a, b, poly, degree):
+    """
+    Multiply polynomials a and b over GF(2) modulo poly (int bit encoding)
+    """
+
+    res = 0
+    while b:
+        if b & 1:
+            res ^= a
+        b >>= 1
+        a <<= 1
+        if a >> degree & 1:
+            a ^= poly
+    return res
+
+
+def _poly_powmod(exp, poly, degree):
+    """
+    Returns x ** exp modulo poly over GF(2) (int bit encoding)
+    """
+
+    res = 1
+    base = 2 if degree > 1 else 1
+    while exp:
+        if exp & 1:
+            res = _poly_mulmod(res, base, poly, degree)
+        base = _poly_mulmod(base, base, poly, degree)
+        exp >>= 1
+    return res
+
+
+def _prime_factors(value):
+    """
+    Returns set of prime factors of value
+    """
+
+    set_factors = set()
+    div = 2
+    while div * div <= value:
+        while value % div == 0:
+            set_factors.add(div)
+            value //= div
+        div += 1
+    if value > 1:
+        set_factors.add(value)
+    return set_factors
+
+
+def _is_primitive(poly, degree):
+    """
+    Check if polynomial (int bit encoding with leading and constant term)
+    is primitive over GF(2)
+    """
+
+    order = 2 ** degree - 1
+
+    if _poly_powmod(order, poly, degree) != 1:
+        return False
+
+    for factor in _prime_factors(order):
+        if factor != order and \
+                _poly_powmod(order // factor, poly, degree) == 1:
+            return False
+
+    return True
+
+
+def _gen_primitive_polys():
+    """
+    Generator of primitive polynomials over GF(2), sorted by degree and
+    coefficients. Yields tuples (degree, poly) with int bit encoding of poly.
+    """
+
+    degree = 1
+    while True:
+        for poly in range(2 ** degree + 1, 2 ** (degree + 1), 2):
+            if _is_primitive(poly, degree):
+                yield (degree, poly)
+        degree += 1
+
+
+def get_sobol_direction_numbers(nb_dim):
+    """
+    Returns Sobol direction numbers for nb_dim dimensions.
+
+    The first dimension is the van der Corput sequence. Further dimensions
+    use primitive polynomials over GF(2) (in order of degree) with initial
+    direction numbers of Joe and Kuo (new-joe-kuo-6.21201). Dimensions
+    above len(_SOBOL_JOE_KUO_M) + 1 use odd initial direction numbers
+    drawn from a fixed legacy random stream (with lower uniformity).
+
+    Parameters
+    ----------
+    nb_dim : int
+        Number of dimensions
+
+    Returns
+    -------
+    array_dir : np.array (of uint64)
+        2d array (nb_dim x _SOBOL_BITS) holding direction numbers
+    """
+
+    if nb_dim > len(_SOBOL_JOE_KUO_M) + 1:
+        msg = 'Joe-Kuo direction numbers only cover ' + \
+              str(len(_SOBOL_JOE_KUO_M) + 1) + ' dimensions. Going to ' \
+              'use random initial direction numbers for further ' \
+              'dimensions.'
+        warnings.warn(msg)
+
+    if len(_list_sobol_dir) < nb_dim:
+
+        if len(_list_sobol_dir) == 0:
+            _list_sobol_dir.append(
+                np.array([1 << (_SOBOL_BITS - k - 1)
+                          for k in range(_SOBOL_BITS)], dtype=np.uint64))
+
+        gen_poly = _gen_primitive_polys()
+
+        for i in range(1, nb_dim):
+            (degree, poly) = next(gen_poly)
+
+            if i < len(_list_sobol_dir):
+                continue
+
+            if i <= len(_SOBOL_JOE_KUO_M):
+                list_m = list(_SOBOL_JOE_KUO_M[i - 1])
+            else:
+                rand_state = np.random.RandomState(i)
+                list_m = [int(2 * rand_state.randint(0, 2 ** (k - 1)) + 1)
+                          for k in range(1, degree + 1)]
+
+            #  Recurrence relation of direction numbers
+            for k in range(degree, _SOBOL_BITS):
+                m_new = list_m[k - degree] ^ \
+                        (list_m[k - degree] << degree)
+                for j in range(1, degree):
+                    if poly >> (degree - j) & 1:
+                        m_new ^= list_m[k - j] << j
+                list_m.append(m_new)
+
+            _list_sobol_dir.append(
+                np.array([list_m[k] << (_SOBOL_BITS - k - 1)
+                          for k in range(_SOBOL_BITS)], dtype=np.uint64))
+
+    return np.array(_list_sobol_dir[:nb_dim])
+
+
+def sobol_design(nb_samples, nb_par, scramble=True, rng=None, seed=None):
+    """
+    Generate Sobol sequence design on unit hypercube.
+
+    Points are generated in Gray code order (Antonov-Saleev), which gives
+    the same point set as the standard order for powers of two. Scrambling
+    applies random linear matrix scrambling and digital shift.
+    Points are placed in the center of their dyadic cell, so that no value
+    is exactly 0 or 1.
+
+    Parameters
+    ----------
+    nb_samples : int
+        Number of samples
+    nb_par : int
+        Number of parameters (dimensions)
+    scramble : bool, optional
+        Defines, if sequence should be scrambled (default: True)
+    rng : np.random.Generator, optional
+        Random Generator for scrambling (default: None)
+    seed : int, optional
+        Seed for scrambling (default: None)
+
+    Returns
+    -------
+    design : np.array
+        2d array (nb_samples x nb_par) with values in (0, 1)
+    """
+
+    assert nb_samples > 0
+    assert nb_par > 0
+    assert nb_samples <= 2 ** _SOBOL_BITS
+
+    array_dir = get_sobol_direction_numbers(nb_par)
+
+    if scramble:
+        rng = get_rng(rng=rng, seed=seed)
+
+        #  Columns of random lower triangular bit matrices (diagonal ones)
+        array_bits = np.arange(_SOBOL_BITS - 1, -1, -1, dtype=np.uint64)
+        array_cols = (rng.integers(0, 2 ** 62, size=(nb_par, _SOBOL_BITS),
+                                   dtype=np.uint64)
+                      & ((np.uint64(1) << array_bits) - np.uint64(1))) \
+                     | (np.uint64(1) << array_bits)
+
+        array_scr = np.zeros_like(array_dir)
+        for j in range(_SOBOL_BITS):
+            mask_bit = (array_dir >> array_bits[j]) & np.uint64(1)
+            array_scr ^= mask_bit * array_cols[:, j][:, np.newaxis]
+        array_dir = array_scr
+
+        array_shift = rng.integers(0, 2 ** _SOBOL_BITS, size=nb_par,
+                                   dtype=np.uint64)
+    else:
+        array_shift = np.zeros(nb_par, dtype=np.uint64)
+
+    #  Index of direction number, which changes from point i - 1 to i
+    #  (number of trailing zeros of i)
+    array_idx = np.arange(1, nb_samples, dtype=np.int64)
+    array_ctz = np.log2(array_idx & -array_idx).astype(int)
+
+    array_points = np.zeros((nb_samples, nb_par), dtype=np.uint64)
+    array_points[1:] = array_dir.T[array_ctz]
+    array_points = np.bitwise_xor.accumulate(array_points, axis=0)
+    array_points ^= array_shift
+
+    return (array_points + 0.5) / 2 ** _SOBOL_BITS
+
+
+def _gen_lhs(nb_samples, nb_par, rng, centered):
+    """
+    Generate single random latin hypercube design
+    """
+
+    array_perm = np.array([rng.permutation(nb_samples)
+                           for i in range(nb_par)]).T
+
+    if centered:
+        return (array_perm + 0.5) / nb_samples
+
+    return (array_perm + rng.random((nb_samples, nb_par))) / nb_samples
+
+
+def calc_min_distance(design):
+    """
+    Returns minimal euclidean distance between points of design
+
+    Parameters
+    ----------
+    design : np.array
+        2d array (nb_samples x nb_par)
+
+    Returns
+    -------
+    min_dist : float
+        Minimal distance between two design points
+    """
+
+    if len(design) < 2:
+        return np.inf
+
+    tree = spatial.cKDTree(design)
+    return np.min(tree.query(design, k=2)[0][:, 1])
+
+
+def calc_max_correlation(design):
+    """
+    Returns maximal absolute correlation coefficient between columns of
+    design
+
+    Parameters
+    ----------
+    design : np.array
+        2d array (nb_samples x nb_par)
+
+    Returns
+    -------
+    max_corr : float
+        Maximal absolute correlation coefficient
+    """
+
+    if design.shape[1] < 2:
+        return 0
+
+    array_corr = np.corrcoef(design, rowvar=False)
+    return np.max(np.abs(array_corr[np.triu_indices_from(array_corr, k=1)]))
+
+
+def lhs_design(nb_samples, nb_par, criterion='center', iterations=5,
+               rng=None, seed=None):
+    """
+    Generate latin hypercube design on unit hypercube
+
+    Parameters
+    ----------
+    nb_samples : int
+        Number of samples
+    nb_par : int
+        Number of parameters (dimensions)
+    criterion : str, optional
+        Design criterion (default: 'center')
+        Options:
+        - None : Random positions within intervals
+        - 'center' : Center of intervals
+        - 'maximin' : Maximize minimal distance between points (best of
+        iterations designs)
+        - 'centermaximin' : Like 'maximin', but with centered points
+        - 'correlation' : Minimize maximal correlation between parameters
+        (best of iterations designs)
+        Maximin criteria use nearest neighbour search, which gets slow for
+        large designs with many parameters. Use 'correlation' for large
+        designs.
+    iterations : int, optional
+        Number of candidate designs for 'maximin', 'centermaximin' and
+        'correlation' (default: 5)
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None)
+
+    Returns
+    -------
+    design : np.array
+        2d array (nb_samples x nb_par) with values in (0, 1)
+    """
+
+    assert nb_samples > 0
+    assert nb_par > 0
+    assert criterion in [None, 'center', 'maximin', 'centermaximin',
+                         'correlation']
+    assert iterations > 0
+
+    rng = get_rng(rng=rng, seed=seed)
+
+    centered = criterion in ['center', 'centermaximin']
+
+    if criterion in [None, 'center']:
+        return _gen_lhs(nb_samples, nb_par, rng, centered)
+
+    design = None
+    best_score = None
+    for i in range(iterations):
+        cand = _gen_lhs(nb_samples, nb_par, rng, centered)
+
+        if criterion == 'correlation':
+            #  Minimize maximal correlation
+            score = -calc_max_correlation(cand)
+        else:
+            score = calc_min_distance(cand)
+
+        if best_score is None or score > best_score:
+            design = cand
+            best_score = score
+
+    return design
+
+
+def gen_design(nb_samples, nb_par, method='lhc', criterion='center',
+               iterations=5, scramble=True, rng=None, seed=None):
+    """
+    Generate design on unit hypercube
+
+    Parameters
+    ----------
+    nb_samples : int
+        Number of samples
+    nb_par : int
+        Number of parameters (dimensions)
+    method : str, optional
+        Design method (default: 'lhc')
+        Options:
+        - 'random' : Pseudo random numbers
+        - 'lhc' : Latin hypercube design
+        - 'sobol' : Sobol sequence
+    criterion : str, optional
+        Latin hypercube criterion (default: 'center'). Only relevant for
+        method 'lhc' (see lhs_design)
+    iterations : int, optional
+        Number of latin hypercube candidate designs (default: 5)
+    scramble : bool, optional
+        Defines, if Sobol sequence is scrambled (default: True)
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None)
+
+    Returns
+    -------
+    design : np.array
+        2d array (nb_samples x nb_par) with values in [0, 1)
+    """
+
+    assert method in ['random', 'lhc', 'sobol']
+
+    if method == 'lhc':
+        return lhs_design(nb_samples=nb_samples, nb_par=nb_par,
+                          criterion=criterion, iterations=iterations,
+                          rng=rng, seed=seed)
+    elif method == 'sobol':
+        return sobol_design(nb_samples=nb_samples, nb_par=nb_par,
+                            scramble=scramble, rng=rng, seed=seed)
+
+    return get_rng(rng=rng, seed=seed).random((nb_samples, nb_par))
+
+
+def ppf_uniform(array_u, min_val, max_val):
+    """
+    Inverse cumulative distribution function of uniform distribution
+
+    Parameters
+    ----------
+    array_u : np.array
+        Values in [0, 1]
+    min_val : float
+        Minimal value
+    max_val : float
+        Maximal value
+
+    Returns
+    -------
+    array_val : np.array
+        Sample values
+    """
+
+    return np.asarray(array_u) * (max_val - min_val) + min_val
+
+
+def ppf_normal(array_u, mean=0, std=1, min_val=None):
+    """
+    Inverse cumulative distribution function of normal distribution
+
+    Parameters
+    ----------
+    array_u : np.array
+        Values in (0, 1)
+    mean : float, optional
+        Mean value (default: 0)
+    std : float, optional
+        Standard deviation (default: 1)
+    min_val : float, optional
+        Lower limit (default: None). If set, smaller values are set to
+        min_val.
+
+    Returns
+    -------
+    array_val : np.array
+        Sample values
+    """
+
+    array_val = special.ndtri(array_u) * std + mean
+
+    if min_val is not None:
+        array_val = np.where(array_val < min_val, min_val, array_val)
+
+    return array_val
+
+
+def ppf_lognormal(array_u, sigma, mu=0, scale=1):
+    """
+    Inverse cumulative distribution function of lognormal distribution
+
+    Parameters
+    ----------
+    array_u : np.array
+        Values in (0, 1)
+    sigma : float
+        Standard deviation of underlying normal distribution
+    mu : float, optional
+        Mean of underlying normal distribution (default: 0)
+    scale : float, optional
+        Scaling factor (default: 1)
+
+    Returns
+    -------
+    array_val : np.array
+        Sample values
+    """
+
+    return np.exp(mu + sigma * special.ndtri(array_u)) * scale
+
+
+def ppf_discrete(array_u, values, probs=None):
+    """
+    Inverse cumulative distribution function of discrete distribution
+
+    Parameters
+    ----------
+    array_u : np.array
+        Values in [0, 1)
+    values : array-like
+        Possible values
+    probs : array-like, optional
+        Probabilities of values (default: None). If None, assumes equal
+        probabilities. Probabilities are normalized to a sum of 1.
+
+    Returns
+    -------
+    array_val : np.array
+        Sample values
+    """
+
+    values = np.asarray(values)
+
+    if probs is None:
+        probs = np.ones(len(values))
+
+    array_cum = np.cumsum(probs, dtype=float)
+    array_cum /= array_cum[-1]
+
+    array_idx = np.searchsorted(array_cum, array_u, side='right')
+
+    return values[np.minimum(array_idx, len(values) - 1)]
+
+
+#  Inverse cumulative distribution functions by distribution name
+dict_ppf = {'uniform': ppf_uniform,
+            'normal': ppf_normal,
+            'lognormal': ppf_lognormal,
+            'discrete': ppf_discrete}
+
+
+def sample_parameters(nb_samples, dict_par, method='lhc',
+                      criterion='center', rng=None, seed=None):
+    """
+    Sample parameters with design method and inverse cumulative
+    distribution functions
+
+    Parameters
+    ----------
+    nb_samples : int
+        Number of samples
+    dict_par : dict
+        Dict holding parameter names as keys and tuples
+        (distribution name, dict with distribution parameters) as values,
+        e.g. {'interest': ('uniform', {'min_val': 1.01, 'max_val': 1.0675})}
+        Distribution names: 'uniform', 'normal', 'lognormal', 'discrete'
+    method : str, optional
+        Design method (default: 'lhc'). See gen_design
+    criterion : str, optional
+        Latin hypercube criterion (default: 'center'). See lhs_design
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None)
+
+    Returns
+    -------
+    dict_samples : dict
+        Dict holding parameter names as keys and numpy arrays with
+        samples as values
+    """
+
+    list_keys = list(dict_par.keys())
+
+    design = gen_design(nb_samples=nb_samples, nb_par=len(list_keys),
+                        method=method, criterion=criterion, rng=rng,
+                        seed=seed)
+
+    dict_samples = {}
+    for i in range(len(list_keys)):
+        (dist, dict_args) = dict_par[list_keys[i]]
+        dict_samples[list_keys[i]] = dict_ppf[dist](design[:, i],
+                                                    **dict_args)
+
+    return dict_samples
+
+
+def select_subsets(array_ids, array_nb, rng=None, seed=None):
+    """
+    Randomly select subsets (without replacement) of ids for each sample
+
+    Parameters
+    ----------
+    array_ids : array-like
+        Ids to select from
+    array_nb : array-like (of ints)
+        Number of selected ids per sample
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None)
+
+    Returns
+    -------
+    list_subsets : list (of np.arrays)
+        List holding array with selected ids for each sample
+    """
+
+    rng = get_rng(rng=rng, seed=seed)
+
+    array_ids = np.asarray(array_ids)
+
+    array_order = np.argsort(rng.random((len(array_nb), len(array_ids))),
+                             axis=1)
+
+    return [array_ids[array_order[i, :int(array_nb[i])]]
+            for i in range(len(array_nb))]
+
+
+if __name__ == '__main__':
+
+    import time
+
+    nb_samples = 100000
+    nb_par = 50
+
+    for method in ['random', 'lhc', 'sobol']:
+        start = time.time()
+        design = gen_design(nb_samples=nb_samples, nb_par=nb_par,
+                            method=method, seed=1)
+        print('Method ' + method + ': ' + str(round(time.time() - start, 3))
+              + ' seconds for ' + str(nb_samples) + ' samples with '
+              + str(nb_par) + ' parameters')
+
+    dict_par = {'interest': ('uniform', {'min_val': 1.01, 'max_val': 1.0675}),
+                'eta_boi': ('normal', {'mean': 0.95, 'std': 0.005}),
+                'boi_inv': ('lognormal', {'sigma': 0.2}),
+                'nb_occ': ('discrete', {'values': [1, 2, 3, 4, 5],
+                                        'probs': [41.4, 34.2, 12.1, 9, 3.2]})}
+
+    dict_samples = sample_parameters(nb_samples=1000, dict_par=dict_par,
+                                     method='sobol', seed=1)
+
+    for key in dict_samples.keys():
+        print(key, np.mean(dict_samples[key]), np.std(dict_samples[key]))
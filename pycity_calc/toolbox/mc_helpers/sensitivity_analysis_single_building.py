@@ -58,14 +58,11 @@ def do_single_building_sensitivity_analysis(building, fix_build_year=1990,
 
     #  Get weather dictionaries (cold, regular, warm weather)
     dict_weather = uncweat.get_warm_cold_regular_weather()
-    list_weather = []
     array_weath_interpol = np.arange(start=-1, stop=1.25, step=0.25)
     # array_weath_interpol = np.arange(start=-1, stop=1, step=0.3)
-    for interpol in array_weath_interpol:
-        new_weather = \
-            uncweat.calc_lin_ipl_weath(weath_dict=dict_weather,
-                                       factor=interpol)
-        list_weather.append(new_weather)
+    list_weather = \
+        uncweat.calc_lin_ipl_ensemble(weath_dict=dict_weather,
+                                      array_factors=array_weath_interpol)
 
     #  Perform sensitivity analysis with different years of construction
     #  ##################################################################
@@ -0,0 +1,1595 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Generic parameter study engine for Monte-Carlo and sensitivity analysis.
+
+A ParameterRegistry declares uncertain parameters with their distribution
+(see sampling_engine.dict_ppf) and a setter, which writes a sample value
+into a copy of the study object (e.g. CityAnnuityCalc object). Setters and
+evaluators have to be picklable (module-level functions or objects like
+AttrSetter, BuildingParSetter and CityEcoEvaluator), if studies are
+evaluated in worker processes.
+
+The StudyEngine evaluates designs of parameter values in batches. Each
+batch is processed on one copy of the study object (pickled once per batch,
+if executor is used), results are streamed (iter_run / callback) and cached
+per parameter value combination, so that repeated points (e.g. of Morris
+trajectories) are only evaluated once.
+
+Random, latin hypercube and Sobol sampling (run_sampling), Morris screening
+(run_morris) and Sobol indices (run_sobol_indices) all run on the engine.
+"""
+from __future__ import division
+
+import os
+import copy
+import pickle
+import warnings
+import collections
+import numpy as np
+from concurrent.futures import as_completed
+
+import pycity_calc.simulation.energy_balance.city_eb_calc as citeb
+import pycity_calc.toolbox.mc_helpers.sampling_engine as sampeng
+import pycity_calc.toolbox.modifiers.mod_city_sh_dem as shmod
+import pycity_calc.toolbox.modifiers.mod_city_el_dem as elmod
+import pycity_calc.toolbox.modifiers.mod_city_dhw_dem as dhwmod
+
+
+#  Distributions of uncertain city parameters of McRunner sampling
+#  (parameter name, distribution name, distribution parameters)
+list_city_par_dist = \
+    [('interest', 'uniform', {'min_val': 1.01, 'max_val': 1.0675}),
+     ('price_ch_cap', 'uniform', {'min_val': 1.0, 'max_val': 1.0575}),
+     ('price_ch_dem_gas', 'uniform', {'min_val': 0.96, 'max_val': 1.06}),
+     ('price_ch_dem_el', 'uniform', {'min_val': 0.98, 'max_val': 1.1}),
+     ('price_ch_op', 'uniform', {'min_val': 1, 'max_val': 1.0575}),
+     ('price_ch_eeg_chp', 'uniform', {'min_val': 0.98, 'max_val': 1.02}),
+     ('price_ch_eeg_pv', 'uniform', {'min_val': 0.98, 'max_val': 1.02}),
+     ('price_ch_eex', 'uniform', {'min_val': 0.94, 'max_val': 1.02}),
+     ('price_ch_grid_use', 'uniform', {'min_val': 0.98, 'max_val': 1.04}),
+     ('temp_ground', 'uniform', {'min_val': 8, 'max_val': 12}),
+     #  Share of buildings with heating during summer
+     ('list_sum_on', 'uniform', {'min_val': 0, 'max_val': 1}),
+     ('lhn_loss', 'uniform', {'min_val': 0.75, 'max_val': 1.25}),
+     ('grid_av_fee', 'uniform', {'min_val': 0.0001, 'max_val': 0.015}),
+     ('lhn_inv', 'lognormal', {'sigma': 0.5})]
+
+#  Distributions of uncertain building parameters of McRunner sampling
+#  (parameter name, distribution name, distribution parameters). Demand
+#  distributions are relative to reference demand of building.
+list_build_par_dist = \
+    [('sh_dem', 'normal', {'mean': 1, 'std': 0.5791, 'min_val': 0}),
+     ('el_dem', 'normal', {'mean': 1, 'std': 0.2, 'min_val': 0}),
+     ('dhw_dem', 'normal', {'mean': 1, 'std': 0.2, 'min_val': 0}),
+     ('self_discharge', 'uniform', {'min_val': 0.00001, 'max_val': 0.001}),
+     ('eta_charge', 'normal', {'mean': 0.95, 'std': 0.005}),
+     ('eta_discharge', 'normal', {'mean': 0.9, 'std': 0.005}),
+     ('bat_inv', 'lognormal', {'sigma': 0.3}),
+     ('eta_boi', 'normal', {'mean': 0.95, 'std': 0.005}),
+     ('boi_inv', 'lognormal', {'sigma': 0.2}),
+     ('omega_chp', 'normal', {'mean': 0.9, 'std': 0.02}),
+     ('chp_inv', 'lognormal', {'sigma': 0.3}),
+     ('qual_grade_ww', 'uniform', {'min_val': 0.38, 'max_val': 0.48}),
+     ('qual_grade_aw', 'uniform', {'min_val': 0.29, 'max_val': 0.39}),
+     ('t_sink', 'uniform', {'min_val': 31, 'max_val': 55}),
+     ('hp_inv', 'lognormal', {'sigma': 0.2}),
+     ('eh_inv', 'lognormal', {'sigma': 0.2}),
+     ('k_loss', 'uniform', {'min_val': 0.1, 'max_val': 0.5}),
+     ('tes_inv', 'lognormal', {'sigma': 0.2}),
+     ('eta_pv', 'normal', {'mean': 0.1275, 'std': 0.02}),
+     ('beta', 'uniform', {'min_val': 0, 'max_val': 60}),
+     ('gamma', 'uniform', {'min_val': -180, 'max_val': 180}),
+     ('pv_inv', 'lognormal', {'sigma': 0.3})]
+
+
+class StudyToleranceException(Exception):
+    def __init__(self, message):
+        """
+        Constructor of StudyToleranceException
+
+        Parameters
+        ----------
+        message : str
+            Error message
+        """
+        super(StudyToleranceException, self).__init__(message)
+
+
+def get_attr_path(obj, path):
+    """
+    Returns attribute of obj, defined by dotted path (e.g.
+    'energy_balance.city.environment')
+
+    Parameters
+    ----------
+    obj : object
+        Object
+    path : str
+        Dotted attribute path. Empty string returns obj.
+
+    Returns
+    -------
+    attr : object
+        Attribute
+    """
+
+    if path:
+        for name in path.split('.'):
+            obj = getattr(obj, name)
+
+    return obj
+
+
+class AttrSetter(object):
+    """
+    Setter for attribute of study object, defined by dotted path
+    """
+
+    def __init__(self, path):
+        """
+        Constructor of AttrSetter
+
+        Parameters
+        ----------
+        path : str
+            Dotted attribute path relative to study object
+            (e.g. 'annuity_obj.interest')
+        """
+
+        self.path = path
+
+    def __call__(self, obj, value):
+        (path_parent, _, name) = self.path.rpartition('.')
+        setattr(get_attr_path(obj, path_parent), name, value)
+
+
+def set_price_ch_dem_el(city_eco_calc, value):
+    """
+    Set price change of el. demand of annuity object (also used for heat
+    pump el. demand, as in McRunner)
+
+    Parameters
+    ----------
+    city_eco_calc : object
+        CityAnnuityCalc object
+    value : float
+        Price change factor
+    """
+
+    city_eco_calc.annuity_obj.price_ch_dem_el = value
+    city_eco_calc.annuity_obj.price_ch_dem_el_hp = value
+
+
+class BuildingParSetter(object):
+    """
+    Setter for demand and energy system parameters of building within city
+    (parameters of McRunner sampling)
+    """
+
+    #  Parameter names and (bes flag, device attribute) of energy systems
+    dict_esys_par = {'eta_boi': ('hasBoiler', 'boiler'),
+                     'omega_chp': ('hasChp', 'chp'),
+                     'qual_grade_aw': ('hasHeatpump', 'heatpump'),
+                     'qual_grade_ww': ('hasHeatpump', 'heatpump'),
+                     't_sink': ('hasHeatpump', 'heatpump'),
+                     'self_discharge': ('hasBattery', 'battery'),
+                     'eta_charge': ('hasBattery', 'battery'),
+                     'eta_discharge': ('hasBattery', 'battery'),
+                     'eta_pv': ('hasPv', 'pv'),
+                     'beta': ('hasPv', 'pv'),
+                     'gamma': ('hasPv', 'pv'),
+                     'k_loss': ('hasTes', 'tes')}
+
+    #  Parameter names of demands
+    list_dem_par = ['sh_dem', 'el_dem', 'dhw_dem']
+
+    #  Parameter name of summer heating mode (1: heating during summer,
+    #  0: space heating switched off during summer)
+    sum_heat_par = 'sum_heat_on'
+
+    def __init__(self, node_id, par_name, city_path='energy_balance.city',
+                 relative=True):
+        """
+        Constructor of BuildingParSetter
+
+        Parameters
+        ----------
+        node_id : int
+            Building node id within city
+        par_name : str
+            Parameter name. Options are keys of dict_esys_par, list_dem_par
+            and sum_heat_par.
+        city_path : str, optional
+            Dotted path to city, relative to study object
+            (default: 'energy_balance.city'). Use '' for city objects.
+        relative : bool, optional
+            Defines, if demand parameters are relative factors (default:
+            True). If True, values rescale the annual demand of the building
+            (e.g. sh_dem = 1.1 increases the space heating demand by 10 %).
+            If False, values are annual demands in kWh.
+        """
+
+        if par_name not in self.dict_esys_par and \
+                par_name not in self.list_dem_par and \
+                par_name != self.sum_heat_par:
+            msg = 'Unknown building parameter ' + str(par_name)
+            raise ValueError(msg)
+
+        self.node_id = node_id
+        self.par_name = par_name
+        self.city_path = city_path
+        self.relative = relative
+
+    def __call__(self, obj, value):
+
+        city = get_attr_path(obj, self.city_path)
+        build = city.nodes[self.node_id]['entity']
+
+        if self.par_name == 'sh_dem':
+            if self.relative:
+                value *= build.get_annual_space_heat_demand()
+            shmod.rescale_sh_dem_build(building=build, sh_dem=value)
+            return
+        elif self.par_name == 'el_dem':
+            if self.relative:
+                value *= build.get_annual_el_demand()
+            elmod.rescale_el_dem_build(building=build, el_dem=value)
+            return
+        elif self.par_name == 'dhw_dem':
+            if self.relative:
+                value *= build.get_annual_dhw_demand()
+            dhwmod.rescale_dhw_build(building=build, dhw_dem=value)
+            return
+        elif self.par_name == self.sum_heat_par:
+            if value < 0.5:
+                #  Switch space heating off during summer
+                shmod.sh_curve_summer_off_build(building=build)
+            return
+
+        device = getattr(build.bes, self.dict_esys_par[self.par_name][1])
+
+        if self.par_name == 'eta_boi':
+            device.eta = value
+        elif self.par_name == 'omega_chp':
+            #  Recalculate nominal electrical power with new omega
+            (th_power, el_power) = \
+                device.run_precalculation(q_nominal=device.qNominal,
+                                          p_nominal=None,
+                                          eta_total=value,
+                                          thermal_operation_mode=True)
+            device.qNominal = th_power
+            device.pNominal = el_power
+        elif self.par_name in ['qual_grade_aw', 'qual_grade_ww', 't_sink']:
+            setattr(device, self.par_name, value)
+            #  Update quality grade used for COP calculation
+            device._recalc_quality_grade()
+        elif self.par_name == 'self_discharge':
+            device.selfDischarge = value
+        elif self.par_name == 'eta_charge':
+            device.etaCharge = value
+        elif self.par_name == 'eta_discharge':
+            device.etaDischarge = value
+        elif self.par_name == 'eta_pv':
+            device.eta = value
+        else:
+            setattr(device, self.par_name, value)
+
+
+class ProfileSetter(object):
+    """
+    Setter for el. or dhw profile of building within city, which is chosen
+    from profile pool by sample value (row index of profile pool)
+    """
+
+    #  Parameter names with apartment load attributes
+    dict_profile_par = {'el_profile': 'power_el',
+                        'dhw_profile': 'demandDomesticHotWater'}
+
+    def __init__(self, node_id, par_name, profiles,
+                 city_path='energy_balance.city'):
+        """
+        Constructor of ProfileSetter
+
+        Parameters
+        ----------
+        node_id : int
+            Building node id within city
+        par_name : str
+            Parameter name. Options are keys of dict_profile_par.
+        profiles : np.array
+            2d array (nb. of profiles x nb. of timesteps) with building
+            profiles (e.g. 'el_profiles' of profile pool). Profiles are
+            shared equally between apartments of building.
+        city_path : str, optional
+            Dotted path to city, relative to study object
+            (default: 'energy_balance.city'). Use '' for city objects.
+        """
+
+        if par_name not in self.dict_profile_par:
+            msg = 'Unknown profile parameter ' + str(par_name)
+            raise ValueError(msg)
+
+        self.node_id = node_id
+        self.par_name = par_name
+        self.profiles = profiles
+        self.city_path = city_path
+
+    def __call__(self, obj, value):
+
+        city = get_attr_path(obj, self.city_path)
+        build = city.nodes[self.node_id]['entity']
+
+        nb_app = len(build.apartments)
+
+        for app in build.apartments:
+            getattr(app, self.dict_profile_par[self.par_name]).loadcurve = \
+                self.profiles[int(value)] / nb_app
+
+
+class McSampleSetter(object):
+    """
+    Setter for Monte-Carlo sample values, which are handed over to energy
+    balance and economic calculation of CityAnnuityCalc object (LHN loss
+    and investment cost factors). Values are stored on dict_mc_sample
+    attribute of study object and used by CityEcoEvaluator.
+    """
+
+    #  Investment cost parameter names with bes flag of device
+    dict_inv_par = {'bat_inv': 'hasBattery',
+                    'boi_inv': 'hasBoiler',
+                    'chp_inv': 'hasChp',
+                    'hp_inv': 'hasHeatpump',
+                    'eh_inv': 'hasElectricalHeater',
+                    'tes_inv': 'hasTes',
+                    'pv_inv': 'hasPv'}
+
+    #  City parameter names
+    list_city_par = ['lhn_loss', 'lhn_inv']
+
+    def __init__(self, par_name, node_id=None):
+        """
+        Constructor of McSampleSetter
+
+        Parameters
+        ----------
+        par_name : str
+            Parameter name. Options are keys of dict_inv_par (building
+            parameters) and list_city_par (city parameters).
+        node_id : int, optional
+            Building node id (default: None). Required for building
+            parameters.
+        """
+
+        if par_name in self.dict_inv_par:
+            if node_id is None:
+                msg = 'node_id is required for ' + str(par_name)
+                raise ValueError(msg)
+        elif par_name not in self.list_city_par:
+            msg = 'Unknown Monte-Carlo sample parameter ' + str(par_name)
+            raise ValueError(msg)
+
+        self.par_name = par_name
+        self.node_id = node_id
+
+    def __call__(self, obj, value):
+
+        if getattr(obj, 'dict_mc_sample', None) is None:
+            obj.dict_mc_sample = {}
+
+        obj.dict_mc_sample[(self.node_id, self.par_name)] = value
+
+
+class ParameterRegistry(object):
+    """
+    Registry of uncertain parameters with distributions and setters
+    """
+
+    def __init__(self):
+        """
+        Constructor of ParameterRegistry
+        """
+
+        #  List of parameter names (defines column order of designs)
+        self.list_names = []
+
+        #  Holding parameter names as keys and tuples
+        #  (distribution name, dict with distribution parameters) as values
+        self.dict_par = {}
+
+        #  Holding parameter names as keys and setters as values
+        self.dict_setter = {}
+
+        #  Holding parameter names as keys and tuples (stage, node_id) as
+        #  values
+        self.dict_stage = {}
+
+    def add_parameter(self, name, setter, dist='uniform', dict_dist=None,
+                      stage='city', node_id=None):
+        """
+        Add parameter to registry
+
+        Parameters
+        ----------
+        name : str
+            Unique parameter name
+        setter : callable or str
+            Setter with signature setter(obj, value), which writes value into
+            study object obj. If str, AttrSetter with dotted attribute path
+            is used.
+        dist : str, optional
+            Distribution name (default: 'uniform').
+            Options: 'uniform', 'normal', 'lognormal', 'discrete'
+        dict_dist : dict, optional
+            Distribution parameters (default: None), e.g.
+            {'min_val': 1.01, 'max_val': 1.0675} for 'uniform'
+            (see sampling_engine ppf functions)
+        stage : str, optional
+            Defines, which part of the evaluation depends on parameter
+            (default: 'city'). Used to reuse results of unchanged parts, e.g.
+            between consecutive points of Morris trajectories.
+            Options:
+            - 'city' : Whole evaluation (energy balance and economic calc.)
+            - 'eco' : Economic calculation only. Setter has to set absolute
+              values (it can be applied to already evaluated objects).
+            - 'building' : Energy balance of building with node_id
+        node_id : int, optional
+            Building node id (default: None). Only relevant for stage
+            'building'. If None, uses node_id attribute of setter.
+        """
+
+        if stage not in ['city', 'eco', 'building']:
+            msg = 'Unknown stage ' + str(stage) + '. Options are city, eco ' \
+                                                  'and building.'
+            raise ValueError(msg)
+
+        if stage == 'building' and node_id is None:
+            node_id = getattr(setter, 'node_id', None)
+            if node_id is None:
+                msg = 'node_id is required for stage building.'
+                raise ValueError(msg)
+
+        if name in self.dict_par:
+            msg = 'Parameter ' + str(name) + ' is already registered.'
+            raise ValueError(msg)
+
+        if dist not in sampeng.dict_ppf:
+            msg = 'Unknown distribution ' + str(dist) + '. Options are ' + \
+                  str(sorted(sampeng.dict_ppf.keys()))
+            raise ValueError(msg)
+
+        if isinstance(setter, str):
+            setter = AttrSetter(path=setter)
+
+        if dict_dist is None:
+            dict_dist = {}
+
+        self.list_names.append(name)
+        self.dict_par[name] = (dist, dict_dist)
+        self.dict_setter[name] = setter
+        self.dict_stage[name] = (stage, node_id)
+
+    def __len__(self):
+        return len(self.list_names)
+
+    def transform(self, design):
+        """
+        Convert design on unit hypercube to parameter values
+
+        Parameters
+        ----------
+        design : np.array
+            2d array (nb_samples x nb_par) with values in [0, 1]
+
+        Returns
+        -------
+        array_values : np.array
+            2d array (nb_samples x nb_par) with parameter values
+        """
+
+        design = np.atleast_2d(design)
+
+        array_values = np.zeros(design.shape)
+        for i in range(len(self.list_names)):
+            (dist, dict_dist) = self.dict_par[self.list_names[i]]
+            array_values[:, i] = sampeng.dict_ppf[dist](design[:, i],
+                                                        **dict_dist)
+
+        return array_values
+
+    def apply(self, obj, values, list_idx=None):
+        """
+        Write parameter values into study object
+
+        Parameters
+        ----------
+        obj : object
+            Study object (e.g. CityAnnuityCalc object)
+        values : array-like
+            Parameter values in order of list_names
+        list_idx : list (of ints), optional
+            Indexes of parameters, which should be written (default: None).
+            If None, all parameters are written.
+        """
+
+        if list_idx is None:
+            list_idx = range(len(self.list_names))
+
+        for i in list_idx:
+            self.dict_setter[self.list_names[i]](obj, values[i])
+
+
+def gen_city_eco_registry(city_eco_calc, list_build_ids=None, city_par=True,
+                          dem_par=True, esys_par=True, mc_par=False,
+                          heating_off=False, abs_dem=False,
+                          dict_profiles=None):
+    """
+    Generate parameter registry with parameters and distributions of McRunner
+    sampling (list_city_par_dist, list_build_par_dist).
+
+    Parameters
+    ----------
+    city_eco_calc : object
+        CityAnnuityCalc object
+    list_build_ids : list (of ints), optional
+        List of building node ids (default: None). If None, uses all
+        building entity node ids of city.
+    city_par : bool, optional
+        Add economic and environment parameters (default: True)
+    dem_par : bool, optional
+        Add demand parameters of buildings (default: True)
+    esys_par : bool, optional
+        Add energy system parameters of existing devices (default: True)
+    mc_par : bool, optional
+        Add LHN loss and investment cost factors of LHN and existing devices
+        (default: False). Values are handed over to energy balance and
+        economic calculation as Monte-Carlo samples (see McSampleSetter).
+    heating_off : bool, optional
+        Add summer heating mode parameter per building (default: False),
+        with equal probability of heating on (1) or off (0) during summer
+    abs_dem : bool, optional
+        Defines, if demand parameters are annual demands in kWh (default:
+        False). If False, demand parameters are relative factors.
+    dict_profiles : dict, optional
+        Profile pool (default: None), holding building ids as keys and dicts
+        with 'el_profiles' and 'dhw_profiles' arrays as values (see
+        McRunner.perform_lhc_sampling). If set, adds el. and dhw profile
+        indexes per building, which are applied before demand parameters.
+
+    Returns
+    -------
+    registry : object
+        ParameterRegistry object
+    """
+
+    registry = ParameterRegistry()
+
+    city = city_eco_calc.energy_balance.city
+
+    if list_build_ids is None:
+        list_build_ids = city.get_list_build_entity_node_ids()
+
+    for (key, dist, dict_dist) in list_city_par_dist:
+        if key in McSampleSetter.list_city_par:
+            if not mc_par:
+                continue
+            setter = McSampleSetter(par_name=key)
+            stage = 'city' if key == 'lhn_loss' else 'eco'
+        elif key == 'list_sum_on':
+            #  Summer heating mode is added per building
+            continue
+        elif not city_par:
+            continue
+        elif key == 'temp_ground':
+            setter = 'energy_balance.city.environment.temp_ground'
+            stage = 'city'
+        elif key == 'grid_av_fee':
+            setter = 'energy_balance.city.environment.prices.grid_av_fee'
+            stage = 'eco'
+        elif key == 'price_ch_dem_el':
+            setter = set_price_ch_dem_el
+            stage = 'eco'
+        else:
+            setter = 'annuity_obj.' + key
+            stage = 'eco'
+
+        registry.add_parameter(name=key, setter=setter, dist=dist,
+                               dict_dist=dict_dist, stage=stage)
+
+    for n in list_build_ids:
+        build = city.nodes[n]['entity']
+
+        if dict_profiles is not None and n in dict_profiles:
+            for (par_name, key) in [('el_profile', 'el_profiles'),
+                                    ('dhw_profile', 'dhw_profiles')]:
+                profiles = dict_profiles[n][key]
+                registry.add_parameter(
+                    name=par_name + '_' + str(n),
+                    setter=ProfileSetter(node_id=n, par_name=par_name,
+                                         profiles=profiles),
+                    dist='discrete',
+                    dict_dist={'values': np.arange(len(profiles))},
+                    stage='building')
+
+        for (par_name, dist, dict_dist) in list_build_par_dist:
+            if par_name in BuildingParSetter.list_dem_par:
+                if not dem_par:
+                    continue
+                if abs_dem:
+                    dem_ref = {'sh_dem': build.get_annual_space_heat_demand,
+                               'el_dem': build.get_annual_el_demand,
+                               'dhw_dem': build.get_annual_dhw_demand}[
+                        par_name]()
+                    dict_dist = {'mean': dem_ref * dict_dist['mean'],
+                                 'std': dem_ref * dict_dist['std'],
+                                 'min_val': 0}
+                setter = BuildingParSetter(node_id=n, par_name=par_name,
+                                           relative=not abs_dem)
+                stage = 'building'
+            elif par_name in McSampleSetter.dict_inv_par:
+                if not mc_par or not build.hasBes or \
+                        not getattr(build.bes,
+                                    McSampleSetter.dict_inv_par[par_name]):
+                    continue
+                setter = McSampleSetter(par_name=par_name, node_id=n)
+                stage = 'eco'
+            else:
+                if not esys_par or not build.hasBes:
+                    continue
+                bes_flag = BuildingParSetter.dict_esys_par[par_name][0]
+                if not getattr(build.bes, bes_flag):
+                    continue
+                setter = BuildingParSetter(node_id=n, par_name=par_name)
+                stage = 'building'
+
+            registry.add_parameter(name=par_name + '_' + str(n),
+                                   setter=setter, dist=dist,
+                                   dict_dist=dict_dist, stage=stage,
+                                   node_id=n)
+
+    if heating_off:
+        #  Summer heating mode is applied after demand parameters
+        for n in list_build_ids:
+            registry.add_parameter(
+                name=BuildingParSetter.sum_heat_par + '_' + str(n),
+                setter=BuildingParSetter(
+                    node_id=n, par_name=BuildingParSetter.sum_heat_par),
+                dist='discrete', dict_dist={'values': [0, 1]},
+                stage='building')
+
+    return registry
+
+
+class CityEcoEvaluator(object):
+    """
+    Evaluator for CityAnnuityCalc objects. Runs energy balance, annuity and
+    CO2 calculation and returns results with keys of McRunner dict_mc_res
+    (and dict_mc_cov, if calc_th_el_cov is True).
+    """
+
+    #  Result keys of thermal and electric coverage factors
+    list_cov_keys = ['th_cov_boi', 'th_cov_chp', 'th_cov_hp_aw',
+                     'th_cov_hp_ww', 'th_cov_eh', 'el_cov_chp', 'el_cov_pv',
+                     'el_cov_grid']
+
+    def __init__(self, eeg_pv_limit=False, use_kwkg_lhn_sub=False,
+                 el_mix_for_chp=True, el_mix_for_pv=True,
+                 calc_th_el_cov=False):
+        """
+        Constructor of CityEcoEvaluator
+
+        Parameters
+        ----------
+        eeg_pv_limit : bool, optional
+            Defines, if EEG PV feed-in limitation of 70 % of peak load is
+            active (default: False)
+        use_kwkg_lhn_sub : bool, optional
+            Defines, if KWKG LHN subsidies are used (default: False)
+        el_mix_for_chp : bool, optional
+            Defines, if el. mix should be used for CHP fed-in electricity
+            (default: True)
+        el_mix_for_pv : bool, optional
+            Defines, if el. mix should be used for PV fed-in electricity
+            (default: True)
+        calc_th_el_cov : bool, optional
+            Defines, if thermal and electric coverage of different types of
+            devices should be calculated (default: False)
+        """
+
+        self.eeg_pv_limit = eeg_pv_limit
+        self.use_kwkg_lhn_sub = use_kwkg_lhn_sub
+        self.el_mix_for_chp = el_mix_for_chp
+        self.el_mix_for_pv = el_mix_for_pv
+        self.calc_th_el_cov = calc_th_el_cov
+
+    def __call__(self, city_eco_calc):
+
+        #  Recalculate values, which depend on sampled annuity parameters
+        city_eco_calc.annuity_obj.initial_calc()
+
+        (annuity, co2) = city_eco_calc. \
+            perform_overall_energy_balance_and_economic_calc(
+            eeg_pv_limit=self.eeg_pv_limit,
+            use_kwkg_lhn_sub=self.use_kwkg_lhn_sub,
+            el_mix_for_chp=self.el_mix_for_chp,
+            el_mix_for_pv=self.el_mix_for_pv,
+            **self._get_mc_kwargs(city_eco_calc))
+
+        return self._get_results(city_eco_calc, annuity, co2)
+
+    @staticmethod
+    def _get_mc_kwargs(city_eco_calc):
+        """
+        Returns Monte-Carlo sample arguments of energy balance and economic
+        calculation with values of McSampleSetter (reference value 1 for
+        parameters without sample value)
+        """
+
+        dict_mc_sample = getattr(city_eco_calc, 'dict_mc_sample', None)
+
+        if dict_mc_sample is None:
+            return {}
+
+        dict_city_sample = collections.defaultdict(lambda: np.ones(1))
+        dict_build_samples = collections.defaultdict(
+            lambda: collections.defaultdict(lambda: np.ones(1)))
+
+        for ((node_id, par_name), value) in dict_mc_sample.items():
+            if node_id is None:
+                dict_city_sample[par_name] = np.array([value])
+            else:
+                dict_build_samples[node_id][par_name] = np.array([value])
+
+        return {'run_mc': True,
+                'sampling_method': 'lhc',
+                'dict_city_sample_lhc': dict_city_sample,
+                'dict_build_samples_lhc': dict_build_samples,
+                'run_idx': 0}
+
+    def eval_eco(self, city_eco_calc):
+        """
+        Re-evaluate economic calculation and emissions of already evaluated
+        CityAnnuityCalc object (without energy balance)
+
+        Parameters
+        ----------
+        city_eco_calc : object
+            CityAnnuityCalc object with energy balance results
+
+        Returns
+        -------
+        dict_res : dict
+            Results dict (see __call__)
+        """
+
+        city_eco_calc.annuity_obj.initial_calc()
+
+        (annuity, co2) = city_eco_calc.perform_economic_calc(
+            use_kwkg_lhn_sub=self.use_kwkg_lhn_sub,
+            el_mix_for_chp=self.el_mix_for_chp,
+            el_mix_for_pv=self.el_mix_for_pv,
+            **self._get_mc_kwargs(city_eco_calc))
+
+        return self._get_results(city_eco_calc, annuity, co2)
+
+    def can_eval_buildings(self, city_eco_calc, list_ids):
+        """
+        Returns True, if buildings can be re-evaluated separately
+        (stand-alone buildings without energy network connection)
+
+        Parameters
+        ----------
+        city_eco_calc : object
+            CityAnnuityCalc object
+        list_ids : list (of ints)
+            Building node ids
+
+        Returns
+        -------
+        can_eval : bool
+            True, if all buildings are stand-alone buildings
+        """
+
+        list_single = city_eco_calc.energy_balance._list_single_build
+
+        return list_single is not None and set(list_ids) <= set(list_single)
+
+    def reset_buildings(self, city_eco_calc, list_ids, city_eco_src):
+        """
+        Replace stand-alone buildings of already evaluated CityAnnuityCalc
+        object with copies of (not evaluated) buildings of city_eco_src
+        (e.g. base object of study). Only the buildings are copied. They
+        share the environment of city_eco_calc.
+
+        Parameters
+        ----------
+        city_eco_calc : object
+            CityAnnuityCalc object with energy balance results
+        list_ids : list (of ints)
+            Node ids of stand-alone buildings (see can_eval_buildings)
+        city_eco_src : object
+            CityAnnuityCalc object holding buildings to be copied
+        """
+
+        city = city_eco_calc.energy_balance.city
+        city_src = city_eco_src.energy_balance.city
+
+        for n in list_ids:
+            #  Copy building without copying environment
+            city.nodes[n]['entity'] = \
+                copy.deepcopy(city_src.nodes[n]['entity'],
+                              {id(city_src.environment): city.environment})
+
+    def eval_buildings(self, city_eco_calc, list_ids):
+        """
+        Re-run energy balance of (changed) stand-alone buildings of already
+        evaluated CityAnnuityCalc object and the economic calculation
+
+        Parameters
+        ----------
+        city_eco_calc : object
+            CityAnnuityCalc object with energy balance results
+        list_ids : list (of ints)
+            Node ids of stand-alone buildings (see can_eval_buildings)
+
+        Returns
+        -------
+        dict_res : dict
+            Results dict (see __call__)
+        """
+
+        city = city_eco_calc.energy_balance.city
+
+        for n in list_ids:
+            citeb.calc_single_build_eb(build=city.nodes[n]['entity'], id=n,
+                                       eeg_pv_limit=self.eeg_pv_limit)
+
+        city_eco_calc.energy_balance.calc_final_energy_balance_city()
+
+        return self.eval_eco(city_eco_calc)
+
+    def _get_results(self, city_eco_calc, annuity, co2):
+        """
+        Returns results dict of evaluated CityAnnuityCalc object
+        """
+
+        city = city_eco_calc.energy_balance.city
+        dict_fe = city_eco_calc.energy_balance.dict_fe_city_balance
+
+        dict_res = {'annuity': annuity,
+                    'co2': co2,
+                    'sh_dem': city.get_annual_space_heating_demand(),
+                    'el_dem': city.get_annual_el_demand(),
+                    'dhw_dem': city.get_annual_dhw_demand(),
+                    'gas_boiler': dict_fe['fuel_boiler'],
+                    'gas_chp': dict_fe['fuel_chp'],
+                    'grid_imp_dem': dict_fe['grid_import_dem'],
+                    'grid_imp_hp': dict_fe['grid_import_hp'],
+                    'grid_imp_eh': dict_fe['grid_import_eh'],
+                    'lhn_pump': dict_fe['pump_energy'],
+                    'grid_exp_chp': dict_fe['chp_feed'],
+                    'grid_exp_pv': dict_fe['pv_feed']}
+
+        if self.calc_th_el_cov:
+            dict_res.update(self._calc_coverage(city_eco_calc, dict_res))
+
+        return dict_res
+
+    @staticmethod
+    def _calc_coverage(city_eco_calc, dict_res):
+        """
+        Returns thermal and electric coverage factors of device types of
+        evaluated CityAnnuityCalc object (keys of list_cov_keys)
+        """
+
+        city = city_eco_calc.energy_balance.city
+
+        timestep = city.environment.timer.timeDiscretization
+
+        nb_timesteps = int((365 * 24 * 3600) / timestep)
+
+        #  Initial zero result arrays (on city district level)
+        array_chp_q_out = np.zeros(nb_timesteps)
+        array_chp_el_out = np.zeros(nb_timesteps)
+        array_boi_q_out = np.zeros(nb_timesteps)
+        array_hp_aw_q_out = np.zeros(nb_timesteps)
+        array_hp_aw_el_in = np.zeros(nb_timesteps)
+        array_hp_ww_q_out = np.zeros(nb_timesteps)
+        array_hp_ww_el_in = np.zeros(nb_timesteps)
+        array_eh_q_out = np.zeros(nb_timesteps)
+        array_pv_el_out = np.zeros(nb_timesteps)
+
+        #  Loop over each building in city and extract generated power
+        for n in city_eco_calc._list_buildings:
+            curr_b = city.nodes[n]['entity']
+            if curr_b.hasBes:
+                if curr_b.bes.hasBoiler:
+                    array_boi_q_out += curr_b.bes.boiler.totalQOutput
+                if curr_b.bes.hasChp:
+                    array_chp_q_out += curr_b.bes.chp.totalQOutput
+                    array_chp_el_out += curr_b.bes.chp.totalPOutput
+                if curr_b.bes.hasHeatpump:
+                    if curr_b.bes.heatpump.hp_type == 'aw':
+                        array_hp_aw_q_out += curr_b.bes.heatpump.totalQOutput
+                        array_hp_aw_el_in += \
+                            curr_b.bes.heatpump.array_el_power_in
+                    elif curr_b.bes.heatpump.hp_type == 'ww':
+                        array_hp_ww_q_out += curr_b.bes.heatpump.totalQOutput
+                        array_hp_ww_el_in += \
+                            curr_b.bes.heatpump.array_el_power_in
+                    else:
+                        msg = 'Unkown heat pump type'
+                        raise AssertionError(msg)
+                if curr_b.bes.hasElectricalHeater:
+                    array_eh_q_out += curr_b.bes.electricalHeater.totalQOutput
+                if curr_b.bes.hasPv:
+                    array_pv_el_out += curr_b.bes.pv.totalPower
+
+        #  Energy values in kWh
+        th_energy_boi = sum(array_boi_q_out) * timestep / (3600 * 1000)
+        th_energy_chp = sum(array_chp_q_out) * timestep / (3600 * 1000)
+        el_energy_chp = sum(array_chp_el_out) * timestep / (3600 * 1000)
+        th_energy_hp_aw = sum(array_hp_aw_q_out) * timestep / (3600 * 1000)
+        el_energy_hp_aw = sum(array_hp_aw_el_in) * timestep / (3600 * 1000)
+        th_energy_hp_ww = sum(array_hp_ww_q_out) * timestep / (3600 * 1000)
+        el_energy_hp_ww = sum(array_hp_ww_el_in) * timestep / (3600 * 1000)
+        th_energy_eh = sum(array_eh_q_out) * timestep / (3600 * 1000)
+        el_energy_pv = sum(array_pv_el_out) * timestep / (3600 * 1000)
+
+        #  Also includes LHN and storage losses (thus, not using sh_dem value)
+        th_energy_overall_gen = (th_energy_boi + th_energy_chp
+                                 + th_energy_hp_aw + th_energy_hp_ww
+                                 + th_energy_eh)
+
+        #  El. ref. demand (100 % eff. of electr. heater)
+        el_ref_dem = (dict_res['el_dem'] + el_energy_hp_aw + el_energy_hp_ww
+                      + th_energy_eh)
+
+        return {'th_cov_boi': th_energy_boi / th_energy_overall_gen,
+                'th_cov_chp': th_energy_chp / th_energy_overall_gen,
+                'th_cov_hp_aw': th_energy_hp_aw / th_energy_overall_gen,
+                'th_cov_hp_ww': th_energy_hp_ww / th_energy_overall_gen,
+                'th_cov_eh': th_energy_eh / th_energy_overall_gen,
+                'el_cov_chp': (el_energy_chp - dict_res['grid_exp_chp'])
+                              / el_ref_dem,
+                'el_cov_pv': (el_energy_pv - dict_res['grid_exp_pv'])
+                             / el_ref_dem,
+                'el_cov_grid': (dict_res['grid_imp_dem']
+                                + dict_res['grid_imp_hp']
+                                + dict_res['grid_imp_eh']) / el_ref_dem}
+
+
+def eval_batch(base_obj, registry, evaluator, array_values,
+               failure_exceptions=()):
+    """
+    Evaluate batch of parameter value combinations on copies of base_obj
+    (e.g. as job of worker process)
+
+    Parameters
+    ----------
+    base_obj : object
+        Study object, which is copied for each evaluation
+    registry : object
+        ParameterRegistry object
+    evaluator : callable
+        Evaluator with signature evaluator(obj), returning dict with result
+        names as keys and floats as values
+    array_values : np.array
+        2d array (nb_samples x nb_par) with parameter values
+    failure_exceptions : tuple (of exception classes), optional
+        Exceptions, which mark single evaluations as failed (default: ()).
+        Other exceptions are raised.
+
+    Returns
+    -------
+    list_res : list
+        List holding result dict for each evaluation (None, if evaluation
+        failed)
+    """
+
+    list_res = []
+
+    for values in array_values:
+        obj = copy.deepcopy(base_obj)
+        registry.apply(obj, values)
+
+        try:
+            list_res.append(evaluator(obj))
+        except failure_exceptions as ermessage:
+            warnings.warn('Evaluation failed with ' + repr(ermessage))
+            list_res.append(None)
+
+    return list_res
+
+
+class StudyEngine(object):
+    """
+    Engine to evaluate parameter studies (batched, optionally parallel, with
+    result streaming and caching)
+    """
+
+    def __init__(self, base_obj, registry, evaluator, executor=None,
+                 batch_size=None, failure_exceptions=(),
+                 failure_tolerance=0.05, use_cache=True):
+        """
+        Constructor of StudyEngine
+
+        Parameters
+        ----------
+        base_obj : object
+            Study object (e.g. CityAnnuityCalc object). Is not modified, as
+            each evaluation works on a copy.
+        registry : object
+            ParameterRegistry object
+        evaluator : callable
+            Evaluator with signature evaluator(obj), returning dict with
+            result names as keys and floats as values
+            (e.g. CityEcoEvaluator object)
+        executor : object, optional
+            concurrent.futures executor (e.g. ProcessPoolExecutor) to
+            evaluate batches in parallel (default: None). If None, batches
+            are evaluated sequentially.
+        batch_size : int, optional
+            Number of evaluations per batch (default: None). base_obj is
+            transferred once per batch to worker processes. If None, uses
+            one batch for sequential evaluation and about four batches per
+            CPU with executor.
+        failure_exceptions : tuple (of exception classes), optional
+            Exceptions, which mark single evaluations as failed (default: ()),
+            e.g. (EnergyBalanceException, TESChargingException)
+        failure_tolerance : float, optional
+            Allowed share of failed evaluations (default: 0.05). Raises
+            StudyToleranceException, if share is exceeded.
+        use_cache : bool, optional
+            Defines, if results are cached per parameter value combination
+            (default: True)
+        """
+
+        self.base_obj = base_obj
+        self.registry = registry
+        self.evaluator = evaluator
+        self.executor = executor
+        self.batch_size = batch_size
+        self.failure_exceptions = tuple(failure_exceptions)
+        self.failure_tolerance = failure_tolerance
+        self.use_cache = use_cache
+
+        #  Holding tuples of parameter values as keys and result dicts
+        #  (or None for failed evaluations) as values
+        self._dict_cache = {}
+
+        #  Number of evaluations, which have been performed (without cached)
+        self.nb_evals = 0
+
+    def _get_batch_size(self, nb_samples):
+        """
+        Returns number of evaluations per batch
+        """
+
+        if self.batch_size is not None:
+            return max(int(self.batch_size), 1)
+
+        if self.executor is None:
+            return max(nb_samples, 1)
+
+        nb_cpu = os.cpu_count() or 1
+        return max(int(np.ceil(nb_samples / (4 * nb_cpu))), 1)
+
+    def iter_run(self, array_values):
+        """
+        Evaluate parameter value combinations and yield results as soon as
+        their batch is finished (order of finished batches)
+
+        Parameters
+        ----------
+        array_values : np.array
+            2d array (nb_samples x nb_par) with parameter values
+            (columns in order of registry.list_names)
+
+        Yields
+        ------
+        tup_res : tuple
+            Tuple (idx, dict_res) with row index idx of array_values and
+            result dict dict_res (None, if evaluation failed)
+        """
+
+        array_values = np.atleast_2d(np.asarray(array_values, dtype=float))
+
+        if array_values.shape[1] != len(self.registry):
+            msg = 'Number of columns of array_values does not match number ' \
+                  'of registered parameters.'
+            raise ValueError(msg)
+
+        #  Yield cached results and collect unique combinations to evaluate
+        dict_todo = {}
+        for i in range(len(array_values)):
+            key = tuple(array_values[i])
+            if self.use_cache and key in self._dict_cache:
+                yield (i, self._dict_cache[key])
+            else:
+                dict_todo.setdefault(key, []).append(i)
+
+        list_keys = list(dict_todo.keys())
+        batch_size = self._get_batch_size(len(list_keys))
+        list_batches = [list_keys[j:j + batch_size]
+                        for j in range(0, len(list_keys), batch_size)]
+
+        if self.executor is None:
+            iter_batches = ((batch, eval_batch(self.base_obj, self.registry,
+                                               self.evaluator,
+                                               np.array(batch),
+                                               self.failure_exceptions))
+                            for batch in list_batches)
+        else:
+            dict_futures = {}
+            for batch in list_batches:
+                future = self.executor.submit(eval_batch, self.base_obj,
+                                              self.registry, self.evaluator,
+                                              np.array(batch),
+                                              self.failure_exceptions)
+                dict_futures[future] = batch
+            iter_batches = ((dict_futures[future], future.result())
+                            for future in as_completed(dict_futures))
+
+        for (batch, list_res) in iter_batches:
+            self.nb_evals += len(batch)
+            for (key, dict_res) in zip(batch, list_res):
+                if self.use_cache:
+                    self._dict_cache[key] = dict_res
+                for i in dict_todo[key]:
+                    yield (i, dict_res)
+
+    def run(self, array_values, callback=None, conv_monitor=None):
+        """
+        Evaluate parameter value combinations
+
+        Parameters
+        ----------
+        array_values : np.array
+            2d array (nb_samples x nb_par) with parameter values
+            (columns in order of registry.list_names)
+        callback : callable, optional
+            Function with signature callback(idx, dict_res), which is called
+            for each result as soon as it is available (default: None),
+            e.g. to save intermediate results
+        conv_monitor : object, optional
+            McConvergenceMonitor object (default: None). If set, results
+            are evaluated in order of array_values (batch by batch) and
+            evaluation stops, when conv_monitor reports convergence or
+            exhausted time budget. Result arrays are shortened to the number
+            of performed evaluations.
+
+        Returns
+        -------
+        tup_res : tuple
+            Tuple (dict_res, list_failed) with
+            dict_res : dict
+                Dict holding result names as keys and numpy arrays with
+                results per row of array_values as values (nan for failed
+                evaluations)
+            list_failed : list (of ints)
+                Row indexes of failed evaluations
+        """
+
+        array_values = np.atleast_2d(np.asarray(array_values, dtype=float))
+        nb_samples = len(array_values)
+
+        if conv_monitor is None:
+            list_chunks = [array_values]
+        else:
+            conv_monitor.start()
+            #  Check convergence after one batch per CPU
+            chunk_size = self._get_batch_size(nb_samples)
+            if self.executor is not None:
+                chunk_size *= os.cpu_count() or 1
+            list_chunks = [array_values[j:j + chunk_size]
+                           for j in range(0, nb_samples, chunk_size)]
+
+        dict_res = {}
+        list_failed = []
+        nb_done = 0
+
+        for chunk in list_chunks:
+            for (i, dict_run) in self.iter_run(chunk):
+                idx = nb_done + i
+
+                if callback is not None:
+                    callback(idx, dict_run)
+
+                if dict_run is None:
+                    list_failed.append(idx)
+                    continue
+
+                for (key, val) in dict_run.items():
+                    if key not in dict_res:
+                        dict_res[key] = np.zeros(nb_samples) * np.nan
+                    dict_res[key][idx] = val
+
+            nb_done += len(chunk)
+
+            if len(list_failed) > self.failure_tolerance * nb_samples:
+                msg = 'Number of failed evaluations (' + \
+                      str(len(list_failed)) + ') exceeds failure tolerance.'
+                raise StudyToleranceException(msg)
+
+            if conv_monitor is not None and \
+                    conv_monitor.check(dict_mc_res=dict_res, nb_runs=nb_done,
+                                       list_failed_runs=list_failed):
+                break
+
+        if nb_done < nb_samples:
+            for key in dict_res.keys():
+                dict_res[key] = dict_res[key][:nb_done]
+
+        if conv_monitor is not None and conv_monitor.stop_reason is None:
+            conv_monitor.stop_reason = 'max_runs'
+
+        return (dict_res, sorted(list_failed))
+
+    def run_sampling(self, nb_samples, method='lhc', criterion='center',
+                     rng=None, seed=None, callback=None, conv_monitor=None):
+        """
+        Perform Monte-Carlo study with random, latin hypercube or Sobol
+        sampling of registered parameters
+
+        Parameters
+        ----------
+        nb_samples : int
+            Number of samples (maximum number, if conv_monitor is used)
+        method : str, optional
+            Design method (default: 'lhc'). Options: 'random', 'lhc', 'sobol'
+        criterion : str, optional
+            Latin hypercube criterion (default: 'center')
+        rng : np.random.Generator, optional
+            Random Generator (default: None)
+        seed : int, optional
+            Seed (default: None)
+        callback : callable, optional
+            See run (default: None)
+        conv_monitor : object, optional
+            See run (default: None)
+
+        Returns
+        -------
+        tup_res : tuple
+            Tuple (array_values, dict_res, list_failed) with sampled
+            parameter values and results of run
+        """
+
+        design = sampeng.gen_design(nb_samples=nb_samples,
+                                    nb_par=len(self.registry), method=method,
+                                    criterion=criterion, rng=rng, seed=seed)
+
+        array_values = self.registry.transform(design)
+
+        (dict_res, list_failed) = self.run(array_values, callback=callback,
+                                           conv_monitor=conv_monitor)
+
+        if conv_monitor is not None and len(dict_res) > 0:
+            #  Shorten to number of performed evaluations
+            nb_done = len(list(dict_res.values())[0])
+            array_values = array_values[:nb_done]
+
+        return (array_values, dict_res, list_failed)
+
+    def run_morris(self, nb_traj, nb_levels=4, rng=None, seed=None,
+                   callback=None):
+        """
+        Perform Morris screening (elementary effects method)
+
+        Parameters
+        ----------
+        nb_traj : int
+            Number of trajectories (nb_traj * (nb_par + 1) evaluations)
+        nb_levels : int, optional
+            Number of grid levels (default: 4). Has to be even.
+        rng : np.random.Generator, optional
+            Random Generator (default: None)
+        seed : int, optional
+            Seed (default: None)
+        callback : callable, optional
+            See run (default: None)
+
+        Returns
+        -------
+        tup_res : tuple
+            Tuple (array_values, dict_res, dict_morris) with
+            array_values : np.array
+                Parameter values of trajectory points
+            dict_res : dict
+                Results of run
+            dict_morris : dict
+                Dict holding result names as keys and dicts with keys 'mu',
+                'mu_star' and 'sigma' (arrays in order of
+                registry.list_names) as values
+        """
+
+        design = gen_morris_design(nb_traj=nb_traj,
+                                   nb_par=len(self.registry),
+                                   nb_levels=nb_levels, rng=rng, seed=seed)
+
+        array_values = self.registry.transform(
+            morris_to_unit(design, nb_levels=nb_levels))
+
+        (dict_res, list_failed) = self.run(array_values, callback=callback)
+
+        dict_morris = {}
+        for (key, array_res) in dict_res.items():
+            dict_morris[key] = calc_morris_indices(
+                design=design, array_res=array_res,
+                nb_par=len(self.registry), nb_levels=nb_levels)
+
+        return (array_values, dict_res, dict_morris)
+
+    def run_sobol_indices(self, nb_samples, rng=None, seed=None,
+                          callback=None):
+        """
+        Estimate first order and total Sobol indices (Saltelli scheme with
+        nb_samples * (nb_par + 2) evaluations)
+
+        Parameters
+        ----------
+        nb_samples : int
+            Number of base samples
+        rng : np.random.Generator, optional
+            Random Generator (default: None)
+        seed : int, optional
+            Seed (default: None)
+        callback : callable, optional
+            See run (default: None)
+
+        Returns
+        -------
+        tup_res : tuple
+            Tuple (array_values, dict_res, dict_sobol) with
+            array_values : np.array
+                Parameter values (rows of A, B and AB_i matrices)
+            dict_res : dict
+                Results of run
+            dict_sobol : dict
+                Dict holding result names as keys and dicts with keys 'S1'
+                and 'ST' (arrays in order of registry.list_names) as values
+        """
+
+        nb_par = len(self.registry)
+
+        design = gen_saltelli_design(nb_samples=nb_samples, nb_par=nb_par,
+                                     rng=rng, seed=seed)
+
+        array_values = self.registry.transform(design)
+
+        (dict_res, list_failed) = self.run(array_values, callback=callback)
+
+        dict_sobol = {}
+        for (key, array_res) in dict_res.items():
+            dict_sobol[key] = calc_sobol_indices(array_res=array_res,
+                                                 nb_samples=nb_samples,
+                                                 nb_par=nb_par)
+
+        return (array_values, dict_res, dict_sobol)
+
+    def save_cache(self, path):
+        """
+        Save result cache as pickle file
+
+        Parameters
+        ----------
+        path : str
+            Path to pickle file
+        """
+
+        with open(path, mode='wb') as file:
+            pickle.dump(self._dict_cache, file)
+
+    def load_cache(self, path):
+        """
+        Load result cache from pickle file (and add to existing cache)
+
+        Parameters
+        ----------
+        path : str
+            Path to pickle file
+        """
+
+        with open(path, mode='rb') as file:
+            self._dict_cache.update(pickle.load(file))
+
+    def clear_cache(self):
+        """
+        Clear result cache
+        """
+
+        self._dict_cache.clear()
+
+
+def gen_morris_design(nb_traj, nb_par, nb_levels=4, rng=None, seed=None):
+    """
+    Generate Morris trajectories on level grid. Each trajectory holds
+    nb_par + 1 points; consecutive points differ in one parameter by
+    delta = nb_levels / (2 * (nb_levels - 1)).
+
+    Parameters
+    ----------
+    nb_traj : int
+        Number of trajectories
+    nb_par : int
+        Number of parameters
+    nb_levels : int, optional
+        Number of grid levels (default: 4). Has to be even.
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None)
+
+    Returns
+    -------
+    design : np.array
+        2d array (nb_traj * (nb_par + 1) x nb_par) with values on level grid
+        {0, 1 / (nb_levels - 1), ..., 1}
+    """
+
+    if nb_levels % 2 != 0:
+        msg = 'nb_levels has to be even.'
+        raise ValueError(msg)
+
+    rng = sampeng.get_rng(rng=rng, seed=seed)
+
+    delta = nb_levels / (2 * (nb_levels - 1))
+
+    #  Strictly lower triangular matrix (nb_par + 1 x nb_par)
+    array_b = np.tril(np.ones((nb_par + 1, nb_par)), k=-1)
+
+    design = np.zeros((nb_traj, nb_par + 1, nb_par))
+
+    for t in range(nb_traj):
+        #  Random base point (only levels, which allow a step of +delta)
+        x_base = rng.integers(0, nb_levels // 2, size=nb_par) / \
+                 (nb_levels - 1)
+        #  Random step directions and parameter order
+        array_d = rng.choice([-1, 1], size=nb_par)
+        array_perm = rng.permutation(nb_par)
+
+        traj = x_base + delta / 2 * ((2 * array_b - 1) * array_d + 1)
+        design[t] = traj[:, array_perm]
+
+    return design.reshape(-1, nb_par)
+
+
+def morris_to_unit(design, nb_levels=4):
+    """
+    Map Morris level grid to centers of nb_levels equal probability bins, so
+    that unbounded distributions (e.g. normal) get finite values
+
+    Parameters
+    ----------
+    design : np.array
+        Morris design with values in [0, 1]
+    nb_levels : int, optional
+        Number of grid levels (default: 4)
+
+    Returns
+    -------
+    design_unit : np.array
+        Design with values in (0, 1)
+    """
+
+    return (np.asarray(design) * (nb_levels - 1) + 0.5) / nb_levels
+
+
+def calc_morris_indices(design, array_res, nb_par, nb_levels=4):
+    """
+    Calculate Morris elementary effect statistics. Elementary effects are
+    defined on unit design (probability) space. Trajectories with failed
+    evaluations (nan) are skipped per elementary effect.
+
+    Parameters
+    ----------
+    design : np.array
+        Morris design (see gen_morris_design)
+    array_res : np.array
+        Results of design points
+    nb_par : int
+        Number of parameters
+    nb_levels : int, optional
+        Number of grid levels (default: 4)
+
+    Returns
+    -------
+    dict_morris : dict
+        Dict with keys 'mu', 'mu_star' and 'sigma' and arrays (nb_par) as
+        values
+    """
+
+    design = np.asarray(design).reshape(-1, nb_par + 1, nb_par)
+    array_res = np.asarray(array_res, dtype=float).reshape(-1, nb_par + 1)
+
+    #  Step of each trajectory step and index of changed parameter
+    array_step = np.diff(design, axis=1)
+    array_idx = np.argmax(np.abs(array_step), axis=2)
+    array_delta = np.take_along_axis(array_step, array_idx[:, :, None],
+                                     axis=2)[:, :, 0]
+
+    array_ee = np.diff(array_res, axis=1) / array_delta
+
+    array_ee_par = np.zeros((len(design), nb_par))
+    np.put_along_axis(array_ee_par, array_idx, array_ee, axis=1)
+
+    return {'mu': np.nanmean(array_ee_par, axis=0),
+            'mu_star': np.nanmean(np.abs(array_ee_par), axis=0),
+            'sigma': np.nanstd(array_ee_par, axis=0, ddof=1)
+            if len(design) > 1 else np.zeros(nb_par)}
+
+
+def gen_saltelli_design(nb_samples, nb_par, rng=None, seed=None):
+    """
+    Generate Saltelli design for Sobol indices with rows of matrices
+    A, B and AB_1, ..., AB_nb_par (AB_i is A with column i of B)
+
+    Parameters
+    ----------
+    nb_samples : int
+        Number of base samples
+    nb_par : int
+        Number of parameters
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed (default: None)
+
+    Returns
+    -------
+    design : np.array
+        2d array (nb_samples * (nb_par + 2) x nb_par) with values in (0, 1)
+    """
+
+    base = sampeng.sobol_design(nb_samples=nb_samples, nb_par=2 * nb_par,
+                                scramble=True, rng=rng, seed=seed)
+
+    #  Avoid infinite values of unbounded distributions
+    base = np.clip(base, 1e-10, 1 - 1e-10)
+
+    array_a = base[:, :nb_par]
+    array_b = base[:, nb_par:]
+
+    list_mat = [array_a, array_b]
+    for i in range(nb_par):
+        array_ab = array_a.copy()
+        array_ab[:, i] = array_b[:, i]
+        list_mat.append(array_ab)
+
+    return np.vstack(list_mat)
+
+
+def calc_sobol_indices(array_res, nb_samples, nb_par):
+    """
+    Calculate first order (Saltelli 2010) and total (Jansen) Sobol indices
+
+    Parameters
+    ----------
+    array_res : np.array
+        Results of Saltelli design (see gen_saltelli_design)
+    nb_samples : int
+        Number of base samples
+    nb_par : int
+        Number of parameters
+
+    Returns
+    -------
+    dict_sobol : dict
+        Dict with keys 'S1' and 'ST' and arrays (nb_par) as values
+    """
+
+    array_res = np.asarray(array_res, dtype=float).reshape(nb_par + 2,
+                                                           nb_samples)
+
+    res_a = array_res[0]
+    res_b = array_res[1]
+    res_ab = array_res[2:]
+
+    var = np.nanvar(np.concatenate([res_a, res_b]))
+
+    if var == 0:
+        return {'S1': np.zeros(nb_par), 'ST': np.zeros(nb_par)}
+
+    return {'S1': np.nanmean(res_b * (res_ab - res_a), axis=1) / var,
+            'ST': 0.5 * np.nanmean((res_a - res_ab) ** 2, axis=1) / var}
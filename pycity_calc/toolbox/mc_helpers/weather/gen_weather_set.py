@@ -15,6 +15,8 @@ import numpy as np
 import pycity_base.classes.Timer as time
 import pycity_base.classes.Weather as wea
 
+import pycity_calc.toolbox.mc_helpers.weather.weather_ensemble as weaens
+
 
 def calc_lin_ipl_array(ref_array, side_array, factor):
     """
@@ -41,22 +43,86 @@ def calc_lin_ipl_array(ref_array, side_array, factor):
     assert factor >= 0
     assert len(ref_array) == len(side_array), 'Arrays have different length!'
 
-    ipl_array = np.zeros(len(ref_array))
+    ref_array = np.asarray(ref_array, dtype=float)
+    side_array = np.asarray(side_array, dtype=float)
+
+    #  Identical to adding (ref < side) or subtracting (ref > side)
+    #  factor * abs(side - ref) for every value
+    ipl_array = ref_array + factor * (side_array - ref_array)
+
+    return ipl_array
+
+
+def calc_lin_ipl_ensemble(weath_dict, array_factors, path=None,
+                          list_attr=('tAmbient', 'qDirect', 'qDiffuse')):
+    """
+    Calculate weather ensemble with one vectorized linear interpolation of
+    all weather samples (same results as calc_lin_ipl_weath per factor).
+    New weathers are based on regular TRY.
+
+    Parameters
+    ----------
+    weath_dict : dict (of weather objects)
+        Dictionary with weather objects as values. Keys are TRY type names
+        'cold', 'warm', 'regular'
+    array_factors : array-like (of floats)
+        Factors for linear interpolation (between - 1 and 1), one per
+        weather sample
+        0: Use regular TRY
+        1: Use warm TRY
+        -1: Use cold TRY
+        else: interpolate
+    path : str, optional
+        Path to .npy file for memory-mapped ensemble (default: None)
+    list_attr : tuple (of str), optional
+        Interpolated weather attributes
+        (default: ('tAmbient', 'qDirect', 'qDiffuse'))
+
+    Returns
+    -------
+    ensemble : object
+        WeatherEnsemble object (see weather_ensemble.py)
+    """
+
+    array_factors = np.asarray(array_factors, dtype=float)
+
+    assert np.all(array_factors <= 1)
+    assert np.all(array_factors >= -1)
+
+    ensemble = weaens.WeatherEnsemble(
+        base_weather=copy.deepcopy(weath_dict['regular']),
+        nb_weath=len(array_factors), path=path, list_attr=list_attr)
+
+    #  Interpolate between warm and regular (factor > 0) respectively
+    #  regular and cold TRY (factor < 0)
+    array_warm = (array_factors > 0)[:, None]
+    array_abs = np.abs(array_factors)[:, None]
 
-    for i in range(len(ipl_array)):
+    for k in range(len(ensemble.list_attr)):
+        attr = ensemble.list_attr[k]
 
-        if ref_array[i] < side_array[i]:
-            ipl_value = ref_array[i] + factor * \
-                                       abs(side_array[i] - ref_array[i])
-        elif ref_array[i] > side_array[i]:
-            ipl_value = ref_array[i] - factor * \
-                                       abs(side_array[i] - ref_array[i])
+        #  Temperatures are interpolated in Kelvin
+        if attr == 'tAmbient':
+            offset = 273.15
         else:
-            ipl_value = ref_array[i] + 0.0
+            offset = 0
 
-        ipl_array[i] = ipl_value
+        ref_array = getattr(weath_dict['regular'], attr) + offset
+        side_array = np.where(array_warm,
+                              getattr(weath_dict['warm'], attr) + offset,
+                              getattr(weath_dict['cold'], attr) + offset)
 
-    return ipl_array
+        ensemble.array[:, :, k] = \
+            ref_array + array_abs * (side_array - ref_array) - offset
+
+        #  Use original TRY values for factors 0, 1 and -1
+        for (factor, key) in [(0, 'regular'), (1, 'warm'), (-1, 'cold')]:
+            ensemble.array[array_factors == factor, :, k] = \
+                getattr(weath_dict[key], attr)
+
+    ensemble.flush()
+
+    return ensemble
 
 
 def calc_lin_ipl_weath(weath_dict, factor):
@@ -201,17 +267,54 @@ def get_warm_cold_regular_weather(year=2010, timestep=3600, region_nb=5):
     return dict_weather
 
 
-def gen_set_of_weathers(nb_weath, year=2010, timestep=3600, region_nb=5,
-                        random_method='uniform'):
+def gen_weather_factors(nb_weath, random_method='uniform'):
     """
-    Generates and returns list of weather objects for uncertainty analysis.
+    Generates random interpolation factors for weather sampling
+
+    Parameters
+    ----------
+    nb_weath : int
+        Number of requested factors
+    random_method : str, optional)
+        Method to select random number for interpolation (default: 'uniform')
+        Options:
+        'uniform' --> Use uniform distribution between -1 and 1
+        'normal' --> Normal distribution
+
+    Returns
+    -------
+    array_factors : np.array (of floats)
+        Interpolation factors
+    """
+
+    assert random_method in ['uniform', 'normal'], \
+        'Unknown method for random numbers.'
+
+    array_factors = np.zeros(nb_weath)
+
+    for i in range(nb_weath):
+
+        #  Choose random number
+        if random_method == 'uniform':
+            array_factors[i] = random.uniform(-1, 1)
+
+        elif random_method == 'normal':
+            array_factors[i] = np.random.normal(loc=0, scale=0.23)
+
+    return array_factors
+
+
+def gen_weather_ensemble(nb_weath, year=2010, timestep=3600, region_nb=5,
+                         random_method='uniform', path=None):
+    """
+    Generates and returns weather ensemble for uncertainty analysis.
     Outdoor temperatures and radiations are approximated between warm and
     regular respectively regular and cold TRY based on random numbers.
 
     Parameters
     ----------
     nb_weath : int
-        Number of requested weather objects in output list
+        Number of requested weather samples
     year : int, optional
         TRY year (default: 2010).
         Options: 2010 or 2035
@@ -224,35 +327,66 @@ def gen_set_of_weathers(nb_weath, year=2010, timestep=3600, region_nb=5,
         Options:
         'uniform' --> Use uniform distribution between -1 and 1
         'normal' --> Normal distribution
+    path : str, optional
+        Path to .npy file for memory-mapped ensemble (default: None)
 
     Returns
     -------
-    list_weather : list (of weather objects)
-        List holding different weather objects
+    ensemble : object
+        WeatherEnsemble object (see weather_ensemble.py). ensemble[i]
+        returns weather object of sample i.
     """
 
-    assert random_method in ['uniform', 'normal'], \
-        'Unknown method for random numbers.'
-
-    list_weather = []
+    array_factors = gen_weather_factors(nb_weath=nb_weath,
+                                        random_method=random_method)
 
     #  Get dictionary with cold, regular and warm TRY weather objects
     dict_weather = get_warm_cold_regular_weather(year=year, timestep=timestep,
                                                  region_nb=region_nb)
 
-    for i in range(nb_weath):
+    return calc_lin_ipl_ensemble(weath_dict=dict_weather,
+                                 array_factors=array_factors, path=path)
 
-        #  Choose random number
-        if random_method == 'uniform':
-            rand_nb = random.uniform(-1, 1)
 
-        elif random_method == 'normal':
-            rand_nb = np.random.normal(loc=0, scale=0.23)
+def gen_set_of_weathers(nb_weath, year=2010, timestep=3600, region_nb=5,
+                        random_method='uniform'):
+    """
+    Generates and returns list of weather objects for uncertainty analysis.
+    Outdoor temperatures and radiations are approximated between warm and
+    regular respectively regular and cold TRY based on random numbers.
+
+    Weather objects are lightweight views on a single weather ensemble
+    (see gen_weather_ensemble), sharing all attributes except of the
+    (read-only) interpolated outdoor temperatures and radiations.
+
+    Parameters
+    ----------
+    nb_weath : int
+        Number of requested weather objects in output list
+    year : int, optional
+        TRY year (default: 2010).
+        Options: 2010 or 2035
+    timestep : int, optional
+        Time discretization in seconds (default: 3600)
+    region_nb : int, optional
+        Integer defining TRY region number (default: 5)
+    random_method : str, optional)
+        Method to select random number for interpolation (default: 'uniform')
+        Options:
+        'uniform' --> Use uniform distribution between -1 and 1
+        'normal' --> Normal distribution
+
+    Returns
+    -------
+    list_weather : list (of weather objects)
+        List holding different weather objects
+    """
 
-        new_weather = \
-            calc_lin_ipl_weath(weath_dict=dict_weather, factor=rand_nb)
+    ensemble = gen_weather_ensemble(nb_weath=nb_weath, year=year,
+                                    timestep=timestep, region_nb=region_nb,
+                                    random_method=random_method)
 
-        list_weather.append(new_weather)
+    list_weather = list(ensemble)
 
     return list_weather
 
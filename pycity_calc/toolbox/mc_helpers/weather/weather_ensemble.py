@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Weather ensemble for uncertainty analysis.
+
+WeatherEnsemble stores the sampled weather values (by default outdoor
+temperature, direct and diffuse radiation) of all weather samples in a single
+3d array (nb. of samples x nb. of timesteps x nb. of variables). All other
+weather attributes are taken from a single base weather object. If a path is
+given, the array is a memory-mapped .npy file, so that the ensemble can be
+shared by several processes (the operating system shares the file pages).
+
+WeatherEnsemble behaves like the former list of weather objects:
+ensemble[i] returns a lightweight pycity weather object, which is a shallow
+copy of the base weather with read-only views on the ensemble array as
+sampled attributes. Thus, it can directly be used as environment weather
+(e.g. for VDI 6007 simulations).
+
+Pickling a memory-mapped ensemble only stores path and base weather; the
+weather array is re-opened (read-only) on unpickling, e.g. in worker
+processes.
+"""
+from __future__ import division
+
+import copy
+import numpy as np
+
+
+class WeatherEnsemble(object):
+    """
+    Ensemble of weather samples within single (memory-mapped) array
+    """
+
+    def __init__(self, base_weather, nb_weath, path=None, dtype=np.float64,
+                 list_attr=('tAmbient', 'qDirect', 'qDiffuse')):
+        """
+        Constructor of WeatherEnsemble. Allocates weather array with zeros.
+
+        Parameters
+        ----------
+        base_weather : object
+            Pycity weather object. Holds all weather attributes, which are
+            not part of list_attr (shared by all weather samples)
+        nb_weath : int
+            Number of weather samples
+        path : str, optional
+            Path to .npy file (default: None). If set, weather array is
+            memory-mapped to path (existing file is overwritten). If None,
+            weather array is held in memory.
+        dtype : np.dtype, optional
+            Data type of weather values (default: np.float64)
+        list_attr : tuple (of str), optional
+            Sampled weather attributes
+            (default: ('tAmbient', 'qDirect', 'qDiffuse'))
+        """
+
+        self.base_weather = base_weather
+        self.path = path
+        self.list_attr = tuple(list_attr)
+
+        nb_timesteps = len(getattr(base_weather, self.list_attr[0]))
+
+        shape = (int(nb_weath), int(nb_timesteps), len(self.list_attr))
+
+        if path is None:
+            self.array = np.zeros(shape, dtype=dtype)
+        else:
+            self.array = np.lib.format.open_memmap(path, mode='w+',
+                                                   dtype=dtype, shape=shape)
+
+    @classmethod
+    def from_weathers(cls, list_weather, path=None, dtype=np.float64,
+                      list_attr=('tAmbient', 'qDirect', 'qDiffuse')):
+        """
+        Generate WeatherEnsemble out of list of weather objects (e.g. former
+        list_wea). First weather object is used as base weather.
+
+        Parameters
+        ----------
+        list_weather : list (of weather objects)
+            List of pycity weather objects
+        path : str, optional
+            Path to .npy file for memory-mapped ensemble (default: None)
+        dtype : np.dtype, optional
+            Data type of weather values (default: np.float64)
+        list_attr : tuple (of str), optional
+            Sampled weather attributes
+            (default: ('tAmbient', 'qDirect', 'qDiffuse'))
+
+        Returns
+        -------
+        ensemble : object
+            WeatherEnsemble object
+        """
+
+        ensemble = cls(base_weather=copy.deepcopy(list_weather[0]),
+                       nb_weath=len(list_weather), path=path, dtype=dtype,
+                       list_attr=list_attr)
+
+        for i in range(len(list_weather)):
+            for k in range(len(ensemble.list_attr)):
+                ensemble.array[i, :, k] = \
+                    getattr(list_weather[i], ensemble.list_attr[k])
+
+        ensemble.flush()
+
+        return ensemble
+
+    def get_values(self, idx, attr):
+        """
+        Returns view on values of weather attribute of weather sample
+
+        Parameters
+        ----------
+        idx : int
+            Weather sample index
+        attr : str
+            Weather attribute (e.g. 'tAmbient')
+
+        Returns
+        -------
+        values : np.array
+            1d view on ensemble array
+        """
+
+        return self.array[idx, :, self.list_attr.index(attr)]
+
+    def get_weather(self, idx):
+        """
+        Returns lightweight weather object of weather sample idx
+
+        Parameters
+        ----------
+        idx : int
+            Weather sample index
+
+        Returns
+        -------
+        weather : object
+            Shallow copy of base weather with read-only views on ensemble
+            array as sampled weather attributes
+        """
+
+        if idx < -len(self) or idx >= len(self):
+            msg = 'Weather index ' + str(idx) + ' is out of range!'
+            raise IndexError(msg)
+
+        weather = copy.copy(self.base_weather)
+
+        for k in range(len(self.list_attr)):
+            values = self.array[idx, :, k].view()
+            values.flags.writeable = False
+            setattr(weather, self.list_attr[k], values)
+
+        return weather
+
+    def flush(self):
+        """
+        Write changes of memory-mapped ensemble to disk
+        """
+
+        if self.path is not None:
+            self.array.flush()
+
+    def __getitem__(self, idx):
+        return self.get_weather(idx)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.get_weather(i)
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self.path is not None:
+            #  Only store path and base weather of memory-mapped ensemble
+            self.flush()
+            state['array'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.path is not None:
+            self.array = np.load(self.path, mmap_mode='r')
@@ -7,9 +7,10 @@ in pyCity_opt
 from __future__ import division
 
 import copy
-import numpy as np
 import matplotlib.pyplot as plt
 
+import pycity_calc.toolbox.modifiers.profile_transform as proftrans
+
 
 def resc_sh_peak_load(loadcurve, timestep, resc_factor, span=1):
     """
@@ -19,7 +20,8 @@ def resc_sh_peak_load(loadcurve, timestep, resc_factor, span=1):
     Parameters
     ----------
     loadcurve : array
-        Space heating load curve in Watt
+        Space heating load curve in Watt. Can also be 2d array with one
+        curve per row (e.g. curves of multiple apartments)
     timestep : int
         Timestep in seconds
     resc_factor : float
@@ -37,40 +39,10 @@ def resc_sh_peak_load(loadcurve, timestep, resc_factor, span=1):
     assert isinstance(span, int)
     assert span > 0
 
-    #  Get original space heating demand value
-    sp_dem_org = sum(loadcurve) * timestep / (3600 * 1000)
-
-    #  Identify peak load timestep
-    idx_max = np.argmax(loadcurve)
-
-    #  Identify list of peak load period indexes
-    hour = 0
-    while hour * 3600 < idx_max * timestep:
-        hour += 24
-
-    start = hour - span * 24  # Start index; while hour is stop index
-    list_idx = list(range(start, hour))
-
-    #  Copy loadcurve
-    mod_loadcurve = copy.copy(loadcurve)
-
-    #  Rescale each value
-    for idx in list_idx:
-        mod_loadcurve[idx] *= resc_factor
-
-    #  Calculate new energy demand
-    sp_dem_mod = sum(mod_loadcurve) * timestep / (3600 * 1000)
-
-    #  Generate list of all indexes
-    list_all_idx = list(range(0, len(loadcurve)))
-
-    #  Get differences in indexes
-    list_remain_idx = list(set(list_all_idx) - set(list_idx))
-
-    #  Normalize overall array
-    norm_factor = sp_dem_org / sp_dem_mod
-    for idx in list_remain_idx:
-        mod_loadcurve[idx] *= norm_factor
+    mod_loadcurve = proftrans.resc_peak_load_days(profiles=loadcurve,
+                                                  timestep=timestep,
+                                                  resc_factor=resc_factor,
+                                                  span=span)
 
     return mod_loadcurve
 
@@ -98,18 +70,16 @@ def resc_sh_peak_load_build(building, resc_factor, span=1):
 
     timestep = building.environment.timer.timeDiscretization
 
-    #  Loop over apartments in building
-    for app in building.apartments:
-        #  Pointer to space heating load
-        sh_load = app.demandSpaceheating.loadcurve
-
-        #  Rescale space heating load
-        mod_sh = resc_sh_peak_load(loadcurve=sh_load,
-                                   timestep=timestep,
-                                   resc_factor=resc_factor,
-                                   span=span)
+    #  Rescale space heating loads of all apartments at once
+    array_mod_sh = \
+        resc_sh_peak_load(loadcurve=[app.demandSpaceheating.loadcurve
+                                     for app in building.apartments],
+                          timestep=timestep,
+                          resc_factor=resc_factor,
+                          span=span)
 
-        #  Overwrite original value
+    #  Overwrite original values
+    for (app, mod_sh) in zip(building.apartments, array_mod_sh):
         app.demandSpaceheating.loadcurve = mod_sh
 
 
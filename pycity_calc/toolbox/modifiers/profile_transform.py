@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Array based transformations of annual load profiles (e.g. heating cut-off
+on warm days, summer cut-off, peak load day rescaling).
+
+All functions take a single profile (1d array) or multiple profiles of
+equal length at once (2d array with one profile per row, e.g. space heating
+curves of all buildings of a city). Daily operations work on
+(days x steps per day) reshaped views of the profiles.
+
+Sums are evaluated in sequential order (like the built-in sum), so that
+results are identical to step-by-step evaluation of the same profile.
+"""
+from __future__ import division
+
+import numpy as np
+
+
+def as_profile_array(profiles):
+    """
+    Returns profiles as 2d float array (one profile per row)
+
+    Parameters
+    ----------
+    profiles : array-like
+        Single profile (1d) or multiple profiles (2d or list of 1d arrays)
+
+    Returns
+    -------
+    array_profiles : np.array
+        2d float array (nb. of profiles x nb. of timesteps)
+    """
+
+    return np.atleast_2d(np.array(profiles, dtype=float))
+
+
+def _return_shape(array_profiles, profiles):
+    """
+    Returns 1d array, if input profiles have been a single 1d profile
+    """
+
+    if np.ndim(profiles) == 1:
+        return array_profiles[0]
+    return array_profiles
+
+
+def seq_sum(array, axis=-1):
+    """
+    Sum up values in sequential order along axis (same rounding as
+    built-in sum)
+
+    Parameters
+    ----------
+    array : np.array
+        Input array
+    axis : int, optional
+        Axis to sum over (default: -1)
+
+    Returns
+    -------
+    array_sum : np.array
+        Sums along axis
+    """
+
+    if np.shape(array)[axis] == 0:
+        return np.sum(array, axis=axis)
+
+    return np.take(np.cumsum(array, axis=axis), -1, axis=axis)
+
+
+def reshape_days(array_profiles, nb_days=365):
+    """
+    Returns (nb. of profiles x days x steps per day) view on profiles
+
+    Parameters
+    ----------
+    array_profiles : np.array
+        2d array (nb. of profiles x nb. of timesteps)
+    nb_days : int, optional
+        Number of days (default: 365)
+
+    Returns
+    -------
+    array_days : np.array
+        3d array (nb. of profiles x days x steps per day)
+    """
+
+    nb_profiles, nb_steps = array_profiles.shape
+
+    assert nb_steps % nb_days == 0, 'Profile length is not a multiple of ' \
+                                    'nb_days!'
+
+    return array_profiles.reshape(nb_profiles, nb_days,
+                                  nb_steps // nb_days)
+
+
+def calc_daily_means(profiles, nb_days=365):
+    """
+    Calculate daily mean values of profile(s)
+
+    Parameters
+    ----------
+    profiles : array-like
+        Single profile (1d) or multiple profiles (2d)
+    nb_days : int, optional
+        Number of days (default: 365)
+
+    Returns
+    -------
+    array_means : np.array
+        Daily mean values (nb_days or nb. of profiles x nb_days)
+    """
+
+    array_days = reshape_days(as_profile_array(profiles), nb_days=nb_days)
+
+    array_means = seq_sum(array_days, axis=2) / array_days.shape[2]
+
+    return _return_shape(array_means, profiles)
+
+
+def cut_off_warm_days(profiles, temp_array, timestep, temp_av_cut=12):
+    """
+    Set power of profile(s) to zero on days with daily average outdoor
+    temperature equal to or above temp_av_cut and rescale remaining
+    power to original annual energy demand.
+
+    Parameters
+    ----------
+    profiles : array-like
+        Single power profile in W (1d) or multiple profiles (2d)
+    temp_array : array-like
+        Annual outdoor temperature array in degree Celsius (per timestep)
+    timestep : int
+        Timestep in seconds
+    temp_av_cut : float, optional
+        Average daily temperature in degree Celsius, where power is cut off
+        (default: 12)
+
+    Returns
+    -------
+    array_mod : np.array
+        Modified power profile(s) in W
+    """
+
+    array_profiles = as_profile_array(profiles)
+
+    org_energy = seq_sum(array_profiles) * timestep / (3600 * 1000)  # kWh
+
+    #  Days with average temperature below cut-off temperature
+    heat_days = calc_daily_means(temp_array) < temp_av_cut
+
+    array_mod = np.where(np.repeat(heat_days, array_profiles.shape[1] // 365),
+                         array_profiles, 0)
+
+    # Rescale to original energy demand
+    con_factor = org_energy / (seq_sum(array_mod) * timestep / (3600 * 1000))
+    array_mod *= con_factor[:, np.newaxis]
+
+    return _return_shape(array_mod, profiles)
+
+
+def cut_off_period(profiles, idx_start, idx_stop, timestep, resc=0.2):
+    """
+    Set positive power values of profile(s) to zero within index period and
+    rescale remaining power with share resc of cut off energy.
+
+    Parameters
+    ----------
+    profiles : array-like
+        Single power profile in W (1d) or multiple profiles (2d)
+    idx_start : int
+        Start index of cut off period
+    idx_stop : int
+        Stop index of cut off period (not included)
+    timestep : int
+        Timestep in seconds
+    resc : float, optional
+        Defines rescaling factor, related to "cut off" energy
+        (default: 0.2). E.g. 0.2 means, that 20 % of "cut off" energy are
+        used to rescale remaining demand
+
+    Returns
+    -------
+    array_mod : np.array
+        Modified power profile(s) in W
+    """
+
+    array_mod = as_profile_array(profiles)
+
+    period = array_mod[:, idx_start:idx_stop]
+    mask_pos = period > 0
+
+    cut_off_energy = seq_sum(np.where(mask_pos, period, 0)
+                             * timestep / (1000 * 3600))
+    period[mask_pos] = 0
+
+    dem_after = seq_sum(array_mod) * timestep / (1000 * 3600)
+
+    resc_factor = np.ones(len(array_mod))
+    mask_dem = dem_after != 0
+    resc_factor[mask_dem] = (resc * cut_off_energy[mask_dem]
+                             + dem_after[mask_dem]) / dem_after[mask_dem]
+
+    array_mod *= resc_factor[:, np.newaxis]
+
+    return _return_shape(array_mod, profiles)
+
+
+def resc_peak_load_days(profiles, timestep, resc_factor, span=1):
+    """
+    Rescale peak load period (span days before end of peak load day) of
+    profile(s) with resc_factor and normalize all other values to keep
+    original annual energy demand.
+
+    Parameters
+    ----------
+    profiles : array-like
+        Single power profile in W (1d) or multiple profiles (2d)
+    timestep : int
+        Timestep in seconds
+    resc_factor : float
+        Rescaling factor for peak load period
+    span : int, optional
+        Timespan in days, defining peak load period (default: 1)
+
+    Returns
+    -------
+    array_mod : np.array
+        Modified power profile(s) in W
+    """
+
+    array_mod = as_profile_array(profiles)
+    nb_steps = array_mod.shape[1]
+
+    org_energy = seq_sum(array_mod) * timestep / (3600 * 1000)
+
+    #  End of peak load day (in hours; used as index)
+    array_idx_max = np.argmax(array_mod, axis=1)
+    array_stop = 24 * np.ceil(array_idx_max * timestep / (3600 * 24))
+    array_start = array_stop - span * 24
+
+    array_idx = np.arange(nb_steps)[np.newaxis, :]
+    mask_peak = (array_idx >= array_start[:, np.newaxis]) & \
+                (array_idx < array_stop[:, np.newaxis])
+    #  Negative (python) indexes are counted from the end of the profile
+    mask_wrap = array_idx >= nb_steps + array_start[:, np.newaxis]
+
+    array_mod[mask_peak | mask_wrap] *= resc_factor
+
+    mod_energy = seq_sum(array_mod) * timestep / (3600 * 1000)
+
+    #  Normalize all values outside of peak load period
+    norm_factor = org_energy / mod_energy
+    array_mod *= np.where(mask_peak, 1, norm_factor[:, np.newaxis])
+
+    return _return_shape(array_mod, profiles)
@@ -15,6 +15,8 @@ import pycity_base.classes.Prices
 import pycity_base.classes.Environment
 import pycity_base.classes.demand.SpaceHeating as SpaceHeating
 
+import pycity_calc.toolbox.modifiers.profile_transform as proftrans
+
 
 def gen_pycity_environment(timestep=3600):
     """
@@ -68,13 +70,17 @@ def gen_th_slp(environment, living_area=150, spec_dem=100):
 
 def slp_th_manipulator(timestep, th_slp_curve, temp_array, temp_av_cut=12):
     """
+    Sets thermal power to zero on days with average outdoor temperature
+    equal to or larger than temp_av_cut and rescales power curve to
+    original annual energy demand.
 
     Parameters
     ----------
     timestep : int
         Timestep in seconds
     th_slp_curve : array-like
-        Annual thermal SLP power curve in W (per timestep)
+        Annual thermal SLP power curve in W (per timestep). Can also be 2d
+        array with one curve per row (e.g. curves of multiple buildings)
     temp_array : array-like
         Annual outdoor temperature array in °C (per timestep)
     temp_av_cut : float, optional
@@ -86,63 +92,14 @@ def slp_th_manipulator(timestep, th_slp_curve, temp_array, temp_av_cut=12):
         Modified thermal SLP curve in W (per timestep)
     """
 
-    assert len(th_slp_curve) * timestep == 365 * 24 * 3600
+    assert np.shape(th_slp_curve)[-1] * timestep == 365 * 24 * 3600
     assert len(temp_array) * timestep == 365 * 24 * 3600
 
-    timesteps_per_day = len(th_slp_curve)/365
-
-    slp_org_th_energy = sum(th_slp_curve) * timestep / (3600 * 1000)  # kWh
-
-    #  Calculate average, daily temperatures
-    temp_average_array = np.zeros(365)
-    count_timestep = 0
-
-    #  Loop over days
-    for i in range(len(temp_average_array)):
-
-        temp_average = 0
-
-        #  Loop over hours
-        for h in range(int(timesteps_per_day)):
-            #  Sum up values
-            temp_average += temp_array[count_timestep + h]
-
-        # and divide by 24 hours
-        temp_average /= timesteps_per_day
-
-        temp_average_array[i] = temp_average
-
-        #  Count up day counter
-        count_timestep += int(timesteps_per_day)
-
-    slp_mod_curve = np.zeros(len(th_slp_curve))
-
-    count_timestep = 0
-    #  Loop over days (for average temperatures)
-    for i in range(len(temp_average_array)):
-
-        curr_av_temp = temp_average_array[i]
-
-        #  If average temperature is larger or equal to limit temperature
-        if curr_av_temp >= temp_av_cut:  # Set power in timeframe to zero
-
-            #  Loop over hours
-            for h in range(int(timesteps_per_day)):
-                slp_mod_curve[count_timestep + h] = 0  # Set to zero
-
-        else:  # Set slp_mod values to th_slp_curve values
-
-            #  Loop over hours
-            for h in range(int(timesteps_per_day)):
-                slp_mod_curve[count_timestep + h] = th_slp_curve[count_timestep + h]
-
-        # Count up day counter
-        count_timestep += int(timesteps_per_day)
-
-    # Rescale to original energy demand
-    con_factor = slp_org_th_energy / (
-    sum(slp_mod_curve) * timestep / (3600 * 1000))
-    slp_mod_curve *= con_factor
+    slp_mod_curve = \
+        proftrans.cut_off_warm_days(profiles=th_slp_curve,
+                                    temp_array=temp_array,
+                                    timestep=timestep,
+                                    temp_av_cut=temp_av_cut)
 
     return slp_mod_curve
 
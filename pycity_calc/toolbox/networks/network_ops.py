@@ -9,9 +9,12 @@ import math
 import copy
 import pickle
 import warnings
-import matplotlib.pyplot as plt
+import numpy as np
 import shapely.geometry.point as point
 import shapely.geometry.linestring as lstr
+import scipy.sparse as sparse
+import scipy.sparse.csgraph as csgraph
+from scipy.spatial import cKDTree
 
 import networkx as nx
 
@@ -442,7 +445,198 @@ def get_str_linstr_pos(city, pnt, resolution=1e-4, check_street=True):
 
 
 
-def calc_graph_pos_closest_to(graph, target_point, show_process=False):
+class StreetSegmentIndex(object):
+    """
+    Spatial index of street segments (edges between street nodes) of graph.
+    Segments are indexed by their midpoints within KD-tree. Exact point
+    to segment distances are only calculated for candidate segments
+    around the target point. Segments can be split by new nodes (see
+    split_segment) without rebuilding the KD-tree.
+    """
+
+    def __init__(self, graph, check_street=True):
+        """
+        Constructor of street segment index
+
+        Parameters
+        ----------
+        graph : nx.Graph
+            Networkx graph object (should hold nodes with 'position'
+            attributes as shapely Points)
+        check_street : bool, optional
+            Checks, if graph edge is of network_type street (default: True)
+        """
+
+        #  List of original segments (edge tuples)
+        self.list_edges = []
+        #  Dict with node ids as keys and position tuples as values
+        self.dict_pos = {}
+
+        for e1, e2 in graph.edges():  # Loop over all edges in street graph
+            node1 = graph.nodes[e1]
+            node2 = graph.nodes[e2]
+
+            if check_street:
+                # check if both nodes are streets
+                if not (is_street(node1) and is_street(node2)):
+                    continue
+
+            self.list_edges.append((e1, e2))
+            self.dict_pos[e1] = (node1['position'].x, node1['position'].y)
+            self.dict_pos[e2] = (node2['position'].x, node2['position'].y)
+
+        #  Array with segment coordinates (x_start, y_start, x_stop, y_stop)
+        self.coords = np.array([self.dict_pos[e1] + self.dict_pos[e2]
+                                for e1, e2 in self.list_edges],
+                               dtype=float).reshape(-1, 4)
+
+        #  Current sub-segments of original segments (after splits)
+        self.dict_sub = dict((i, [self.list_edges[i]])
+                             for i in range(len(self.list_edges)))
+        #  Sub-segment (sorted node tuple) to original segment index
+        self.dict_sub_to_seg = dict((frozenset(self.list_edges[i]), i)
+                                    for i in range(len(self.list_edges)))
+
+        self.tree = None
+        self.half_len_max = 0
+        if len(self.list_edges) > 0:
+            mid_points = (self.coords[:, 0:2] + self.coords[:, 2:4]) / 2
+            self.tree = cKDTree(mid_points)
+            self.half_len_max = np.max(
+                np.linalg.norm(self.coords[:, 2:4] - self.coords[:, 0:2],
+                               axis=1)) / 2
+
+    def __len__(self):
+        return len(self.list_edges)
+
+    @staticmethod
+    def calc_closest_points(coords, x, y):
+        """
+        Calculate closest points on segments and distances to point (x, y)
+
+        Parameters
+        ----------
+        coords : np.array
+            Array with segment coordinates (x_start, y_start, x_stop, y_stop)
+        x : float
+            x-coordinate of point
+        y : float
+            y-coordinate of point
+
+        Returns
+        -------
+        res_tuple : tuple (of np.arrays)
+            (x_closest, y_closest, distances)
+        """
+        a_x = coords[:, 0]
+        a_y = coords[:, 1]
+        u_x = coords[:, 2] - a_x
+        u_y = coords[:, 3] - a_y
+        u_sq = u_x ** 2 + u_y ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lam = np.where(u_sq > 0,
+                           ((x - a_x) * u_x + (y - a_y) * u_y) / u_sq, 0)
+        lam = np.clip(lam, 0, 1)
+        x_cl = a_x + lam * u_x
+        y_cl = a_y + lam * u_y
+        return (x_cl, y_cl, np.sqrt((x_cl - x) ** 2 + (y_cl - y) ** 2))
+
+    def query(self, target_point):
+        """
+        Returns point on street segments, which is closest to target point,
+        and (sub-)segment, where closest point is placed on.
+
+        Parameters
+        ----------
+        target_point : shapely Point
+            shapely Point object (e.g. Point(10.5, 25.8))
+
+        Returns
+        -------
+        closest_point : shapely Point
+            Point on street segment, which is closest to target point
+        segment : tuple
+            Tuple with start and stop node id of (sub-)segment, where closest
+            point is placed on
+        """
+
+        if len(self.list_edges) == 0:
+            raise AssertionError('Segment list is empty! '
+                                 'Check get_street_linestrings function call!'
+                                 'Did you generate and hand over edges of'
+                                 'network_type street!')
+
+        x = target_point.x
+        y = target_point.y
+
+        #  Upper bound for min. distance: Distance to segment with closest
+        #  midpoint
+        (d_mid, idx_mid) = self.tree.query((x, y))
+        d_upper = self.calc_closest_points(
+            self.coords[idx_mid:idx_mid + 1], x, y)[2][0]
+
+        #  Every segment closer than d_upper has midpoint within
+        #  d_upper + half_len_max
+        list_cand = np.array(sorted(self.tree.query_ball_point(
+            (x, y), d_upper + self.half_len_max + 1e-9)), dtype=int)
+        if len(list_cand) == 0:
+            list_cand = np.array([idx_mid], dtype=int)
+
+        (x_cl, y_cl, dist) = \
+            self.calc_closest_points(self.coords[list_cand], x, y)
+
+        #  argmin returns first segment (in edge order) for equal distances
+        idx = int(np.argmin(dist))
+        seg_idx = int(list_cand[idx])
+        closest_point = point.Point(x_cl[idx], y_cl[idx])
+
+        #  Find sub-segment, where closest point is placed on
+        list_sub = self.dict_sub[seg_idx]
+        if len(list_sub) == 1:
+            segment = list_sub[0]
+        else:
+            sub_coords = np.array([self.dict_pos[e1] + self.dict_pos[e2]
+                                   for e1, e2 in list_sub], dtype=float)
+            sub_dist = self.calc_closest_points(sub_coords, x_cl[idx],
+                                                y_cl[idx])[2]
+            segment = list_sub[int(np.argmin(sub_dist))]
+
+        return closest_point, segment
+
+    def get_position(self, node_id):
+        """
+        Returns position of segment node as shapely Point
+        """
+        return point.Point(self.dict_pos[node_id])
+
+    def split_segment(self, segment, node_id, position):
+        """
+        Split (sub-)segment with new node on segment.
+
+        Parameters
+        ----------
+        segment : tuple
+            Tuple with start and stop node id of (sub-)segment
+        node_id : int
+            Id of new node
+        position : shapely Point
+            Position of new node (should be placed on segment)
+        """
+
+        seg_idx = self.dict_sub_to_seg.pop(frozenset(segment))
+
+        self.dict_pos[node_id] = (position.x, position.y)
+
+        list_sub = self.dict_sub[seg_idx]
+        pos = list_sub.index(segment)
+        list_sub[pos:pos + 1] = [(segment[0], node_id), (node_id, segment[1])]
+
+        for sub in [(segment[0], node_id), (node_id, segment[1])]:
+            self.dict_sub_to_seg[frozenset(sub)] = seg_idx
+
+
+def calc_graph_pos_closest_to(graph, target_point, show_process=False,
+                              seg_index=None):
     """
     Calculates point on graph, which is closest to target point.
     Point can be on a graph node or edge.
@@ -457,6 +651,10 @@ def calc_graph_pos_closest_to(graph, target_point, show_process=False):
         shapely Point object (e.g. Point(10.5, 25.8))
     show_process : bool, optional
         Defines if steps of ongoing process should be plotted (default: False)
+    seg_index : object, optional
+        StreetSegmentIndex object of graph (default: None). If None,
+        generates new index of street segments of graph. Should be handed
+        over for multiple calls on the same graph.
 
     Returns
     -------
@@ -475,34 +673,17 @@ def calc_graph_pos_closest_to(graph, target_point, show_process=False):
         print('Start calculation of closest point position of graph to ' +
               'given target point: ', target_point)
 
-    #  Get list of street network linestrings
-    list_seg = get_street_linestrings(graph)
-
-    if len(list_seg) == 0:
-        raise AssertionError('Segment list is empty! '
-                             'Check get_street_linestrings function call!'
-                             'Did you generate and hand over edges of'
-                             'network_type street!')
+    if seg_index is None:
+        #  Generate index of street network segments
+        seg_index = StreetSegmentIndex(graph)
 
     # Calculate shapely geometry point, which is closest to target_point
     #  position. Returns point as well as segment, where point is placed on
-    closest_point = \
-        intersec.calc_closest_point_w_list_linestr(target_point, list_seg)
-
-    #  Get coordinates of start and stop points of street segment
-    tup_pos = get_str_linstr_pos(graph, pnt=closest_point, check_street=True)
-
-    # #  Get coordinates of start and stop points of street segment
-    # tup_pos = intersec.get_lstr_points_list(closest_point, list_seg)
+    (closest_point, segment) = seg_index.query(target_point)
 
-    if tup_pos is None:
-        msg = 'Have not found linestring, where point is placed on.'
-        raise AssertionError(msg)
-
-    else:
-        #  Generate point objects
-        segment_start_point = point.Point(tup_pos[0])
-        segment_stop_point = point.Point(tup_pos[1])
+    #  Generate point objects
+    segment_start_point = seg_index.get_position(segment[0])
+    segment_stop_point = seg_index.get_position(segment[1])
 
     if show_process:
         print('Closest point position is:', closest_point)
@@ -943,6 +1124,90 @@ def get_min_span_tree_for_x_y_positions(city, nodelist):
     return min_span_tree
 
 
+def get_edges_of_network_type(graph, network_type):
+    """
+    Returns list of edges of specific network_type(s). Uses edge index of
+    city object, if available. Otherwise, all graph edges are searched.
+
+    Parameters
+    ----------
+    graph : object
+        Networkx graph or city object of pyCity_calc
+    network_type : str or list (of str)
+        Network type(s), e.g. 'heating' or ['heating', 'heating_and_deg']
+
+    Returns
+    -------
+    list_edges : list (of tuples)
+        List of edge tuples (u, v)
+    """
+
+    if isinstance(network_type, str):
+        network_type = [network_type]
+
+    if isinstance(graph, cit.City):
+        return graph.get_edges_of_network_type(network_type=network_type)
+
+    return [(u, v) for u, v, net_type in graph.edges(data='network_type')
+            if net_type in network_type]
+
+
+def get_network_components(graph, network_type, search_node=None):
+    """
+    Returns connected components of subgraph, which only consists of edges
+    of specific network_type(s). Runtime is proportional to number of
+    network edges (not to number of city nodes).
+
+    Parameters
+    ----------
+    graph : object
+        Networkx graph or city object of pyCity_calc
+    network_type : str or list (of str)
+        Network type(s), e.g. 'heating' or ['heating', 'heating_and_deg']
+    search_node : int, optional
+        Id of node, which should be used for search (default: None)
+        If search_node is None, all components are returned.
+
+    Returns
+    -------
+    list_comp : list (of lists)
+        List holding lists of node ids of connected components. If
+        search_node is set, list holds single component of search_node
+        (or is empty, if search_node is not connected to network edges).
+    """
+
+    #  Adjacency dict of network subgraph
+    dict_adj = {}
+    for u, v in get_edges_of_network_type(graph, network_type=network_type):
+        dict_adj.setdefault(u, []).append(v)
+        dict_adj.setdefault(v, []).append(u)
+
+    if search_node is not None:
+        list_start = [search_node] if search_node in dict_adj else []
+    else:
+        list_start = list(dict_adj.keys())
+
+    list_comp = []
+    set_processed = set()
+
+    for start in list_start:
+        if start in set_processed:
+            continue
+        #  Breadth-first search on network subgraph
+        set_processed.add(start)
+        comp = [start]
+        i = 0
+        while i < len(comp):
+            for nb in dict_adj[comp[i]]:
+                if nb not in set_processed:
+                    set_processed.add(nb)
+                    comp.append(nb)
+            i += 1
+        list_comp.append(comp)
+
+    return list_comp
+
+
 def process_neighbors(city, node, etype, list_conn_nodes, list_curr_nodes,
                       processed_nodes):
     """
@@ -1052,71 +1317,39 @@ def get_list_with_energy_net_con_node_ids(city, network_type='heating',
 
     assert network_type in ['heating', 'electricity']
 
-    list_conn_nodes = []
-    list_curr_nodes = []
-    processed_nodes = []
-
-    if search_node is None:
-        # Loop over all nodes of graph
-        for node in city.nodes():
-            # Execute function process_neighbors
-            list_curr_nodes = \
-                process_neighbors(city=city, node=node, etype=network_type,
-                                  list_conn_nodes=list_conn_nodes,
-                                  list_curr_nodes=list_curr_nodes,
-                                  processed_nodes=processed_nodes)
-
-            # If current list is not empty, add list to list_lhn_conn_nodes
-            if list_curr_nodes:
-                list_conn_nodes.append(list_curr_nodes)
-            list_curr_nodes = []
-
-        if build_node_only:
-            #  Erase all nodes within list, if they are not of node_type
-            #  'building'
-
-            list_nodes_clean = []
-
-            for sublist in list_conn_nodes:
-
-                sublist_clean = []
-
-                for n in sublist:
-                    if 'node_type' in city.nodes[n]:
-                        if city.nodes[n]['node_type'] == 'building':
-                            sublist_clean.append(n)
-                if sublist_clean != []:
-                    list_nodes_clean.append(sublist_clean)
-
-            #  Overwrite list_conn_nodes with cleaned up list
-            #  Building nodes, only
-            list_conn_nodes = list_nodes_clean
-
-    else:  # Use search node (only get network connected to search node)
+    if network_type == 'heating':
+        list_network_type = ['heating', 'heating_and_deg']
+    else:
+        list_network_type = ['electricity', 'heating_and_deg']
 
+    if search_node is not None:
         assert search_node in city.nodes(), 'Search node is not within city!'
 
-        # Execute function process_neighbors
-        list_conn_nodes = \
-            process_neighbors(city=city, node=search_node, etype=network_type,
-                              list_conn_nodes=list_conn_nodes,
-                              list_curr_nodes=list_curr_nodes,
-                              processed_nodes=processed_nodes)
-
-        if build_node_only:
-            #  Erase all nodes within list, if they are not of node_type
-            #  'building'
-
-            list_nodes_clean = []
-
-            for n in list_conn_nodes:
-                if 'node_type' in city.nodes[n]:
-                    if city.nodes[n]['node_type'] == 'building':
-                        list_nodes_clean.append(n)
-
-            #  Overwrite list_conn_nodes with cleaned up list
-            #  Building nodes, only
-            list_conn_nodes = list_nodes_clean
+    list_conn_nodes = get_network_components(city,
+                                             network_type=list_network_type,
+                                             search_node=search_node)
+
+    if build_node_only:
+        #  Erase all nodes within list, if they are not of node_type
+        #  'building'
+        list_nodes_clean = []
+
+        for sublist in list_conn_nodes:
+            sublist_clean = [n for n in sublist
+                             if city.nodes[n].get('node_type') == 'building']
+            if sublist_clean != []:
+                list_nodes_clean.append(sublist_clean)
+
+        #  Overwrite list_conn_nodes with cleaned up list
+        #  Building nodes, only
+        list_conn_nodes = list_nodes_clean
+
+    if search_node is not None:
+        #  Return flat list of nodes, connected to search_node
+        if list_conn_nodes:
+            list_conn_nodes = list_conn_nodes[0]
+        else:
+            list_conn_nodes = []
 
     return list_conn_nodes
 
@@ -1142,35 +1375,19 @@ def get_list_build_without_energy_network(city):
     #  Get list of all building entities
     list_b_entities = city.get_list_build_entity_node_ids()
 
+    #  Nodes connected to LHN or DEG
+    set_net_nodes = set()
+    for u, v in get_edges_of_network_type(city,
+                                          network_type=['heating',
+                                                        'heating_and_deg',
+                                                        'electricity']):
+        set_net_nodes.add(u)
+        set_net_nodes.add(v)
+
     #  Identify all single buildings (in city, but not LHN or DEG
     #  connected
-    list_single_build = []
-
-    for n in list_b_entities:
-        #  Add all buildings without graph neighbours
-        if len(list(city.neighbors(n))) == 0:
-            list_single_build.append(n)
-        # If buildings are connected to graph, check network_type
-        else:
-            valid_net = True
-            for k in city.neighbors(n):
-                if 'network_type' in city.edges[k, n]:
-                    net_type = city.edges[k, n]['network_type']
-                    if (net_type == 'heating' or
-                                net_type == 'heating_and_deg' or
-                                net_type == 'electricity'):
-                        valid_net = False
-                        break
-                if 'network_type' in city.edges[n, k]:
-                    net_type = city.edges[n, k]['network_type']
-                    if (net_type == 'heating' or
-                                net_type == 'heating_and_deg' or
-                                net_type == 'electricity'):
-                        valid_net = False
-                        break
-
-            if valid_net:
-                list_single_build.append(n)
+    list_single_build = [n for n in list_b_entities
+                         if n not in set_net_nodes]
 
     return list_single_build
 
@@ -1192,9 +1409,10 @@ def remove_str_nodes_degree_one(city, nodelist):
 
     #  Identify all nodes of degree 1, which are not in nodelist
     #  These should be street nodes with only single edge --> Remove them
+    set_nodes = set(nodelist)
     list_remove = []
     for n in city.nodes():
-        if n not in nodelist:
+        if n not in set_nodes:
             if nx.degree(city, nbunch=n) == 1:
                 list_remove.append(n)
     # Erase nodes
@@ -1202,12 +1420,98 @@ def remove_str_nodes_degree_one(city, nodelist):
         city.remove_node(n)
 
 
+def prune_str_nodes_degree_one(graph, nodelist):
+    """
+    Iteratively remove all nodes of degree 1, which are not part of nodelist,
+    until no such node exists anymore (e.g. street branches of minimum
+    spanning tree, which do not lead to a building of nodelist).
+    Nodes, which become isolated by removal, are removed, too.
+
+    Parameters
+    ----------
+    graph : nx.Graph
+        Networkx graph object
+    nodelist : list (of ints)
+        List of node ids, which should not be removed
+    """
+
+    set_nodes = set(nodelist)
+
+    list_check = [n for n in graph.nodes()
+                  if n not in set_nodes and graph.degree(n) == 1]
+
+    while len(list_check) > 0:
+        n = list_check.pop()
+        if n not in graph or graph.degree(n) > 1:
+            continue
+        list_neighbors = list(graph.neighbors(n))
+        graph.remove_node(n)
+        for m in list_neighbors:
+            if m not in set_nodes and graph.degree(m) <= 1:
+                list_check.append(m)
+
+
+def calc_min_span_tree_compact(graph, weight='weight'):
+    """
+    Calculates minimum spanning tree (or forest) of graph on compact,
+    integer-indexed sparse matrix representation (with scipy.sparse.csgraph).
+    Returns graph of same class with all nodes (and node attributes) of graph
+    and minimum spanning tree edges (with edge attributes).
+
+    Parameters
+    ----------
+    graph : nx.Graph
+        Networkx graph object with weighted edges
+    weight : str, optional
+        Name of edge weight attribute (default: 'weight')
+
+    Returns
+    -------
+    min_span_graph : nx.Graph
+        Minimum spanning tree graph
+    """
+
+    list_nodes = list(graph.nodes())
+    dict_idx = dict((list_nodes[i], i) for i in range(len(list_nodes)))
+
+    list_edges = list(graph.edges(data=True))
+
+    row = np.array([dict_idx[u] for (u, v, d) in list_edges], dtype=int)
+    col = np.array([dict_idx[v] for (u, v, d) in list_edges], dtype=int)
+    #  csgraph interprets zero entries as missing edges. Thus, zero weights
+    #  are replaced by very small value
+    data = np.array([d.get(weight, 1) for (u, v, d) in list_edges],
+                    dtype=float)
+    data[data <= 0] = 1e-12
+
+    mat = sparse.coo_matrix((data, (row, col)),
+                            shape=(len(list_nodes), len(list_nodes))).tocsr()
+
+    mst = csgraph.minimum_spanning_tree(mat).tocoo()
+
+    min_span_graph = graph.__class__()  # Same graph class as graph
+    min_span_graph.graph.update(graph.graph)
+    min_span_graph.add_nodes_from(graph.nodes.items())
+
+    for (i, j) in zip(mst.row, mst.col):
+        u = list_nodes[i]
+        v = list_nodes[j]
+        min_span_graph.add_edge(u, v, **graph.edges[u, v])
+
+    return min_span_graph
+
+
 def gen_min_span_tree_along_street(city, nodelist, plot_graphs=False):
     """
     Generates minimum spanning tree of specific network type along street n
     etwork within city object. Requires street network.
     Connects all building node ids within nodelist.
 
+    Buildings are projected on street network with spatial index of street
+    segments (StreetSegmentIndex), which is updated, when street segments
+    are split. Minimum spanning tree is calculated on compact sparse graph
+    (calc_min_span_tree_compact).
+
     Parameters
     ----------
     city : object
@@ -1227,6 +1531,8 @@ def gen_min_span_tree_along_street(city, nodelist, plot_graphs=False):
             List with new node ids (within min. spann tree, compared to city)
     """
 
+    import matplotlib.pyplot as plt
+
     for n in nodelist:
         assert n in city.nodes()
 
@@ -1255,22 +1561,28 @@ def gen_min_span_tree_along_street(city, nodelist, plot_graphs=False):
     while id_new in city.nodes():
         id_new += 1
 
+    #  Spatial index of street segments (reused for all buildings)
+    seg_index = StreetSegmentIndex(graph_temp)
+
     #  Loop over all building nodes and add intersect points and new segments
     for n in nodelist:
 
         #  Get current point position
         curr_pos = graph_temp.nodes[n]['position']
 
-        #  Extract closest point as well as start and stop points of closest
-        #  segment
-        closest_point_pos, segment_start_position, segment_stop_position = \
-            calc_graph_pos_closest_to(graph=graph_temp, target_point=curr_pos)
+        #  Extract closest point as well as segment, where point is placed on
+        (closest_point_pos, (id_start, id_stop)) = seg_index.query(curr_pos)
 
-        #  If node on position already exists and if it is building node
-        if check_node_on_pos(graph_temp, closest_point_pos):
+        #  Check if closest point is placed on existing segment node
+        id_exist = None
+        for id_seg in (id_start, id_stop):
+            if seg_index.get_position(id_seg).distance(closest_point_pos) \
+                    < 1e-4:
+                id_exist = id_seg
+                break
 
-            #  Get id of existing node
-            id_exist = get_node_id_by_position(graph_temp, closest_point_pos)
+        #  If node on position already exists
+        if id_exist is not None:
 
             #  Connect node n to existing node with network edge
             graph_temp.add_edge(n, id_exist)
@@ -1284,19 +1596,16 @@ def gen_min_span_tree_along_street(city, nodelist, plot_graphs=False):
             graph_temp.add_edge(n, id_new)
 
             #  Connect new node with street segment start and stop points
-            id_start = get_node_id_by_position(graph_temp,
-                                               position=segment_start_position)
-            #  Add network edge
             graph_temp.add_edge(id_start, id_new)
-
-            id_stop = get_node_id_by_position(graph_temp,
-                                              position=segment_stop_position)
-            #  Add network edge
             graph_temp.add_edge(id_stop, id_new)
 
             #  Remove redundant edge, on which new node has been placed
             graph_temp.remove_edge(id_start, id_stop)
 
+            #  Update street segment index
+            seg_index.split_segment((id_start, id_stop), id_new,
+                                    closest_point_pos)
+
             id_new += 1
 
         if plot_graphs:
@@ -1313,31 +1622,15 @@ def gen_min_span_tree_along_street(city, nodelist, plot_graphs=False):
         plt.title('Mod. city (with build-str interconnections)')
         plt.show()
 
-    # Identify all nodes of degree 1, which are not in nodelist
-    remove_str_nodes_degree_one(graph_temp, nodelist)
-
     # Add weight to edges
     add_weights_to_edges(graph_temp)
 
     #  Generate minimum spanning tree
-    min_span_graph = nx.minimum_spanning_tree(graph_temp, weight='weight')
+    min_span_graph = calc_min_span_tree_compact(graph_temp, weight='weight')
 
     #  Identify all nodes of degree 1, which are not in nodelist
     #  These should be street nodes with only single edge --> Remove them
-    to_remove = True
-
-    while to_remove:
-
-        #  Remove street nodes of degree 1
-        remove_str_nodes_degree_one(min_span_graph, nodelist)
-
-        for n in min_span_graph.nodes():
-            if n not in nodelist:
-                if nx.degree(min_span_graph, nbunch=n) == 1:
-                    to_remove = True
-                    break
-                else:
-                    to_remove = False
+    prune_str_nodes_degree_one(min_span_graph, nodelist)
 
     if plot_graphs:
         pos = gen_pos_tuple_dict(min_span_graph)
@@ -1364,14 +1657,7 @@ def search_lhn(city):
         Defines, if LHN system exists in city
     """
 
-    has_lhn = False
-
-    for edge in city.edges(data=True):
-        if 'network_type' in edge[2]:
-            if (edge[2]['network_type'] == 'heating' or
-                        edge[2]['network_type'] == 'heating_and_deg'):
-                has_lhn = True
-                break
+    has_lhn = len(search_lhn_all_edges(city=city)) > 0
 
     return has_lhn
 
@@ -1392,19 +1678,17 @@ def search_lhn_all_edges(city):
         Returns list of LHN tuples (holding start and stop node ids)
     """
 
-    list_lhn_edges = []
-
-    for edge in city.edges(data=True):
-        if 'network_type' in edge[2]:
-            if (edge[2]['network_type'] == 'heating' or
-                        edge[2]['network_type'] == 'heating_and_deg'):
-                list_lhn_edges.append((edge[0], edge[1]))
+    list_lhn_edges = \
+        get_edges_of_network_type(city,
+                                  network_type=['heating', 'heating_and_deg'])
 
     return list_lhn_edges
 
 
 if __name__ == '__main__':
 
+    import matplotlib.pyplot as plt
+
     def plot_city(city):
         """
         Plot city function. Prevents import error (mutual top-level import
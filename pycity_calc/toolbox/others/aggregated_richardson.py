@@ -15,7 +15,6 @@ from scipy.interpolate import interp1d
 import ebc_ues_plot.line_plots as uesline
 
 import pycity_base.classes.demand.ElectricalDemand as elec
-import pycity_base.classes.demand.Occupancy as occ
 import pycity_base.classes.Weather as weath
 import pycity_base.functions.changeResolution as chres
 
@@ -24,6 +23,7 @@ import pycity_calc.environments.environment as env
 import pycity_calc.environments.market as mark
 import pycity_calc.environments.timer as time
 import pycity_calc.toolbox.mc_helpers.user.user_unc_sampling as usunc
+import pycity_calc.toolbox.user.user_profile_batch as upbatch
 
 def gen_aggr_rich_profiles():
     """
@@ -71,33 +71,21 @@ def gen_aggr_rich_profiles():
     #  Sample list of occupants
     list_occ = usunc.calc_sampling_occ_per_app(nb_samples=nb_loops)
 
-    stoch_load = np.zeros(len(time_array))
-
-    for i in range(nb_loops):
-
-        print('Counter: ', i+1)
-
-        # nb_occ = random.randint(1, 5)
-        nb_occ = list_occ[i]
-
-        print('Nb. of occupants:', str(nb_occ))
-        print()
-
-        # light_conf_nb = random.randint(0, 9)
-
-        occupancy = occ.Occupancy(environment=environment, number_occupants=nb_occ)
-
-        el_stoch_obj = elec.ElectricalDemand(environment,
-                                                 method=2,
-                                                 annualDemand=3000,
-                                                 total_nb_occupants=nb_occ,
-                                                 randomizeAppliances=True,
-                                                 lightConfiguration=1,
-                                                 occupancy=occupancy.occupancy,
-                                                 do_normalization=False,
-                                                 prev_heat_dev=True)
-
-        stoch_load += el_stoch_obj.loadcurve[:]
+    #  Generate and sum up stochastic el. load profiles of all apartments
+    #  at once
+    dict_profiles = \
+        upbatch.gen_apartment_profiles(environment=environment,
+                                       array_nb_occ=list_occ,
+                                       dhw_profiles=False,
+                                       annual_el_demands=3000,
+                                       randomize_appliances=True,
+                                       light_config=1,
+                                       do_normalization=False,
+                                       prev_heat_dev=True,
+                                       group_ids=np.zeros(nb_loops,
+                                                          dtype=int))
+
+    stoch_load = dict_profiles['el'][0]
 
     idx_start = int(3600 * 24 * 1 / timestep)
     idx_stop = int(idx_start + 3600 * 24 / timestep)
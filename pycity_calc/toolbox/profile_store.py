@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Multi-resolution profile store.
+
+A ProfileStore holds profiles (e.g. outdoor temperature, occupancy or el.
+load) at their base resolution and generates views at other resolutions on
+demand. Each view is resampled once and cached until the base profile
+changes. Profile stores can be attached to environment and building objects
+(see get_profile_store), e.g. to resample weather data once per timestep
+for all buildings and Monte-Carlo runs.
+
+Resampling methods:
+- 'mean': Interpolation / mean values (changeResolution of pycity_base,
+  e.g. for temperature or power)
+- 'sum': Sum preserving resampling (changeResolution of pycity_base, e.g.
+  for energy)
+- 'hold': Values are held constant within their timesteps (upsampling) or
+  averaged per new timestep (downsampling). Falls back to 'mean', if
+  timesteps are not integer multiples of each other.
+"""
+from __future__ import division
+
+import numpy as np
+
+import pycity_base.functions.changeResolution as chres
+
+
+def resample_profile(values, timestep_old, timestep_new, method='mean'):
+    """
+    Returns profile with new timestep
+
+    Parameters
+    ----------
+    values : array (of floats)
+        Profile values
+    timestep_old : float
+        Timestep of values in seconds
+    timestep_new : float
+        New timestep in seconds
+    method : str, optional
+        Resampling method (default: 'mean').
+        Options: 'mean', 'sum', 'hold' (see module docstring)
+
+    Returns
+    -------
+    values_new : array (of floats)
+        Resampled profile
+    """
+
+    if method not in ['mean', 'sum', 'hold']:
+        msg = 'Unknown resampling method ' + str(method) + '. Options are ' \
+              'mean, sum and hold.'
+        raise ValueError(msg)
+
+    values = np.asarray(values, dtype=float)
+
+    if timestep_old == timestep_new:
+        return values
+
+    if method == 'hold':
+        if timestep_old > timestep_new and timestep_old % timestep_new == 0:
+            return np.repeat(values, int(timestep_old // timestep_new))
+        elif (timestep_new > timestep_old
+              and timestep_new % timestep_old == 0
+              and len(values) % int(timestep_new // timestep_old) == 0):
+            return values.reshape(
+                -1, int(timestep_new // timestep_old)).mean(axis=1)
+        method = 'mean'
+
+    return chres.changeResolution(values, oldResolution=timestep_old,
+                                  newResolution=timestep_new, method=method)
+
+
+class ProfileStore(object):
+    """
+    Store for profiles at base resolution with cached, resampled views
+    """
+
+    def __init__(self):
+        """
+        Constructor of ProfileStore
+        """
+
+        #  Holding profile name as key and tuple (values, timestep) as value
+        self._dict_base = {}
+
+        #  Holding tuple (name, timestep, method) as key and resampled
+        #  values as value
+        self._dict_views = {}
+
+    def add_profile(self, name, values, timestep):
+        """
+        Add (or replace) profile with base resolution. Cached views of
+        profile are only discarded, if values or timestep have changed.
+
+        Parameters
+        ----------
+        name : str
+            Name of profile (e.g. 'tAmbient')
+        values : array (of floats)
+            Profile values
+        timestep : float
+            Timestep of values in seconds
+        """
+
+        if name in self._dict_base:
+            (values_old, timestep_old) = self._dict_base[name]
+            if timestep_old == timestep and \
+                    np.array_equal(values_old, values):
+                return
+
+            self.remove_profile(name)
+
+        #  Store copy to be independent of changes of input array
+        self._dict_base[name] = (np.array(values, dtype=float), timestep)
+
+    def has_profile(self, name):
+        """
+        Returns True, if store holds profile with name
+
+        Parameters
+        ----------
+        name : str
+            Name of profile
+
+        Returns
+        -------
+        has_profile : bool
+            True, if profile exists
+        """
+
+        return name in self._dict_base
+
+    def get_base_timestep(self, name):
+        """
+        Returns base timestep of profile in seconds
+
+        Parameters
+        ----------
+        name : str
+            Name of profile
+
+        Returns
+        -------
+        timestep : float
+            Base timestep of profile in seconds
+        """
+
+        return self._dict_base[name][1]
+
+    def get_profile(self, name, timestep=None, method='mean', copy=True):
+        """
+        Returns profile with timestep. Resampled views are generated once
+        per timestep and method and cached.
+
+        Parameters
+        ----------
+        name : str
+            Name of profile
+        timestep : float, optional
+            Timestep in seconds (default: None). If None, returns profile
+            with base timestep.
+        method : str, optional
+            Resampling method (default: 'mean').
+            Options: 'mean', 'sum', 'hold' (see resample_profile)
+        copy : bool, optional
+            Defines, if copy of cached profile should be returned
+            (default: True). If False, returns read-only array.
+
+        Returns
+        -------
+        values : array (of floats)
+            Profile with timestep
+        """
+
+        if name not in self._dict_base:
+            msg = 'Profile store does not hold profile ' + str(name)
+            raise KeyError(msg)
+
+        (values, timestep_base) = self._dict_base[name]
+
+        if timestep is not None and timestep != timestep_base:
+            key = (name, timestep, method)
+
+            if key not in self._dict_views:
+                view = resample_profile(values, timestep_old=timestep_base,
+                                        timestep_new=timestep, method=method)
+                view.flags.writeable = False
+                self._dict_views[key] = view
+
+            values = self._dict_views[key]
+
+        if copy:
+            return np.array(values)
+
+        values = values.view()
+        values.flags.writeable = False
+        return values
+
+    def remove_profile(self, name):
+        """
+        Remove profile and its cached views
+
+        Parameters
+        ----------
+        name : str
+            Name of profile
+        """
+
+        self._dict_base.pop(name, None)
+
+        for key in list(self._dict_views.keys()):
+            if key[0] == name:
+                del self._dict_views[key]
+
+    def clear(self):
+        """
+        Remove all profiles and cached views
+        """
+
+        self._dict_base.clear()
+        self._dict_views.clear()
+
+
+def get_profile_store(obj):
+    """
+    Returns profile store of object (e.g. environment or building). Profile
+    store is generated and added as attribute profile_store, if not existent.
+
+    Parameters
+    ----------
+    obj : object
+        Object (e.g. environment or building object)
+
+    Returns
+    -------
+    profile_store : object
+        ProfileStore object of obj
+    """
+
+    if getattr(obj, 'profile_store', None) is None:
+        obj.profile_store = ProfileStore()
+
+    return obj.profile_store
+
+
+def get_weather_profile(environment, name, timestep=None, method='mean'):
+    """
+    Returns weather profile of environment with timestep. Resampled profiles
+    are cached within profile store of environment (as long as weather data
+    is not changed).
+
+    Parameters
+    ----------
+    environment : object
+        Environment object
+    name : str
+        Attribute name of weather profile (e.g. 'tAmbient', 'qDirect',
+        'qDiffuse')
+    timestep : float, optional
+        Timestep in seconds (default: None). If None, returns profile with
+        timestep of environment.
+    method : str, optional
+        Resampling method (default: 'mean').
+        Options: 'mean', 'sum', 'hold' (see resample_profile)
+
+    Returns
+    -------
+    values : array (of floats)
+        Weather profile with timestep
+    """
+
+    values = getattr(environment.weather, name)
+
+    store = get_profile_store(environment)
+    store.add_profile(name='weather.' + name, values=values,
+                      timestep=365 * 24 * 3600 / len(values))
+
+    return store.get_profile(name='weather.' + name, timestep=timestep,
+                             method=method)
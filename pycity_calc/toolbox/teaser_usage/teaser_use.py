@@ -1,6 +1,10 @@
 # coding=utf-8
 """
 Functions for usage of TEASER typebuildings with pycity_calc
+
+TEASER (and its VDI 6007 core) is imported on first usage. Thus, modules,
+which import teaser_use, can be imported without TEASER installation and
+without TEASER import time.
 """
 
 import os
@@ -22,29 +26,81 @@ import pycity_calc.environments.market as mark
 import pycity_calc.environments.timer as time
 
 import pycity_calc.toolbox.user.user_air_exchange as usair
+import pycity_calc.toolbox.profile_store as profsto
+import pycity_calc.toolbox.mc_helpers.sampling_engine as sampeng
+
+#  TEASER modules (set by load_teaser on first usage)
+Project = None
+low_order_vdi = None
+vdiweather = None
+equ_air = None
+
+#  Cache for TEASER data, which is shared by all projects
+_dict_teaser_data = {}
+
+
+def load_teaser(vdi_core=False):
+    """
+    Import TEASER modules, if they have not been imported, yet.
+
+    Parameters
+    ----------
+    vdi_core : bool, optional
+        Defines, if TEASER VDI 6007 core modules should be imported, too
+        (default: False)
+    """
+
+    global Project, low_order_vdi, vdiweather, equ_air
+
+    if Project is None:
+        try:
+            from teaser.project import Project
+        except:
+            raise ImportError('Could not import TEASER package. Please check '
+                              'your installation. TEASER can be found at: '
+                              'https://github.com/RWTH-EBC/TEASER. '
+                              'Installation is possible via pip. '
+                              'Alternatively, you might have run into '
+                              'trouble with XML bindings in TEASER. This can '
+                              'happen if you try to re-import TEASER within '
+                              'an active Python console. Please close the '
+                              'active Python console and open another one. '
+                              'Then try again.')
+
+    if vdi_core and low_order_vdi is None:
+        try:
+            import teaser.logic.simulation.VDI_6007.low_order_VDI \
+                as low_order_vdi
+            import teaser.logic.simulation.VDI_6007.weather as vdiweather
+            import teaser.logic.simulation.VDI_6007.equal_air_temperature \
+                as equ_air
+        except:
+            msg = 'Could not import TEASER VDI 6007 core. You might be on ' \
+                  'the wrong branch. Look for issue297_vdi_core branch.'
+            raise ImportError(msg)
+
+
+def get_teaser_data():
+    """
+    Returns TEASER data (Typebuildings, UseConditions and Material
+    Templates). Data is loaded once and reused by all following calls.
 
-try:
-    from teaser.project import Project
-except:
-    raise ImportError('Could not import TEASER package. Please check your '
-                      'installation. TEASER can be found at: '
-                      'https://github.com/RWTH-EBC/TEASER. '
-                      'Installation is possible via pip. Alternatively, '
-                      'you might have run into trouble with XML bindings in '
-                      'TEASER. This can happen if you try to re-import TEASER '
-                      'within an active Python console. Please close the '
-                      'active Python console and open another one. Then '
-                      'try again.')
-try:
-    import teaser.logic.simulation.VDI_6007.low_order_VDI as low_order_vdi
-    import teaser.logic.simulation.VDI_6007.weather as vdiweather
-    import teaser.logic.simulation.VDI_6007.equal_air_temperature as equ_air
-except:
-    msg = 'Could not import TEASER VDI 6007 core. You might be on the wrong' \
-          ' branch. Look for issue297_vdi_core branch.'
-    raise ImportError(msg)
-
-def create_teaser_project(load_data=True, name=None, merge_windows=False):
+    Returns
+    -------
+    data : object
+        TEASER DataClass object
+    """
+
+    load_teaser()
+
+    if 'data' not in _dict_teaser_data:
+        _dict_teaser_data['data'] = Project(load_data=True).data
+
+    return _dict_teaser_data['data']
+
+
+def create_teaser_project(load_data=True, name=None, merge_windows=False,
+                          use_cached_data=True):
     """
     Creates a new teaser Project and sets the calculation method to "vdi"
 
@@ -58,6 +114,10 @@ def create_teaser_project(load_data=True, name=None, merge_windows=False):
     merge_windows : bool, optional
         Use calculation to merge window areas into walls within TEASER
         (default: True)
+    use_cached_data : bool, optional
+        Defines, if TEASER data should be loaded once and be shared by all
+        projects (default: True). If False, data is loaded for every new
+        project. Only relevant, if load_data is True.
 
     Returns
     -------
@@ -65,7 +125,13 @@ def create_teaser_project(load_data=True, name=None, merge_windows=False):
         TEASER project
     """
 
-    project = Project(load_data=load_data)
+    load_teaser()
+
+    if load_data and use_cached_data:
+        project = Project(load_data=False)
+        project.data = get_teaser_data()
+    else:
+        project = Project(load_data=load_data)
 
     if name is not None:
         project.name = name
@@ -481,6 +547,8 @@ def calc_th_load__build_vdi6007(type_build, temp_out, rad,
             Heat flow through outer wall in W
     """
 
+    load_teaser(vdi_core=True)
+
     #  Make copy of typebuilding and merge windows (see issue #56)
     #  Necessary to call VDI 6007 TEASER core, but prevent merging of windows
     #  into walls on typebuilding object, as it might be used for Modelica or
@@ -708,6 +776,8 @@ def calc_th_load_build_vdi6007_ex_build(exbuild, add_th_load=False,
             Heat flow through outer wall in W
     """
 
+    load_teaser(vdi_core=True)
+
     #  Check, if extended building object holds necessary attributes and
     #  objects
     assert exbuild.hasApartments is True, 'Building object has no apartment!'
@@ -757,10 +827,9 @@ def calc_th_load_build_vdi6007_ex_build(exbuild, add_th_load=False,
     #  Set timestep to 3600 seconds
     timestep = 3600
 
-    #  Outdoor temperature pointer
-    t_out = teaser_weather.temp[:]
-    t_out = chres.changeResolution(t_out, oldResolution=timestep_org,
-                                   newResolution=timestep)
+    #  Outdoor temperature with timestep (resampled once per environment)
+    t_out = profsto.get_weather_profile(environment=exbuild.environment,
+                                        name='tAmbient', timestep=timestep)
 
     #  Get radiation values
     rad = np.transpose(teaser_weather.sun_rad)[:]
@@ -798,9 +867,12 @@ def calc_th_load_build_vdi6007_ex_build(exbuild, add_th_load=False,
         #  Change resolution to timestep of environment
         org_res = 365 * 24 * 3600 / len(occ_profile)
 
-        occ_profile = chres.changeResolution(occ_profile,
-                                             oldResolution=org_res,
-                                             newResolution=timestep)
+        #  Resampled profile is cached as long as profile is unchanged
+        build_store = profsto.get_profile_store(exbuild)
+        build_store.add_profile(name='occupancy', values=occ_profile,
+                                timestep=org_res)
+        occ_profile = build_store.get_profile(name='occupancy',
+                                              timestep=timestep)
 
     # Extract electrical load
     el_load = exbuild.get_electric_power_curve()[:]
@@ -809,9 +881,10 @@ def calc_th_load_build_vdi6007_ex_build(exbuild, add_th_load=False,
         #  Change resolution to timestep of environment
         org_res = 365 * 24 * 3600 / len(el_load)
 
-        el_load = chres.changeResolution(el_load,
-                                         oldResolution=org_res,
-                                         newResolution=timestep)
+        build_store = profsto.get_profile_store(exbuild)
+        build_store.add_profile(name='el_load', values=el_load,
+                                timestep=org_res)
+        el_load = build_store.get_profile(name='el_load', timestep=timestep)
 
     #  Convert array_vent_rate
     if array_vent_rate is None:
@@ -905,7 +978,9 @@ def calc_and_add_vdi_6007_loads_to_city(city,
                                         heat_lim_val=10000000,
                                         cool_lim_val=10000000,
                                         use_exist_tbuild=False,
-                                        requ_profiles=True):
+                                        requ_profiles=True,
+                                        rng=None,
+                                        seed=None):
     """
     Calculates and adds vdi 6007 space heating loads for every building
     within city object. Uses attributes of extended building to generate
@@ -959,8 +1034,18 @@ def calc_and_add_vdi_6007_loads_to_city(city,
         for VDI usage (default: True).
         If set to True: Requires profile on every building
         If set to False: Set user profile and el. load profiles to zero
+    rng : object, optional
+        numpy.random.Generator for stochastic air exchange rates
+        (default: None). Only relevant, if air_vent_mode is 2. If None,
+        generator is initialized with seed (see sampling_engine.get_rng)
+    seed : int, optional
+        Seed for stochastic air exchange rates (default: None). Only used,
+        if rng is None. If rng and seed are None, seed is drawn from the
+        legacy numpy random state.
     """
 
+    load_teaser(vdi_core=True)
+
     #  Pointer to timestep
     timestep_org = city.environment.timer.timeDiscretization
 
@@ -991,6 +1076,10 @@ def calc_and_add_vdi_6007_loads_to_city(city,
                         if city.nodes[n]['entity'].build_type in [0, 1]:
                             list_build.append(n)
 
+    if air_vent_mode == 2:
+        #  Single random generator for air exchange rates of all buildings
+        rng = sampeng.get_rng(rng=rng, seed=seed)
+
     # #  Create TEASER weather
     #  #####################################################################
 
@@ -1028,10 +1117,9 @@ def calc_and_add_vdi_6007_loads_to_city(city,
     #  Set timestep to 3600 seconds
     timestep = 3600
 
-    #  Outdoor temperature pointer
-    t_out = teaser_weather.temp[:]
-    t_out = chres.changeResolution(t_out, oldResolution=(365 * 24 * 3600 / len(t_out)),
-                                   newResolution=timestep)
+    #  Outdoor temperature with timestep (resampled once per environment)
+    t_out = profsto.get_weather_profile(environment=city.environment,
+                                        name='tAmbient', timestep=timestep)
 
     #  Get radiation values
     rad = np.transpose(teaser_weather.sun_rad)[:]
@@ -1125,6 +1213,8 @@ def calc_and_add_vdi_6007_loads_to_city(city,
             #  Generate dummy array
             array_vent = np.zeros(len(t_out))
 
+            list_occ_profiles = []
+
             #  Loop over all apartments
             for ap in curr_build.apartments:
 
@@ -1143,14 +1233,20 @@ def calc_and_add_vdi_6007_loads_to_city(city,
                                                          oldResolution=org_res,
                                                          newResolution=timestep)
 
-                #  Sum up air exchange rate profiles
-                #  Get ventilation rate (in 1/h, related to building air volume)
-                array_vent += \
-                    usair.gen_user_air_ex_rate(
-                        occ_profile=occ_profile,
-                        temp_profile=t_out,
-                        b_type='res',
-                        inf_rate=0)
+                list_occ_profiles.append(occ_profile)
+
+            #  Sum up air exchange rate profiles of all apartments
+            #  (window state chains of all apartments are simulated at once)
+            #  Get ventilation rate (in 1/h, related to building air volume)
+            array_vent += \
+                usair.gen_user_air_ex_rates(
+                    list_occ_profiles=list_occ_profiles,
+                    temp_profile=t_out,
+                    b_type='res',
+                    inf_rate=0,
+                    rng=rng,
+                    profile_store=profsto.get_profile_store(
+                        city.environment)).sum(axis=0)
 
             #  Finally, add infiltration rate of building
             array_vent += inf_rate
@@ -1315,6 +1411,9 @@ def add_kfw_retrofit_to_city(city, material=None, thickness=None):
 
 
 if __name__ == '__main__':
+
+    load_teaser(vdi_core=True)
+
     #  Example how to calculate thermal load according to VDI 6007 with
     #  TEASER type building
 
@@ -33,6 +33,9 @@ import pycity_base.classes.Prices as Prices
 import pycity_base.functions.changeResolution as chres
 import pycity_base.classes.demand.Occupancy as Occupancy
 
+import pycity_calc.toolbox.profile_store as profsto
+import pycity_calc.toolbox.mc_helpers.sampling_engine as sampeng
+
 
 def get_inf_rate(mod_year):
     """
@@ -157,6 +160,147 @@ def gen_det_air_ex_rate_temp_dependend(occ_profile, temp_profile,
 
     return array_air_ex
 
+#  Transition table of window state Markov chain (5 minute timestep).
+#  Rows: Outdoor temperature bands (< 10, < 16, < set_temp, < set_temp + 4,
+#  else), columns: current window mode (0: closed, 1: partially open,
+#  2: fully open). New window mode is 0, if random number is below
+#  _WINDOW_LIM_CLOSED, 1, if random number is below _WINDOW_LIM_PART,
+#  else 2.
+_WINDOW_LIM_CLOSED = np.array([[1, 1, 1],
+                               [0.8, 0.85, 1],
+                               [0.75, 0.6, 1],
+                               [0.5, 0.05, 1],
+                               [0.2, 0.05, 0.1]])
+_WINDOW_LIM_PART = np.array([[1, 1, 1],
+                             [1, 1, 1],
+                             [1, 1, 1],
+                             [1, 1, 1],
+                             [0.7, 1, 0.1]])
+#  Air exchange rates in 1/h per window mode (last entry: not occupied)
+_WINDOW_AIR_EX = np.array([0, 1.2, 8.8, 0])
+
+
+def get_window_temp_bands(temp_profile, set_temp=20):
+    """
+    Returns array with temperature band indexes of window state Markov chain
+
+    Parameters
+    ----------
+    temp_profile : array (of floats)
+        Outdoor temperature profile (in degree Celsius)
+    set_temp : float, optional
+        Set temperature of building in degree Celsius (default: 20)
+
+    Returns
+    -------
+    array_bands : array (of ints)
+        Temperature band index per timestep (0: below 10 degree C; 1: below
+        16 degree C; 2: below set_temp; 3: below set_temp + 4; 4: else)
+    """
+
+    temp_profile = np.asarray(temp_profile)
+
+    return np.select([temp_profile < 10, temp_profile < 16,
+                      temp_profile < set_temp, temp_profile < set_temp + 4],
+                     [0, 1, 2, 3], default=4).astype(np.int8)
+
+
+def calc_window_air_ex_chains(occ_mask, temp_profile, set_temp=20,
+                              array_rand=None, rng=None, block_size=4096):
+    """
+    Simulate independent window state Markov chains (5 minute timestep) and
+    return user dependend air exchange rates (without infiltration).
+    Window state is only updated at timesteps with present occupants.
+
+    Parameters
+    ----------
+    occ_mask : array (of bools)
+        2d array (nb. of chains x nb. of timesteps), defining, if occupants
+        are present
+    temp_profile : array (of floats)
+        Outdoor temperature profile (in degree Celsius). Either 1d array
+        (same for all chains) or 2d array (nb. of chains x nb. of timesteps)
+    set_temp : float, optional
+        Set temperature of building in degree Celsius (default: 20)
+    array_rand : array (of floats), optional
+        Random numbers (default: None). Only valid for single chain. Holds
+        one random number per occupied timestep. If None, uses rng.
+    rng : object, optional
+        numpy.random.Generator (default: None). If None and array_rand is
+        None, new generator is seeded from the legacy numpy random state
+        (see sampling_engine.get_rng), thus np.random.seed reproduces
+        the profiles.
+    block_size : int, optional
+        Number of timesteps, for which random numbers are drawn at once
+        (default: 4096)
+
+    Returns
+    -------
+    array_air_ex : array (of floats)
+        2d array (nb. of chains x nb. of timesteps) with user dependend air
+        exchange rates in 1/h
+    """
+
+    occ_mask = np.asarray(occ_mask, dtype=bool)
+    nb_chains, nb_steps = occ_mask.shape
+
+    array_bands = get_window_temp_bands(temp_profile=temp_profile,
+                                        set_temp=set_temp)
+
+    #  Window mode per chain and timestep (3: not occupied / no update)
+    array_modes = np.full((nb_chains, nb_steps), 3, dtype=np.int8)
+
+    if array_rand is not None:
+        assert nb_chains == 1, 'array_rand is only valid for single chain!'
+        assert array_bands.ndim == 1
+
+        #  Single chain: Step through occupied timesteps
+        lim_closed = _WINDOW_LIM_CLOSED.tolist()
+        lim_part = _WINDOW_LIM_PART.tolist()
+        list_idx = np.flatnonzero(occ_mask[0])
+        list_bands = array_bands[list_idx].tolist()
+        list_modes = []
+
+        window_mode = 0
+        for (band, rand_nb) in zip(list_bands, array_rand.tolist()):
+            if rand_nb < lim_closed[band][window_mode]:
+                window_mode = 0
+            elif rand_nb < lim_part[band][window_mode]:
+                window_mode = 1
+            else:
+                window_mode = 2
+            list_modes.append(window_mode)
+
+        array_modes[0, list_idx] = list_modes
+
+    else:
+        rng = sampeng.get_rng(rng=rng)
+
+        lim_closed = _WINDOW_LIM_CLOSED.ravel()
+        lim_part = _WINDOW_LIM_PART.ravel()
+
+        #  Only timesteps with occupants (in any chain) change window modes
+        array_steps = np.flatnonzero(occ_mask.any(axis=0))
+
+        window_mode = np.zeros(nb_chains, dtype=np.int8)
+
+        for j in range(0, len(array_steps), block_size):
+            steps = array_steps[j:j + block_size]
+            block_rand = rng.random((len(steps), nb_chains))
+
+            for (t, rand_nb) in zip(steps, block_rand):
+                if array_bands.ndim == 1:
+                    idx = 3 * array_bands[t] + window_mode
+                else:
+                    idx = 3 * array_bands[:, t] + window_mode
+                new_mode = (rand_nb >= lim_closed[idx]).astype(np.int8) \
+                           + (rand_nb >= lim_part[idx])
+                occ = occ_mask[:, t]
+                window_mode = np.where(occ, new_mode, window_mode)
+                array_modes[occ, t] = new_mode[occ]
+
+    return _WINDOW_AIR_EX[array_modes]
+
 
 def gen_user_air_ex_rate(occ_profile, temp_profile, b_type='res',
                          inf_rate=None, set_temp=20):
@@ -217,216 +361,142 @@ def gen_user_air_ex_rate(occ_profile, temp_profile, b_type='res',
                                             oldResolution=timestep_temp,
                                             newResolution=300)
 
-    #  Generate base air exchange rate array
-    if inf_rate is None:
-        array_air_ex = np.zeros(len(temp_profile_5))
-    else:
-        array_air_ex = np.ones(len(temp_profile_5)) * inf_rate
+    if np.any(np.asarray(occ_profile_5) < 0):
+        raise AssertionError('Occupancy profile cannot be negative!')
 
-    # Initial status
-    window_mode = 0
+    occ_mask = np.asarray(occ_profile_5) > 0
 
-    for i in range(len(temp_profile_5)):
+    #  Draw one random number per occupied timestep (same random number
+    #  sequence as step-by-step window state simulation)
+    array_rand = np.array([random.random() for i in
+                           range(np.count_nonzero(occ_mask))])
 
-        if occ_profile_5[i] == 0:
-            #  Set user defined air exchange rate to zero / keep value
-            pass
+    array_air_ex = \
+        calc_window_air_ex_chains(occ_mask=occ_mask[np.newaxis, :],
+                                  temp_profile=temp_profile_5,
+                                  set_temp=set_temp,
+                                  array_rand=array_rand)[0]
 
-        elif occ_profile_5[i] > 0:
+    #  Add infiltration rate
+    if inf_rate is not None:
+        array_air_ex += inf_rate
 
-            #  Generate user dependend air exchange rate
-            rand_nb = random.random()
+    # Re-change resolution
+    air_exch = chres.changeResolution(array_air_ex, oldResolution=300,
+                                      newResolution=timestep_temp)
 
-            #  If temperature is equal or below 0 degree C:
-            if temp_profile_5[i] <= 0:
+    return air_exch
 
-                #  Leave windows closed / close window
-                window_mode = 0
 
-            # If temperature is below 10 degree C:
-            elif temp_profile_5[i] < 10:
+def gen_user_air_ex_rates(list_occ_profiles, temp_profile, b_type='res',
+                          inf_rate=None, set_temp=20, rng=None, seed=None,
+                          timestep=None, profile_store=None):
+    """
+    Generate multiple user air exchange rate profiles (in 1/h) at once,
+    e.g. for all apartments of a city or for all Monte-Carlo samples.
+    Window state Markov chains are simulated as arrays.
 
-                #  Leave windows closed / close window
-                window_mode = 0
+    Parameters
+    ----------
+    list_occ_profiles : list (of arrays)
+        List of occupancy profiles (or 2d array with one profile per row).
+        All profiles should have the same length (one year)
+    temp_profile : array (of floats)
+        Outdoor temperature profile (in degree Celsius)
+    b_type : str, optional
+        Defines type of building (default: 'res')
+        Options:
+        - 'res' : residential building / profile
+    inf_rate : float, optional
+        Infiltration rate in 1/h (default: None). Values is added to
+        returned air exchange rates.
+    set_temp : float, optional
+        Set temperature of building in degree Celsius (default: 20)
+    rng : object, optional
+        numpy.random.Generator (default: None). If None, generator is
+        initialized with seed (see sampling_engine.get_rng)
+    seed : int, optional
+        Seed of random number generator (default: None). Only used, if rng
+        is None. If rng and seed are None, seed is drawn from the legacy
+        numpy random state.
+    timestep : int, optional
+        Timestep of returned profiles in seconds (default: None).
+        If None, timestep of temp_profile is used and profiles are
+        resampled with changeResolution (like gen_user_air_ex_rate).
+        If set, input profiles are held constant within their timesteps and
+        air exchange rates of 5 minute steps are averaged per timestep.
+    profile_store : object, optional
+        ProfileStore object (default: None), e.g. of environment (see
+        profile_store.get_profile_store). If set, resampled temperature
+        profile is cached within profile store and reused by following
+        calls with same temperature profile.
 
-            # If temperature is below 16 degree C:
-            elif temp_profile_5[i] < 16:
-
-                if window_mode == 0:  # Window is closed
-
-                    if rand_nb < 0.8:
-                        #  Leave windows closed / close window
-                        window_mode = 0
-                    # elif rand_nb < 0.98:
-                    else:
-                        #  Window only partially open
-                        array_air_ex[i] += 1.2
-                        window_mode = 1
-                        # else:
-                        #     #  Fully open windows
-                        #     array_air_ex[i] += 8.8
-                        #     window_mode = 2
-
-                elif window_mode == 1:  # Window is partially open
-
-                    if rand_nb < 0.85:
-                        #  Leave windows closed / close window
-                        window_mode = 0
-                    # if rand_nb < 0.99:
-                    else:
-                        #  Leave window partially open
-                        array_air_ex[i] += 1.2
-                        window_mode = 1
-                        # else:
-                        #     #  Fully open windows
-                        #     array_air_ex[i] += 8.8
-                        #     window_mode = 2
-
-                elif window_mode == 2:  # Windows fully open
-
-                    #  Leave windows closed / close window
-                    window_mode = 0
-
-            # If temperature is below set_temp degree C:
-            elif temp_profile_5[i] < set_temp:
-
-                if window_mode == 0:  # Window is closed
-
-                    if rand_nb < 0.75:
-                        #  Leave windows closed / close window
-                        window_mode = 0
-                    # elif rand_nb < 0.98:
-                    else:
-                        #  Window only partially open
-                        array_air_ex[i] += 1.2
-                        window_mode = 1
-                        # else:
-                        #     #  Fully open windows
-                        #     array_air_ex[i] += 8.8
-                        #     window_mode = 2
-
-                elif window_mode == 1:  # Window is partially open
-
-                    if rand_nb < 0.6:
-                        #  Leave windows closed / close window
-                        window_mode = 0
-                    # if rand_nb < 0.99:
-                    else:
-                        #  Leave window partially open
-                        array_air_ex[i] += 1.2
-                        window_mode = 1
-                        # else:
-                        #     #  Fully open windows
-                        #     array_air_ex[i] += 8.8
-                        #     window_mode = 2
-
-                elif window_mode == 2:  # Windows fully open
-
-                    #  Leave windows closed / close window
-                    window_mode = 0
-
-            # If temperature is below set_temp degree C:
-            elif temp_profile_5[i] < (set_temp + 4):
-
-                if window_mode == 0:  # Window is closed
-
-                    if rand_nb < 0.5:
-                        #  Leave windows closed / close window
-                        window_mode = 0
-                    # elif rand_nb < 0.9:
-                    else:
-                        #  Window only partially open
-                        array_air_ex[i] += 1.2
-                        window_mode = 1
-                    # else:
-                    #     #  Fully open windows
-                    #     array_air_ex[i] += 8.8
-                    #     window_mode = 2
-
-                elif window_mode == 1:  # Window is partially open
-
-                    if rand_nb < 0.05:
-                        #  Leave windows closed / close window
-                        window_mode = 0
-                    # if rand_nb < 0.99:
-                    else:
-                        #  Leave window partially open
-                        array_air_ex[i] += 1.2
-                        window_mode = 1
-                        # else:
-                        #     #  Fully open windows
-                        #     array_air_ex[i] += 8.8
-                        #     window_mode = 2
-
-                elif window_mode == 2:  # Windows fully open
-
-                    # if rand_nb < 0.7:
-                    #     #  Leave windows closed / close window
-                    #     window_mode = 0
-                    # # elif rand_nb < 0.91:
-                    # #     #  Leave window partially open
-                    # #     array_air_ex[i] += 1.2
-                    # #     window_mode = 1
-                    # else:
-                    #     #  Fully open windows
-                    #     array_air_ex[i] += 8.8
-                    #     window_mode = 2
-
-                    window_mode = 0
-
-            else:  # Outdoor temperature profile above (set_temp + 4) degree C
-
-                if window_mode == 0:  # Window is closed
-
-                    if rand_nb < 0.2:
-                        #  Leave windows closed / close window
-                        window_mode = 0
-                    elif rand_nb < 0.7:
-                        #  Window only partially open
-                        array_air_ex[i] += 1.2
-                        window_mode = 1
-                    else:
-                        #  Fully open windows
-                        array_air_ex[i] += 8.8
-                        window_mode = 2
-
-                elif window_mode == 1:  # Window is partially open
-
-                    if rand_nb < 0.05:
-                        #  Leave windows closed / close window
-                        window_mode = 0
-                    # if rand_nb < 0.95:
-                    else:
-                        #  Leave window partially open
-                        array_air_ex[i] += 1.2
-                        window_mode = 1
-                        # else:
-                        #     #  Fully open windows
-                        #     array_air_ex[i] += 8.8
-                        #     window_mode = 2
-
-                elif window_mode == 2:  # Windows fully open
-
-                    if rand_nb < 0.1:
-                        #  Leave windows closed / close window
-                        window_mode = 0
-                    # elif rand_nb < 0.8:
-                    #     #  Leave window partially open
-                    #     array_air_ex[i] += 1.2
-                    #     window_mode = 1
-                    else:
-                        #  Fully open windows
-                        array_air_ex[i] += 8.8
-                        window_mode = 2
-
-        elif occ_profile_5[i] < 0:
-            raise AssertionError('Occupancy profile cannot be negative!')
+    Returns
+    -------
+    array_air_ex : array (of floats)
+        2d array (nb. of profiles x nb. of timesteps) with air exchange
+        rates in 1/h
+    """
 
-    # Re-change resolution
-    air_exch = chres.changeResolution(array_air_ex, oldResolution=300,
-                                      newResolution=timestep_temp)
+    #  Assert statements
+    if inf_rate is not None:
+        assert inf_rate >= 0, 'Infiltration rate cannot be below zero!'
+    assert b_type in ['res'], 'Unknown building type!'
 
-    return air_exch
+    rng = sampeng.get_rng(rng=rng, seed=seed)
+
+    timestep_temp = 365 * 24 * 3600 / len(temp_profile)
+
+    list_occ_5 = []
+    for occ_profile in list_occ_profiles:
+        timestep_occ = 365 * 24 * 3600 / len(occ_profile)
+        if timestep is None:
+            list_occ_5.append(
+                chres.changeResolution(copy.copy(occ_profile),
+                                       oldResolution=timestep_occ,
+                                       newResolution=300))
+        else:
+            list_occ_5.append(profsto.resample_profile(
+                occ_profile, timestep_occ, 300, method='hold'))
+    array_occ_5 = np.vstack(list_occ_5)
+
+    if np.any(array_occ_5 < 0):
+        raise AssertionError('Occupancy profile cannot be negative!')
+
+    if timestep is None:
+        method = 'mean'
+    else:
+        method = 'hold'
+
+    if profile_store is not None:
+        #  Temperature profile is only resampled once (per profile store)
+        profile_store.add_profile(name='user_air_ex.temp_profile',
+                                  values=temp_profile,
+                                  timestep=timestep_temp)
+        temp_profile_5 = \
+            profile_store.get_profile(name='user_air_ex.temp_profile',
+                                      timestep=300, method=method,
+                                      copy=False)
+    else:
+        temp_profile_5 = profsto.resample_profile(temp_profile,
+                                                  timestep_temp, 300,
+                                                  method=method)
+
+    array_air_ex = calc_window_air_ex_chains(occ_mask=array_occ_5 > 0,
+                                             temp_profile=temp_profile_5,
+                                             set_temp=set_temp, rng=rng)
+
+    if inf_rate is not None:
+        array_air_ex += inf_rate
+
+    if timestep is None:
+        return np.vstack([chres.changeResolution(air_ex, oldResolution=300,
+                                                 newResolution=timestep_temp)
+                          for air_ex in array_air_ex])
+
+    return np.vstack([profsto.resample_profile(air_ex, 300, timestep,
+                                               method='hold')
+                      for air_ex in array_air_ex])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,999 @@
+#!/usr/bin/env python
+# coding=utf-8
+"""
+Batched stochastic user profile generation (occupancy, el. load and
+domestic hot water) for many apartments at once.
+
+The generators follow the stochastic models of richardsonpy (occupancy,
+appliance and lighting model) and pycity_base (stochastic hot water model)
+step by step and use the same input data and probability tables. Instead of
+one object per apartment, all apartments are simulated as arrays:
+
+- Occupancy: Markov chains of all apartments are stepped together
+  (apartments x 10 minute timesteps).
+- El. load: Appliance and lighting states are reset every day. Thus,
+  all days of a block of apartments are simulated in parallel
+  ((apartments x days) x 1440 minutes).
+- Hot water: Tap events are independent per minute and are drawn for
+  blocks of apartments at once.
+
+Random numbers are drawn from a numpy random Generator (pass rng or seed for
+reproducible profiles). Profiles are returned per apartment or directly
+summed up per group (e.g. per building) with group_ids.
+
+Differences to richardsonpy / pycity_base:
+
+- Profiles are statistically equivalent, but not identical to the single
+  apartment models (different random number streams).
+- Irradiance is interpolated to 1 minute timesteps for every input timestep
+  (richardsonpy only interpolates hourly irradiance correctly).
+- El. load profiles are converted to timestep by averaging (instead of
+  sampling every n-th minute value).
+- Storage heaters use the intended on/off month logic (raises TypeError in
+  richardsonpy).
+"""
+from __future__ import division
+
+import os
+import csv
+import numpy as np
+
+import richardsonpy
+import richardsonpy.classes.lighting as light_model
+import pycity_base
+import pycity_base.functions.dhw_stochastical as dhw_sto
+
+import pycity_calc.toolbox.mc_helpers.sampling_engine as sampeng
+
+#  Paths to input data of richardsonpy and pycity_base
+_RICH_PATH = os.path.join(os.path.dirname(os.path.abspath(
+    richardsonpy.__file__)), 'inputs')
+_DHW_PATH = os.path.join(os.path.dirname(os.path.abspath(
+    pycity_base.__file__)), 'inputs', 'dhw_stochastical.xlsx')
+
+#  Annual el. demands in kWh per number of occupants (richardsonpy defaults)
+STANDARD_CONSUMPTION = {'SFH': {1: 2700, 2: 3200, 3: 4000, 4: 4400, 5: 5500},
+                        'MFH': {1: 1500, 2: 2200, 3: 3000, 4: 3400, 5: 4100}}
+
+#  Appliance indexes with special treatment (rows of Appliances.csv)
+_IDX_TV = [14, 15, 16]
+_IDX_WASHING = {26: 138, 27: 198}  # Index: total cycle time in minutes
+_IDX_HEATING_VAR = [31, 32]  # Heating appliances with varying cycle length
+_IDX_HEAT_DEV = [29, 30, 31, 32]  # Excluded by prev_heat_dev
+
+#  Washing machine power profile in W (start and end minute of phase)
+_WASHING_PHASES = [(1, 8, 73), (9, 29, 2056), (30, 81, 73), (82, 92, 73),
+                   (93, 94, 250), (95, 105, 73), (106, 107, 250),
+                   (108, 118, 73), (119, 120, 250), (121, 131, 73),
+                   (132, 133, 250), (134, 138, 568), (139, 198, 2500)]
+
+#  Lighting model parameters (richardsonpy LightingModelConfiguration)
+_LIGHT_CONFIG = light_model.LightingModelConfiguration()
+
+_DAYS_PER_MONTH = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+
+#  Cache for loaded input data
+_dict_inputs = {}
+
+
+def _load_occ_tables():
+    """
+    Returns cumulative transition probabilities of occupancy model as
+    array (nb. of occupants - 1, weekend, timestep, current state, new state)
+    """
+
+    if 'occ_cum' not in _dict_inputs:
+        array_cum = np.zeros((5, 2, 144, 7, 7))
+        for nb_occ in range(1, 6):
+            for (we, type_day) in enumerate(['wd', 'we']):
+                path = os.path.join(_RICH_PATH, 'constants',
+                                    'tpm' + str(nb_occ) + '_' + type_day
+                                    + '.csv')
+                tpm = np.loadtxt(path, delimiter=';')
+                array_cum[nb_occ - 1, we] = \
+                    np.cumsum(tpm[:, 2:9], axis=1).reshape(144, 7, 7)
+        _dict_inputs['occ_cum'] = array_cum
+
+    return _dict_inputs['occ_cum']
+
+
+def _load_app_inputs(path_app=None):
+    """
+    Returns appliance data (rows of Appliances.csv) and activity statistics
+    (weekday and weekend)
+    """
+
+    if path_app is None:
+        path_app = os.path.join(_RICH_PATH, 'Appliances.csv')
+
+    key = ('app', path_app)
+    if key not in _dict_inputs:
+        data = np.loadtxt(path_app, delimiter=';', skiprows=1,
+                          usecols=range(2, 13), encoding='utf8')
+        list_act = []
+        for type_day in ['wd', 'we']:
+            path = os.path.join(_RICH_PATH, 'constants',
+                                'ActiveAppliances_' + type_day + '.csv')
+            list_act.append(np.loadtxt(path, delimiter=';')[:, 2:])
+        _dict_inputs[key] = (data, np.array(list_act))
+
+    return _dict_inputs[key]
+
+
+def _load_light_configs(list_configs, path_light=None):
+    """
+    Returns 2d array with bulb ratings in W (configurations x bulbs, padded
+    with zeros)
+    """
+
+    if path_light is None:
+        path_light = os.path.join(_RICH_PATH, 'LightBulbs.csv')
+
+    key = ('light', path_light)
+    if key not in _dict_inputs:
+        list_rows = []
+        with open(path_light, 'r') as input_file:
+            for row in csv.reader(input_file, delimiter=';'):
+                list_bulbs = []
+                for val in row:
+                    if val == '':
+                        break
+                    list_bulbs.append(float(val))
+                list_rows.append(list_bulbs)
+        _dict_inputs[key] = list_rows
+
+    list_rows = _dict_inputs[key]
+    list_bulbs = [list_rows[int(idx)] for idx in list_configs]
+
+    array_bulbs = np.zeros((len(list_bulbs),
+                            max(len(bulbs) for bulbs in list_bulbs)))
+    for (i, bulbs) in enumerate(list_bulbs):
+        array_bulbs[i, :len(bulbs)] = bulbs
+
+    return array_bulbs
+
+
+def _load_dhw_tables():
+    """
+    Returns tap probabilities (weekend, active occupants, minute) and mean
+    tap water flows in l/h (weekend, minute) of stochastic hot water model
+    """
+
+    if 'dhw' not in _dict_inputs:
+        profiles = dhw_sto.load_profiles(_DHW_PATH)
+        array_prob = np.zeros((2, 7, 1440))
+        array_mean = np.zeros((2, 1440))
+        for (we, type_day) in enumerate(['wd', 'we']):
+            for nb_occ in profiles[type_day].keys():
+                array_prob[we, nb_occ] = profiles[type_day][nb_occ]
+            array_mean[we] = profiles[type_day + '_mw']
+        _dict_inputs['dhw'] = (array_prob, array_mean)
+
+    return _dict_inputs['dhw']
+
+
+def get_weekend_days(nb_days, initial_day=1):
+    """
+    Returns bool array, defining weekend days
+
+    Parameters
+    ----------
+    nb_days : int
+        Number of days
+    initial_day : int, optional
+        Initial day (default: 1). 1-5 correspond to Monday-Friday, 6-7 to
+        Saturday and Sunday
+
+    Returns
+    -------
+    array_we : np.array (of bools)
+        True for Saturdays and Sundays
+    """
+
+    return np.isin((np.arange(nb_days) + initial_day) % 7, (0, 6))
+
+
+def _sum_groups(array_profiles, group_ids, nb_groups):
+    """
+    Sum up profiles (rows) per group id
+    """
+
+    array_sum = np.zeros((nb_groups, array_profiles.shape[1]))
+    np.add.at(array_sum, group_ids, array_profiles)
+    return array_sum
+
+
+def _mean_timestep(array_min, timestep):
+    """
+    Convert profiles with 60 seconds resolution (rows) to timestep by
+    averaging
+    """
+
+    if timestep == 60:
+        return array_min
+
+    nb_min = int(timestep // 60)
+    return array_min.reshape(array_min.shape[0], -1, nb_min).mean(axis=2)
+
+
+def _check_timestep(timestep):
+    if timestep % 60 != 0 or 86400 % timestep != 0:
+        msg = 'Timestep has to be multiple of 60 seconds and divisor of ' \
+              '86400 seconds, but is ' + str(timestep)
+        raise AssertionError(msg)
+
+
+def gen_occ_profiles(array_nb_occ, nb_days=365, initial_day=1, rng=None,
+                     seed=None):
+    """
+    Generate stochastic occupancy profiles (number of active occupants with
+    10 minute timestep) for multiple apartments at once
+
+    Parameters
+    ----------
+    array_nb_occ : array-like (of ints)
+        Number of occupants per apartment (1 to 5)
+    nb_days : int, optional
+        Number of days (default: 365)
+    initial_day : int, optional
+        Initial day (default: 1). 1-5 correspond to Monday-Friday, 6-7 to
+        Saturday and Sunday
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed for new Generator (default: None). Only used, if rng is None.
+
+    Returns
+    -------
+    occ_profiles : np.array (of ints)
+        2d array (apartments x (nb_days * 144)) with number of active
+        occupants (dtype np.int8)
+    """
+
+    array_nb_occ = np.atleast_1d(np.array(array_nb_occ, dtype=int))
+
+    assert np.min(array_nb_occ) > 0, 'At least 1 occupant is required'
+    assert np.max(array_nb_occ) <= 5, 'Max. number of occupants is 5'
+    assert nb_days > 0
+
+    rng = sampeng.get_rng(rng=rng, seed=seed)
+
+    #  Flat table of cumulative transition probabilities
+    table = _load_occ_tables().reshape(-1, 7)
+
+    nb_app = len(array_nb_occ)
+    occ_profiles = np.zeros((nb_app, nb_days * 144), dtype=np.int8)
+
+    #  richardsonpy always starts with state 0 (start state probabilities
+    #  are read from wrong axis)
+    state = np.zeros(nb_app, dtype=int)
+    idx_occ = (array_nb_occ - 1) * 2
+
+    array_we = get_weekend_days(nb_days=nb_days, initial_day=initial_day)
+
+    for day in range(nb_days):
+        array_rand = rng.random((144, nb_app))
+        idx_day = (idx_occ + int(array_we[day])) * 144
+
+        for step in range(144):
+            if step == 7:
+                #  richardsonpy sets state 0 at 8th timestep of each day
+                state = np.zeros(nb_app, dtype=int)
+            else:
+                cum = table[(idx_day + step) * 7 + state]
+                new_state = np.sum(array_rand[step][:, np.newaxis] >= cum,
+                                   axis=1)
+                #  Keep state, if random number exceeds summed probability
+                state = np.where(new_state < 7, new_state, state)
+
+            occ_profiles[:, day * 144 + step] = state
+
+    return occ_profiles
+
+
+def _calibrate_appliances(data, array_own, array_demand,
+                          mean_active_occupancy=0.459, max_iter=2):
+    """
+    Calibrate appliance cycles per apartment to annual appliance demand
+    (vectorized version of richardsonpy Appliances calibration)
+
+    Returns
+    -------
+    tup_res : tuple (of arrays)
+        (calib_cycles, calib_scalar) with shape (apartments x appliances)
+    """
+
+    array_prop = np.where(data[:, 7] == 0, 1, mean_active_occupancy)
+
+    def estimate(calib_factor):
+        calib_cycles = data[:, 2] * calib_factor[:, np.newaxis]
+        time_running = data[:, 3] * calib_cycles
+        minutes_events = 365 * 24 * 60 * array_prop - time_running \
+                         - calib_cycles * data[:, 6]
+        calib_scalar = calib_cycles / minutes_events / data[:, 9]
+        energy = calib_cycles * data[:, 3] * data[:, 4] / (60 * 1000) \
+                 + (365 * 24 * 60 - time_running) * data[:, 5] / (60 * 1000)
+        return (calib_cycles, calib_scalar, np.sum(energy * array_own,
+                                                   axis=1))
+
+    nb_app = len(array_demand)
+    (lb_fac, ub_fac) = (np.zeros(nb_app), np.full(nb_app, 100.0))
+    lb_dem = estimate(lb_fac)[2]
+    ub_dem = estimate(ub_fac)[2]
+
+    for i in range(max_iter):
+        calib_factor = lb_fac + (ub_fac - lb_fac) * (array_demand - lb_dem) \
+                       / (ub_dem - lb_dem)
+        (calib_cycles, calib_scalar, calib_dem) = estimate(calib_factor)
+
+        upper = calib_dem > array_demand
+        ub_fac = np.where(upper, calib_factor, ub_fac)
+        ub_dem = np.where(upper, calib_dem, ub_dem)
+        lb_fac = np.where(upper, lb_fac, calib_factor)
+        lb_dem = np.where(upper, lb_dem, calib_dem)
+
+    return (calib_cycles, calib_scalar)
+
+
+def _get_month(array_days):
+    """
+    Returns month per day index (richardsonpy convention)
+    """
+
+    return np.searchsorted(np.cumsum(_DAYS_PER_MONTH), array_days) + 1
+
+
+def _get_storage_heater_probs(calib_cycles):
+    """
+    Returns start probabilities of storage heaters per apartment and month
+    (apartments x 12)
+    """
+
+    def month_of_day(day_of_year):
+        return np.searchsorted(np.cumsum(_DAYS_PER_MONTH), day_of_year) + 1
+
+    half_cycles = np.round(calib_cycles / 2)
+    #  Coldest day of the year: January 14th
+    month_off = month_of_day((14 + half_cycles - 1) % 365 + 1)
+    month_on = month_of_day((14 - half_cycles - 1) % 365 + 1)
+
+    array_month = np.arange(1, 13)
+    month_off = month_off[:, np.newaxis]
+    month_on = month_on[:, np.newaxis]
+
+    return np.where((array_month == month_off) | (array_month == month_on),
+                    0.5 / 10,
+                    np.where((array_month > month_off)
+                             & (array_month < month_on), 0, 1))
+
+
+def _sim_el_days(occ_days, irr_days, array_we, array_month, data, act_stats,
+                 array_own, calib_cycles, calib_scalar, array_bulbs, rng):
+    """
+    Simulate appliance and lighting power of independent days (units)
+    with 1 minute timestep
+
+    Parameters
+    ----------
+    occ_days : np.array
+        Active occupants (units x 144)
+    irr_days : np.array
+        Irradiance in W/m2 (units x 1440)
+    array_we : np.array
+        Weekend flags per unit
+    array_month : np.array
+        Month per unit
+    data : np.array
+        Appliance data (appliances x 11)
+    act_stats : np.array
+        Activity statistics (weekend x 36 x 144)
+    array_own : np.array
+        Appliance ownership (units x appliances)
+    calib_cycles : np.array
+        Calibrated cycles per year (units x appliances)
+    calib_scalar : np.array
+        Calibration scalars (units x appliances)
+    array_bulbs : np.array
+        Bulb ratings in W (units x bulbs)
+    rng : np.random.Generator
+        Random Generator
+
+    Returns
+    -------
+    tup_res : tuple (of arrays)
+        (app_load, light_load) in W (units x 1440)
+    """
+
+    nb_units = len(occ_days)
+    nb_apps = len(data)
+    nb_bulbs = array_bulbs.shape[1]
+
+    mean_length = data[:, 3]
+    rated_mean = data[:, 4]
+    standby = data[:, 5]
+    restart_delay = data[:, 6]
+    use_prof = data[:, 8].astype(int)
+
+    #  Start probability factors per weekend, active occupants and
+    #  timestep (activity statistics for profiles 0 to 5, else 1)
+    act_fac = np.ones((2, 7, 144, nb_apps))
+    idx_act = np.flatnonzero(use_prof < 6)
+    for nb_occ in range(7):
+        act_fac[:, nb_occ, :, idx_act] = \
+            act_stats[:, 5 * nb_occ + use_prof[idx_act], :].transpose(1, 0,
+                                                                       2)
+    #  Start events require active occupants (except for level and custom
+    #  profiles)
+    act_fac[:, 0, :, :] = 0
+    act_fac[:, :, :, use_prof == 8] = 0
+    act_fac[:, :, :, use_prof == 7] = 1
+
+    #  Appliances, which keep running without active occupants
+    keep_running = np.isin(use_prof, (2, 7, 8))
+
+    idx_storage = np.flatnonzero(use_prof == 8)
+    storage_probs = _get_storage_heater_probs(calib_cycles[:, idx_storage]
+                                              .reshape(-1)) \
+        .reshape(nb_units, len(idx_storage), 12)
+    storage_probs = storage_probs[np.arange(nb_units), :,
+                                  array_month - 1]
+
+    #  Washing machine power (total cycle time x minutes into cycle)
+    array_washing = np.full((nb_apps, 200), np.nan)
+    for (idx, total_time) in _IDX_WASHING.items():
+        for (start, stop, power) in _WASHING_PHASES:
+            array_washing[idx, start:stop + 1] = power
+    idx_washing = list(_IDX_WASHING.keys())
+    total_cycle = np.zeros(nb_apps)
+    for (idx, total_time) in _IDX_WASHING.items():
+        total_cycle[idx] = total_time
+    is_washing = np.zeros(nb_apps, dtype=bool)
+    is_washing[idx_washing] = True
+
+    is_tv = np.zeros(nb_apps, dtype=bool)
+    is_tv[_IDX_TV] = True
+    is_heat_var = np.zeros(nb_apps, dtype=bool)
+    is_heat_var[_IDX_HEATING_VAR] = True
+
+    #  Daily random appliance parameters
+    rated = rng.normal(rated_mean, rated_mean / 10, (nb_units, nb_apps))
+    restart_left = rng.random((nb_units, nb_apps)) * restart_delay * 2
+    cycle_left = np.zeros((nb_units, nb_apps))
+
+    standby_sum = np.sum(array_own * standby, axis=1)
+    calib_own = calib_scalar * array_own
+
+    #  Daily random lighting parameters
+    irr_threshold = rng.normal(_LIGHT_CONFIG.ext_irr_threshold_mean,
+                               _LIGHT_CONFIG.ext_irr_threshold_std_dev,
+                               nb_units)
+    bulb_weight = _LIGHT_CONFIG.calib_scalar \
+                  * rng.standard_exponential((nb_units, nb_bulbs)) \
+                  * (array_bulbs > 0)
+    eff_occ = np.array(_LIGHT_CONFIG.eff_occupancy
+                       + [_LIGHT_CONFIG.eff_occupancy[-1]])
+    light_lower = np.array(_LIGHT_CONFIG.light_event_lower_value)
+    light_upper = np.array(_LIGHT_CONFIG.light_event_upper_value)
+    light_left = np.zeros((nb_units, nb_bulbs), dtype=int)
+
+    app_load = np.zeros((nb_units, 1440))
+    light_load = np.zeros((nb_units, 1440))
+
+    we_idx = array_we.astype(int)
+
+    for t in range(1440):
+
+        if t % 10 == 0:
+            slot = t // 10
+            occ = occ_days[:, slot].astype(int)
+
+            p_start = calib_own * act_fac[we_idx, occ, slot]
+            if slot == 4:
+                p_start[:, idx_storage] = storage_probs \
+                                          * array_own[:, idx_storage]
+            p_start_flat = p_start.ravel()
+
+            keep_flat = (keep_running[np.newaxis, :]
+                         | (occ > 0)[:, np.newaxis]).ravel()
+
+            #  Lights are switched off without active occupants
+            light_left[occ == 0] = 0
+            p_light = bulb_weight * eff_occ[occ][:, np.newaxis]
+
+        # Appliances
+        #  #-----------------------------------------------------------------
+        cycle_flat = cycle_left.ravel()
+        restart_flat = restart_left.ravel()
+
+        off = cycle_flat <= 0
+        in_delay = off & (restart_flat > 0)
+        restart_flat[in_delay] -= 1
+
+        idx_cand = np.flatnonzero(off & ~in_delay & (p_start_flat > 0))
+        idx_start = idx_cand[rng.random(len(idx_cand))
+                             < p_start_flat[idx_cand]]
+
+        idx_run = np.flatnonzero(~off)
+        idx_run = idx_run[keep_flat[idx_run]]
+
+        if len(idx_start) > 0:
+            col = idx_start % nb_apps
+            length = mean_length[col].copy()
+            tv = is_tv[col]
+            length[tv] = np.round(70.0 * rng.standard_exponential(
+                np.count_nonzero(tv)) ** 1.1)
+            heat = is_heat_var[col]
+            length[heat] = rng.normal(mean_length[col[heat]],
+                                      mean_length[col[heat]] / 10)
+            cycle_flat[idx_start] = length
+            restart_flat[idx_start] = restart_delay[col]
+
+        idx_act = np.concatenate((idx_run, idx_start))
+
+        if len(idx_act) > 0:
+            col = idx_act % nb_apps
+            power = rated.ravel()[idx_act]
+            wash = is_washing[col]
+            if np.any(wash):
+                minute = (total_cycle[col[wash]] - cycle_flat[idx_act[wash]]
+                          + 1).astype(int)
+                in_cycle = (minute > 0) & (minute < 200)
+                power_wash = np.full(len(minute), np.nan)
+                power_wash[in_cycle] = \
+                    array_washing[col[wash][in_cycle], minute[in_cycle]]
+                power[wash] = np.where(np.isnan(power_wash),
+                                       standby[col[wash]], power_wash)
+            cycle_flat[idx_act] -= 1
+
+            app_load[:, t] = standby_sum \
+                             + np.bincount(idx_act // nb_apps,
+                                           weights=power - standby[col],
+                                           minlength=nb_units)
+        else:
+            app_load[:, t] = standby_sum
+
+        # Lighting
+        #  #-----------------------------------------------------------------
+        light_flat = light_left.ravel()
+
+        fac_irr = np.where(irr_days[:, t] < irr_threshold, 1, 0.05)
+        p_curr = (p_light * fac_irr[:, np.newaxis]).ravel()
+
+        idx_cand = np.flatnonzero((light_flat == 0) & (p_curr > 0))
+        idx_on = idx_cand[rng.random(len(idx_cand)) < p_curr[idx_cand]]
+
+        if len(idx_on) > 0:
+            idx_dur = (rng.random(len(idx_on)) * 9).astype(int)
+            light_flat[idx_on] = \
+                (light_lower[idx_dur] + rng.random(len(idx_on))
+                 * (light_upper[idx_dur] - light_lower[idx_dur])).astype(int)
+
+        lit = light_left > 0
+        light_load[:, t] = np.sum(array_bulbs * lit, axis=1)
+        light_left -= lit
+
+    return (app_load, light_load)
+
+
+def gen_el_profiles(occ_profiles, array_nb_occ, irradiance, timestep=3600,
+                    annual_demands=None, is_sfh=True,
+                    randomize_appliances=True, prev_heat_dev=False,
+                    light_config=0, initial_day=1, season_light_mod=False,
+                    light_mod_fac=0.25, do_normalization=False,
+                    group_ids=None, block_size=4096, path_app=None,
+                    path_light=None, rng=None, seed=None):
+    """
+    Generate stochastic el. load profiles (appliances and lighting) for
+    multiple apartments at once
+
+    Parameters
+    ----------
+    occ_profiles : np.array
+        2d array (apartments x (nb. of days * 144)) with number of active
+        occupants (e.g. of gen_occ_profiles)
+    array_nb_occ : array-like (of ints)
+        Number of occupants per apartment (1 to 5)
+    irradiance : array-like
+        Global irradiance (direct + diffuse) on horizontal plane in W/m2
+        with timestep
+    timestep : int, optional
+        Timestep of irradiance and output profiles in seconds
+        (default: 3600)
+    annual_demands : array-like, optional
+        Annual el. demands per apartment in kWh (default: None). If None,
+        uses standard consumption per number of occupants.
+    is_sfh : bool, optional
+        Defines, if standard consumption of single family house (True) or
+        multi-family house (False) is used (default: True)
+    randomize_appliances : bool, optional
+        Defines, if appliances are randomly chosen per apartment (default:
+        True). If False, uses appliance set of Appliances.csv
+    prev_heat_dev : bool, optional
+        Defines, if electric heating and hot water devices are prevented
+        (default: False)
+    light_config : int or array-like, optional
+        Lighting configuration (0 to 99), single value or one value per
+        apartment (default: 0)
+    initial_day : int, optional
+        Initial day (default: 1). 1-5 correspond to Monday-Friday, 6-7 to
+        Saturday and Sunday
+    season_light_mod : bool, optional
+        Defines, if lighting power is modified with cosine wave over the
+        year (default: False)
+    light_mod_fac : float, optional
+        Modification factor for season_light_mod (default: 0.25)
+    do_normalization : bool, optional
+        Defines, if profiles are normalized to annual_demands
+        (default: False)
+    group_ids : array-like (of ints), optional
+        Group index (0 to nb. of groups - 1) per apartment, e.g. building
+        index (default: None). If set, profiles are summed up per group.
+    block_size : int, optional
+        Max. number of apartment days, which are simulated at once
+        (default: 4096)
+    path_app : str, optional
+        Path to appliance input file (default: None). If None, uses
+        Appliances.csv of richardsonpy
+    path_light : str, optional
+        Path to light bulb input file (default: None). If None, uses
+        LightBulbs.csv of richardsonpy
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed for new Generator (default: None). Only used, if rng is None.
+
+    Returns
+    -------
+    el_profiles : np.array
+        2d array (apartments or groups x timesteps) with el. power in W
+    """
+
+    _check_timestep(timestep)
+
+    occ_profiles = np.atleast_2d(occ_profiles)
+    array_nb_occ = np.atleast_1d(np.array(array_nb_occ, dtype=int))
+    irradiance = np.asarray(irradiance, dtype=float)
+
+    nb_app = len(occ_profiles)
+    nb_days = int(occ_profiles.shape[1] // 144)
+    steps_day = int(86400 // timestep)
+
+    assert len(array_nb_occ) == nb_app
+    assert len(irradiance) >= nb_days * steps_day, \
+        'Irradiance does not match nb. of days of occupancy profiles!'
+
+    rng = sampeng.get_rng(rng=rng, seed=seed)
+
+    (data, act_stats) = _load_app_inputs(path_app=path_app)
+    nb_apps = len(data)
+
+    if annual_demands is None:
+        dict_cons = STANDARD_CONSUMPTION['SFH' if is_sfh else 'MFH']
+        annual_demands = np.array([dict_cons[nb_occ]
+                                   for nb_occ in array_nb_occ], dtype=float)
+    else:
+        annual_demands = np.atleast_1d(np.array(annual_demands, dtype=float))
+        if len(annual_demands) == 1:
+            annual_demands = np.repeat(annual_demands, nb_app)
+
+    #  Appliance ownership and calibration per apartment (about 9 % of el.
+    #  demand is lighting)
+    if randomize_appliances:
+        array_own = (rng.random((nb_app, nb_apps)) <= data[:, 1]) \
+            .astype(float)
+    else:
+        array_own = np.repeat(data[np.newaxis, :, 0], nb_app, axis=0)
+    if prev_heat_dev:
+        array_own[:, _IDX_HEAT_DEV] = 0
+
+    (calib_cycles, calib_scalar) = \
+        _calibrate_appliances(data=data, array_own=array_own,
+                              array_demand=0.91 * annual_demands)
+
+    light_config = np.atleast_1d(light_config)
+    if len(light_config) == 1:
+        light_config = np.repeat(light_config, nb_app)
+    array_bulbs = _load_light_configs(light_config, path_light=path_light)
+
+    #  Irradiance with 1 minute timestep (interpolated within each day)
+    irr_days = irradiance[:nb_days * steps_day].reshape(nb_days, steps_day)
+    minute_given = np.arange(steps_day) * timestep / 60
+    irr_min = np.array([np.interp(np.arange(1440), minute_given, irr_day)
+                        for irr_day in irr_days])
+
+    array_we = get_weekend_days(nb_days=nb_days, initial_day=initial_day)
+    array_month = _get_month(np.arange(nb_days))
+
+    if group_ids is not None:
+        group_ids = np.asarray(group_ids, dtype=int)
+        assert len(group_ids) == nb_app
+        el_profiles = np.zeros((np.max(group_ids) + 1, nb_days * steps_day))
+    else:
+        el_profiles = np.zeros((nb_app, nb_days * steps_day))
+
+    #  Simulate blocks of apartments (all days at once)
+    nb_block = max(1, int(block_size // nb_days))
+
+    for start in range(0, nb_app, nb_block):
+        idx_app = np.arange(start, min(start + nb_block, nb_app))
+
+        #  Units: apartment days
+        unit_app = np.repeat(idx_app, nb_days)
+        unit_day = np.tile(np.arange(nb_days), len(idx_app))
+
+        (app_load, light_load) = \
+            _sim_el_days(occ_days=occ_profiles[idx_app, :nb_days * 144]
+                         .reshape(-1, 144),
+                         irr_days=irr_min[unit_day],
+                         array_we=array_we[unit_day],
+                         array_month=array_month[unit_day],
+                         data=data, act_stats=act_stats,
+                         array_own=array_own[unit_app],
+                         calib_cycles=calib_cycles[unit_app],
+                         calib_scalar=calib_scalar[unit_app],
+                         array_bulbs=array_bulbs[unit_app], rng=rng)
+
+        app_load = app_load.reshape(len(idx_app), -1)
+        light_load = light_load.reshape(len(idx_app), -1)
+
+        if season_light_mod:
+            #  Cosine wave on lighting (rescaled to original lighting demand)
+            time_pi = np.arange(light_load.shape[1]) * 2 * np.pi \
+                      / light_load.shape[1]
+            cos_array = 0.5 * np.cos(time_pi) + 0.5
+            light_energy = np.sum(light_load, axis=1)
+            ref_power = np.max(light_load, axis=1)
+            light_new = np.where(light_load > 0,
+                                 light_load + light_mod_fac
+                                 * ref_power[:, np.newaxis] * cos_array, 0)
+            light_energy_new = np.sum(light_new, axis=1)
+            light_energy_new[light_energy_new == 0] = 1
+            light_load = light_new * (light_energy
+                                      / light_energy_new)[:, np.newaxis]
+
+        loadcurves = _mean_timestep(app_load + light_load, timestep)
+
+        if do_normalization:
+            curr_dem = np.sum(loadcurves, axis=1) * timestep / (3600 * 1000)
+            loadcurves *= (annual_demands[idx_app] / curr_dem)[:, np.newaxis]
+
+        if group_ids is not None:
+            el_profiles += _sum_groups(loadcurves, group_ids[idx_app],
+                                       len(el_profiles))
+        else:
+            el_profiles[idx_app] = loadcurves
+
+    return el_profiles
+
+
+def gen_dhw_profiles(occ_profiles, timestep=3600, initial_day=1,
+                     temp_diff=35, daily_volumes=None, group_ids=None,
+                     block_size=4096, rng=None, seed=None):
+    """
+    Generate stochastic domestic hot water profiles for multiple apartments
+    at once
+
+    Parameters
+    ----------
+    occ_profiles : np.array
+        2d array (apartments x (nb. of days * 144)) with number of active
+        occupants (e.g. of gen_occ_profiles)
+    timestep : int, optional
+        Timestep of output profiles in seconds (default: 3600)
+    initial_day : int, optional
+        Initial day (default: 1). 1-5 correspond to Monday-Friday, 6-7 to
+        Saturday and Sunday
+    temp_diff : float, optional
+        Temperature difference of hot water in Kelvin (default: 35)
+    daily_volumes : array-like, optional
+        Hot water volumes per apartment and day in liters (default: None).
+        If set, profiles are rescaled to daily_volumes.
+    group_ids : array-like (of ints), optional
+        Group index (0 to nb. of groups - 1) per apartment, e.g. building
+        index (default: None). If set, profiles are summed up per group.
+    block_size : int, optional
+        Max. number of apartment days, which are simulated at once
+        (default: 4096)
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed for new Generator (default: None). Only used, if rng is None.
+
+    Returns
+    -------
+    tup_res : tuple (of arrays)
+        (water, heat)
+        water : 2d array (apartments or groups x timesteps) with hot water
+        flow in l/h
+        heat : 2d array (apartments or groups x timesteps) with hot water
+        heat flow in W
+    """
+
+    _check_timestep(timestep)
+
+    occ_profiles = np.atleast_2d(occ_profiles)
+
+    nb_app = len(occ_profiles)
+    nb_days = int(occ_profiles.shape[1] // 144)
+
+    rng = sampeng.get_rng(rng=rng, seed=seed)
+
+    (array_prob, array_mean) = _load_dhw_tables()
+
+    #  Seasonal factor of tap probability per day and minute
+    time_day = np.arange(nb_days)[:, np.newaxis] + np.arange(1440) / 1440
+    season = 1 + 0.1 * np.cos(np.pi * (2 / 365 * time_day - 1 / 4))
+
+    we_idx = get_weekend_days(nb_days=nb_days,
+                              initial_day=initial_day).astype(int)
+
+    if daily_volumes is not None:
+        daily_volumes = np.atleast_1d(np.array(daily_volumes, dtype=float))
+        if len(daily_volumes) == 1:
+            daily_volumes = np.repeat(daily_volumes, nb_app)
+
+    if group_ids is not None:
+        group_ids = np.asarray(group_ids, dtype=int)
+        assert len(group_ids) == nb_app
+        nb_rows = np.max(group_ids) + 1
+    else:
+        nb_rows = nb_app
+
+    nb_steps = int(nb_days * 86400 // timestep)
+    water = np.zeros((nb_rows, nb_steps))
+
+    nb_block = max(1, int(block_size // nb_days))
+    minutes = np.arange(1440)
+
+    for start in range(0, nb_app, nb_block):
+        idx_app = np.arange(start, min(start + nb_block, nb_app))
+
+        occ_min = np.repeat(occ_profiles[idx_app, :nb_days * 144]
+                            .reshape(len(idx_app), nb_days, 144)
+                            .astype(int), 10, axis=2)
+        we_min = we_idx[np.newaxis, :, np.newaxis]
+
+        prob = array_prob[we_min, occ_min, minutes] * season
+
+        tap = rng.random(prob.shape) < prob
+        water_min = np.zeros(prob.shape)
+        mean_flow = np.broadcast_to(array_mean[we_min, minutes],
+                                    prob.shape)[tap]
+        water_min[tap] = np.abs(rng.normal(mean_flow, 114.33))
+
+        water_block = _mean_timestep(water_min.reshape(len(idx_app), -1),
+                                     timestep)
+
+        if daily_volumes is not None:
+            curr_vol = np.sum(water_block, axis=1) * timestep / 3600 \
+                       / nb_days
+            curr_vol[curr_vol == 0] = 1
+            water_block *= (daily_volumes[idx_app]
+                            / curr_vol)[:, np.newaxis]
+
+        if group_ids is not None:
+            water += _sum_groups(water_block, group_ids[idx_app], nb_rows)
+        else:
+            water[idx_app] = water_block
+
+    #  Heat capacity 4180 J/(kg*K), density 980 kg/m3 (like pycity_base)
+    heat = water * 0.98 * 4180 * temp_diff / 3600
+
+    return (water, heat)
+
+
+def gen_apartment_profiles(environment, array_nb_occ, occ_profiles=None,
+                           el_profiles=True, dhw_profiles=True,
+                           annual_el_demands=None,
+                           is_sfh=True, randomize_appliances=True,
+                           prev_heat_dev=True, light_config=0,
+                           season_light_mod=False, light_mod_fac=0.25,
+                           do_normalization=False, t_flow=60,
+                           t_supply=25, dhw_volumes=None, group_ids=None,
+                           block_size=4096, rng=None, seed=None):
+    """
+    Generate occupancy, el. load and hot water profiles for multiple
+    apartments with timer and weather of environment
+
+    Parameters
+    ----------
+    environment : object
+        Environment object of pyCity_calc
+    array_nb_occ : array-like (of ints)
+        Number of occupants per apartment (1 to 5)
+    occ_profiles : np.array, optional
+        Occupancy profiles of apartments (default: None). If None, new
+        occupancy profiles are generated.
+    el_profiles : bool, optional
+        Generate el. load profiles (default: True)
+    dhw_profiles : bool, optional
+        Generate hot water profiles (default: True)
+    annual_el_demands : array-like, optional
+        Annual el. demands per apartment in kWh (default: None)
+    is_sfh : bool, optional
+        Single family house (True) or multi-family house (False) standard
+        consumption (default: True)
+    randomize_appliances : bool, optional
+        Randomize appliances per apartment (default: True)
+    prev_heat_dev : bool, optional
+        Prevent electric heating and hot water devices (default: True)
+    light_config : int or array-like, optional
+        Lighting configuration(s) (default: 0)
+    season_light_mod : bool, optional
+        Seasonal lighting modification (default: False)
+    light_mod_fac : float, optional
+        Modification factor for season_light_mod (default: 0.25)
+    do_normalization : bool, optional
+        Normalize el. load profiles to annual_el_demands (default: False)
+    t_flow : float, optional
+        Hot water flow temperature in degree Celsius (default: 60)
+    t_supply : float, optional
+        Cold water supply temperature in degree Celsius (default: 25)
+    dhw_volumes : array-like, optional
+        Hot water volumes per apartment and day in liters (default: None)
+    group_ids : array-like (of ints), optional
+        Group index per apartment (default: None). If set, el. and hot water
+        profiles are summed up per group (e.g. per building).
+    block_size : int, optional
+        Max. number of apartment days, which are simulated at once
+        (default: 4096)
+    rng : np.random.Generator, optional
+        Random Generator (default: None)
+    seed : int, optional
+        Seed for new Generator (default: None). Only used, if rng is None.
+
+    Returns
+    -------
+    dict_profiles : dict
+        Dictionary with profile arrays
+        dict_profiles['occ'] : Active occupants (10 minute timestep)
+        dict_profiles['el'] : El. power in W (if el_profiles is True)
+        dict_profiles['dhw_water'] : Hot water flow in l/h (if dhw_profiles
+        is True)
+        dict_profiles['dhw_heat'] : Hot water heat flow in W (if
+        dhw_profiles is True)
+    """
+
+    rng = sampeng.get_rng(rng=rng, seed=seed)
+
+    timestep = environment.timer.timeDiscretization
+    initial_day = environment.timer.initialDay
+    nb_days = int(len(environment.weather.tAmbient) * timestep // 86400)
+
+    dict_profiles = {}
+
+    if occ_profiles is None:
+        occ_profiles = gen_occ_profiles(array_nb_occ=array_nb_occ,
+                                        nb_days=nb_days,
+                                        initial_day=initial_day, rng=rng)
+
+    dict_profiles['occ'] = occ_profiles
+
+    if el_profiles:
+        irradiance = environment.weather.qDirect \
+                     + environment.weather.qDiffuse
+
+        dict_profiles['el'] = \
+            gen_el_profiles(occ_profiles=dict_profiles['occ'],
+                            array_nb_occ=array_nb_occ,
+                            irradiance=irradiance, timestep=timestep,
+                            annual_demands=annual_el_demands, is_sfh=is_sfh,
+                            randomize_appliances=randomize_appliances,
+                            prev_heat_dev=prev_heat_dev,
+                            light_config=light_config,
+                            initial_day=initial_day,
+                            season_light_mod=season_light_mod,
+                            light_mod_fac=light_mod_fac,
+                            do_normalization=do_normalization,
+                            group_ids=group_ids, block_size=block_size,
+                            rng=rng)
+
+    if dhw_profiles:
+        (dict_profiles['dhw_water'], dict_profiles['dhw_heat']) = \
+            gen_dhw_profiles(occ_profiles=dict_profiles['occ'],
+                             timestep=timestep, initial_day=initial_day,
+                             temp_diff=t_flow - t_supply,
+                             daily_volumes=dhw_volumes, group_ids=group_ids,
+                             block_size=block_size, rng=rng)
+
+    return dict_profiles
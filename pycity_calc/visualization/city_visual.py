@@ -9,16 +9,9 @@ import warnings
 import numpy as np
 import shapely.geometry.point as point
 
-import matplotlib.pyplot as plt
 import networkx as nx
 import itertools
 
-try:
-    from matplotlib2tikz import save as tikz_save
-except:  # pragma: no cover
-    msg = 'Could not import matplotlib2tikz. Install first (e.g. via pip)'
-    warnings.warn(msg)
-
 
 def gen_path(path):
     """
@@ -145,6 +138,171 @@ def get_pos_for_plotting(city):
     return pos
 
 
+def get_pos_array(city, nodelist=None):
+    """
+    Returns array with (x, y) positions of nodes (shapely Points as
+    'position' attribute)
+
+    Parameters
+    ----------
+    city : City object
+        City object of pycity_calc
+    nodelist : list (of ints), optional
+        List of node ids (default: None). If None, uses all nodes with
+        'position' attribute.
+
+    Returns
+    -------
+    tup_res : tuple
+        Tuple with list of node ids and array with node positions of shape
+        (number of nodes, 2)
+    """
+
+    if nodelist is None:
+        nodelist = [n for n in city.nodes() if 'position' in city.nodes[n]]
+    else:
+        nodelist = list(nodelist)
+
+    pos_array = np.zeros((len(nodelist), 2))
+
+    for i in range(len(nodelist)):
+        position = city.nodes[nodelist[i]]['position']
+        pos_array[i, 0] = position.x
+        pos_array[i, 1] = position.y
+
+    return (nodelist, pos_array)
+
+
+def get_edge_segments(city, edgelist, dict_index=None, pos_array=None):
+    """
+    Returns array with line segments of edges (start and end position)
+
+    Parameters
+    ----------
+    city : City object
+        City object of pycity_calc
+    edgelist : list (of tuples)
+        List of edge tuples (u, v)
+    dict_index : dict, optional
+        Dictionary with node ids as keys and row indexes of pos_array as
+        values (default: None). If None, positions are extracted from city.
+    pos_array : array, optional
+        Array with node positions (default: None), see get_pos_array
+
+    Returns
+    -------
+    segments : array
+        Array of shape (number of edges, 2, 2) with (x, y) positions of
+        start and end nodes
+    """
+
+    if dict_index is None or pos_array is None:
+        (nodelist, pos_array) = get_pos_array(city)
+        dict_index = dict(zip(nodelist, range(len(nodelist))))
+
+    array_u = np.array([dict_index[u] for (u, v) in edgelist], dtype=int)
+    array_v = np.array([dict_index[v] for (u, v) in edgelist], dtype=int)
+
+    return np.stack((pos_array[array_u], pos_array[array_v]), axis=1)
+
+
+def thin_positions(pos_array, lod_dist):
+    """
+    Level of detail thinning of node positions. Positions are snapped to
+    centers of quadratic grid cells with edge length lod_dist. Only one
+    position per grid cell is kept.
+
+    Parameters
+    ----------
+    pos_array : array
+        Array with (x, y) positions of shape (number of nodes, 2)
+    lod_dist : float
+        Edge length of grid cells in m (e.g. size of one pixel)
+
+    Returns
+    -------
+    pos_thin : array
+        Array with thinned (x, y) positions
+    """
+
+    if len(pos_array) == 0:
+        return pos_array
+
+    cells = np.unique(np.floor(pos_array / lod_dist), axis=0)
+
+    return (cells + 0.5) * lod_dist
+
+
+def thin_segments(segments, lod_dist):
+    """
+    Level of detail thinning of line segments. Start and end positions are
+    snapped to centers of quadratic grid cells with edge length lod_dist.
+    Segments within a single grid cell and duplicates (same start and end
+    cells) are removed.
+
+    Parameters
+    ----------
+    segments : array
+        Array of line segments of shape (number of edges, 2, 2)
+    lod_dist : float
+        Edge length of grid cells in m (e.g. size of one pixel)
+
+    Returns
+    -------
+    segments_thin : array
+        Array with thinned line segments of shape (number of segments, 2, 2)
+    """
+
+    if len(segments) == 0:
+        return segments
+
+    cells = np.floor(segments / lod_dist).reshape(-1, 4)
+
+    #  Remove segments within single grid cell
+    cells = cells[np.any(cells[:, 0:2] != cells[:, 2:4], axis=1)]
+
+    #  Sort start and end cells to remove duplicates independent of direction
+    do_swap = (cells[:, 0] > cells[:, 2]) | \
+              ((cells[:, 0] == cells[:, 2]) & (cells[:, 1] > cells[:, 3]))
+    cells[do_swap] = cells[do_swap][:, [2, 3, 0, 1]]
+
+    cells = np.unique(cells, axis=0)
+
+    return ((cells + 0.5) * lod_dist).reshape(-1, 2, 2)
+
+
+def get_street_nodes_in_dist(city, max_dist):
+    """
+    Returns list of street node ids, which are within max_dist of at least
+    one building node (KD-tree search)
+
+    Parameters
+    ----------
+    city : City object
+        City object of pycity_calc
+    max_dist : float
+        Maximal distance between street and building node in m
+
+    Returns
+    -------
+    list_str_close : list (of ints)
+        List of street node ids (in order of city.nodelist_street)
+    """
+
+    from scipy.spatial import cKDTree
+
+    if len(city.nodelist_street) == 0 or len(city.nodelist_building) == 0:
+        return []
+
+    (list_str, pos_str) = get_pos_array(city, city.nodelist_street)
+    (list_build, pos_build) = get_pos_array(city, city.nodelist_building)
+
+    (array_dist, array_ind) = cKDTree(pos_build).query(pos_str, k=1)
+
+    return [list_str[i] for i in range(len(list_str))
+            if array_dist[i] <= max_dist]
+
+
 def plot_city_district(city, city_list=None, plot_buildings=True,
                        plot_street=True,
                        plot_lhn=False, plot_deg=False, plot_esys=False,
@@ -230,6 +388,8 @@ def plot_city_district(city, city_list=None, plot_buildings=True,
         Node size for plotting (default: 50)
     """
 
+    import matplotlib.pyplot as plt
+
     import pycity_calc.toolbox.networks.network_ops as netop
 
     plt.rc('text', usetex=False)
@@ -282,26 +442,15 @@ def plot_city_district(city, city_list=None, plot_buildings=True,
                                        node_size=node_size,
                                        width=2)
 
-                edgelist_street = []
-                for u, v in city.edges():
-                    if 'network_type' in city.edges[u, v]:
-                        if city.edges[u, v]['network_type'] == 'street':
-                            edgelist_street.append((u, v))
+                edgelist_street = netop.get_edges_of_network_type(city,
+                                                                  'street')
                 nx.draw_networkx_edges(city, pos=pos, edgelist=edgelist_street,
                                        width=1, edge_color='k')
 
             else:  # Only plot street network in specific position
 
-                list_str_close = []
-
-                for s in city.nodelist_street:
-                    for b in city.nodelist_building:
-                        dist = netop.calc_node_distance(city, s, b)
-                        if dist <= plot_str_dist:
-                            if s not in list_str_close:
-                                #  Add street node s to list
-                                list_str_close.append(s)
-                                break
+                list_str_close = get_street_nodes_in_dist(
+                    city=city, max_dist=plot_str_dist)
 
                 nx.draw_networkx_nodes(city, pos=pos,
                                        nodelist=list_str_close,
@@ -309,15 +458,12 @@ def plot_city_district(city, city_list=None, plot_buildings=True,
                                        alpha=0.5, with_labels=False,
                                        node_size=node_size,
                                        width=2)
-                edgelist_street = []
+                set_str_close = set(list_str_close)
 
-                for s1 in list_str_close:
-                    for s2 in list_str_close:
-                        if (s1, s2) in city.edges():
-                            if 'network_type' in city.edges[s1, s2]:
-                                if city.edges[s1, s2][
-                                    'network_type'] == 'street':
-                                    edgelist_street.append((s1, s2))
+                edgelist_street = \
+                    [(s1, s2) for (s1, s2) in
+                     netop.get_edges_of_network_type(city, 'street')
+                     if s1 in set_str_close and s2 in set_str_close]
 
                 nx.draw_networkx_edges(city, pos=pos, edgelist=edgelist_street,
                                        width=1, edge_color='k')
@@ -340,11 +486,8 @@ def plot_city_district(city, city_list=None, plot_buildings=True,
                                            network_id],
                                        node_size=node_size, width=2,
                                        node_color=node_color)
-            edgelist_heating = []
-            for u, v in city.edges():
-                if 'network_type' in city.edges[u, v]:
-                    if city.edges[u, v]['network_type'] == 'heating':
-                        edgelist_heating.append((u, v))
+            edgelist_heating = netop.get_edges_of_network_type(city,
+                                                               'heating')
             nx.draw_networkx_edges(city, pos=pos, edgelist=edgelist_heating,
                                    width=3, edge_color=edge_color,
                                    style=edge_style)
@@ -367,21 +510,15 @@ def plot_city_district(city, city_list=None, plot_buildings=True,
                                            network_id],
                                        node_size=node_size, width=2,
                                        node_color=node_color)
-            edgelist_el = []
-            for u, v in city.edges():
-                if 'network_type' in city.edges[u, v]:
-                    if city.edges[u, v]['network_type'] == 'electricity':
-                        edgelist_el.append((u, v))
+            edgelist_el = netop.get_edges_of_network_type(city,
+                                                          'electricity')
             nx.draw_networkx_edges(city, pos=pos, edgelist=edgelist_el,
                                    width=3, edge_color=edge_color,
                                    style=edge_style)
 
             #   add transformers
-            edgelist_transformer = []
-            for u, v in city.edges():
-                if 'network_type' in city.edges[u, v]:
-                    if (city.edges[u, v]['network_type'] == 'transformer'):
-                        edgelist_transformer.append((u, v))
+            edgelist_transformer = netop.get_edges_of_network_type(
+                city, 'transformer')
             nx.draw_networkx_edges(city, pos=pos,
                                    edgelist=edgelist_transformer,
                                    style='dotted', width=3,
@@ -396,11 +533,8 @@ def plot_city_district(city, city_list=None, plot_buildings=True,
                 edge_color = get_grey_color_list()[2]
                 edge_style = 'dotted'
 
-            edgelist_el = []
-            for u, v in city.edges():
-                if 'network_type' in city.edges[u, v]:
-                    if city.edges[u, v]['network_type'] == 'heating_and_deg':
-                        edgelist_el.append((u, v))
+            edgelist_el = netop.get_edges_of_network_type(city,
+                                                          'heating_and_deg')
             nx.draw_networkx_edges(city, pos=pos, edgelist=edgelist_el,
                                    width=2, edge_color=edge_color,
                                    style=edge_style)
@@ -574,6 +708,8 @@ def plot_city_district(city, city_list=None, plot_buildings=True,
             plt.savefig(save_svg, format='svg', dpi=dpi)
 
             try:
+                from matplotlib2tikz import save as tikz_save
+
                 path_tikz = os.path.join(save_path, 'city_district.tikz')
 
                 tikz_save(path_tikz, figureheight='\\figureheight',
@@ -596,6 +732,8 @@ def plot_city_district(city, city_list=None, plot_buildings=True,
                 plt.savefig(save_svg, format='svg', dpi=dpi)
 
                 try:
+                    from matplotlib2tikz import save as tikz_save
+
                     path_tikz = os.path.join(save_path, 'city_district.tikz')
 
                     tikz_save(path_tikz, figureheight='\\figureheight',
@@ -621,6 +759,222 @@ def plot_city_district(city, city_list=None, plot_buildings=True,
     return fig
 
 
+def plot_city_district_fast(city, plot_buildings=True, plot_street=True,
+                            plot_lhn=False, plot_deg=False,
+                            plot_str_dist=None, lod_dist=None,
+                            node_size=10, line_width=1, plot_color=True,
+                            equal_axis=True, font_size=16, plt_title=None,
+                            x_label='x-position in m',
+                            y_label='y-position in m', fig_adjust=None,
+                            dpi=100, rasterized=True, save_path=None,
+                            show_plot=False, auto_close=False):
+    """
+    Plots (large) city object of pycity_calc with matplotlib collections.
+    Nodes and edges of each type are drawn as single PathCollection or
+    LineCollection, which are generated out of position arrays (e.g. for
+    OSM based cities with thousands of nodes). Node and edge labels as well
+    as energy system labels are not plotted (see plot_city_district).
+
+    Parameters
+    ----------
+    city : city object
+        City object of pycity_calc
+    plot_buildings : bool, optional
+        Plot buildings (default: True)
+    plot_street : bool, optional
+        Plot street (default: True)
+    plot_lhn : bool, optional
+        Plot local heating networks (default: False)
+    plot_deg : bool, optional
+        Plot decentralized, electrical grids (default: False)
+    plot_str_dist : float, optional
+        Defines, if streets should only be plotted within a specific distance
+        to buildings (default: None). If set to None, all street networks are
+        plotted (requires plot_street == True)
+    lod_dist : float or str, optional
+        Level of detail distance in m (default: None). If set, street nodes
+        and edges are snapped to grid with cell size lod_dist and thinned out
+        (see thin_positions and thin_segments). If 'auto', the size of one
+        pixel of the figure is used. If None, no thinning is performed.
+    node_size : int, optional
+        Node size for plotting (default: 10)
+    line_width : float, optional
+        Line width of street edges (default: 1). Energy network edges are
+        plotted with 3 * line_width.
+    plot_color : bool, optional
+        Defines, if plot should be colored or in greyscale (default: True)
+    equal_axis : bool, optional
+        Equalize x- and y-axis (default: True)
+    font_size : float, optional
+        Font size of axis text and title (default: 16)
+    plt_title : str, optional
+        Title of plot (default: None)
+    x_label : str, optional
+        x-axis label (default: 'x-position in m')
+    y_label : str, optional
+        y-axis label (default: 'y-position in m')
+    fig_adjust : str, optional
+        Defines figure size (default: None)
+        If None, default rc parameters are used.
+        Other options: 'a4', 'a4_half'
+    dpi : int, optional
+        DPI size (default: 100)
+    rasterized : bool, optional
+        Defines, if collections should be rasterized within vector graphic
+        outputs, e.g. pdf or svg (default: True)
+    save_path : str, optional
+        Path to save figure to (default: None). File format is defined by
+        file ending (e.g. 'city.png'). If None, figure is not saved.
+    show_plot : bool, optional
+        Defines, if plot should be displayed (default: False)
+    auto_close : bool, optional
+        Automatically closes figure (default: False)
+
+    Returns
+    -------
+    fig : object
+        Matplotlib figure object
+    """
+
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
+    import pycity_calc.toolbox.networks.network_ops as netop
+
+    plt.rc('font', size=font_size)
+
+    # Generate figure object
+    if fig_adjust == 'a4':
+        fig = plt.figure(figsize=(8, 8), dpi=dpi)
+    elif fig_adjust == 'a4_half':
+        fig = plt.figure(figsize=(4, 4), dpi=dpi)
+    else:
+        fig = plt.figure(dpi=dpi)
+
+    ax = fig.add_subplot(111)
+
+    #  Extract positions of all nodes once
+    (nodelist, pos_array) = get_pos_array(city)
+    dict_index = dict(zip(nodelist, range(len(nodelist))))
+
+    if lod_dist == 'auto':
+        if len(pos_array) > 0:
+            (width, height) = fig.get_size_inches() * dpi
+            extent = np.max(np.ptp(pos_array, axis=0))
+            lod_dist = extent / max(width, height)
+        if not lod_dist:
+            lod_dist = None
+
+    def get_pos(list_nodes):
+        return pos_array[[dict_index[n] for n in list_nodes]].reshape(-1, 2)
+
+    def plot_nodes(pos_nodes, marker, color, alpha=1):
+        if len(pos_nodes) > 0:
+            ax.scatter(pos_nodes[:, 0], pos_nodes[:, 1], s=node_size,
+                       marker=marker, c=color, alpha=alpha, linewidths=0,
+                       rasterized=rasterized, zorder=2)
+
+    def plot_edges(network_type, color, width, style, set_nodes=None,
+                   do_thinning=False):
+        edgelist = netop.get_edges_of_network_type(city, network_type)
+        if set_nodes is not None:
+            edgelist = [(u, v) for (u, v) in edgelist
+                        if u in set_nodes and v in set_nodes]
+        if len(edgelist) == 0:
+            return
+        segments = get_edge_segments(city, edgelist, dict_index=dict_index,
+                                     pos_array=pos_array)
+        if do_thinning and lod_dist is not None:
+            segments = thin_segments(segments, lod_dist)
+        ax.add_collection(LineCollection(segments, colors=color,
+                                         linewidths=width, linestyles=style,
+                                         rasterized=rasterized, zorder=1))
+
+    if plot_buildings:
+        #  Plot building nodes
+        plot_nodes(get_pos(city.nodelist_building), marker='s', color='k',
+                   alpha=0.5)
+
+    if plot_street:
+        #  Plot street network
+        if plot_str_dist is None:
+            list_str = city.nodelist_street
+            set_str = None
+        else:
+            list_str = get_street_nodes_in_dist(city=city,
+                                                max_dist=plot_str_dist)
+            set_str = set(list_str)
+
+        pos_str = get_pos(list_str)
+        if lod_dist is not None:
+            pos_str = thin_positions(pos_str, lod_dist)
+
+        plot_nodes(pos_str, marker='o', color='k', alpha=0.5)
+        plot_edges('street', color='k', width=line_width, style='-',
+                   set_nodes=set_str, do_thinning=True)
+
+    if plot_lhn:
+        #  Plot local heating networks
+        if plot_color:
+            color = 'r'
+        else:
+            color = get_grey_color_list()[0]
+
+        for network_id in city.nodelists_heating:
+            plot_nodes(get_pos(city.nodelists_heating[network_id]),
+                       marker='o', color=color)
+        plot_edges('heating', color=color, width=3 * line_width,
+                   style='--')
+
+    if plot_deg:
+        #  Plot decentralized electrical grids and transformers
+        if plot_color:
+            color = 'y'
+        else:
+            color = get_grey_color_list()[1]
+
+        for network_id in city.nodelists_electricity:
+            plot_nodes(get_pos(city.nodelists_electricity[network_id]),
+                       marker='o', color=color)
+        plot_edges('electricity', color=color, width=3 * line_width,
+                   style='-.')
+        plot_edges('transformer', color=color, width=3 * line_width,
+                   style=':')
+
+    if plot_lhn or plot_deg:
+        if plot_color:
+            plot_edges('heating_and_deg', color='g', width=2 * line_width,
+                       style='-.')
+        else:
+            plot_edges('heating_and_deg', color=get_grey_color_list()[2],
+                       width=2 * line_width, style=':')
+
+    ax.autoscale_view()
+
+    if plt_title:
+        ax.set_title(str(plt_title))
+    if x_label:
+        ax.set_xlabel(str(x_label))
+    if y_label:
+        ax.set_ylabel(str(y_label))
+
+    if equal_axis:
+        ax.set_aspect('equal', adjustable='datalim')
+
+    fig.tight_layout()
+
+    if save_path is not None:
+        fig.savefig(save_path, dpi=dpi)
+
+    if show_plot:
+        plt.show()
+
+    if auto_close:
+        plt.close(fig)
+
+    return fig
+
+
 def plot_multi_city_district(city, main_save_path,
                              city_list=None,
                              plot_buildings=True,
@@ -780,6 +1134,8 @@ def plot_cluster_results(city, cluster_dict, plot_street=True,
         (requires plot_street == True)
     """
 
+    import matplotlib.pyplot as plt
+
     import pycity_calc.toolbox.networks.network_ops as netop
 
     #  Get node positions